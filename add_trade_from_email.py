@@ -93,8 +93,12 @@ Examples:
     
     args = parser.parse_args()
     
+    # Duplicate index for this session, built from the trade log on first save
+    duplicate_index = None
+    
     # Helper: add a single parsed trade and update portfolio
     def _save_trade_only(trade_obj) -> bool:
+        nonlocal duplicate_index
         try:
             # Import here to avoid circular imports
             from data.repositories.csv_repository import CSVRepository
@@ -113,8 +117,13 @@ Examples:
                 repository = CSVRepository(args.data_dir)
 
             # Check for duplicates
-            from utils.email_trade_parser import is_duplicate_trade
-            if is_duplicate_trade(trade_obj, repository):
+            from utils.email_trade_parser import is_duplicate_trade, TradeFingerprintIndex
+            if duplicate_index is None:
+                try:
+                    duplicate_index = TradeFingerprintIndex.from_repository(repository)
+                except Exception as e:
+                    print(f"Warning: Could not load trade history for duplicate check: {e}")
+            if is_duplicate_trade(trade_obj, repository, index=duplicate_index):
                 print("ℹ️  Duplicate trade detected; skipping insert.")
                 return True
 
@@ -123,6 +132,8 @@ Examples:
             success = processor.process_trade_entry(trade_obj, clear_caches=True, trade_already_saved=False)
             
             if success:
+                if duplicate_index is not None:
+                    duplicate_index.add_trade(trade_obj)
                 print(f"Successfully added trade: {trade_obj.ticker} {trade_obj.action} {trade_obj.shares} @ {trade_obj.price}")
                 return True
             else:
@@ -58,11 +58,18 @@ class Settings:
                 'fallback_source': 'stooq',
                 'cache_enabled': True,
                 'cache_duration_hours': 24,
+                'price_cache_max_mb': 256,  # Memory budget for in-process PriceCache entries
+                'price_store_max_parts': 8,  # Parquet parts per ticker before compaction
                 'fundamentals_cache_persist': True,
                 'fundamentals_cache_ttl_hours': 12,
                 'historical_window_days': 90,  # Days of historical data for volume calculations
                 'average_volume_period_days': 30,  # Days for average volume calculation
-                'volume_format_threshold': 1000  # Threshold for formatting volume in thousands
+                'volume_format_threshold': 1000,  # Threshold for formatting volume in thousands
+                'source_failure_threshold': 0.5,  # Failure rate that opens a source's circuit breaker
+                'source_min_calls': 5,  # Outcomes required before a breaker may open
+                'source_cooldown_seconds': 60,  # How long an open breaker skips its source
+                'strategy_hedge_delay_seconds': 0,  # Start next fallback after this delay (0 = off)
+                'slow_call_seconds': 5  # Empty responses slower than this count as failures
             },
             'timezone': {
                 'user_display': {  # For CSV and user-facing displays
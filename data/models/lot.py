@@ -86,10 +86,11 @@ class Lot:
         return {
             'lot_id': self.lot_id,
             'ticker': self.ticker,
-            'shares': float(self.shares),
-            'remaining_shares': float(self.remaining_shares),
-            'price': float(self.price),
-            'cost_basis': float(self.cost_basis),
+            # Decimal strings so serialized lots round-trip exactly
+            'shares': str(self.shares),
+            'remaining_shares': str(self.remaining_shares),
+            'price': str(self.price),
+            'cost_basis': str(self.cost_basis),
             'purchase_date': self.purchase_date.isoformat(),
             'currency': self.currency
         }
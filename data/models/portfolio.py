@@ -59,6 +59,8 @@ class Position:
             """Safely convert value to Decimal, handling errors gracefully."""
             if value is None:
                 return default_value
+            if isinstance(value, Decimal):
+                return value
             try:
                 if isinstance(value, str):
                     # Handle empty strings and 'nan' strings
@@ -178,18 +180,60 @@ class Position:
         Returns:
             Position instance
         """
-        # Safely convert to Decimal, handling both float and string inputs from CSV
-        def safe_decimal(value, default=Decimal('0')):
-            if value is None or value == '' or str(value).lower() in ('nan', 'none'):
-                return default
+        return cls._from_csv_values(
+            data.get('Ticker', ''), data.get('Shares', 0), data.get('Average Price', 0),
+            data.get('Cost Basis', 0), data.get('Currency', 'CAD'), data.get('Company'),
+            data.get('Current Price'), data.get('Stop Loss'), _csv_decimal
+        )
+
+    @classmethod
+    def from_csv_columns(cls, columns: Dict[str, List[Any]]) -> List[Position]:
+        """Create Positions in bulk from CSV column arrays.
+
+        Equivalent to calling from_csv_dict on every row, but works from one list
+        per column and converts each distinct numeric value to Decimal only once
+        (prices and share counts repeat heavily across daily snapshots).
+
+        Args:
+            columns: Mapping of llm_portfolio_update.csv column name to a list of values
+
+        Returns:
+            List of Position instances in row order
+        """
+        lengths = {len(values) for values in columns.values()}
+        row_count = lengths.pop() if lengths else 0
+
+        def column(name, default):
+            return columns.get(name) or [default] * row_count
+
+        memo: Dict[Any, Decimal] = {}
+
+        def to_decimal(value, default=Decimal('0')):
             try:
-                return Decimal(str(value))
-            except (ValueError, TypeError, ArithmeticError):
-                return default
-        
-        shares = safe_decimal(data.get('Shares', 0))
-        avg_price = safe_decimal(data.get('Average Price', 0))
-        current_price = safe_decimal(data.get('Current Price')) if data.get('Current Price') not in (None, '', 0, '0', '0.0') else None
+                key = (type(value), value)
+                cached = memo.get(key)
+            except TypeError:
+                return _csv_decimal(value, default)
+            if cached is None:
+                cached = memo[key] = _csv_decimal(value, None)
+            return default if cached is None else cached
+
+        return [
+            cls._from_csv_values(*values, to_decimal)
+            for values in zip(
+                column('Ticker', ''), column('Shares', 0), column('Average Price', 0),
+                column('Cost Basis', 0), column('Currency', 'CAD'), column('Company', None),
+                column('Current Price', None), column('Stop Loss', None)
+            )
+        ]
+
+    @classmethod
+    def _from_csv_values(cls, ticker, shares, avg_price, cost_basis, currency, company,
+                         current_price, stop_loss, to_decimal) -> Position:
+        """Build a Position from raw CSV cell values."""
+        shares = to_decimal(shares)
+        avg_price = to_decimal(avg_price)
+        current_price = to_decimal(current_price) if current_price not in (None, '', 0, '0', '0.0') else None
 
         # Calculate proper unrealized P&L instead of using the potentially incorrect CSV value
         unrealized_pnl = None
@@ -199,19 +243,29 @@ class Position:
             market_value = current_price * shares
 
         return cls(
-            ticker=str(data.get('Ticker', '')),
+            ticker=str(ticker),
             shares=shares,
             avg_price=avg_price,
-            cost_basis=safe_decimal(data.get('Cost Basis', 0)),
-            currency=str(data.get('Currency', 'CAD')),
-            company=data.get('Company'),
+            cost_basis=to_decimal(cost_basis),
+            currency=str(currency),
+            company=company,
             current_price=current_price,
             market_value=market_value,
             unrealized_pnl=unrealized_pnl,
-            stop_loss=safe_decimal(data.get('Stop Loss')) if data.get('Stop Loss') not in (None, '', 0, '0', '0.0') else None
+            stop_loss=to_decimal(stop_loss) if stop_loss not in (None, '', 0, '0', '0.0') else None
         )
 
 
+def _csv_decimal(value, default=Decimal('0')):
+    """Safely convert a CSV cell to Decimal, handling both float and string inputs."""
+    if value is None or value == '' or str(value).lower() in ('nan', 'none'):
+        return default
+    try:
+        return Decimal(str(value))
+    except (ValueError, TypeError, ArithmeticError):
+        return default
+
+
 @dataclass
 class PortfolioSnapshot:
     """Represents a complete portfolio snapshot at a specific point in time.
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import List, Optional, Tuple
@@ -10,6 +11,8 @@ from ..models.portfolio import Position, PortfolioSnapshot
 from ..models.trade import Trade
 from ..models.market_data import MarketData
 
+logger = logging.getLogger(__name__)
+
 
 class BaseRepository(ABC):
     """Abstract base class for data access operations.
@@ -63,6 +66,127 @@ class BaseRepository(ABC):
         """
         pass
     
+    def save_portfolio_snapshots(self, snapshots: List[PortfolioSnapshot], is_trade_execution: bool = False) -> None:
+        """Save several portfolio snapshots (one per trading day) in one batch.
+        
+        Backends override this to write all snapshots in a single operation.
+        Default implementation calls save_portfolio_snapshot for each snapshot.
+        
+        Args:
+            snapshots: Complete portfolio snapshots to save
+            is_trade_execution: Whether this is triggered by a trade execution (bypasses market-close protection)
+            
+        Raises:
+            RepositoryError: If save operation fails
+        """
+        for snapshot in sorted(snapshots, key=lambda s: s.timestamp):
+            self.save_portfolio_snapshot(snapshot, is_trade_execution)
+    
+    def _rebuild_ticker_in_snapshots(self, ticker: str, trade_timestamp: datetime) -> List[PortfolioSnapshot]:
+        """Recompute a ticker's position in every snapshot from the trade timestamp on.
+        
+        Trades and snapshots are walked together in time order, advancing a single
+        FIFO LotTracker, so each trade is applied exactly once no matter how many
+        snapshots follow it.
+        
+        Args:
+            ticker: Ticker symbol to rebuild
+            trade_timestamp: Timestamp of the backdated trade
+            
+        Returns:
+            Updated snapshots (not yet saved), in time order
+        """
+        from datetime import timezone
+        from decimal import Decimal
+        from ..models.lot import LotTracker
+        
+        logger.info(f"Rebuilding {ticker} positions from {trade_timestamp} forward due to backdated trade")
+        
+        # Get all trades for this ticker from the trade date forward
+        trade_date = trade_timestamp.date()
+        start_date = datetime.combine(trade_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+        end_date = datetime.now(timezone.utc)
+        
+        all_trades = self.get_trade_history(ticker=ticker, date_range=(start_date, end_date))
+        if not all_trades:
+            logger.info(f"No trades found for {ticker} from {trade_date} forward")
+            return []
+        
+        snapshots = self.get_portfolio_data(date_range=(start_date, end_date))
+        if not snapshots:
+            logger.info(f"No snapshots found from {trade_date} forward")
+            return []
+        
+        def as_utc(ts: datetime) -> datetime:
+            # Naive timestamps are treated as UTC for comparison
+            return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+        
+        all_trades.sort(key=lambda t: as_utc(t.timestamp))
+        snapshots.sort(key=lambda s: as_utc(s.timestamp))
+        trade_ts = as_utc(trade_timestamp)
+        
+        tracker = LotTracker(ticker)
+        next_trade = 0
+        currency = all_trades[0].currency
+        updated = []
+        
+        for snapshot in snapshots:
+            snapshot_ts = as_utc(snapshot.timestamp)
+            if snapshot_ts < trade_ts:
+                continue  # Skip snapshots before the trade
+            
+            # Apply only the trades between the previous snapshot and this one
+            while next_trade < len(all_trades) and as_utc(all_trades[next_trade].timestamp) <= snapshot_ts:
+                trade = all_trades[next_trade]
+                next_trade += 1
+                currency = trade.currency
+                if trade.is_buy():
+                    tracker.add_lot(
+                        shares=trade.shares,
+                        price=trade.price,
+                        purchase_date=trade.timestamp,
+                        currency=trade.currency
+                    )
+                elif trade.is_sell():
+                    try:
+                        tracker.sell_shares_fifo(
+                            shares_to_sell=trade.shares,
+                            sell_price=trade.price,
+                            sell_date=trade.timestamp
+                        )
+                    except Exception as e:
+                        logger.warning(f"Error processing sell trade for {ticker}: {e}")
+            
+            # Calculate the position at this snapshot time
+            total_shares = tracker.get_total_remaining_shares()
+            total_cost_basis = tracker.get_total_remaining_cost_basis()
+            avg_price = total_cost_basis / total_shares if total_shares > 0 else Decimal('0')
+            
+            if total_shares > 0:
+                # Keep current price and other details from the original position
+                original_position = snapshot.get_position_by_ticker(ticker)
+                current_price = original_position.current_price if original_position else None
+                snapshot.add_position(Position(
+                    ticker=ticker,
+                    shares=total_shares,
+                    avg_price=avg_price,
+                    cost_basis=total_cost_basis,
+                    currency=currency,
+                    company=original_position.company if original_position else None,
+                    current_price=current_price,
+                    market_value=current_price * total_shares if current_price else None,
+                    unrealized_pnl=None  # Will be calculated
+                ))
+            else:
+                # No shares remaining, remove position
+                snapshot.remove_position(ticker)
+            
+            # Recalculate snapshot totals
+            snapshot.total_value = snapshot.calculate_total_value()
+            updated.append(snapshot)
+        
+        return updated
+    
     def update_daily_portfolio_snapshot(self, snapshot: PortfolioSnapshot) -> None:
         """Update today's portfolio snapshot or create new one if it doesn't exist.
         
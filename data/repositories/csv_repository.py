@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import csv
+import json
 import os
 import shutil
 from datetime import datetime
@@ -27,6 +28,10 @@ class CSVRepository(BaseRepository):
     while providing the repository interface for future database migration.
     """
     
+    _SNAPSHOT_INDEX_VERSION = 2
+    # Trailing timezone designators understood by _parse_csv_timestamp
+    _CSV_TZ_SUFFIX = r'(\d:\d{2}(?::\d{2}(?:\.\d+)?)?)(?:\s*(?:[PMCE][SD]T|UTC|GMT)|[+-]\d{2}(?::?\d{2})?|Z)$'
+    
     def __init__(self, fund_name: str, data_directory: str = None):
         """Initialize CSV repository.
         
@@ -47,6 +52,8 @@ class CSVRepository(BaseRepository):
         self.portfolio_file = self.data_dir / "llm_portfolio_update.csv"
         self.trade_log_file = self.data_dir / "llm_trade_log.csv"
         self.cash_balances_file = self.data_dir / "cash_balances.json"
+        # Sidecar index of byte offsets per trading day in the portfolio CSV
+        self.portfolio_index_file = self.data_dir / ".cache" / "portfolio_day_index.json"
         
         # Ensure data directory exists
         self.data_dir.mkdir(exist_ok=True)
@@ -71,14 +78,8 @@ class CSVRepository(BaseRepository):
                 logger.info("Portfolio CSV file is empty")
                 return []
             
-            # Parse timestamps with timezone awareness  
-            # _parse_csv_timestamp returns timezone-aware pandas Timestamps
-            parsed_dates = df['Date'].apply(self._parse_csv_timestamp)
-            # Convert to datetime64 by extracting components (avoids timezone conversion issues)
-            df['Date'] = pd.to_datetime(parsed_dates.apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if hasattr(x, 'strftime') else str(x)))
-            # Add timezone info back
-            if not parsed_dates.empty and hasattr(parsed_dates.iloc[0], 'tz'):
-                df['Date'] = df['Date'].dt.tz_localize(parsed_dates.iloc[0].tz)
+            # Parse timestamps with timezone awareness in one vectorized pass
+            df['Date'] = self._parse_csv_timestamps(df['Date'])
             
             # Filter by date range if provided
             if date_range:
@@ -96,22 +97,24 @@ class CSVRepository(BaseRepository):
             
             # Group by date to create snapshots (group by date only, not exact timestamp)
             df['Date_Only'] = df['Date'].dt.date
+            
+            # Build every position at once from column arrays, then slice per day
+            all_positions = Position.from_csv_columns({
+                col: df[col].tolist() for col in df.columns if col not in ('Date', 'Date_Only')
+            })
+            latest_timestamps = df.groupby('Date_Only')['Date'].max()
             snapshots = []
-            for date, group in df.groupby('Date_Only'):
-                positions = []
-                total_value = Decimal('0')
-                
-                for _, row in group.iterrows():
-                    position = Position.from_csv_dict(row.to_dict())
-                    positions.append(position)
-                    if position.market_value:
-                        total_value += position.market_value
+            for date, row_numbers in df.groupby('Date_Only').indices.items():
+                positions = [all_positions[i] for i in row_numbers]
+                total_value = sum(
+                    (p.market_value for p in positions if p.market_value),
+                    Decimal('0')
+                )
                 
                 # Use the latest timestamp from the group for the snapshot
-                latest_timestamp = group['Date'].max()
                 snapshot = PortfolioSnapshot(
                     positions=positions,
-                    timestamp=latest_timestamp,
+                    timestamp=latest_timestamps[date],
                     total_value=total_value
                 )
                 snapshots.append(snapshot)
@@ -137,105 +140,45 @@ class CSVRepository(BaseRepository):
             is_trade_execution: Whether this is triggered by a trade execution (bypasses market-close protection)
         """
         try:
-            # Prepare data for CSV - use normalized timestamp
-            from utils.timezone_utils import get_trading_timezone
-            trading_tz = get_trading_timezone()
+            normalized_timestamp, df = self._snapshot_to_csv_frame(snapshot)
             
-            # Normalize snapshot timestamp to trading timezone
-            if snapshot.timestamp.tzinfo is None:
-                normalized_timestamp = snapshot.timestamp.replace(tzinfo=trading_tz)
-            else:
-                normalized_timestamp = snapshot.timestamp.astimezone(trading_tz)
-            
-            rows = []
-            timestamp_str = self._format_timestamp_for_csv(normalized_timestamp)
-            
-            for position in snapshot.positions:
-                row = position.to_csv_dict()
-                row['Date'] = timestamp_str
-                row['Action'] = 'HOLD'  # Default action for portfolio snapshots
-                rows.append(row)
-            
-            # Create DataFrame
-            df = pd.DataFrame(rows)
-            
-            # Ensure proper column order to match existing format
-            expected_columns = [
-                'Date', 'Ticker', 'Shares', 'Average Price', 'Cost Basis', 
-                'Stop Loss', 'Current Price', 'Total Value', 'PnL', 'Action', 
-                'Company', 'Currency'
-            ]
-            
-            # Add missing columns with default values
-            for col in expected_columns:
-                if col not in df.columns:
-                    df[col] = ''
-            
-            # Reorder columns
-            df = df[expected_columns]
+            today = normalized_timestamp.date()
+            is_market_close = normalized_timestamp.hour == 16 and normalized_timestamp.minute == 0
+            rows_csv = df.to_csv(index=False, header=False, lineterminator='\n').encode('utf-8')
             
-            # Check for duplicates before saving
-            if self.portfolio_file.exists():
-                existing_df = pd.read_csv(self.portfolio_file)
-                if not existing_df.empty:
-                    # Parse dates to compare - handle timezone-aware dates properly
-                    from utils.timezone_utils import get_trading_timezone
-                    trading_tz = get_trading_timezone()
-                    
-                    parsed_dates = existing_df['Date'].apply(self._parse_csv_timestamp)
-                    # Convert to datetime64 by extracting components
-                    existing_df['Date'] = pd.to_datetime(parsed_dates.apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if hasattr(x, 'strftime') else str(x)))
-                    # Add timezone info back
-                    if not parsed_dates.empty and hasattr(parsed_dates.iloc[0], 'tz'):
-                        existing_df['Date'] = existing_df['Date'].dt.tz_localize(parsed_dates.iloc[0].tz)
-                    # Convert to date-only for comparison
-                    existing_df['Date_Only'] = existing_df['Date'].dt.date
+            # The day index tells us where each trading day's rows live without
+            # parsing the whole file, so replacing today's snapshot only touches the tail
+            index = self._load_snapshot_index() if self.portfolio_file.exists() else None
+            if index is None or not index['days']:
+                # Missing or empty file, create new
+                df.to_csv(self.portfolio_file, index=False, lineterminator='\n')
+                self._rebuild_snapshot_index()
+            else:
+                day_entry = index['days'].get(today.isoformat())
+                if day_entry is None:
+                    # No rows for this day yet, append normally
+                    self._append_portfolio_rows(index, rows_csv, today, is_market_close)
+                else:
+                    # If we're trying to save a market close snapshot and one already exists
+                    if is_market_close and day_entry['close']:
+                        logger.warning(f"Market close snapshot already exists for {today}")
+                        # Don't crash, just update the existing one
                     
-                    # Check if today's data already exists - normalize snapshot to trading timezone
-                    if snapshot.timestamp.tzinfo is None:
-                        normalized_timestamp = snapshot.timestamp.replace(tzinfo=trading_tz)
-                    else:
-                        normalized_timestamp = snapshot.timestamp.astimezone(trading_tz)
-                    today = normalized_timestamp.date()
-                    today_data = existing_df[existing_df['Date_Only'] == today]
+                    # If we're trying to save an intraday snapshot but market close exists
+                    elif day_entry['close'] and not is_market_close:
+                        logger.warning(f"⚠️  Attempting to save intraday snapshot but market close snapshot already exists for {today}")
+                        logger.warning(f"   Skipping save to preserve market close snapshot at 16:00:00")
+                        return  # Don't save, preserve market close snapshot
                     
-                    if not today_data.empty:
-                        # Check if any existing snapshot is at market close (16:00:00)
-                        market_close_exists = any(
-                            pd.to_datetime(row['Date']).hour == 16 and pd.to_datetime(row['Date']).minute == 0
-                            for _, row in today_data.iterrows()
-                        )
-                        
-                        # If we're trying to save a market close snapshot and one already exists
-                        if (normalized_timestamp.hour == 16 and normalized_timestamp.minute == 0 
-                            and market_close_exists):
-                            logger.warning(f"Market close snapshot already exists for {today}")
-                            # Don't crash, just update the existing one
-                            pass
-                        
-                        # If we're trying to save an intraday snapshot but market close exists
-                        elif market_close_exists and not (normalized_timestamp.hour == 16 and normalized_timestamp.minute == 0):
-                            logger.warning(f"⚠️  Attempting to save intraday snapshot but market close snapshot already exists for {today}")
-                            logger.warning(f"   Skipping save to preserve market close snapshot at 16:00:00")
-                            return  # Don't save, preserve market close snapshot
-                        
-                        logger.debug(f"Portfolio data for {today} already exists. Use update_daily_portfolio_snapshot() instead of save_portfolio_snapshot() to prevent duplicates.")
-                        # Remove existing today's data to prevent duplicates
-                        existing_df = existing_df[existing_df['Date_Only'] != today]
-                        existing_df = existing_df.drop('Date_Only', axis=1)  # Remove helper column
-                        
-                        # Combine existing data with new data
-                        combined_df = pd.concat([existing_df, df], ignore_index=True)
-                        combined_df.to_csv(self.portfolio_file, index=False)
+                    logger.debug(f"Portfolio data for {today} already exists. Use update_daily_portfolio_snapshot() instead of save_portfolio_snapshot() to prevent duplicates.")
+                    ranges = day_entry['ranges']
+                    if len(ranges) == 1 and ranges[0][1] == index['size']:
+                        # Today's rows are the tail of the file: truncate and append
+                        self._truncate_portfolio_file(index, today)
+                        self._append_portfolio_rows(index, rows_csv, today, is_market_close)
                     else:
-                        # No duplicates, append normally
-                        df.to_csv(self.portfolio_file, mode='a', header=False, index=False)
-                else:
-                    # Empty file, create new
-                    df.to_csv(self.portfolio_file, index=False)
-            else:
-                # File doesn't exist, create new
-                df.to_csv(self.portfolio_file, index=False)
+                        # Backdated day in the middle of the file: rewrite from that day on
+                        self._rewrite_portfolio_days(index, {today.isoformat(): rows_csv})
             
             logger.info(f"Saved portfolio snapshot with {len(snapshot.positions)} positions")
             
@@ -243,6 +186,91 @@ class CSVRepository(BaseRepository):
             logger.error(f"Failed to save portfolio snapshot: {e}")
             raise RepositoryError(f"Failed to save portfolio snapshot: {e}") from e
     
+    def save_portfolio_snapshots(self, snapshots: List[PortfolioSnapshot], is_trade_execution: bool = False) -> None:
+        """Save several portfolio snapshots with a single write to the CSV file.
+        
+        Each snapshot replaces all rows for its trading day, as with
+        save_portfolio_snapshot, but the file is rewritten at most once, starting
+        from the earliest affected day.
+        
+        Args:
+            snapshots: Complete portfolio snapshots to save
+            is_trade_execution: Whether this is triggered by a trade execution (bypasses market-close protection)
+        """
+        if not snapshots:
+            return
+        try:
+            index = self._load_snapshot_index()
+            if index is None or not index['days']:
+                # Nothing to replace yet; the first save creates the file
+                super().save_portfolio_snapshots(snapshots, is_trade_execution)
+                return
+            
+            replacements: Dict[str, bytes] = {}
+            for snapshot in sorted(snapshots, key=lambda s: s.timestamp):
+                normalized_timestamp, df = self._snapshot_to_csv_frame(snapshot)
+                day = normalized_timestamp.date()
+                is_market_close = normalized_timestamp.hour == 16 and normalized_timestamp.minute == 0
+                day_entry = index['days'].get(day.isoformat())
+                if day_entry and day_entry['close'] and not is_market_close:
+                    logger.warning(f"⚠️  Skipping intraday snapshot for {day} to preserve market close snapshot at 16:00:00")
+                    continue
+                replacements[day.isoformat()] = df.to_csv(index=False, header=False, lineterminator='\n').encode('utf-8')
+            
+            if replacements:
+                self._rewrite_portfolio_days(index, replacements)
+            logger.info(f"Saved {len(replacements)} portfolio snapshots")
+            
+        except Exception as e:
+            logger.error(f"Failed to save portfolio snapshots: {e}")
+            raise RepositoryError(f"Failed to save portfolio snapshots: {e}") from e
+    
+    def _snapshot_to_csv_frame(self, snapshot: PortfolioSnapshot) -> Tuple[datetime, pd.DataFrame]:
+        """Render a snapshot as portfolio CSV rows.
+        
+        Args:
+            snapshot: Portfolio snapshot to render
+            
+        Returns:
+            Tuple of (timestamp normalized to the trading timezone, DataFrame in CSV column order)
+        """
+        # Prepare data for CSV - use normalized timestamp
+        from utils.timezone_utils import get_trading_timezone
+        trading_tz = get_trading_timezone()
+        
+        # Normalize snapshot timestamp to trading timezone
+        if snapshot.timestamp.tzinfo is None:
+            normalized_timestamp = snapshot.timestamp.replace(tzinfo=trading_tz)
+        else:
+            normalized_timestamp = snapshot.timestamp.astimezone(trading_tz)
+        
+        rows = []
+        timestamp_str = self._format_timestamp_for_csv(normalized_timestamp)
+        
+        for position in snapshot.positions:
+            row = position.to_csv_dict()
+            row['Date'] = timestamp_str
+            row['Action'] = 'HOLD'  # Default action for portfolio snapshots
+            rows.append(row)
+        
+        # Create DataFrame
+        df = pd.DataFrame(rows)
+        
+        # Ensure proper column order to match existing format
+        expected_columns = [
+            'Date', 'Ticker', 'Shares', 'Average Price', 'Cost Basis', 
+            'Stop Loss', 'Current Price', 'Total Value', 'PnL', 'Action', 
+            'Company', 'Currency'
+        ]
+        
+        # Add missing columns with default values
+        for col in expected_columns:
+            if col not in df.columns:
+                df[col] = ''
+        
+        # Reorder columns
+        return normalized_timestamp, df[expected_columns]
+    
     def update_daily_portfolio_snapshot(self, snapshot: PortfolioSnapshot) -> None:
         """Update today's portfolio snapshot or create new one if it doesn't exist.
         
@@ -277,12 +305,7 @@ class CSVRepository(BaseRepository):
                 existing_df = pd.read_csv(self.portfolio_file)
                 if not existing_df.empty:
                     # Parse dates to compare - ensure consistent timezone handling
-                    parsed_dates = existing_df['Date'].apply(self._parse_csv_timestamp)
-                    # Convert to datetime64 by extracting components (same fix as get_portfolio_data)
-                    existing_df['Date'] = pd.to_datetime(parsed_dates.apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if hasattr(x, 'strftime') else str(x)))
-                    # Add timezone info back
-                    if not parsed_dates.empty and hasattr(parsed_dates.iloc[0], 'tz'):
-                        existing_df['Date'] = existing_df['Date'].dt.tz_localize(parsed_dates.iloc[0].tz)
+                    existing_df['Date'] = self._parse_csv_timestamps(existing_df['Date'])
                     existing_df['Date_Only'] = existing_df['Date'].dt.date
                     
                     # Check if today's data exists
@@ -508,6 +531,205 @@ class CSVRepository(BaseRepository):
         except Exception as e:
             logger.warning(f"Failed to ensure proper newline in {file_path}: {e}")
     
+    def _load_snapshot_index(self) -> Optional[Dict[str, Any]]:
+        """Load the portfolio day index, rebuilding it if the CSV changed underneath it.
+        
+        The index is only trusted when the CSV's size and modification time match
+        what was recorded after our last write, so edits by other tools (manual
+        edits, rebuild scripts, restores) just trigger a rescan.
+        
+        Returns:
+            Index dict, or None if the portfolio file does not exist
+        """
+        if not self.portfolio_file.exists():
+            return None
+        try:
+            stat = self.portfolio_file.stat()
+            if self.portfolio_index_file.exists():
+                with open(self.portfolio_index_file, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                if (index.get('version') == self._SNAPSHOT_INDEX_VERSION
+                        and index.get('size') == stat.st_size
+                        and index.get('mtime_ns') == stat.st_mtime_ns):
+                    return index
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable portfolio index {self.portfolio_index_file}: {e}")
+        return self._rebuild_snapshot_index()
+    
+    def _rebuild_snapshot_index(self, index: Optional[Dict[str, Any]] = None,
+                                from_offset: int = 0) -> Optional[Dict[str, Any]]:
+        """Scan the portfolio CSV and record the byte ranges of each trading day.
+        
+        Args:
+            index: Existing index that is still valid for bytes before from_offset
+            from_offset: Byte offset (start of a row) to rescan from; 0 rescans everything
+        
+        Returns:
+            Index dict, or None if the portfolio file does not exist
+        """
+        if not self.portfolio_file.exists():
+            return None
+        
+        if index is not None and from_offset > index.get('header_end', 0):
+            # Keep days that lie entirely before the rewritten tail
+            days = {}
+            for day_key, entry in index['days'].items():
+                ranges = [r for r in entry['ranges'] if r[1] <= from_offset]
+                if len(ranges) != len(entry['ranges']) and ranges:
+                    # Day is split around the tail; its close flag may be stale
+                    return self._rebuild_snapshot_index()
+                if ranges:
+                    days[day_key] = {'ranges': ranges, 'close': entry['close']}
+            index = {'header_end': index['header_end'], 'date_col': index['date_col'], 'days': days}
+            offset = from_offset
+        else:
+            index = {'header_end': 0, 'date_col': None, 'days': {}}
+            offset = 0
+        
+        parsed_cache: Dict[str, Tuple[str, bool]] = {}
+        last_line = b''
+        with open(self.portfolio_file, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                start, offset = offset, offset + len(line)
+                last_line = line
+                text = line.decode('utf-8', errors='replace').strip('\r\n')
+                if index['date_col'] is None:
+                    header = next(csv.reader([text]), [])
+                    index['date_col'] = header.index('Date') if 'Date' in header else 0
+                    index['header_end'] = offset
+                    continue
+                if not text.strip():
+                    continue
+                fields = next(csv.reader([text]), [])
+                date_col = index['date_col']
+                timestamp_str = fields[date_col] if len(fields) > date_col else ''
+                if timestamp_str not in parsed_cache:
+                    parsed_cache[timestamp_str] = self._snapshot_index_key(timestamp_str)
+                day_key, is_close = parsed_cache[timestamp_str]
+                self._add_index_range(index, day_key, start, offset, is_close)
+        
+        index['ends_with_newline'] = not last_line or last_line.endswith(b'\n')
+        return self._save_snapshot_index(index)
+    
+    def _snapshot_index_key(self, timestamp_str: str) -> Tuple[str, bool]:
+        """Map a CSV timestamp to its trading day and whether it is a market close snapshot."""
+        try:
+            parsed = self._parse_csv_timestamp(timestamp_str)
+            return parsed.date().isoformat(), parsed.hour == 16 and parsed.minute == 0
+        except Exception:
+            return str(timestamp_str)[:10], False
+    
+    @staticmethod
+    def _add_index_range(index: Dict[str, Any], day_key: str, start: int, end: int, is_close: bool) -> None:
+        """Record a byte range for a day, merging it with an adjacent range."""
+        entry = index['days'].setdefault(day_key, {'ranges': [], 'close': False})
+        if entry['ranges'] and entry['ranges'][-1][1] == start:
+            entry['ranges'][-1][1] = end
+        else:
+            entry['ranges'].append([start, end])
+        entry['close'] = entry['close'] or is_close
+    
+    def _save_snapshot_index(self, index: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp the index with the CSV's current size/mtime and write it atomically."""
+        stat = self.portfolio_file.stat()
+        index.update({
+            'version': self._SNAPSHOT_INDEX_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        })
+        try:
+            self.portfolio_index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.portfolio_index_file.with_name(f"{self.portfolio_index_file.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.portfolio_index_file)
+        except Exception as e:
+            # The index is only an accelerator; the next save will rescan
+            logger.debug(f"Could not write portfolio index {self.portfolio_index_file}: {e}")
+        return index
+    
+    def _append_portfolio_rows(self, index: Dict[str, Any], rows_csv: bytes, day, is_close: bool) -> None:
+        """Append rendered snapshot rows to the portfolio CSV and record them in the index."""
+        with open(self.portfolio_file, 'ab') as f:
+            if not index.get('ends_with_newline', True):
+                f.write(b'\n')
+                index['size'] += 1
+            start = index['size']
+            f.write(rows_csv)
+        self._add_index_range(index, day.isoformat(), start, start + len(rows_csv), is_close)
+        index['ends_with_newline'] = True
+        self._save_snapshot_index(index)
+    
+    def _truncate_portfolio_file(self, index: Dict[str, Any], day) -> None:
+        """Drop a day's rows from the end of the portfolio CSV."""
+        entry = index['days'].pop(day.isoformat())
+        start = entry['ranges'][0][0]
+        with open(self.portfolio_file, 'r+b') as f:
+            f.truncate(start)
+        index['size'] = start
+        index['ends_with_newline'] = True
+    
+    def _rewrite_portfolio_days(self, index: Dict[str, Any], replacements: Dict[str, bytes]) -> None:
+        """Replace the rows of several trading days with one rewrite of the file tail.
+        
+        Each replaced day's new rows go where its old rows were and days not yet
+        in the file are appended. Bytes before the earliest affected row are
+        copied unchanged, and rows of other days are copied verbatim so their
+        formatting is preserved. The result is written to a temporary file next
+        to the CSV and swapped in with os.replace, so a failure partway through
+        leaves the original file intact.
+        
+        Args:
+            index: Current (valid) day index
+            replacements: Mapping of ISO trading day to rendered CSV rows (no header)
+        """
+        cuts = []
+        appended = []
+        for day_key, rows_csv in sorted(replacements.items()):
+            entry = index['days'].get(day_key)
+            if entry is None:
+                appended.append(rows_csv)
+                continue
+            for i, (start, end) in enumerate(sorted(entry['ranges'])):
+                cuts.append((start, end, rows_csv if i == 0 else b''))
+        cuts.sort()
+        tail_start = cuts[0][0] if cuts else index['size']
+        
+        with open(self.portfolio_file, 'rb') as f:
+            head = f.read(tail_start)
+            tail = f.read()
+        
+        pieces = []
+        pos = tail_start
+        for start, end, rows_csv in cuts:
+            pieces.append(tail[pos - tail_start:start - tail_start])
+            pieces.append(rows_csv)
+            pos = end
+        pieces.append(tail[pos - tail_start:])
+        pieces.extend(appended)
+        
+        out = bytearray()
+        if not cuts and not index.get('ends_with_newline', True):
+            out += b'\n'
+        for piece in pieces:
+            if piece:
+                if out and not out.endswith(b'\n'):
+                    out += b'\n'
+                out += piece
+        
+        tmp_path = self.portfolio_file.with_name(f"{self.portfolio_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(head)
+                f.write(out)
+            os.replace(tmp_path, self.portfolio_file)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        self._rebuild_snapshot_index(index, from_offset=tail_start)
+    
     def get_positions_by_ticker(self, ticker: str) -> List[Position]:
         """Get all positions for a specific ticker across time.
         
@@ -746,6 +968,48 @@ class CSVRepository(BaseRepository):
                 trading_tz = get_trading_timezone()
                 return datetime.now(trading_tz)
     
+    def _parse_csv_timestamps(self, timestamps: pd.Series) -> pd.Series:
+        """Vectorized equivalent of applying _parse_csv_timestamp to a column.
+
+        Every value keeps its wall-clock time (the timezone suffix is stripped, as
+        PST/PDT/EST/... and UTC offsets all describe the wall clock the row was
+        written in) and the column is localized to the timezone of the first
+        row, matching how snapshots have always been grouped by date.
+        Values the fast path cannot read fall back to _parse_csv_timestamp.
+
+        Args:
+            timestamps: Series of timestamp strings from CSV
+
+        Returns:
+            Series of timezone-aware timestamps
+        """
+        if timestamps.empty:
+            return pd.to_datetime(timestamps)
+
+        raw = timestamps.astype(str).str.strip()
+        wall_clock = raw.str.replace(self._CSV_TZ_SUFFIX, r'\1', regex=True)
+        parsed = pd.to_datetime(wall_clock, format='ISO8601', errors='coerce')
+
+        unparsed = parsed.isna()
+        if unparsed.any():
+            # Rare formats: parse each distinct value the slow way
+            fallback = {
+                value: self._parse_csv_timestamp(value if value != 'nan' else None)
+                for value in raw[unparsed].unique()
+            }
+            parsed = parsed.astype(object)
+            parsed[unparsed] = raw[unparsed].map(
+                lambda value: pd.Timestamp(fallback[value].strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            parsed = pd.to_datetime(parsed)
+        # _parse_csv_timestamp round-trips through whole seconds
+        parsed = parsed.dt.floor('s')
+
+        first = self._parse_csv_timestamp(timestamps.iloc[0])
+        if hasattr(first, 'tz'):
+            parsed = parsed.dt.tz_localize(first.tz)
+        return parsed
+
     def _format_timestamp_for_csv(self, timestamp: datetime) -> str:
         """Format timestamp for CSV output with timezone name.
 
@@ -769,6 +1033,7 @@ class CSVRepository(BaseRepository):
         
         This method rebuilds the ticker's position using FIFO lot tracking from the
         trade date forward, ensuring accurate historical snapshots after backdated trades.
+        All updated snapshots are written back with a single rewrite of the CSV.
         
         Args:
             ticker: Ticker symbol to update
@@ -778,109 +1043,12 @@ class CSVRepository(BaseRepository):
             RepositoryError: If update operation fails
         """
         try:
-            from datetime import timezone
-            from portfolio.fifo_trade_processor import FIFOTradeProcessor
-            from data.models.lot import LotTracker
-            import pandas as pd
-            
-            logger.info(f"Rebuilding {ticker} positions from {trade_timestamp} forward due to backdated trade")
-            
-            # Get all trades for this ticker from the trade date forward
-            trade_date = trade_timestamp.date()
-            start_date = datetime.combine(trade_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-            end_date = datetime.now(timezone.utc)
-            
-            all_trades = self.get_trade_history(ticker=ticker, date_range=(start_date, end_date))
-            
-            if not all_trades:
-                logger.info(f"No trades found for {ticker} from {trade_date} forward")
-                return
-            
-            # Sort trades chronologically
-            all_trades.sort(key=lambda x: x.timestamp)
-            
-            # Get all snapshots from trade date forward
-            snapshots = self.get_portfolio_data(date_range=(start_date, end_date))
-            
+            snapshots = self._rebuild_ticker_in_snapshots(ticker, trade_timestamp)
             if not snapshots:
-                logger.info(f"No snapshots found from {trade_date} forward")
                 return
             
-            # For each snapshot, rebuild the ticker's position
-            for snapshot in snapshots:
-                # Normalize both timestamps to UTC for comparison
-                from datetime import timezone as tz
-                snapshot_ts = snapshot.timestamp if snapshot.timestamp.tzinfo else snapshot.timestamp.replace(tzinfo=tz.utc)
-                trade_ts = trade_timestamp if trade_timestamp.tzinfo else trade_timestamp.replace(tzinfo=tz.utc)
-                
-                if snapshot_ts < trade_ts:
-                    continue  # Skip snapshots before the trade
-                
-                # Rebuild lots up to this snapshot's timestamp
-                tracker = LotTracker(ticker)
-                
-                # Process all trades up to this snapshot's timestamp
-                for trade in all_trades:
-                    trade_ts_loop = trade.timestamp if trade.timestamp.tzinfo else trade.timestamp.replace(tzinfo=tz.utc)
-                    if trade_ts_loop > snapshot_ts:
-                        break
-                    
-                    if trade.is_buy():
-                        tracker.add_lot(
-                            shares=trade.shares,
-                            price=trade.price,
-                            purchase_date=trade.timestamp,
-                            currency=trade.currency
-                        )
-                    elif trade.is_sell():
-                        try:
-                            tracker.sell_shares_fifo(
-                                shares_to_sell=trade.shares,
-                                sell_price=trade.price,
-                                sell_date=trade.timestamp
-                            )
-                        except Exception as e:
-                            logger.warning(f"Error processing sell trade for {ticker}: {e}")
-                
-                # Calculate the position at this snapshot time
-                total_shares = sum(lot.remaining_shares for lot in tracker.lots)
-                total_cost_basis = sum(lot.remaining_cost_basis for lot in tracker.lots)
-                avg_price = total_cost_basis / total_shares if total_shares > 0 else Decimal('0')
-                
-                # Create new position for this ticker
-                if total_shares > 0:
-                    # Find the original position to get current price and other details
-                    original_position = None
-                    for pos in snapshot.positions:
-                        if pos.ticker == ticker:
-                            original_position = pos
-                            break
-                    
-                    new_position = Position(
-                        ticker=ticker,
-                        shares=total_shares,
-                        avg_price=avg_price,
-                        cost_basis=total_cost_basis,
-                        currency=trade.currency if all_trades else "CAD",
-                        company=original_position.company if original_position else None,
-                        current_price=original_position.current_price if original_position else None,
-                        market_value=original_position.current_price * total_shares if original_position and original_position.current_price else None,
-                        unrealized_pnl=None  # Will be calculated
-                    )
-                    
-                    # Remove old position and add new one
-                    snapshot.remove_position(ticker)
-                    snapshot.add_position(new_position)
-                else:
-                    # No shares remaining, remove position
-                    snapshot.remove_position(ticker)
-                
-                # Recalculate snapshot totals
-                snapshot.total_value = snapshot.calculate_total_value()
-                
-                # Save the updated snapshot
-                self.save_portfolio_snapshot(snapshot)
-                logger.info(f"Updated {ticker} position in snapshot {snapshot.timestamp}")
+            self.save_portfolio_snapshots(snapshots)
+            logger.info(f"Updated {ticker} position in {len(snapshots)} snapshots")
             
             logger.info(f"Successfully rebuilt {ticker} positions from {trade_timestamp} forward")
             
@@ -0,0 +1,96 @@
+"""Per-fund daily value rollup (``fund_daily_values``).
+
+The table holds one row per fund, day and position currency with the summed
+market value, cost basis and P&L of that day's ``portfolio_positions``, in the
+position currency and in the fund's base currency. It is rebuilt for a date
+range by the ``refresh_fund_daily_values`` database function (see
+``web_dashboard/schema/39_fund_daily_values.sql``) whenever positions for
+those days are rewritten.
+
+Readers that only need daily totals use ``load_fund_daily_values`` instead of
+paging through every position row.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from .supabase_pagination import SupabasePageReader
+
+logger = logging.getLogger(__name__)
+
+DAILY_VALUES_TABLE = "fund_daily_values"
+REFRESH_FUNCTION = "refresh_fund_daily_values"
+
+_COLUMNS = (
+    "fund, date, currency, base_currency, position_count, ticker_count, "
+    "total_value, cost_basis, pnl, total_value_base, cost_basis_base, pnl_base"
+)
+
+
+def refresh_fund_daily_values(supabase: Any, fund: Optional[str],
+                              start_date: Optional[date] = None,
+                              end_date: Optional[date] = None) -> bool:
+    """Recompute the rollup for a fund over an inclusive date range.
+
+    Failures are logged and swallowed: the rollup is derived data and readers
+    fall back to portfolio_positions when it is missing.
+
+    Args:
+        supabase: Supabase client (``client.supabase`` for SupabaseClient wrappers)
+        fund: Fund name, or None for all funds
+        start_date: First day to refresh (None = no lower bound)
+        end_date: Last day to refresh (None = no upper bound)
+
+    Returns:
+        True if the refresh succeeded
+    """
+    params = {
+        "p_fund": fund,
+        "p_start_date": start_date.isoformat() if start_date else None,
+        "p_end_date": end_date.isoformat() if end_date else None,
+    }
+    try:
+        supabase.rpc(REFRESH_FUNCTION, params).execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Could not refresh {DAILY_VALUES_TABLE} for {fund} ({start_date} to {end_date}): {e}")
+        return False
+
+
+def load_fund_daily_values(supabase: Any, fund: Optional[str] = None,
+                           start_date: Optional[date] = None) -> Optional[List[Dict[str, Any]]]:
+    """Read rollup rows for a fund, oldest first.
+
+    ``date`` is returned as a UTC midnight ISO timestamp so the rows can stand
+    in for portfolio_positions rows in code that groups by day.
+
+    Args:
+        supabase: Supabase client (``client.supabase`` for SupabaseClient wrappers)
+        fund: Fund name, or None for all funds
+        start_date: Only days on or after this date
+
+    Returns:
+        List of rows, or None if the rollup is unavailable or has no rows
+        (callers then fall back to reading positions)
+    """
+    def apply_filters(query):
+        if fund:
+            query = query.eq("fund", fund)
+        if start_date:
+            query = query.gte("date", start_date.isoformat())
+        return query
+
+    try:
+        rows = SupabasePageReader(supabase, DAILY_VALUES_TABLE, _COLUMNS, apply_filters).fetch_all()
+    except Exception as e:
+        logger.debug(f"{DAILY_VALUES_TABLE} unavailable, falling back to positions: {e}")
+        return None
+    if not rows:
+        return None
+
+    for row in rows:
+        row["date"] = f"{str(row['date'])[:10]}T00:00:00+00:00"
+    return rows
@@ -86,6 +86,19 @@ class SupabaseDualWriteRepository(BaseRepository):
             logger.error(f"Failed to save portfolio snapshot: {e}")
             raise RepositoryError(f"Failed to save portfolio snapshot: {e}") from e
     
+    def save_portfolio_snapshots(self, snapshots: List[PortfolioSnapshot], is_trade_execution: bool = False) -> None:
+        """Save several portfolio snapshots to both Supabase and CSV in one batch each."""
+        try:
+            self.supabase_repo.save_portfolio_snapshots(snapshots, is_trade_execution)
+            logger.info(f"Saved {len(snapshots)} portfolio snapshots to Supabase")
+            
+            self.csv_repo.save_portfolio_snapshots(snapshots, is_trade_execution)
+            logger.info(f"Saved {len(snapshots)} portfolio snapshots to CSV")
+            
+        except Exception as e:
+            logger.error(f"Failed to save portfolio snapshots: {e}")
+            raise RepositoryError(f"Failed to save portfolio snapshots: {e}") from e
+    
     def get_trade_history(self, ticker: Optional[str] = None, date_range: Optional[Tuple[datetime, datetime]] = None) -> List[Trade]:
         """Get trade history from Supabase."""
         return self.supabase_repo.get_trade_history(ticker, date_range)
@@ -0,0 +1,165 @@
+"""Keyset-paginated reads from Supabase (PostgREST) tables.
+
+PostgREST caps responses at 1000 rows, so long histories have to be read in
+pages. Paging with ``.range(offset, ...)`` makes the database skip ``offset``
+rows on every request, so each page is slower than the last. This reader
+instead pages by keyset on ``(date, id)``: every request asks for the rows
+after the last key seen, which the ``(fund, date)`` indexes answer directly.
+
+When the total row count is known to span several pages, ``fetch_all`` splits
+the date range into contiguous slices and reads them concurrently with a
+bounded worker count. ``iter_pages`` streams pages to the caller as they
+arrive.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+
+class SupabasePageReader:
+    """Read every row of a filtered query, page by page, ordered by (date, id)."""
+
+    def __init__(
+        self,
+        supabase: Any,
+        table: str,
+        columns: str = "*",
+        apply_filters: Optional[Callable[[Any], Any]] = None,
+        page_size: int = 1000,
+        max_workers: int = 4,
+        order_column: str = "date",
+        id_column: str = "id",
+    ):
+        """
+        Initialize the reader.
+
+        Args:
+            supabase: Supabase client (``client.supabase`` for SupabaseClient wrappers)
+            table: Table name
+            columns: Columns to select; the keyset columns are added if missing
+            apply_filters: Function adding filters (eq/gte/...) to a query builder
+            page_size: Rows per request (PostgREST caps this at 1000)
+            max_workers: Upper bound on concurrent requests in fetch_all
+            order_column: Leading keyset column, a timestamp
+            id_column: Unique tie-breaker keyset column
+        """
+        self.supabase = supabase
+        self.table = table
+        self.columns = self._with_key_columns(columns, order_column, id_column)
+        self.apply_filters = apply_filters or (lambda query: query)
+        self.page_size = page_size
+        self.max_workers = max(1, max_workers)
+        self.order_column = order_column
+        self.id_column = id_column
+
+    def count(self) -> int:
+        """Count the rows matching the filters without fetching them."""
+        query = self.supabase.table(self.table).select(self.id_column, count="exact")
+        result = self.apply_filters(query).limit(1).execute()
+        return result.count or 0
+
+    def iter_pages(self, lower: Optional[str] = None, upper: Optional[str] = None) -> Iterator[List[Row]]:
+        """Stream pages of rows in (date, id) order.
+
+        Args:
+            lower: Only rows with order_column >= lower (ISO timestamp)
+            upper: Only rows with order_column < upper (ISO timestamp)
+
+        Yields:
+            Lists of up to page_size rows
+        """
+        last_key = None
+        while True:
+            query = self.apply_filters(self.supabase.table(self.table).select(self.columns))
+            if lower is not None:
+                query = query.gte(self.order_column, lower)
+            if upper is not None:
+                query = query.lt(self.order_column, upper)
+            if last_key is not None:
+                last_date, last_id = last_key
+                query = query.or_(
+                    f'{self.order_column}.gt."{last_date}",'
+                    f'and({self.order_column}.eq."{last_date}",{self.id_column}.gt."{last_id}")'
+                )
+            rows = query.order(self.order_column).order(self.id_column).limit(self.page_size).execute().data
+
+            if not rows:
+                return
+            yield rows
+            if len(rows) < self.page_size:
+                return
+            last_key = (rows[-1][self.order_column], rows[-1][self.id_column])
+
+    def iter_rows(self) -> Iterator[Row]:
+        """Stream individual rows in (date, id) order."""
+        for page in self.iter_pages():
+            yield from page
+
+    def fetch_all(self) -> List[Row]:
+        """Fetch all rows in (date, id) order, reading date slices in parallel when worthwhile."""
+        if self.max_workers == 1:
+            return list(self.iter_rows())
+
+        total = self.count()
+        pages = math.ceil(total / self.page_size)
+        if pages <= 1:
+            return list(self.iter_rows())
+
+        bounds = self._date_bounds()
+        if bounds is None:
+            return list(self.iter_rows())
+        first, last = bounds
+        slices = min(self.max_workers, pages)
+        if slices <= 1 or first >= last:
+            return list(self.iter_rows())
+
+        # Contiguous, non-overlapping date slices; the last one is open-ended
+        step = (last - first) / slices
+        edges = [(first + step * i).isoformat() for i in range(1, slices)]
+        ranges = list(zip([None] + edges, edges + [None]))
+
+        def read_slice(bounds_pair):
+            lower, upper = bounds_pair
+            return [row for page in self.iter_pages(lower, upper) for row in page]
+
+        with ThreadPoolExecutor(max_workers=slices) as executor:
+            chunks = list(executor.map(read_slice, ranges))
+
+        rows = [row for chunk in chunks for row in chunk]
+        logger.debug(f"Read {len(rows)} rows from {self.table} in {slices} parallel slices")
+        return rows
+
+    def _date_bounds(self) -> Optional[tuple]:
+        """First and last order_column values matching the filters."""
+        def edge(desc: bool):
+            query = self.apply_filters(self.supabase.table(self.table).select(self.order_column))
+            rows = query.order(self.order_column, desc=desc).limit(1).execute().data
+            return _parse_timestamp(rows[0][self.order_column]) if rows else None
+
+        first, last = edge(False), edge(True)
+        if first is None or last is None:
+            return None
+        return first, last
+
+    @staticmethod
+    def _with_key_columns(columns: str, *keys: str) -> str:
+        """Make sure the keyset columns are selected."""
+        if columns.strip() == "*":
+            return columns
+        selected = {c.strip() for c in columns.split(",")}
+        missing = [k for k in keys if k not in selected]
+        return ", ".join([columns] + missing) if missing else columns
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse a PostgREST timestamp (accepts a trailing 'Z')."""
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
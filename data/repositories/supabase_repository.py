@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import List, Optional, Tuple, Dict, Any
 import logging
@@ -14,6 +14,8 @@ from ..models.trade import Trade
 from ..models.market_data import MarketData
 
 # Import field mappers
+from .supabase_pagination import SupabasePageReader
+from .fund_daily_values import refresh_fund_daily_values
 from .field_mapper import (
     PositionMapper,
     TradeMapper,
@@ -34,6 +36,10 @@ class SupabaseRepository(BaseRepository):
     uses Supabase as the backend storage.
     """
     
+    # Dates per delete request and rows per upsert request in batched saves
+    _BATCH_DATE_CHUNK = 100
+    _BATCH_UPSERT_CHUNK = 1000
+    
     def __init__(self, fund_name: str, url: str = None, key: str = None, use_service_role: bool = False, **kwargs):
         """Initialize Supabase repository.
         
@@ -137,41 +143,22 @@ class SupabaseRepository(BaseRepository):
                 logger.info(f"   Date range: {start_date.date()} to {end_date.date()}")
                 logger.info(f"   Note: Full history available but limited for faster loading")
             
-            # Supabase Python client has a 1000-row default limit
-            # We need to paginate to get all data
-            all_data = []
-            page_size = 1000
-            offset = 0
-            batch_num = 1
-            
             if date_range:
                 start_date, end_date = date_range
                 days_diff = (end_date - start_date).days
                 logger.info(f"📊 Loading portfolio data from {start_date.date()} to {end_date.date()} ({days_diff} days)...")
             
-            while True:
-                query = self.supabase.table("portfolio_positions") \
-                    .select("*") \
-                    .eq("fund", self.fund) \
-                    .range(offset, offset + page_size - 1)
-                
+            # Supabase Python client has a 1000-row default limit
+            # Page by (date, id) keyset, reading date slices in parallel
+            def apply_filters(query):
+                query = query.eq("fund", self.fund)
                 if date_range:
                     query = query.gte("date", start_date.isoformat()).lte("date", end_date.isoformat())
-                
-                result = query.execute()
-                
-                if not result.data:
-                    break
-                
-                all_data.extend(result.data)
-                logger.debug(f"   Fetched batch {batch_num}: {len(result.data)} positions (total: {len(all_data)})")
-                
-                # If we got less than page_size rows, we're done
-                if len(result.data) < page_size:
-                    break
-                
-                offset += page_size
-                batch_num += 1
+                return query
+            
+            all_data = SupabasePageReader(
+                self.supabase, "portfolio_positions", "*", apply_filters
+            ).fetch_all()
             
             elapsed_time = time.time() - start_time
             logger.info(f"✅ Fetched {len(all_data)} portfolio positions in {elapsed_time:.2f}s")
@@ -257,85 +244,10 @@ class SupabaseRepository(BaseRepository):
                     logger.warning(f"   Skipping save to preserve market close snapshot at 16:00:00")
                     return  # Don't save, preserve market close snapshot
             
-            # Get fund's base currency for pre-conversion
-            base_currency = 'CAD'  # Default
-            try:
-                fund_result = self.supabase.table("funds")\
-                    .select("base_currency")\
-                    .eq("name", self.fund)\
-                    .limit(1)\
-                    .execute()
-                if fund_result.data and fund_result.data[0].get('base_currency'):
-                    base_currency = fund_result.data[0]['base_currency'].upper()
-            except Exception as e:
-                logger.warning(f"Could not get base_currency for fund {self.fund}, using default CAD: {e}")
-            
-            # Get exchange rates for this date (for currency conversion)
-            # Import exchange rate utility
-            try:
-                import sys
-                from pathlib import Path
-                project_root = Path(__file__).resolve().parent.parent.parent
-                web_dashboard_path = project_root / 'web_dashboard'
-                if str(web_dashboard_path) not in sys.path:
-                    sys.path.insert(0, str(web_dashboard_path))
-                from exchange_rates_utils import get_exchange_rate_for_date_from_db
-            except ImportError:
-                logger.warning("Could not import exchange_rates_utils - pre-converted values will be None")
-                get_exchange_rate_for_date_from_db = None
-            
-            # Use PositionMapper to convert positions to Supabase format with pre-converted values
-            positions_data = []
-            snapshot_date = snapshot.timestamp.date()
-            
-            for position in snapshot.positions:
-                position_currency = (position.currency or 'CAD').upper()
-                exchange_rate = None
-                
-                # Calculate exchange rate if needed
-                if base_currency and position_currency != base_currency:
-                    if get_exchange_rate_for_date_from_db:
-                        try:
-                            # Get exchange rate for this date
-                            if position_currency == 'USD' and base_currency != 'USD':
-                                # Converting USD to base currency
-                                rate = get_exchange_rate_for_date_from_db(
-                                    snapshot.timestamp,
-                                    'USD',
-                                    base_currency
-                                )
-                                if rate is not None:
-                                    exchange_rate = float(rate)
-                            elif base_currency == 'USD' and position_currency != 'USD':
-                                # Converting from position currency to USD
-                                rate = get_exchange_rate_for_date_from_db(
-                                    snapshot.timestamp,
-                                    position_currency,
-                                    'USD'
-                                )
-                                if rate is not None:
-                                    exchange_rate = float(rate)
-                                else:
-                                    # Try inverse rate
-                                    inverse_rate = get_exchange_rate_for_date_from_db(
-                                        snapshot.timestamp,
-                                        'USD',
-                                        position_currency
-                                    )
-                                    if inverse_rate is not None and inverse_rate != 0:
-                                        exchange_rate = 1.0 / float(inverse_rate)
-                        except Exception as e:
-                            logger.warning(f"Could not get exchange rate for {position_currency}→{base_currency} on {snapshot_date}: {e}")
-                
-                # Convert position with pre-converted values
-                position_data = PositionMapper.model_to_db(
-                    position, 
-                    self.fund, 
-                    snapshot.timestamp,
-                    base_currency=base_currency,
-                    exchange_rate=exchange_rate
-                )
-                positions_data.append(position_data)
+            base_currency = self._get_fund_base_currency()
+            positions_data = self._snapshot_positions_to_db(
+                snapshot, base_currency, self._load_exchange_rate_lookup(), {}
+            )
             
             # Clear existing positions for this fund and date first
             # Delete all positions for this fund and DATE (not exact timestamp)
@@ -355,12 +267,178 @@ class SupabaseRepository(BaseRepository):
                 on_conflict="fund,ticker,date_only"
             ).execute()
             
+            # The rollup is keyed by UTC day, which can be the day after a late local timestamp
+            refresh_fund_daily_values(self.supabase, self.fund, snapshot_date, snapshot_date + timedelta(days=1))
             logger.info(f"Saved {len(positions_data)} portfolio positions to Supabase")
             
         except Exception as e:
             logger.error(f"Failed to save portfolio data: {e}")
             raise RepositoryError(f"Failed to save portfolio data: {e}")
     
+    def save_portfolio_snapshots(self, snapshots: List[PortfolioSnapshot], is_trade_execution: bool = False) -> None:
+        """Save several portfolio snapshots to Supabase in one batch.
+        
+        Same semantics as save_portfolio_snapshot for each snapshot (all positions
+        for its date are replaced), but the existing data is read once, the
+        affected dates are deleted with one request per chunk of dates and all
+        positions are upserted together.
+        
+        Args:
+            snapshots: Complete portfolio snapshots, at most one per date
+            is_trade_execution: Whether this is triggered by a trade execution (bypasses market-close protection)
+            
+        Raises:
+            RepositoryError: If data saving fails
+        """
+        if not snapshots:
+            return
+        try:
+            from datetime import timezone
+            snapshots = sorted(snapshots, key=lambda s: s.timestamp)
+            first_date = snapshots[0].timestamp.date()
+            last_date = snapshots[-1].timestamp.date()
+            
+            # One read of the whole span for market-close protection
+            existing = self.get_portfolio_data(date_range=(
+                datetime.combine(first_date, datetime.min.time()).replace(tzinfo=timezone.utc),
+                datetime.combine(last_date, datetime.max.time()).replace(tzinfo=timezone.utc)
+            ))
+            close_dates = {
+                s.timestamp.date() for s in existing
+                if s.timestamp.hour == 16 and s.timestamp.minute == 0
+            }
+            
+            to_save = {}
+            for snapshot in snapshots:
+                snapshot_date = snapshot.timestamp.date()
+                is_close = snapshot.timestamp.hour == 16 and snapshot.timestamp.minute == 0
+                if snapshot_date in close_dates and not is_close and not is_trade_execution:
+                    logger.warning(f"⚠️  Skipping intraday snapshot for {snapshot_date} to preserve market close snapshot at 16:00:00")
+                    continue
+                to_save[snapshot_date] = snapshot
+            if not to_save:
+                return
+            
+            base_currency = self._get_fund_base_currency()
+            get_rate = self._load_exchange_rate_lookup()
+            rate_cache: Dict[Tuple[Any, str, str], Optional[Decimal]] = {}
+            positions_data = []
+            for snapshot in to_save.values():
+                positions_data.extend(
+                    self._snapshot_positions_to_db(snapshot, base_currency, get_rate, rate_cache)
+                )
+            
+            # Clear existing positions for the affected dates
+            dates = [d.isoformat() for d in to_save]
+            for i in range(0, len(dates), self._BATCH_DATE_CHUNK):
+                self.supabase.table("portfolio_positions").delete()\
+                    .eq("fund", self.fund)\
+                    .in_("date_only", dates[i:i + self._BATCH_DATE_CHUNK])\
+                    .execute()
+            
+            for i in range(0, len(positions_data), self._BATCH_UPSERT_CHUNK):
+                self.supabase.table("portfolio_positions").upsert(
+                    positions_data[i:i + self._BATCH_UPSERT_CHUNK],
+                    on_conflict="fund,ticker,date_only"
+                ).execute()
+            
+            refresh_fund_daily_values(self.supabase, self.fund, min(to_save), max(to_save) + timedelta(days=1))
+            logger.info(f"Saved {len(positions_data)} portfolio positions across {len(to_save)} snapshots to Supabase")
+            
+        except Exception as e:
+            logger.error(f"Failed to save portfolio snapshots: {e}")
+            raise RepositoryError(f"Failed to save portfolio snapshots: {e}")
+    
+    def _get_fund_base_currency(self) -> str:
+        """Get the fund's base currency for pre-converted values (defaults to CAD)."""
+        base_currency = 'CAD'  # Default
+        try:
+            fund_result = self.supabase.table("funds")\
+                .select("base_currency")\
+                .eq("name", self.fund)\
+                .limit(1)\
+                .execute()
+            if fund_result.data and fund_result.data[0].get('base_currency'):
+                base_currency = fund_result.data[0]['base_currency'].upper()
+        except Exception as e:
+            logger.warning(f"Could not get base_currency for fund {self.fund}, using default CAD: {e}")
+        return base_currency
+    
+    @staticmethod
+    def _load_exchange_rate_lookup():
+        """Import the exchange rate lookup from web_dashboard, or None if unavailable."""
+        try:
+            import sys
+            from pathlib import Path
+            project_root = Path(__file__).resolve().parent.parent.parent
+            web_dashboard_path = project_root / 'web_dashboard'
+            if str(web_dashboard_path) not in sys.path:
+                sys.path.insert(0, str(web_dashboard_path))
+            from exchange_rates_utils import get_exchange_rate_for_date_from_db
+            return get_exchange_rate_for_date_from_db
+        except ImportError:
+            logger.warning("Could not import exchange_rates_utils - pre-converted values will be None")
+            return None
+    
+    def _snapshot_positions_to_db(self, snapshot: PortfolioSnapshot, base_currency: str,
+                                  get_rate, rate_cache: Dict) -> List[Dict[str, Any]]:
+        """Convert a snapshot's positions to Supabase rows with pre-converted values.
+        
+        Args:
+            snapshot: Portfolio snapshot to convert
+            base_currency: Fund base currency
+            get_rate: Exchange rate lookup (date, from, to) -> rate, or None
+            rate_cache: Rates already looked up, keyed by (date, from, to); shared across snapshots
+            
+        Returns:
+            List of portfolio_positions rows
+        """
+        def lookup(from_currency: str, to_currency: str):
+            key = (snapshot.timestamp.date(), from_currency, to_currency)
+            if key not in rate_cache:
+                rate_cache[key] = get_rate(snapshot.timestamp, from_currency, to_currency)
+            return rate_cache[key]
+        
+        positions_data = []
+        snapshot_date = snapshot.timestamp.date()
+        
+        for position in snapshot.positions:
+            position_currency = (position.currency or 'CAD').upper()
+            exchange_rate = None
+            
+            # Calculate exchange rate if needed
+            if base_currency and position_currency != base_currency:
+                if get_rate:
+                    try:
+                        # Get exchange rate for this date
+                        if position_currency == 'USD' and base_currency != 'USD':
+                            # Converting USD to base currency
+                            rate = lookup('USD', base_currency)
+                            if rate is not None:
+                                exchange_rate = float(rate)
+                        elif base_currency == 'USD' and position_currency != 'USD':
+                            # Converting from position currency to USD
+                            rate = lookup(position_currency, 'USD')
+                            if rate is not None:
+                                exchange_rate = float(rate)
+                            else:
+                                # Try inverse rate
+                                inverse_rate = lookup('USD', position_currency)
+                                if inverse_rate is not None and inverse_rate != 0:
+                                    exchange_rate = 1.0 / float(inverse_rate)
+                    except Exception as e:
+                        logger.warning(f"Could not get exchange rate for {position_currency}→{base_currency} on {snapshot_date}: {e}")
+            
+            # Convert position with pre-converted values
+            positions_data.append(PositionMapper.model_to_db(
+                position, 
+                self.fund, 
+                snapshot.timestamp,
+                base_currency=base_currency,
+                exchange_rate=exchange_rate
+            ))
+        return positions_data
+    
     def get_trade_history(self, ticker: Optional[str] = None, date_range: Optional[Tuple[datetime, datetime]] = None) -> List[Trade]:
         """Get trade history from Supabase.
         
@@ -376,38 +454,19 @@ class SupabaseRepository(BaseRepository):
         """
         try:
             # WE MUST PAGINATE - Supabase has a hard limit of 1000 rows per request
-            all_rows = []
-            batch_size = 1000
-            offset = 0
-            
-            while True:
+            def apply_filters(query):
                 # Filter by fund name
-                query = self.supabase.table("trade_log").select("*").eq("fund", self.fund)
-                
+                query = query.eq("fund", self.fund)
                 if ticker:
                     query = query.eq("ticker", ticker)
-                
                 if date_range:
                     start_date, end_date = date_range
                     query = query.gte("date", start_date.isoformat()).lte("date", end_date.isoformat())
-                
-                result = query.range(offset, offset + batch_size - 1).execute()
-                
-                if not result.data:
-                    break
-                
-                all_rows.extend(result.data)
-                
-                # If we got fewer rows than batch_size, we're done
-                if len(result.data) < batch_size:
-                    break
-                
-                offset += batch_size
-                
-                # Safety break to prevent infinite loops (e.g. max 50k rows = 50 batches)
-                if offset > 50000:
-                    logger.warning("Reached 50,000 row safety limit in get_trade_history pagination")
-                    break
+                return query
+            
+            all_rows = SupabasePageReader(
+                self.supabase, "trade_log", "*", apply_filters
+            ).fetch_all()
             
             # Use TradeMapper to convert database rows to Trade objects
             trades = [TradeMapper.db_to_model(row) for row in all_rows]
@@ -1016,6 +1075,7 @@ class SupabaseRepository(BaseRepository):
         
         This method rebuilds the ticker's position using FIFO lot tracking from the
         trade date forward, ensuring accurate historical snapshots after backdated trades.
+        All updated snapshots are written back in one batch.
         
         Args:
             ticker: Ticker symbol to update
@@ -1025,111 +1085,12 @@ class SupabaseRepository(BaseRepository):
             RepositoryError: If update operation fails
         """
         try:
-            from datetime import timezone
-            from portfolio.fifo_trade_processor import FIFOTradeProcessor
-            from data.models.lot import LotTracker
-            
-            logger.info(f"Rebuilding {ticker} positions from {trade_timestamp} forward due to backdated trade")
-            
-            # Get all trades for this ticker from the trade date forward
-            trade_date = trade_timestamp.date()
-            start_date = datetime.combine(trade_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-            end_date = datetime.now(timezone.utc)
-            
-            all_trades = self.get_trade_history(ticker=ticker, date_range=(start_date, end_date))
-            
-            if not all_trades:
-                logger.info(f"No trades found for {ticker} from {trade_date} forward")
-                return
-            
-            # Sort trades chronologically
-            all_trades.sort(key=lambda x: x.timestamp)
-            
-            # Create a FIFO processor to rebuild lots
-            fifo_processor = FIFOTradeProcessor(self)
-            
-            # Get all snapshots from trade date forward
-            snapshots = self.get_portfolio_data(date_range=(start_date, end_date))
-            
+            snapshots = self._rebuild_ticker_in_snapshots(ticker, trade_timestamp)
             if not snapshots:
-                logger.info(f"No snapshots found from {trade_date} forward")
                 return
             
-            # For each snapshot, rebuild the ticker's position
-            for snapshot in snapshots:
-                # Normalize both timestamps to UTC for comparison
-                from datetime import timezone as tz
-                snapshot_ts = snapshot.timestamp if snapshot.timestamp.tzinfo else snapshot.timestamp.replace(tzinfo=tz.utc)
-                trade_ts = trade_timestamp if trade_timestamp.tzinfo else trade_timestamp.replace(tzinfo=tz.utc)
-                
-                if snapshot_ts < trade_ts:
-                    continue  # Skip snapshots before the trade
-                
-                # Rebuild lots up to this snapshot's timestamp
-                tracker = LotTracker(ticker)
-                
-                # Process all trades up to this snapshot's timestamp
-                for trade in all_trades:
-                    trade_ts_loop = trade.timestamp if trade.timestamp.tzinfo else trade.timestamp.replace(tzinfo=tz.utc)
-                    if trade_ts_loop > snapshot_ts:
-                        break
-                    
-                    if trade.is_buy():
-                        tracker.add_lot(
-                            shares=trade.shares,
-                            price=trade.price,
-                            purchase_date=trade.timestamp,
-                            currency=trade.currency
-                        )
-                    elif trade.is_sell():
-                        try:
-                            tracker.sell_shares_fifo(
-                                shares_to_sell=trade.shares,
-                                sell_price=trade.price,
-                                sell_date=trade.timestamp
-                            )
-                        except Exception as e:
-                            logger.warning(f"Error processing sell trade for {ticker}: {e}")
-                
-                # Calculate the position at this snapshot time
-                total_shares = sum(lot.remaining_shares for lot in tracker.lots)
-                total_cost_basis = sum(lot.remaining_cost_basis for lot in tracker.lots)
-                avg_price = total_cost_basis / total_shares if total_shares > 0 else Decimal('0')
-                
-                # Create new position for this ticker
-                if total_shares > 0:
-                    # Find the original position to get current price and other details
-                    original_position = None
-                    for pos in snapshot.positions:
-                        if pos.ticker == ticker:
-                            original_position = pos
-                            break
-                    
-                    new_position = Position(
-                        ticker=ticker,
-                        shares=total_shares,
-                        avg_price=avg_price,
-                        cost_basis=total_cost_basis,
-                        currency=trade.currency if all_trades else "CAD",
-                        company=original_position.company if original_position else None,
-                        current_price=original_position.current_price if original_position else None,
-                        market_value=original_position.current_price * total_shares if original_position and original_position.current_price else None,
-                        unrealized_pnl=None  # Will be calculated
-                    )
-                    
-                    # Remove old position and add new one
-                    snapshot.remove_position(ticker)
-                    snapshot.add_position(new_position)
-                else:
-                    # No shares remaining, remove position
-                    snapshot.remove_position(ticker)
-                
-                # Recalculate snapshot totals
-                snapshot.total_value = snapshot.calculate_total_value()
-                
-                # Save the updated snapshot
-                self.save_portfolio_snapshot(snapshot)
-                logger.info(f"Updated {ticker} position in snapshot {snapshot.timestamp}")
+            self.save_portfolio_snapshots(snapshots)
+            logger.info(f"Updated {ticker} position in {len(snapshots)} snapshots")
             
             logger.info(f"Successfully rebuilt {ticker} positions from {trade_timestamp} forward")
             
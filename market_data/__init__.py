@@ -5,15 +5,19 @@ This module provides:
 - MarketDataFetcher: Robust data fetching with Yahoo/Stooq fallback
 - MarketHours: Market timing and trading day calculations  
 - PriceCache: In-memory price caching with persistence support
+- FetchStrategyEngine: Per-source circuit breakers and hedging for fetch fallbacks
 """
 
 from .data_fetcher import MarketDataFetcher, FetchResult
 from .market_hours import MarketHours
 from .price_cache import PriceCache
+from .strategy_engine import FetchStrategyEngine, get_strategy_engine
 
 __all__ = [
     'MarketDataFetcher',
     'FetchResult', 
     'MarketHours',
-    'PriceCache'
+    'PriceCache',
+    'FetchStrategyEngine',
+    'get_strategy_engine'
 ]
\ No newline at end of file
@@ -8,6 +8,9 @@ fallback strategy for fetching OHLCV data:
 3. Stooq direct CSV
 4. Index proxies (e.g., ^GSPC->SPY, ^RUT->IWM) via Yahoo
 
+Sources that keep failing across tickers are skipped by per-source circuit
+breakers (see market_data.strategy_engine).
+
 The fetcher is designed to work with both current CSV storage and future database backends.
 """
 
@@ -15,11 +18,13 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, Optional, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 import pandas as pd
 from pathlib import Path
 
+from market_data.strategy_engine import FetchStrategyEngine, get_strategy_engine
+
 logger = logging.getLogger(__name__)
 
 # Optional pandas-datareader import for Stooq access
@@ -55,7 +60,7 @@ PROXY_MAP = {
 class FetchResult:
     """Result of a market data fetch operation."""
     df: pd.DataFrame
-    source: str  # "yahoo" | "stooq-pdr" | "stooq-csv" | "yahoo:<proxy>-proxy" | "empty"
+    source: str  # "yahoo" | "stooq-pdr" | "stooq-csv" | "yahoo:<proxy>-proxy" | "empty" | "error"
 
 
 class MarketDataFetcher:
@@ -66,15 +71,23 @@ class MarketDataFetcher:
     through a consistent interface.
     """
     
-    def __init__(self, cache_instance: Optional[Any] = None, market_hours: Optional[Any] = None):
+    def __init__(
+        self,
+        cache_instance: Optional[Any] = None,
+        market_hours: Optional[Any] = None,
+        strategy_engine: Optional[FetchStrategyEngine] = None
+    ):
         """
         Initialize the market data fetcher.
 
         Args:
             cache_instance: Optional cache instance for storing/retrieving data
             market_hours: Optional MarketHours instance for market status checking
+            strategy_engine: Optional strategy engine; defaults to the shared
+                process-wide engine so source health is tracked across fetchers
         """
         self.cache = cache_instance
+        self.strategy_engine = strategy_engine or get_strategy_engine()
         self.proxy_map = PROXY_MAP.copy()
         self._portfolio_currency_cache = {}
         self._load_currency_cache()
@@ -331,12 +344,109 @@ class MarketDataFetcher:
         start_date, end_date = self._weekend_safe_range(period, start, end)
 
         # Try multiple fetch strategies with retries
-        # Smart strategy selection based on ticker characteristics
-        fetch_strategies = []
-        
+        fetch_strategies = self._build_fetch_strategies(ticker, start_date, end_date, period, **kwargs)
+        return self._run_fetch_strategies(ticker, fetch_strategies)
+
+    def fetch_price_data_batch(
+        self,
+        tickers: List[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        period: str = "1d",
+        **kwargs: Any
+    ) -> Dict[str, FetchResult]:
+        """
+        Fetch OHLCV data for many tickers with a single bulk Yahoo request.
+
+        Every ticker whose first strategy is a plain Yahoo download (including the
+        ``.TO`` variant for likely Canadian tickers) is requested in one
+        ``yf.download`` call. Tickers that come back empty then run the normal
+        per-ticker fallback chain, skipping the strategy already attempted.
+
+        Args:
+            tickers: Stock ticker symbols (duplicates are ignored)
+            start: Start date for data fetch
+            end: End date for data fetch
+            period: Period for data (default "1d")
+            **kwargs: Additional arguments passed to yfinance
+
+        Returns:
+            Dict mapping each requested ticker to its FetchResult
+        """
+        results: Dict[str, FetchResult] = {}
+        pending: List[str] = []
+
+        for ticker in dict.fromkeys(tickers):
+            if self.cache:
+                cached_data = self.cache.get_cached_price(ticker, start, end)
+                if cached_data is not None:
+                    results[ticker] = FetchResult(cached_data, "cache")
+                    continue
+            pending.append(ticker)
+
+        if not pending:
+            return results
+
+        start_date, end_date = self._weekend_safe_range(period, start, end)
+
+        # Work out which Yahoo symbol each ticker's primary strategy would request
+        strategies_by_ticker: Dict[str, List[Tuple[str, Callable[[], FetchResult]]]] = {}
+        primary_symbols: Dict[str, str] = {}
+        for ticker in pending:
+            strategies = self._build_fetch_strategies(ticker, start_date, end_date, period, **kwargs)
+            strategies_by_ticker[ticker] = strategies
+            primary_name = strategies[0][0]
+            if primary_name == "yahoo":
+                primary_symbols[ticker] = ticker
+            elif primary_name == "yahoo-ca-to":
+                primary_symbols[ticker] = f"{ticker}.TO"
+
+        symbols = sorted(set(primary_symbols.values()))
+        bulk_data: Optional[Dict[str, pd.DataFrame]] = {}
+        if symbols:
+            try:
+                bulk_data = self.strategy_engine.run_single(
+                    "yahoo", lambda: self._fetch_yahoo_bulk(symbols, start_date, end_date, **kwargs)
+                )
+            except Exception as e:
+                logger.debug(f"Yahoo bulk fetch failed for {len(symbols)} symbols: {e}")
+                bulk_data = {}
+        if bulk_data is None:
+            # Yahoo's breaker is open: run every full chain, which skips the Yahoo strategies too
+            logger.debug(f"Skipped bulk Yahoo download of {len(symbols)} symbols (source circuit breaker open)")
+            primary_symbols = {}
+            bulk_data = {}
+        else:
+            logger.debug(
+                f"Bulk Yahoo download returned data for {len(bulk_data)}/{len(primary_symbols)} symbols"
+            )
+
+        for ticker in pending:
+            strategies = strategies_by_ticker[ticker]
+            symbol = primary_symbols.get(ticker)
+            if symbol is None:
+                results[ticker] = self._run_fetch_strategies(ticker, strategies)
+                continue
+
+            primary_name = strategies[0][0]
+            df = bulk_data.get(symbol)
+            if df is not None and not df.empty:
+                results[ticker] = self._finalize_fetch_result(
+                    ticker, FetchResult(df, "yahoo"), primary_name, []
+                )
+            else:
+                # Bulk request came back empty for this ticker - walk the rest of the chain
+                results[ticker] = self._run_fetch_strategies(
+                    ticker, strategies[1:], failed_strategies=[primary_name]
+                )
+
+        return results
+
+    def _is_likely_canadian(self, ticker: str) -> bool:
+        """Guess whether a ticker trades in Canada from its suffix, currency or overrides."""
         # Check if this is a Canadian ticker based on currency in portfolio data
         is_likely_canadian = ticker.endswith(('.TO', '.V'))  # Already has Canadian suffix
-        
+
         # If no suffix, check if we have currency info from portfolio
         if not is_likely_canadian and hasattr(self, '_portfolio_currency_cache'):
             currency = self._portfolio_currency_cache.get(ticker.upper())
@@ -345,7 +455,7 @@ class MarketDataFetcher:
                 logger.debug(f"Detected Canadian ticker from portfolio cache: {ticker} (Currency: {currency})")
             elif currency == 'USD':
                 is_likely_canadian = False
-        
+
         # If still no currency info, check fundamentals overrides for Canadian securities
         if not is_likely_canadian and hasattr(self, '_fundamentals_overrides'):
             override_data = self._fundamentals_overrides.get(ticker.upper())
@@ -354,25 +464,25 @@ class MarketDataFetcher:
                 # Consider Canadian if country is Canada or if it's a Canadian-listed ETF
                 if country == 'CANADA' or 'CANADIAN' in override_data.get('industry', '').upper():
                     is_likely_canadian = True
-        
-        if is_likely_canadian:
+
+        return is_likely_canadian
+
+    def _build_fetch_strategies(
+        self,
+        ticker: str,
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp,
+        period: str,
+        **kwargs: Any
+    ) -> List[Tuple[str, Callable[[], FetchResult]]]:
+        """Build the ordered (name, fetch function) fallback chain for a ticker."""
+        # Smart strategy selection based on ticker characteristics
+        if self._is_likely_canadian(ticker):
             # For likely Canadian tickers, try Canadian suffixes first
             # But don't add suffixes if ticker already has them
             if ticker.endswith(('.TO', '.V')):
                 # Ticker already has Canadian suffix, use as-is
-                fetch_strategies = [
-                    ("yahoo", lambda: self._fetch_yahoo_data(ticker, start_date, end_date, **kwargs)),
-                    ("stooq-pdr", lambda: self._fetch_stooq_pdr(ticker, start_date, end_date)),
-                    ("stooq-csv", lambda: self._fetch_stooq_csv(ticker, start_date, end_date)),
-                    ("yahoo-retry-period", lambda: self._fetch_yahoo_data_retry_period(ticker, period)),
-                    ("yahoo-retry-simple", lambda: self._fetch_yahoo_data_retry_simple(ticker)),
-                    ("yahoo-proxy", lambda: self._fetch_proxy_data(ticker, start_date, end_date, **kwargs)),
-                ]
-            else:
-                # Ticker doesn't have suffix, try adding Canadian suffixes
-                fetch_strategies = [
-                    ("yahoo-ca-to", lambda: self._fetch_yahoo_data(f"{ticker}.TO", start_date, end_date, **kwargs)),
-                    ("yahoo-ca-v", lambda: self._fetch_yahoo_data(f"{ticker}.V", start_date, end_date, **kwargs)),
+                return [
                     ("yahoo", lambda: self._fetch_yahoo_data(ticker, start_date, end_date, **kwargs)),
                     ("stooq-pdr", lambda: self._fetch_stooq_pdr(ticker, start_date, end_date)),
                     ("stooq-csv", lambda: self._fetch_stooq_csv(ticker, start_date, end_date)),
@@ -380,87 +490,123 @@ class MarketDataFetcher:
                     ("yahoo-retry-simple", lambda: self._fetch_yahoo_data_retry_simple(ticker)),
                     ("yahoo-proxy", lambda: self._fetch_proxy_data(ticker, start_date, end_date, **kwargs)),
                 ]
-        else:
-            # For likely US tickers, try US first, then Canadian as fallback
-            # But don't add suffixes if ticker already has them
-            if ticker.endswith(('.TO', '.V')):
-                # Ticker already has Canadian suffix, use as-is
-                fetch_strategies = [
-                    ("yahoo", lambda: self._fetch_yahoo_data(ticker, start_date, end_date, **kwargs)),
-                    ("stooq-pdr", lambda: self._fetch_stooq_pdr(ticker, start_date, end_date)),
-                    ("stooq-csv", lambda: self._fetch_stooq_csv(ticker, start_date, end_date)),
-                    ("yahoo-retry-period", lambda: self._fetch_yahoo_data_retry_period(ticker, period)),
-                    ("yahoo-retry-simple", lambda: self._fetch_yahoo_data_retry_simple(ticker)),
-                    ("yahoo-proxy", lambda: self._fetch_proxy_data(ticker, start_date, end_date, **kwargs)),
-                ]
-            else:
-                # Ticker doesn't have suffix, try US first then Canadian fallback
-                fetch_strategies = [
-                    ("yahoo", lambda: self._fetch_yahoo_data(ticker, start_date, end_date, **kwargs)),
-                    ("stooq-pdr", lambda: self._fetch_stooq_pdr(ticker, start_date, end_date)),
-                    ("stooq-csv", lambda: self._fetch_stooq_csv(ticker, start_date, end_date)),
-                    ("yahoo-ca-to", lambda: self._fetch_yahoo_data(f"{ticker}.TO", start_date, end_date, **kwargs)),
-                    ("yahoo-ca-v", lambda: self._fetch_yahoo_data(f"{ticker}.V", start_date, end_date, **kwargs)),
-                    ("yahoo-retry-period", lambda: self._fetch_yahoo_data_retry_period(ticker, period)),
-                    ("yahoo-retry-simple", lambda: self._fetch_yahoo_data_retry_simple(ticker)),
-                    ("yahoo-proxy", lambda: self._fetch_proxy_data(ticker, start_date, end_date, **kwargs)),
-                ]
+            # Ticker doesn't have suffix, try adding Canadian suffixes
+            return [
+                ("yahoo-ca-to", lambda: self._fetch_yahoo_data(f"{ticker}.TO", start_date, end_date, **kwargs)),
+                ("yahoo-ca-v", lambda: self._fetch_yahoo_data(f"{ticker}.V", start_date, end_date, **kwargs)),
+                ("yahoo", lambda: self._fetch_yahoo_data(ticker, start_date, end_date, **kwargs)),
+                ("stooq-pdr", lambda: self._fetch_stooq_pdr(ticker, start_date, end_date)),
+                ("stooq-csv", lambda: self._fetch_stooq_csv(ticker, start_date, end_date)),
+                ("yahoo-retry-period", lambda: self._fetch_yahoo_data_retry_period(ticker, period)),
+                ("yahoo-retry-simple", lambda: self._fetch_yahoo_data_retry_simple(ticker)),
+                ("yahoo-proxy", lambda: self._fetch_proxy_data(ticker, start_date, end_date, **kwargs)),
+            ]
 
-        successful_strategy = None
-        failed_strategies = []
-        
-        for strategy_name, fetch_func in fetch_strategies:
-            try:
-                result = fetch_func()
-                if not result.df.empty:
-                    # Update source to indicate which strategy worked
-                    result = FetchResult(result.df, f"{result.source} ({strategy_name})")
-                    self._cache_result(ticker, result)
-                    successful_strategy = strategy_name
-                    
-                    # If we found data using a Canadian suffix, update CSVs to use canonical format
-                    self._normalize_ticker_in_csvs(ticker, strategy_name)
-                    
-                    break
-            except Exception as e:
-                failed_strategies.append(strategy_name)
-                continue
+        # For likely US tickers, try US first, then Canadian as fallback
+        # But don't add suffixes if ticker already has them
+        if ticker.endswith(('.TO', '.V')):
+            # Ticker already has Canadian suffix, use as-is
+            return [
+                ("yahoo", lambda: self._fetch_yahoo_data(ticker, start_date, end_date, **kwargs)),
+                ("stooq-pdr", lambda: self._fetch_stooq_pdr(ticker, start_date, end_date)),
+                ("stooq-csv", lambda: self._fetch_stooq_csv(ticker, start_date, end_date)),
+                ("yahoo-retry-period", lambda: self._fetch_yahoo_data_retry_period(ticker, period)),
+                ("yahoo-retry-simple", lambda: self._fetch_yahoo_data_retry_simple(ticker)),
+                ("yahoo-proxy", lambda: self._fetch_proxy_data(ticker, start_date, end_date, **kwargs)),
+            ]
+        # Ticker doesn't have suffix, try US first then Canadian fallback
+        return [
+            ("yahoo", lambda: self._fetch_yahoo_data(ticker, start_date, end_date, **kwargs)),
+            ("stooq-pdr", lambda: self._fetch_stooq_pdr(ticker, start_date, end_date)),
+            ("stooq-csv", lambda: self._fetch_stooq_csv(ticker, start_date, end_date)),
+            ("yahoo-ca-to", lambda: self._fetch_yahoo_data(f"{ticker}.TO", start_date, end_date, **kwargs)),
+            ("yahoo-ca-v", lambda: self._fetch_yahoo_data(f"{ticker}.V", start_date, end_date, **kwargs)),
+            ("yahoo-retry-period", lambda: self._fetch_yahoo_data_retry_period(ticker, period)),
+            ("yahoo-retry-simple", lambda: self._fetch_yahoo_data_retry_simple(ticker)),
+            ("yahoo-proxy", lambda: self._fetch_proxy_data(ticker, start_date, end_date, **kwargs)),
+        ]
 
-            # Log a summary instead of individual errors
-        if successful_strategy:
-            if len(failed_strategies) > 0:
-                # Provide clear user-visible information about fallbacks
-                fallback_msg = f"{ticker}: {', '.join(failed_strategies)} failed, using {successful_strategy}"
-                logger.info(fallback_msg)
-
-                # Also provide more detailed technical info at debug level
-                if successful_strategy == 'yahoo-retry':
-                    logger.debug(f"{ticker}: Yahoo Finance returned 'possibly delisted' warning, but retry with simplified parameters succeeded")
-                elif successful_strategy == 'yahoo-period':
-                    logger.debug(f"{ticker}: Yahoo Finance with date range failed, but period-based fetch succeeded")
-                elif successful_strategy == 'yahoo-simple':
-                    logger.debug(f"{ticker}: Yahoo Finance with full parameters failed, but minimal 5-day fetch succeeded")
-                elif successful_strategy.startswith('yahoo:'):
-                    logger.debug(f"{ticker}: Using proxy ticker {successful_strategy} instead of original ticker")
-                elif successful_strategy.startswith('stooq'):
-                    logger.debug(f"{ticker}: Yahoo Finance failed, successfully fell back to Stooq data source")
-            else:
-                logger.debug(f"{ticker}: Successfully fetched from primary source {successful_strategy}")
+    def _run_fetch_strategies(
+        self,
+        ticker: str,
+        fetch_strategies: List[Tuple[str, Callable[[], FetchResult]]],
+        failed_strategies: Optional[List[str]] = None
+    ) -> FetchResult:
+        """Walk a fallback chain until one strategy returns data.
+
+        Sources whose circuit breaker is open are skipped, and slow strategies
+        may be hedged, according to the strategy engine's configuration.
+        """
+        failed_strategies = list(failed_strategies or [])
 
-            # Note: Canadian stocks (.TO, .V) already return CAD prices from Canadian exchanges
-            # Only convert if we're getting US data for Canadian tickers (fallback case)
-            if hasattr(self, '_portfolio_currency_cache'):
-                currency = self._portfolio_currency_cache.get(ticker)
-                # Don't convert if ticker already has Canadian suffix (.TO, .V) - these are already in CAD
-                if currency == 'CAD' and not successful_strategy.startswith('yahoo-ca') and not ticker.endswith(('.TO', '.V')):
-                    # Only convert if we got data from US exchange, not Canadian, and ticker doesn't have Canadian suffix
-                    result = self._convert_usd_to_cad(result)
+        winner, failed, skipped = self.strategy_engine.run(ticker, fetch_strategies)
+        failed_strategies.extend(failed)
+        if skipped:
+            logger.debug(f"{ticker}: skipped {', '.join(skipped)} (source circuit breaker open)")
 
-            return result
+        if winner is not None:
+            strategy_name, result = winner
+            return self._finalize_fetch_result(ticker, result, strategy_name, failed_strategies)
+
+        logger.error(f"{ticker}: All strategies failed ({', '.join(failed_strategies + skipped)})")
+        return FetchResult(pd.DataFrame(), "failed")
+
+    def get_strategy_stats(self) -> Dict[str, Any]:
+        """
+        Get fallback strategy statistics.
+
+        Returns:
+            Dictionary with per-source attempt/success/failure/skip counters
+            and circuit breaker states
+        """
+        return self.strategy_engine.get_strategy_stats()
+
+    def _finalize_fetch_result(
+        self,
+        ticker: str,
+        result: FetchResult,
+        successful_strategy: str,
+        failed_strategies: List[str]
+    ) -> FetchResult:
+        """Tag, cache and currency-adjust the result of a successful strategy."""
+        # Update source to indicate which strategy worked
+        result = FetchResult(result.df, f"{result.source} ({successful_strategy})")
+        self._cache_result(ticker, result)
+
+        # If we found data using a Canadian suffix, update CSVs to use canonical format
+        self._normalize_ticker_in_csvs(ticker, successful_strategy)
+
+        # Log a summary instead of individual errors
+        if len(failed_strategies) > 0:
+            # Provide clear user-visible information about fallbacks
+            fallback_msg = f"{ticker}: {', '.join(failed_strategies)} failed, using {successful_strategy}"
+            logger.info(fallback_msg)
+
+            # Also provide more detailed technical info at debug level
+            if successful_strategy == 'yahoo-retry':
+                logger.debug(f"{ticker}: Yahoo Finance returned 'possibly delisted' warning, but retry with simplified parameters succeeded")
+            elif successful_strategy == 'yahoo-period':
+                logger.debug(f"{ticker}: Yahoo Finance with date range failed, but period-based fetch succeeded")
+            elif successful_strategy == 'yahoo-simple':
+                logger.debug(f"{ticker}: Yahoo Finance with full parameters failed, but minimal 5-day fetch succeeded")
+            elif successful_strategy.startswith('yahoo:'):
+                logger.debug(f"{ticker}: Using proxy ticker {successful_strategy} instead of original ticker")
+            elif successful_strategy.startswith('stooq'):
+                logger.debug(f"{ticker}: Yahoo Finance failed, successfully fell back to Stooq data source")
         else:
-            logger.error(f"{ticker}: All strategies failed ({', '.join(failed_strategies)})")
-            return FetchResult(pd.DataFrame(), "failed")
-    
+            logger.debug(f"{ticker}: Successfully fetched from primary source {successful_strategy}")
+
+        # Note: Canadian stocks (.TO, .V) already return CAD prices from Canadian exchanges
+        # Only convert if we're getting US data for Canadian tickers (fallback case)
+        if hasattr(self, '_portfolio_currency_cache'):
+            currency = self._portfolio_currency_cache.get(ticker)
+            # Don't convert if ticker already has Canadian suffix (.TO, .V) - these are already in CAD
+            if currency == 'CAD' and not successful_strategy.startswith('yahoo-ca') and not ticker.endswith(('.TO', '.V')):
+                # Only convert if we got data from US exchange, not Canadian, and ticker doesn't have Canadian suffix
+                result = self._convert_usd_to_cad(result)
+
+        return result
+
     def _weekend_safe_range(
         self,
         period: str,
@@ -555,11 +701,76 @@ class MarketDataFetcher:
                         logger.warning(f"{ticker}: Fallback method also returned no data")
                 except Exception as retry_e:
                     logger.warning(f"{ticker}: Both primary and fallback methods failed")
+                # Delisting warnings describe the ticker, not the health of Yahoo
+                logger.debug(f"Yahoo fetch failed for {ticker}: {e}")
+                return FetchResult(pd.DataFrame(), "empty")
 
             logger.debug(f"Yahoo fetch failed for {ticker}: {e}")
+            return FetchResult(pd.DataFrame(), "error")
 
         return FetchResult(pd.DataFrame(), "empty")
 
+    def _fetch_yahoo_bulk(
+        self,
+        symbols: List[str],
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        **kwargs: Any
+    ) -> Dict[str, pd.DataFrame]:
+        """Download several Yahoo symbols in one request and split per symbol.
+
+        Symbols with no rows are omitted from the returned dict so callers can
+        route them to the per-ticker fallbacks. Download errors propagate so the
+        caller can record them on Yahoo's circuit breaker.
+        """
+        if not symbols:
+            return {}
+
+        import yfinance as yf
+
+        # Suppress yfinance warnings and provide our own clear messaging
+        yf_logger = logging.getLogger("yfinance")
+        original_level = yf_logger.level
+        yf_logger.setLevel(logging.ERROR)
+
+        try:
+            # Match Ticker.history() defaults so bulk and single fetches agree
+            download_kwargs = {'auto_adjust': True, 'threads': True, 'progress': False}
+            download_kwargs.update(kwargs)
+            data = yf.download(
+                symbols,
+                start=start,
+                end=end,
+                group_by='ticker',
+                **download_kwargs
+            )
+        finally:
+            # Restore original logging level
+            yf_logger.setLevel(original_level)
+
+        if not isinstance(data, pd.DataFrame) or data.empty:
+            return {}
+
+        frames: Dict[str, pd.DataFrame] = {}
+        ohlcv_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+        for symbol in symbols:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                df = data[symbol]
+            elif len(symbols) == 1:
+                df = data
+            else:
+                continue
+
+            df = df[[col for col in ohlcv_columns if col in df.columns]].dropna(how='all')
+            if df.empty or 'Close' not in df.columns:
+                continue
+            frames[symbol] = self._normalize_ohlcv(self._to_datetime_index(df.copy()))
+
+
+        return frames
+
     def _fetch_yahoo_data_retry_period(self, ticker: str, period: str) -> FetchResult:
         """Retry Yahoo Finance fetch using period instead of date range."""
         try:
@@ -586,6 +797,7 @@ class MarketDataFetcher:
 
         except Exception as e:
             logger.debug(f"Yahoo period retry failed for {ticker}: {e}")
+            return FetchResult(pd.DataFrame(), "error")
 
         return FetchResult(pd.DataFrame(), "empty")
 
@@ -616,6 +828,7 @@ class MarketDataFetcher:
 
         except Exception as e:
             logger.debug(f"Yahoo simple retry failed for {ticker}: {e}")
+            return FetchResult(pd.DataFrame(), "error")
 
         return FetchResult(pd.DataFrame(), "empty")
 
@@ -651,6 +864,7 @@ class MarketDataFetcher:
 
         except Exception as e:
             logger.debug(f"Stooq PDR fetch failed for {ticker}: {e}")
+            return FetchResult(pd.DataFrame(), "error")
 
         return FetchResult(pd.DataFrame(), "empty")
     
@@ -702,6 +916,7 @@ class MarketDataFetcher:
 
         except Exception as e:
             logger.debug(f"Stooq CSV fetch failed for {ticker}: {e}")
+            return FetchResult(pd.DataFrame(), "error")
 
         return FetchResult(pd.DataFrame(), "empty")
     
@@ -725,6 +940,7 @@ class MarketDataFetcher:
 
         except Exception as e:
             logger.debug(f"Proxy fetch failed for {ticker} -> {proxy}: {e}")
+            return FetchResult(pd.DataFrame(), "error")
 
         return FetchResult(pd.DataFrame(), "empty")
     
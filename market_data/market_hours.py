@@ -314,6 +314,9 @@ class MarketHours:
         """
         Count trading days between two dates (inclusive).
         
+        Weekends and days on which both US and Canadian markets are closed
+        are excluded (the same rule as is_trading_day).
+        
         Args:
             start_date: Start date
             end_date: End date
@@ -328,16 +331,7 @@ class MarketHours:
         if start > end:
             start, end = end, start
         
-        # Count weekdays
-        trading_days = 0
-        current = start
-        
-        while current <= end:
-            if current.weekday() < 5:  # Monday=0, Friday=4
-                trading_days += 1
-            current += pd.Timedelta(days=1)
-        
-        return trading_days
+        return len(self.holidays.calendar("any").trading_days_between(start, end))
     
     def _effective_now(self) -> datetime:
         """Get current time in trading timezone."""
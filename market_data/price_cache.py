@@ -2,14 +2,16 @@
 In-memory price caching with persistence support.
 
 This module provides the PriceCache class for caching market data in memory
-with optional persistence to disk. Designed to support both current CSV-based
-storage and future database backends, with cache invalidation strategies
-suitable for real-time price updates in web dashboards.
+with optional persistence to disk. Persisted prices live in a per-ticker
+columnar PriceStore and are loaded lazily, one ticker at a time, on cache
+misses. Designed to support both current CSV-based storage and future
+database backends, with cache invalidation strategies suitable for real-time
+price updates in web dashboards.
 """
 
 import json
 import logging
-import pickle
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple, Union
@@ -17,6 +19,7 @@ from typing import Any, Dict, Optional, Tuple, Union
 import pandas as pd
 
 from config.settings import Settings
+from market_data.price_store import PriceStore
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +36,8 @@ class PriceCache:
         self, 
         settings: Optional[Settings] = None,
         max_cache_size: int = 1000,
-        default_ttl_minutes: int = 15
+        default_ttl_minutes: int = 15,
+        max_cache_bytes: Optional[int] = None
     ):
         """
         Initialize the price cache.
@@ -42,14 +46,22 @@ class PriceCache:
             settings: Optional settings instance for configuration
             max_cache_size: Maximum number of ticker entries to cache
             default_ttl_minutes: Default time-to-live for cache entries in minutes
+            max_cache_bytes: Maximum total memory footprint of cached DataFrames.
+                Defaults to the market_data.price_cache_max_mb setting.
         """
         self.settings = settings or Settings()
         self.max_cache_size = max_cache_size
         self.default_ttl = timedelta(minutes=default_ttl_minutes)
+        if max_cache_bytes is None:
+            try:
+                max_cache_bytes = int(float(self.settings.get('market_data.price_cache_max_mb', 256)) * 1024 * 1024)
+            except Exception:
+                max_cache_bytes = 256 * 1024 * 1024
+        self.max_cache_bytes = max_cache_bytes
         
-        # Cache structure: {ticker: CacheEntry}
-        self._cache: Dict[str, 'CacheEntry'] = {}
-        self._access_order: list = []  # For LRU eviction
+        # Cache structure: {ticker: CacheEntry}, ordered from least to most recently used
+        self._cache: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._total_bytes = 0
         
         # Company name cache (from original script)
         self._company_name_cache: Dict[str, str] = {}
@@ -57,6 +69,11 @@ class PriceCache:
         # Ticker correction cache (from original script)
         self._ticker_correction_cache: Dict[str, str] = {}
         
+        # Per-ticker on-disk store; entries are loaded lazily on cache misses
+        self._store: Optional[PriceStore] = None
+        self._dirty: set = set()  # Tickers cached since the last save
+        self._store_misses: set = set()  # Tickers known to be absent/expired on disk
+        
         # Load persistent cache if available
         self._load_persistent_cache()
     
@@ -69,6 +86,9 @@ class PriceCache:
         """
         Retrieve cached price data for a ticker.
         
+        The returned DataFrame is a copy, so callers may add or modify columns
+        without affecting the cached data.
+        
         Args:
             ticker: Stock ticker symbol
             start_date: Optional start date filter
@@ -79,7 +99,7 @@ class PriceCache:
         """
         ticker = ticker.upper().strip()
         
-        if ticker not in self._cache:
+        if ticker not in self._cache and not self._load_from_store(ticker):
             return None
         
         entry = self._cache[ticker]
@@ -92,26 +112,22 @@ class PriceCache:
         # Update access order for LRU
         self._update_access_order(ticker)
         
-        # Filter data by date range if specified
-        df = entry.data.copy()
-        if start_date:
-            start_ts = pd.Timestamp(start_date)
-            # Make timezone-aware if the index is timezone-aware
-            if df.index.tz is not None and start_ts.tz is None:
-                start_ts = start_ts.tz_localize(df.index.tz)
-            df = df[df.index >= start_ts]
-        if end_date:
-            end_ts = pd.Timestamp(end_date)
-            # Make timezone-aware if the index is timezone-aware
-            if df.index.tz is not None and end_ts.tz is None:
-                end_ts = end_ts.tz_localize(df.index.tz)
-            df = df[df.index <= end_ts]
+        # Filter data by date range if specified. The index is sorted on insert,
+        # so a positional slice means only the requested rows are copied.
+        df = entry.data
+        if start_date or end_date:
+            lo, hi = 0, len(df)
+            if start_date:
+                lo = df.index.searchsorted(self._align_to_index(start_date, df.index), side='left')
+            if end_date:
+                hi = df.index.searchsorted(self._align_to_index(end_date, df.index), side='right')
+            df = df.iloc[lo:hi]
         
         if df.empty:
             return None
         
         logger.debug(f"Cache hit for {ticker} ({len(df)} rows)")
-        return df
+        return df.copy()
     
     def cache_price_data(
         self, 
@@ -135,18 +151,26 @@ class PriceCache:
         ticker = ticker.upper().strip()
         ttl = timedelta(minutes=ttl_minutes) if ttl_minutes else self.default_ttl
         
+        # Keep a private, date-sorted copy so hits can be served as positional slices
+        data = data.copy()
+        if isinstance(data.index, pd.DatetimeIndex) and not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        
         # Create cache entry
         entry = CacheEntry(
             ticker=ticker,
-            data=data.copy(),
+            data=data,
             source=source,
             timestamp=datetime.now(),
             ttl=ttl
         )
         
-        # Add to cache
+        # Add to cache (replacing any previous entry for the ticker)
+        self._remove_from_cache(ticker)
         self._cache[ticker] = entry
-        self._update_access_order(ticker)
+        self._total_bytes += entry.nbytes
+        self._dirty.add(ticker)
+        self._store_misses.discard(ticker)
         
         # Enforce cache size limit
         self._enforce_cache_limit()
@@ -161,14 +185,22 @@ class PriceCache:
             ticker: Stock ticker symbol to invalidate
         """
         ticker = ticker.upper().strip()
+        self._dirty.discard(ticker)
+        if self._store:
+            # Also drop the persisted copy so a later miss cannot resurrect it
+            self._store.remove(ticker)
         if ticker in self._cache:
             self._remove_from_cache(ticker)
             logger.debug(f"Invalidated cache for {ticker}")
     
     def invalidate_all(self) -> None:
-        """Invalidate all cache entries."""
+        """Invalidate all cache entries, including persisted prices."""
         self._cache.clear()
-        self._access_order.clear()
+        self._total_bytes = 0
+        self._dirty.clear()
+        self._store_misses.clear()
+        if self._store:
+            self._store.clear()
         logger.debug("Invalidated entire price cache")
     
     def invalidate_expired(self) -> int:
@@ -178,11 +210,7 @@ class PriceCache:
         Returns:
             Number of entries removed
         """
-        expired_tickers = []
-        
-        for ticker, entry in self._cache.items():
-            if self._is_expired(entry):
-                expired_tickers.append(ticker)
+        expired_tickers = [ticker for ticker, entry in self._cache.items() if self._is_expired(entry)]
         
         for ticker in expired_tickers:
             self._remove_from_cache(ticker)
@@ -219,6 +247,8 @@ class PriceCache:
             "total_entries": total_entries,
             "total_rows": total_rows,
             "max_cache_size": self.max_cache_size,
+            "total_bytes": self._total_bytes,
+            "max_cache_bytes": self.max_cache_bytes,
             "sources": sources,
             "oldest_entry": oldest,
             "newest_entry": newest,
@@ -287,18 +317,27 @@ class PriceCache:
         self._ticker_correction_cache[original] = corrected
     
     def save_persistent_cache(self) -> None:
-        """Save cache to disk for persistence across sessions."""
+        """Save cache to disk for persistence across sessions.
+        
+        Only tickers cached since the last save are written, and each write
+        merges new bars into that ticker's store without rewriting older history.
+        A ticker that fails to write stays dirty and is retried on the next save.
+        """
         try:
             cache_dir = Path(self.settings.get_data_directory()) / ".cache"
             cache_dir.mkdir(exist_ok=True)
             
-            # Save price cache (using pickle for DataFrame support)
-            price_cache_file = cache_dir / "price_cache.pkl"
-            with open(price_cache_file, 'wb') as f:
-                pickle.dump({
-                    'cache': self._cache,
-                    'access_order': self._access_order
-                }, f)
+            # Save price data (columnar, per ticker)
+            if self._store and self._store.available:
+                for ticker in list(self._dirty):
+                    entry = self._cache.get(ticker)
+                    if entry is not None:
+                        try:
+                            self._store.write(ticker, entry.data, entry.source, entry.timestamp, entry.ttl)
+                        except Exception as e:
+                            logger.warning(f"Failed to save cached prices for {ticker}: {e}")
+                            continue
+                    self._dirty.discard(ticker)
             
             # Save name caches (using JSON for readability)
             name_cache_file = cache_dir / "name_cache.json"
@@ -314,20 +353,24 @@ class PriceCache:
             logger.warning(f"Failed to save persistent cache: {e}")
     
     def _load_persistent_cache(self) -> None:
-        """Load cache from disk if available."""
+        """Open the on-disk price store and load name caches.
+        
+        Price data itself is not read here; see _load_from_store.
+        """
         try:
             cache_dir = Path(self.settings.get_data_directory()) / ".cache"
+            max_parts = 8
+            try:
+                max_parts = int(self.settings.get('market_data.price_store_max_parts', 8))
+            except Exception:
+                max_parts = 8
+            self._store = PriceStore(cache_dir / "price_store", max_parts=max_parts)
             
-            # Load price cache
-            price_cache_file = cache_dir / "price_cache.pkl"
-            if price_cache_file.exists():
-                with open(price_cache_file, 'rb') as f:
-                    data = pickle.load(f)
-                    self._cache = data.get('cache', {})
-                    self._access_order = data.get('access_order', [])
-                
-                # Remove expired entries
-                self.invalidate_expired()
+            # The old whole-cache pickle snapshot is superseded by the price store
+            legacy_pickle = cache_dir / "price_cache.pkl"
+            if legacy_pickle.exists():
+                legacy_pickle.unlink()
+                logger.debug("Removed legacy price_cache.pkl snapshot")
             
             # Load name caches
             name_cache_file = cache_dir / "name_cache.json"
@@ -336,45 +379,104 @@ class PriceCache:
                     data = json.load(f)
                     self._company_name_cache = data.get('company_names', {})
                     self._ticker_correction_cache = data.get('ticker_corrections', {})
-            
-            if self._cache:
-                logger.debug(f"Loaded persistent cache with {len(self._cache)} entries")
                 
         except Exception as e:
             logger.warning(f"Failed to load persistent cache: {e}")
             # Reset caches on load failure
-            self._cache.clear()
-            self._access_order.clear()
             self._company_name_cache.clear()
             self._ticker_correction_cache.clear()
     
+    def _load_from_store(self, ticker: str) -> bool:
+        """Load one ticker from the on-disk store into memory if it is still fresh.
+        
+        Returns:
+            True if the ticker is now in the in-memory cache
+        """
+        if not self._store or not self._store.available or ticker in self._store_misses:
+            return False
+        try:
+            meta = self._store.load_meta(ticker)
+            if not meta or not meta.get('timestamp'):
+                self._store_misses.add(ticker)
+                return False
+            timestamp = datetime.fromisoformat(meta['timestamp'])
+            ttl = timedelta(seconds=float(meta.get('ttl_seconds', self.default_ttl.total_seconds())))
+            if datetime.now() - timestamp > ttl:
+                self._store_misses.add(ticker)
+                return False
+            
+            loaded = self._store.load(ticker)
+            if loaded is None:
+                self._store_misses.add(ticker)
+                return False
+            data, _ = loaded
+            entry = CacheEntry(
+                ticker=ticker,
+                data=data,
+                source=meta.get('source', 'unknown'),
+                timestamp=timestamp,
+                ttl=ttl
+            )
+            self._cache[ticker] = entry
+            self._total_bytes += entry.nbytes
+            self._enforce_cache_limit()
+            logger.debug(f"Loaded {len(data)} stored rows for {ticker}")
+            return ticker in self._cache
+        except Exception as e:
+            logger.debug(f"Could not load stored prices for {ticker}: {e}")
+            self._store_misses.add(ticker)
+            return False
+    
     def _is_expired(self, entry: 'CacheEntry') -> bool:
         """Check if a cache entry is expired."""
         return datetime.now() - entry.timestamp > entry.ttl
     
+    def _spill_to_store(self, ticker: str, entry: 'CacheEntry') -> None:
+        """Persist a single entry to the on-disk store (best-effort)."""
+        if not self._store or not self._store.available:
+            return
+        try:
+            self._store.write(ticker, entry.data, entry.source, entry.timestamp, entry.ttl)
+            self._store_misses.discard(ticker)
+        except Exception as e:
+            logger.debug(f"Could not persist evicted entry for {ticker}: {e}")
+    
+    @staticmethod
+    def _align_to_index(value: Union[datetime, pd.Timestamp], index: pd.Index) -> pd.Timestamp:
+        """Convert a date bound to a Timestamp comparable with the cached index."""
+        ts = pd.Timestamp(value)
+        index_tz = getattr(index, 'tz', None)
+        # Make timezone-aware if the index is timezone-aware
+        if index_tz is not None and ts.tz is None:
+            ts = ts.tz_localize(index_tz)
+        elif index_tz is None and ts.tz is not None:
+            ts = ts.tz_localize(None)
+        return ts
+    
     def _update_access_order(self, ticker: str) -> None:
-        """Update LRU access order for a ticker."""
-        if ticker in self._access_order:
-            self._access_order.remove(ticker)
-        self._access_order.append(ticker)
+        """Mark a ticker as most recently used."""
+        self._cache.move_to_end(ticker)
     
     def _remove_from_cache(self, ticker: str) -> None:
-        """Remove a ticker from cache and access order."""
-        if ticker in self._cache:
-            del self._cache[ticker]
-        if ticker in self._access_order:
-            self._access_order.remove(ticker)
+        """Remove a ticker from cache."""
+        entry = self._cache.pop(ticker, None)
+        if entry is not None:
+            self._total_bytes -= entry.nbytes
     
     def _enforce_cache_limit(self) -> None:
-        """Enforce maximum cache size using LRU eviction."""
-        while len(self._cache) > self.max_cache_size:
-            if not self._access_order:
-                break
-            
+        """Enforce entry-count and memory limits using LRU eviction."""
+        # Always keep the most recent entry, even if it alone exceeds the byte budget
+        while len(self._cache) > 1 and (
+            len(self._cache) > self.max_cache_size or self._total_bytes > self.max_cache_bytes
+        ):
             # Remove least recently used entry
-            lru_ticker = self._access_order[0]
-            self._remove_from_cache(lru_ticker)
-            logger.debug(f"Evicted {lru_ticker} from cache (LRU)")
+            lru_ticker, entry = self._cache.popitem(last=False)
+            self._total_bytes -= entry.nbytes
+            if lru_ticker in self._dirty:
+                # Spill unsaved data so eviction never loses it; it reloads lazily later
+                self._dirty.discard(lru_ticker)
+                self._spill_to_store(lru_ticker, entry)
+            logger.debug(f"Evicted {lru_ticker} from cache (LRU, {entry.nbytes} bytes)")
 
 
 class CacheEntry:
@@ -392,4 +494,13 @@ class CacheEntry:
         self.data = data
         self.source = source
         self.timestamp = timestamp
-        self.ttl = ttl
\ No newline at end of file
+        self.ttl = ttl
+        self.nbytes = self.measure(data)
+    
+    @staticmethod
+    def measure(data: pd.DataFrame) -> int:
+        """Estimate the memory footprint of a DataFrame, including Decimal objects."""
+        try:
+            return int(data.memory_usage(index=True, deep=True).sum())
+        except Exception:
+            return 0
\ No newline at end of file
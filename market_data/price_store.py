@@ -0,0 +1,280 @@
+"""
+Columnar on-disk store for cached OHLCV data.
+
+Each ticker gets its own directory under ``<data_dir>/.cache/price_store`` with
+one or more Parquet part files and a small ``_meta.json`` manifest describing
+them (source, fetch timestamp, TTL and the date range of every part). This
+replaces pickling the whole price cache into a single file:
+
+- Loading is lazy and per ticker, so startup cost does not grow with the
+  number of cached tickers or the length of their history.
+- Writing new bars only rewrites the parts that overlap the new data. Bars
+  after the last stored date are appended as a new part; a fresh intraday bar
+  only touches the most recent part. Parts are compacted once there are many.
+- Each ticker has its own manifest, so concurrent writers for different
+  tickers (e.g. scheduler jobs) never clobber each other.
+
+Parquet support comes from pyarrow. If it is not installed the store reports
+itself unavailable and PriceCache simply runs without persistence.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Optional pyarrow import for Parquet access
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+    logger.debug("pyarrow not available. Persistent price store disabled.")
+
+META_FILE = "_meta.json"
+_UNSAFE_CHARS = re.compile(r'[\\/:*?"<>|\s]')
+
+
+class PriceStore:
+    """Per-ticker Parquet partitions with a small JSON manifest per ticker."""
+
+    def __init__(self, root: Path, max_parts: int = 8):
+        """
+        Initialize the price store.
+
+        Args:
+            root: Directory that holds one sub-directory per ticker
+            max_parts: Compact a ticker into a single part once it has more parts than this
+        """
+        self.root = Path(root)
+        self.max_parts = max_parts
+
+    @property
+    def available(self) -> bool:
+        """True if Parquet support is installed."""
+        return _HAS_PYARROW
+
+    def tickers(self) -> List[str]:
+        """List tickers that have data in the store."""
+        if not self.root.exists():
+            return []
+        tickers = []
+        for meta_path in self.root.glob(f"*/{META_FILE}"):
+            meta = self._read_meta(meta_path.parent)
+            if meta and meta.get("ticker"):
+                tickers.append(meta["ticker"])
+        return tickers
+
+    def load_meta(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Read the manifest for a ticker without loading any price data."""
+        return self._read_meta(self._ticker_dir(ticker), ticker)
+
+    def load(self, ticker: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """
+        Load all stored bars for a ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Tuple of (DataFrame sorted by date, manifest dict), or None if the
+            ticker is not stored or cannot be read
+        """
+        if not self.available:
+            return None
+        ticker_dir = self._ticker_dir(ticker)
+        meta = self._read_meta(ticker_dir, ticker)
+        if not meta:
+            return None
+        try:
+            frames = [self._read_part(ticker_dir / part["file"]) for part in meta.get("parts", [])]
+            frames = [f for f in frames if not f.empty]
+            if not frames:
+                return None
+            # Parts written from different sources may disagree on timezone; follow the newest
+            frames = [self._align_index(f, frames[-1].index) for f in frames]
+            df = pd.concat(frames) if len(frames) > 1 else frames[0]
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+            return df, meta
+        except Exception as e:
+            logger.warning(f"Failed to load stored prices for {ticker}: {e}")
+            return None
+
+    def write(
+        self,
+        ticker: str,
+        data: pd.DataFrame,
+        source: str,
+        timestamp: datetime,
+        ttl: timedelta
+    ) -> None:
+        """
+        Merge new bars for a ticker into the store.
+
+        Bars in ``data`` replace stored bars on the same dates. Parts that end
+        before the first new bar are left untouched, so appending recent bars
+        never rewrites older history.
+
+        Args:
+            ticker: Stock ticker symbol
+            data: OHLCV DataFrame indexed by date
+            source: Data source identifier
+            timestamp: When the data was fetched
+            ttl: How long the data stays fresh
+        """
+        if not self.available or data.empty:
+            return
+
+        data = data.sort_index()
+        ticker_dir = self._ticker_dir(ticker)
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+        meta = self._read_meta(ticker_dir, ticker) or {"ticker": ticker, "parts": []}
+
+        new_first = data.index.min()
+        new_last = data.index.max()
+        kept_parts: List[Dict[str, Any]] = []
+        affected_parts: List[Dict[str, Any]] = []
+        for part in meta.get("parts", []):
+            if self._to_ts(part["last"], data.index) < new_first:
+                kept_parts.append(part)
+            else:
+                affected_parts.append(part)
+
+        # Rows from overlapping parts that fall outside the new range survive the merge
+        merged = data
+        if affected_parts:
+            survivors = []
+            for part in affected_parts:
+                old = self._align_index(self._read_part(ticker_dir / part["file"]), data.index)
+                if not old.empty:
+                    old = old[(old.index < new_first) | (old.index > new_last)]
+                    if not old.empty:
+                        survivors.append(old)
+            if survivors:
+                merged = pd.concat(survivors + [data]).sort_index()
+                merged = merged[~merged.index.duplicated(keep="last")]
+
+        new_parts = [self._write_part(ticker_dir, merged)]
+        parts = kept_parts + new_parts
+
+        if len(parts) > self.max_parts:
+            # Compact: one full rewrite for this ticker only
+            frames = [
+                self._align_index(self._read_part(ticker_dir / p["file"]), merged.index)
+                for p in kept_parts
+            ] + [merged]
+            full = pd.concat(frames).sort_index()
+            full = full[~full.index.duplicated(keep="last")]
+            compacted = self._write_part(ticker_dir, full)
+            stale_files = [p["file"] for p in parts]
+            parts = [compacted]
+        else:
+            stale_files = [p["file"] for p in affected_parts]
+
+        meta.update({
+            "ticker": ticker,
+            "source": source,
+            "timestamp": timestamp.isoformat(),
+            "ttl_seconds": ttl.total_seconds(),
+            "parts": parts,
+        })
+        self._write_meta(ticker_dir, meta)
+
+        # Remove replaced part files only after the manifest points at their replacements
+        for file_name in stale_files:
+            try:
+                (ticker_dir / file_name).unlink()
+            except FileNotFoundError:
+                pass
+
+    def remove(self, ticker: str) -> None:
+        """Delete all stored data for a ticker."""
+        shutil.rmtree(self._ticker_dir(ticker), ignore_errors=True)
+
+    def clear(self) -> None:
+        """Delete all stored data."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _ticker_dir(self, ticker: str) -> Path:
+        """Directory for a ticker; characters unsafe in file names are replaced."""
+        return self.root / _UNSAFE_CHARS.sub("_", ticker)
+
+    def _read_meta(self, ticker_dir: Path, ticker: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Read a ticker manifest, ignoring it if it belongs to a different ticker."""
+        meta_path = ticker_dir / META_FILE
+        if not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except Exception as e:
+            logger.debug(f"Could not read price store manifest {meta_path}: {e}")
+            return None
+        if ticker is not None and meta.get("ticker") != ticker:
+            # Sanitized directory names collided; treat as a miss
+            return None
+        return meta
+
+    def _write_meta(self, ticker_dir: Path, meta: Dict[str, Any]) -> None:
+        """Atomically replace a ticker manifest."""
+        tmp_path = ticker_dir / f"{META_FILE}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, ticker_dir / META_FILE)
+
+    def _write_part(self, ticker_dir: Path, df: pd.DataFrame) -> Dict[str, Any]:
+        """Write one Parquet part and return its manifest entry."""
+        file_name = f"part-{uuid.uuid4().hex[:12]}.parquet"
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        pq.write_table(table, ticker_dir / file_name)
+        return {
+            "file": file_name,
+            "rows": len(df),
+            "first": pd.Timestamp(df.index.min()).isoformat(),
+            "last": pd.Timestamp(df.index.max()).isoformat(),
+        }
+
+    @staticmethod
+    def _read_part(path: Path) -> pd.DataFrame:
+        """Read one Parquet part, returning an empty frame if it is missing."""
+        if not path.exists():
+            return pd.DataFrame()
+        return pq.read_table(path).to_pandas()
+
+    @staticmethod
+    def _align_index(df: pd.DataFrame, like: pd.Index) -> pd.DataFrame:
+        """Make a part's DatetimeIndex timezone match another index, keeping wall-clock dates."""
+        if df.empty or not isinstance(df.index, pd.DatetimeIndex):
+            return df
+        target_tz = getattr(like, "tz", None)
+        if df.index.tz is None and target_tz is not None:
+            df = df.copy()
+            df.index = df.index.tz_localize(target_tz)
+        elif df.index.tz is not None and target_tz is None:
+            df = df.copy()
+            df.index = df.index.tz_localize(None)
+        elif df.index.tz is not None and str(df.index.tz) != str(target_tz):
+            df = df.copy()
+            df.index = df.index.tz_convert(target_tz)
+        return df
+
+    @staticmethod
+    def _to_ts(value: str, index: pd.Index) -> pd.Timestamp:
+        """Parse a manifest date so it compares with the given index."""
+        ts = pd.Timestamp(value)
+        index_tz = getattr(index, "tz", None)
+        if index_tz is not None and ts.tz is None:
+            ts = ts.tz_localize(index_tz)
+        elif index_tz is None and ts.tz is not None:
+            ts = ts.tz_localize(None)
+        return ts
@@ -0,0 +1,481 @@
+"""
+Fallback strategy engine with per-source circuit breakers.
+
+MarketDataFetcher tries an ordered chain of fetch strategies for every ticker
+(Yahoo, Stooq via pandas-datareader, Stooq CSV, Canadian suffixes, proxies).
+When one source is degraded, walking that chain serially means every ticker
+waits for the same slow source to give up. This module keeps track of how each
+underlying source has behaved across tickers:
+
+- A per-source circuit breaker opens once the recent failure rate crosses a
+  threshold, so the source is skipped for every ticker until a cooldown passes.
+- After the cooldown a single half-open probe is let through; success closes the
+  breaker again, failure re-opens it.
+- Optional hedging starts the next strategy after a short delay instead of
+  waiting for a slow strategy to time out. Hedging only happens between
+  strategies that request the same instrument, so a slow Yahoo call may be
+  raced against Stooq but never against a ``.TO`` listing or a proxy ticker.
+
+A single engine is shared process-wide via ``get_strategy_engine()`` so that
+source health learned by one fetcher benefits every other fetcher.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def source_for_strategy(strategy_name: str) -> str:
+    """Map a strategy name to the upstream source it talks to."""
+    if strategy_name.startswith("stooq-pdr"):
+        return "stooq-pdr"
+    if strategy_name.startswith("stooq-csv"):
+        return "stooq-csv"
+    # yahoo, yahoo-ca-*, yahoo-retry-*, yahoo-proxy all hit Yahoo Finance
+    return "yahoo"
+
+
+def instrument_for_strategy(strategy_name: str) -> str:
+    """Identify which listing a strategy requests (base ticker, .TO, .V or proxy)."""
+    if strategy_name == "yahoo-ca-to":
+        return ".TO"
+    if strategy_name == "yahoo-ca-v":
+        return ".V"
+    if strategy_name == "yahoo-proxy":
+        return "proxy"
+    return "base"
+
+
+class SourceCircuitBreaker:
+    """
+    Rolling-window circuit breaker for a single market data source.
+
+    The breaker opens when at least ``min_calls`` outcomes are recorded in the
+    window and the share of failures reaches ``failure_threshold``. While open,
+    requests are rejected until ``cooldown_seconds`` have passed, after which one
+    half-open probe is allowed through.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        failure_threshold: float = 0.5,
+        min_calls: int = 5,
+        window_size: int = 20,
+        cooldown_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            source: Source name (e.g. "yahoo", "stooq-csv")
+            failure_threshold: Failure rate (0-1) at which the breaker opens
+            min_calls: Minimum outcomes in the window before the rate is trusted
+            window_size: Number of recent outcomes to keep
+            cooldown_seconds: Time to stay open before allowing a probe
+            clock: Monotonic clock, injectable for tests
+        """
+        self.source = source
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current breaker state, moving OPEN to HALF_OPEN once the cooldown has passed."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request to this source may be attempted now."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                logger.debug(f"Circuit breaker for {self.source} half-open - sending probe")
+                return True
+            return False
+
+    def is_available(self) -> bool:
+        """Peek whether a request would currently be allowed, without claiming a probe."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state == CLOSED or (self._state == HALF_OPEN and not self._probe_in_flight)
+
+    def record_success(self) -> None:
+        """Record a healthy response from the source."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                logger.info(f"{self.source}: source recovered, closing circuit breaker")
+                self._state = CLOSED
+                self._probe_in_flight = False
+                self._outcomes.clear()
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Record a failed or timed-out response from the source."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(False)
+            if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.failure_threshold:
+                    self._open()
+
+    def failure_rate(self) -> float:
+        """Failure rate across the current window."""
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def reset(self) -> None:
+        """Forget all recorded outcomes and close the breaker."""
+        with self._lock:
+            self._outcomes.clear()
+            self._state = CLOSED
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        """Open the breaker (caller holds the lock)."""
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self.times_opened += 1
+        logger.warning(
+            f"{self.source}: too many failures, skipping this source for {self.cooldown_seconds:.0f}s"
+        )
+
+    def _maybe_half_open(self) -> None:
+        """Move OPEN to HALF_OPEN once the cooldown has elapsed (caller holds the lock)."""
+        if self._state == OPEN and self._opened_at is not None:
+            if self._clock() - self._opened_at >= self.cooldown_seconds:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+
+
+class FetchStrategyEngine:
+    """
+    Runs a ticker's fallback chain while honouring per-source circuit breakers.
+
+    Strategies are ``(name, fetch_func)`` pairs where ``fetch_func`` returns a
+    FetchResult. A strategy counts as a source failure if it raises, returns a
+    result whose source is ``"error"``, or returns nothing after taking longer
+    than ``slow_call_seconds``. An empty result that comes back quickly is a
+    healthy "no data for this symbol" answer and does not count against the source.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        min_calls: int = 5,
+        window_size: int = 20,
+        cooldown_seconds: float = 60.0,
+        hedge_delay_seconds: float = 0.0,
+        slow_call_seconds: float = 5.0,
+        max_workers: int = 4
+    ):
+        """
+        Initialize the strategy engine.
+
+        Args:
+            failure_threshold: Failure rate (0-1) at which a source's breaker opens
+            min_calls: Minimum outcomes before a breaker may open
+            window_size: Number of recent outcomes kept per source
+            cooldown_seconds: How long an open breaker skips its source
+            hedge_delay_seconds: Start the next same-instrument strategy after this
+                delay if the current one has not finished (0 disables hedging)
+            slow_call_seconds: Empty results slower than this count as failures
+            max_workers: Thread pool size used when hedging
+        """
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.window_size = window_size
+        self.cooldown_seconds = cooldown_seconds
+        self.hedge_delay_seconds = hedge_delay_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, SourceCircuitBreaker] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._hedged_launches = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get_breaker(self, source: str) -> SourceCircuitBreaker:
+        """Get (or lazily create) the circuit breaker for a source."""
+        with self._lock:
+            breaker = self._breakers.get(source)
+            if breaker is None:
+                breaker = SourceCircuitBreaker(
+                    source,
+                    failure_threshold=self.failure_threshold,
+                    min_calls=self.min_calls,
+                    window_size=self.window_size,
+                    cooldown_seconds=self.cooldown_seconds
+                )
+                self._breakers[source] = breaker
+            return breaker
+
+    def run(
+        self,
+        ticker: str,
+        strategies: List[Tuple[str, Callable[[], Any]]]
+    ) -> Tuple[Optional[Tuple[str, Any]], List[str], List[str]]:
+        """
+        Run a fallback chain until one strategy returns data.
+
+        Args:
+            ticker: Ticker being fetched (for logging)
+            strategies: Ordered ``(name, fetch_func)`` pairs
+
+        Returns:
+            Tuple of:
+            - ``(strategy_name, result)`` for the winning strategy, or None
+            - Names of strategies that raised an exception
+            - Names of strategies skipped because their source's breaker was open
+        """
+        if self.hedge_delay_seconds and self.hedge_delay_seconds > 0 and len(strategies) > 1:
+            return self._run_hedged(ticker, strategies)
+        return self._run_serial(ticker, strategies)
+
+    def run_single(self, strategy_name: str, fetch_func: Callable[[], Any]) -> Optional[Any]:
+        """
+        Run one request outside a fallback chain (e.g. a bulk download).
+
+        The request is gated by, counted against and recorded on its source's
+        breaker exactly like a chain strategy.
+
+        Returns:
+            The request's result, or None without calling ``fetch_func`` when the
+            source's breaker is open. Exceptions from ``fetch_func`` propagate.
+        """
+        source = source_for_strategy(strategy_name)
+        if not self.get_breaker(source).allow_request():
+            self._count(source, "skipped")
+            return None
+        return self._execute(strategy_name, fetch_func)
+
+    def get_strategy_stats(self) -> Dict[str, Any]:
+        """
+        Get per-source counters and breaker states.
+
+        Returns:
+            Dictionary with engine settings and a ``sources`` mapping of
+            source name to attempts/successes/empty/failures/skipped counters,
+            breaker state and recent failure rate
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+            counters = {source: dict(values) for source, values in self._counters.items()}
+            hedged = self._hedged_launches
+
+        sources = {}
+        for source in sorted(set(breakers) | set(counters)):
+            breaker = breakers.get(source)
+            entry = {
+                "attempts": 0, "successes": 0, "empty": 0, "failures": 0, "skipped": 0
+            }
+            entry.update(counters.get(source, {}))
+            entry["state"] = breaker.state if breaker else CLOSED
+            entry["failure_rate"] = round(breaker.failure_rate(), 3) if breaker else 0.0
+            entry["times_opened"] = breaker.times_opened if breaker else 0
+            sources[source] = entry
+
+        return {
+            "hedge_delay_seconds": self.hedge_delay_seconds,
+            "hedged_launches": hedged,
+            "sources": sources
+        }
+
+    def reset(self) -> None:
+        """Clear all breakers and counters."""
+        with self._lock:
+            self._breakers.clear()
+            self._counters.clear()
+            self._hedged_launches = 0
+
+    def _count(self, source: str, counter: str) -> None:
+        """Increment a per-source counter."""
+        with self._lock:
+            values = self._counters.setdefault(source, {})
+            values[counter] = values.get(counter, 0) + 1
+
+    def _execute(self, strategy_name: str, fetch_func: Callable[[], Any]) -> Any:
+        """Run one strategy and feed its outcome into the source's breaker."""
+        source = source_for_strategy(strategy_name)
+        breaker = self.get_breaker(source)
+        self._count(source, "attempts")
+        started = time.monotonic()
+        try:
+            result = fetch_func()
+        except Exception:
+            self._count(source, "failures")
+            breaker.record_failure()
+            raise
+
+        elapsed = time.monotonic() - started
+        # FetchResult from chain strategies, a dict of frames from run_single bulk calls
+        is_empty = result.df.empty if hasattr(result, "df") else not result
+        if getattr(result, "source", None) == "error" or (is_empty and elapsed >= self.slow_call_seconds):
+            self._count(source, "failures")
+            breaker.record_failure()
+        else:
+            self._count(source, "empty" if is_empty else "successes")
+            breaker.record_success()
+        return result
+
+    def _run_serial(
+        self,
+        ticker: str,
+        strategies: List[Tuple[str, Callable[[], Any]]]
+    ) -> Tuple[Optional[Tuple[str, Any]], List[str], List[str]]:
+        """Walk the chain one strategy at a time."""
+        failed: List[str] = []
+        skipped: List[str] = []
+
+        for strategy_name, fetch_func in strategies:
+            source = source_for_strategy(strategy_name)
+            if not self.get_breaker(source).allow_request():
+                self._count(source, "skipped")
+                skipped.append(strategy_name)
+                continue
+            try:
+                result = self._execute(strategy_name, fetch_func)
+            except Exception as e:
+                logger.debug(f"{ticker}: strategy {strategy_name} raised {e}")
+                failed.append(strategy_name)
+                continue
+            if not result.df.empty:
+                return (strategy_name, result), failed, skipped
+
+        return None, failed, skipped
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the shared executor used for hedged strategies."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="fetch-hedge"
+                )
+            return self._executor
+
+    def _run_hedged(
+        self,
+        ticker: str,
+        strategies: List[Tuple[str, Callable[[], Any]]]
+    ) -> Tuple[Optional[Tuple[str, Any]], List[str], List[str]]:
+        """Walk the chain, starting the next same-instrument strategy if one is slow."""
+        executor = self._get_executor()
+        failed: List[str] = []
+        skipped: List[str] = []
+        pending: Dict[Future, str] = {}
+        next_index = 0
+
+        def launch_next(hedge: bool) -> bool:
+            """Submit the next allowed strategy; returns True if one was launched."""
+            nonlocal next_index
+            while next_index < len(strategies):
+                strategy_name, fetch_func = strategies[next_index]
+                if hedge and any(
+                    instrument_for_strategy(name) != instrument_for_strategy(strategy_name)
+                    for name in pending.values()
+                ):
+                    # Never race two different listings of the same ticker
+                    return False
+                next_index += 1
+                source = source_for_strategy(strategy_name)
+                if not self.get_breaker(source).allow_request():
+                    self._count(source, "skipped")
+                    skipped.append(strategy_name)
+                    continue
+                future = executor.submit(self._execute, strategy_name, fetch_func)
+                pending[future] = strategy_name
+                return True
+            return False
+
+        while True:
+            if not pending and not launch_next(hedge=False):
+                return None, failed, skipped
+
+            can_hedge = next_index < len(strategies) and all(
+                instrument_for_strategy(name) == instrument_for_strategy(strategies[next_index][0])
+                for name in pending.values()
+            )
+            done, _ = wait(
+                list(pending.keys()),
+                timeout=self.hedge_delay_seconds if can_hedge else None,
+                return_when=FIRST_COMPLETED
+            )
+
+            if not done:
+                # Current strategy is slow - race the next one against it
+                if launch_next(hedge=True):
+                    with self._lock:
+                        self._hedged_launches += 1
+                    logger.debug(f"{ticker}: hedging with {list(pending.values())[-1]}")
+                continue
+
+            # Resolve finished strategies in chain order so preference is kept on ties
+            for future in sorted(done, key=lambda f: [n for n, _ in strategies].index(pending[f])):
+                strategy_name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.debug(f"{ticker}: strategy {strategy_name} raised {e}")
+                    failed.append(strategy_name)
+                    continue
+                if not result.df.empty:
+                    # Losing strategies keep running and still report to their breakers
+                    return (strategy_name, result), failed, skipped
+
+
+# Process-wide engine shared by all MarketDataFetcher instances
+_strategy_engine: Optional[FetchStrategyEngine] = None
+_strategy_engine_lock = threading.Lock()
+
+
+def get_strategy_engine() -> FetchStrategyEngine:
+    """Get the shared strategy engine, configured from settings on first use."""
+    global _strategy_engine
+    with _strategy_engine_lock:
+        if _strategy_engine is None:
+            kwargs: Dict[str, Any] = {}
+            try:
+                from config.settings import get_settings  # lazy import to avoid cycles
+                settings = get_settings()
+                kwargs = {
+                    "failure_threshold": float(settings.get('market_data.source_failure_threshold', 0.5)),
+                    "min_calls": int(settings.get('market_data.source_min_calls', 5)),
+                    "cooldown_seconds": float(settings.get('market_data.source_cooldown_seconds', 60)),
+                    "hedge_delay_seconds": float(settings.get('market_data.strategy_hedge_delay_seconds', 0)),
+                    "slow_call_seconds": float(settings.get('market_data.slow_call_seconds', 5)),
+                }
+            except Exception as e:
+                logger.debug(f"Using default strategy engine settings: {e}")
+            _strategy_engine = FetchStrategyEngine(**kwargs)
+        return _strategy_engine
@@ -13,6 +13,7 @@ from data.models.trade import Trade
 from data.models.lot import Lot, LotTracker
 from data.models.portfolio import Position, PortfolioSnapshot
 from data.repositories.base_repository import BaseRepository
+from portfolio.lot_checkpoints import LotCheckpointStore
 from portfolio.trade_processor import TradeProcessorError, TradeValidationError, InsufficientSharesError
 
 logger = logging.getLogger(__name__)
@@ -21,14 +22,17 @@ logger = logging.getLogger(__name__)
 class FIFOTradeProcessor:
     """FIFO-based trade processor for accurate P&L calculation."""
     
-    def __init__(self, repository: BaseRepository):
+    def __init__(self, repository: BaseRepository,
+                 checkpoint_store: Optional[LotCheckpointStore] = None):
         """Initialize FIFO trade processor.
         
         Args:
             repository: Repository for data access
+            checkpoint_store: Lot checkpoint store (defaults to one for the repository's fund)
         """
         self.repository = repository
         self.lot_trackers: Dict[str, LotTracker] = {}
+        self.checkpoint_store = checkpoint_store or LotCheckpointStore.for_repository(repository)
         self._load_existing_lots()
     
     def _load_existing_lots(self) -> None:
@@ -57,13 +61,21 @@ class FIFOTradeProcessor:
         This is a simplified implementation that assumes:
         1. All buy trades create new lots
         2. Sell trades consume lots in FIFO order
-        """
-        tracker = LotTracker(ticker)
         
+        Starts from the newest lot checkpoint that still matches the trade log
+        and replays only later trades, recording new checkpoints along the way.
+        """
         # Sort trades by timestamp
         sorted_trades = sorted(trades, key=lambda x: x.timestamp)
         
-        for trade in sorted_trades:
+        tracker, start = None, 0
+        if self.checkpoint_store:
+            tracker, start = self.checkpoint_store.restore(ticker, sorted_trades)
+        if tracker is None:
+            tracker, start = LotTracker(ticker), 0
+        
+        new_checkpoints = []
+        for count, trade in enumerate(sorted_trades[start:], start=start + 1):
             if trade.is_buy():
                 # Create new lot
                 tracker.add_lot(
@@ -82,9 +94,19 @@ class FIFOTradeProcessor:
                     )
                 except ValueError as e:
                     logger.warning(f"Could not process sell trade for {ticker}: {e}")
+            
+            if self.checkpoint_store and count % self.checkpoint_store.interval == 0:
+                new_checkpoints.append((count, tracker.to_dict()))
         
+        if new_checkpoints:
+            self.checkpoint_store.record(ticker, sorted_trades, new_checkpoints)
         self.lot_trackers[ticker] = tracker
     
+    def _invalidate_checkpoints(self, ticker: str, timestamp: datetime) -> None:
+        """Drop lot checkpoints a backdated trade falls inside of."""
+        if self.checkpoint_store:
+            self.checkpoint_store.invalidate_from(ticker, timestamp.date())
+    
     def execute_buy_trade(self, ticker: str, shares: Decimal, price: Decimal,
                          stop_loss: Optional[Decimal] = None,
                          reason: Optional[str] = None,
@@ -140,6 +162,7 @@ class FIFOTradeProcessor:
             
             # Save trade to repository
             self.repository.save_trade(trade)
+            self._invalidate_checkpoints(ticker, timestamp)
             
             # Add lot to tracker
             if ticker not in self.lot_trackers:
@@ -230,6 +253,7 @@ class FIFOTradeProcessor:
             
             # Save trade to repository
             self.repository.save_trade(trade)
+            self._invalidate_checkpoints(ticker, timestamp)
             
             # Update portfolio position
             self._update_position_after_sell(ticker, trade, timestamp)
@@ -0,0 +1,202 @@
+"""Persisted FIFO lot-state checkpoints.
+
+Rebuilding every ticker's LotTracker from the full trade history is the bulk of
+FIFOTradeProcessor start-up time. This module stores periodic serialized
+LotTracker states per fund and ticker, each tagged with a hash of the trade
+prefix it covers, so start-up only has to replay the trades that came after
+the newest checkpoint that still matches the trade log.
+
+Checkpoints are a cache: anything unreadable or inconsistent with the trade
+log is ignored and the lots are rebuilt from trades.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from data.models.lot import LotTracker
+from data.models.trade import Trade
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_CHARS = re.compile(r'[\\/:*?"<>|\s]')
+
+# Fund directories for non-CSV backends, independent of the working directory
+_FUNDS_DIR = Path(__file__).resolve().parent.parent / "trading_data" / "funds"
+
+
+def trade_key(trade: Trade) -> str:
+    """Identify a trade well enough to tell whether the trade log changed under a checkpoint."""
+    timestamp = trade.timestamp.isoformat() if trade.timestamp else ""
+    return f"{trade.trade_id or ''}|{timestamp}|{trade.action}|{trade.shares}|{trade.price}"
+
+
+def prefix_hashes(trades: List[Trade], counts: Iterable[int]) -> Dict[int, str]:
+    """Hash the first ``count`` trades for each requested count, in one pass.
+
+    Any edit, insertion or removal among those trades changes the hash, not
+    just a change to the last one.
+    """
+    wanted = {count for count in counts if 0 < count <= len(trades)}
+    hashes = {}
+    if not wanted:
+        return hashes
+    digest = hashlib.sha256()
+    for count, trade in enumerate(trades[:max(wanted)], 1):
+        digest.update(trade_key(trade).encode('utf-8'))
+        digest.update(b"\n")
+        if count in wanted:
+            hashes[count] = digest.hexdigest()
+    return hashes
+
+
+class LotCheckpointStore:
+    """One JSON file per ticker holding a list of LotTracker checkpoints."""
+
+    VERSION = 2
+
+    def __init__(self, root: Path, interval: int = 25, max_checkpoints: int = 20,
+                 fund: Optional[str] = None):
+        """
+        Initialize the checkpoint store.
+
+        Args:
+            root: Directory that holds one JSON file per ticker
+            interval: Take a checkpoint every this many trades of a ticker
+            max_checkpoints: Oldest checkpoints beyond this many per ticker are dropped
+            fund: Fund the checkpoints belong to; files written for another fund are ignored
+        """
+        self.root = Path(root)
+        self.fund = fund
+        self.interval = interval
+        self.max_checkpoints = max_checkpoints
+
+    @classmethod
+    def for_repository(cls, repository: Any) -> Optional["LotCheckpointStore"]:
+        """Pick the checkpoint directory for a repository's fund.
+
+        The fund decides the directory: CSV-backed repositories keep
+        checkpoints next to that fund's CSV files, other backends use the
+        fund's directory under the project's trading_data/funds. (SupabaseRepository's
+        ``data_dir`` is a shared exchange-rate directory, not a fund's.)
+
+        Returns:
+            Store, or None if the repository's fund cannot be determined
+        """
+        csv_dir = None
+        for repo in (repository, getattr(repository, 'csv_repo', None)):
+            data_dir = getattr(repo, 'data_dir', None)
+            if isinstance(getattr(repo, 'portfolio_file', None), Path) and isinstance(data_dir, (str, Path)):
+                csv_dir = Path(data_dir)
+                break
+        fund = getattr(repository, 'fund_name', None) or getattr(repository, 'fund', None)
+        if isinstance(fund, str) and fund:
+            fund_dir = csv_dir or _FUNDS_DIR / fund
+            return cls(fund_dir / ".cache" / "lot_checkpoints", fund=fund)
+        if csv_dir:
+            return cls(csv_dir / ".cache" / "lot_checkpoints")
+        return None
+
+    def restore(self, ticker: str, trades: List[Trade]) -> Tuple[Optional[LotTracker], int]:
+        """Load the newest checkpoint that is consistent with a ticker's trades.
+
+        Args:
+            ticker: Ticker symbol
+            trades: The ticker's trades, sorted by timestamp
+
+        Returns:
+            Tuple of (restored tracker, number of leading trades it covers);
+            (None, 0) if no checkpoint applies
+        """
+        checkpoints = self._read(ticker)
+        hashes = prefix_hashes(trades, (c.get('trade_count', 0) for c in checkpoints))
+        for checkpoint in reversed(checkpoints):
+            count = checkpoint.get('trade_count', 0)
+            if count in hashes and checkpoint.get('prefix_hash') == hashes[count]:
+                try:
+                    return LotTracker.from_dict(checkpoint['tracker']), count
+                except Exception as e:
+                    logger.debug(f"Ignoring unreadable lot checkpoint for {ticker}: {e}")
+        return None, 0
+
+    def record(self, ticker: str, trades: List[Trade], states: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Add checkpoints for a ticker.
+
+        Args:
+            ticker: Ticker symbol
+            trades: The ticker's trades, sorted by timestamp
+            states: (count, LotTracker.to_dict()) pairs, where the state reflects
+                the first ``count`` trades
+        """
+        if not states:
+            return
+        first_new = min(count for count, _ in states)
+        checkpoints = [c for c in self._read(ticker) if c.get('trade_count', 0) < first_new]
+        hashes = prefix_hashes(trades, (count for count, _ in states))
+        for count, tracker_state in sorted(states, key=lambda s: s[0]):
+            last_trade = trades[count - 1]
+            checkpoints.append({
+                'trade_count': count,
+                'last_trade_id': last_trade.trade_id,
+                'last_trade_timestamp': last_trade.timestamp.isoformat(),
+                'prefix_hash': hashes[count],
+                'tracker': tracker_state,
+            })
+        self._write(ticker, checkpoints[-self.max_checkpoints:])
+
+    def invalidate_from(self, ticker: str, trade_date: date) -> None:
+        """Drop a ticker's checkpoints covering trades on or after a date.
+
+        Called when a backdated trade is entered; earlier checkpoints stay valid.
+
+        Args:
+            ticker: Ticker symbol
+            trade_date: Date of the backdated trade
+        """
+        checkpoints = self._read(ticker)
+        if not checkpoints:
+            return
+        kept = [
+            c for c in checkpoints
+            if datetime.fromisoformat(c['last_trade_timestamp']).date() < trade_date
+        ]
+        if len(kept) != len(checkpoints):
+            logger.debug(f"Invalidated {len(checkpoints) - len(kept)} lot checkpoints for {ticker} from {trade_date}")
+            self._write(ticker, kept)
+
+    def _path(self, ticker: str) -> Path:
+        """Checkpoint file for a ticker; characters unsafe in file names are replaced."""
+        return self.root / f"{_UNSAFE_CHARS.sub('_', ticker)}.json"
+
+    def _read(self, ticker: str) -> List[Dict[str, Any]]:
+        """Read a ticker's checkpoints, oldest first."""
+        path = self._path(ticker)
+        if not path.exists():
+            return []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.debug(f"Could not read lot checkpoints {path}: {e}")
+            return []
+        if data.get('version') != self.VERSION or data.get('ticker') != ticker or data.get('fund') != self.fund:
+            return []
+        return data.get('checkpoints', [])
+
+    def _write(self, ticker: str, checkpoints: List[Dict[str, Any]]) -> None:
+        """Atomically replace a ticker's checkpoint file."""
+        path = self._path(ticker)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'fund': self.fund, 'ticker': ticker,
+                           'checkpoints': checkpoints}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.debug(f"Could not write lot checkpoints {path}: {e}")
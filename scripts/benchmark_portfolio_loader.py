@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark Portfolio CSV Loader
+==============================
+
+Compares the previous row-by-row CSVRepository.get_portfolio_data loader with
+the vectorized one on a synthetic portfolio CSV (100k rows by default), and
+checks that both produce the same snapshots.
+
+Usage:
+    python scripts/benchmark_portfolio_loader.py [--rows 100000] [--tickers 200]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from data.models.portfolio import Position, PortfolioSnapshot
+from data.repositories.csv_repository import CSVRepository
+
+
+def write_synthetic_portfolio(path: Path, rows: int, tickers: int) -> None:
+    """Write a portfolio CSV with one HOLD row per ticker per trading day."""
+    rng = np.random.default_rng(42)
+    days = pd.bdate_range("2022-01-03", periods=max(1, rows // tickers))
+    symbols = [f"TCK{i:04d}" for i in range(tickers)]
+
+    dates = np.repeat(days, tickers)[:rows]
+    # Mix of PST/PDT rows and a sprinkling of UTC-offset rows like older files
+    date_strings = [
+        d.strftime("%Y-%m-%d 13:00:00 ") + ("PDT" if 3 <= d.month <= 10 else "PST")
+        for d in dates
+    ]
+    for i in range(0, rows, 97):
+        date_strings[i] = dates[i].strftime("%Y-%m-%d 13:00:00-07:00")
+
+    prices = np.round(rng.uniform(1, 200, size=rows), 2)
+    shares = np.round(rng.uniform(1, 500, size=rows), 4)
+    avg = np.round(prices * rng.uniform(0.7, 1.3, size=rows), 2)
+    df = pd.DataFrame({
+        "Date": date_strings,
+        "Ticker": np.tile(symbols, len(days))[:rows],
+        "Shares": shares,
+        "Average Price": avg,
+        "Cost Basis": np.round(shares * avg, 2),
+        "Stop Loss": 0.0,
+        "Current Price": prices,
+        "Total Value": np.round(shares * prices, 2),
+        "PnL": np.round(shares * (prices - avg), 2),
+        "Action": "HOLD",
+        "Company": "Synthetic Co",
+        "Currency": "USD",
+    })
+    df.to_csv(path, index=False)
+
+
+def legacy_get_portfolio_data(repo: CSVRepository):
+    """The previous loader: per-row timestamp parsing and iterrows()."""
+    df = pd.read_csv(repo.portfolio_file)
+    parsed_dates = df['Date'].apply(repo._parse_csv_timestamp)
+    df['Date'] = pd.to_datetime(parsed_dates.apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if hasattr(x, 'strftime') else str(x)))
+    if not parsed_dates.empty and hasattr(parsed_dates.iloc[0], 'tz'):
+        df['Date'] = df['Date'].dt.tz_localize(parsed_dates.iloc[0].tz)
+
+    df['Date_Only'] = df['Date'].dt.date
+    snapshots = []
+    for date, group in df.groupby('Date_Only'):
+        positions = []
+        total_value = Decimal('0')
+        for _, row in group.iterrows():
+            position = Position.from_csv_dict(row.to_dict())
+            positions.append(position)
+            if position.market_value:
+                total_value += position.market_value
+        snapshots.append(PortfolioSnapshot(
+            positions=positions,
+            timestamp=group['Date'].max(),
+            total_value=total_value
+        ))
+    return sorted(snapshots, key=lambda x: x.timestamp)
+
+
+def _time(func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows in the synthetic CSV")
+    parser.add_argument("--tickers", type=int, default=200, help="Positions per daily snapshot")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per loader (best time is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="portfolio_bench_") as tmp:
+        repo = CSVRepository(fund_name="BENCH", data_directory=tmp)
+        write_synthetic_portfolio(repo.portfolio_file, args.rows, args.tickers)
+        print(f"Synthetic portfolio: {args.rows:,} rows, {args.tickers} tickers per snapshot")
+
+        legacy_time, legacy = _time(lambda: legacy_get_portfolio_data(repo), args.repeat)
+        new_time, current = _time(repo.get_portfolio_data, args.repeat)
+
+        matches = (
+            len(legacy) == len(current)
+            and all(
+                a.timestamp == b.timestamp
+                and a.total_value == b.total_value
+                and [p.to_csv_dict() for p in a.positions] == [p.to_csv_dict() for p in b.positions]
+                for a, b in zip(legacy, current)
+            )
+        )
+
+        print(f"  legacy loader:     {legacy_time:8.3f}s")
+        print(f"  vectorized loader: {new_time:8.3f}s")
+        print(f"  speedup:           {legacy_time / new_time:8.1f}x")
+        print(f"  identical output:  {'yes' if matches else 'NO'}")
+        return 0 if matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Tests for per-fund, per-kind cache versions and scoped cache_data invalidation."""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import cache_version
+from cache_version import (
+    bump_cache_version, get_cache_version, add_version_listener, remove_version_listener,
+    POSITIONS, TRADES, CASH, FUNDS,
+)
+
+
+class _VersionsTestCase(unittest.TestCase):
+    """Isolates the module state and shared versions file."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.versions_file = Path(tmp_dir.name) / ".cache_versions.json"
+        patcher = patch.multiple(cache_version, VERSIONS_FILE=self.versions_file, _versions={},
+                                 _file_mtime=None, _last_poll=0.0, _listeners=[])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestCacheVersionNamespaces(_VersionsTestCase):
+
+    def test_fund_bump_leaves_other_funds_and_kinds_alone(self):
+        chimera_positions = get_cache_version("Chimera", [POSITIONS])
+        chimera_trades = get_cache_version("Chimera", [TRADES])
+        other_positions = get_cache_version("Other", [POSITIONS])
+
+        bump_cache_version(fund="Chimera", kinds=[POSITIONS])
+
+        self.assertNotEqual(get_cache_version("Chimera", [POSITIONS]), chimera_positions)
+        self.assertEqual(get_cache_version("Chimera", [TRADES]), chimera_trades)
+        self.assertEqual(get_cache_version("Other", [POSITIONS]), other_positions)
+
+    def test_cross_fund_results_see_any_fund_bump(self):
+        across_funds = get_cache_version(None, [CASH])
+        bump_cache_version(fund="Chimera", kinds=[CASH])
+        self.assertNotEqual(get_cache_version(None, [CASH]), across_funds)
+
+    def test_kind_bump_without_fund_covers_every_fund(self):
+        before = get_cache_version("Other", [POSITIONS])
+        bump_cache_version(kinds=[POSITIONS])
+        self.assertNotEqual(get_cache_version("Other", [POSITIONS]), before)
+
+    def test_global_bump_invalidates_everything(self):
+        before = (get_cache_version(), get_cache_version("Chimera", [TRADES]))
+        bump_cache_version()
+        after = (get_cache_version(), get_cache_version("Chimera", [TRADES]))
+        self.assertNotEqual(after[0], before[0])
+        self.assertNotEqual(after[1], before[1])
+
+    def test_bumps_from_other_processes_are_picked_up(self):
+        before = get_cache_version("Chimera", [POSITIONS])
+        bump_cache_version(fund="Chimera", kinds=[POSITIONS])
+        bumped = get_cache_version("Chimera", [POSITIONS])
+
+        # A fresh process only has the shared file to go on
+        with patch.multiple(cache_version, _versions={}, _file_mtime=None, _last_poll=0.0):
+            self.assertEqual(get_cache_version("Chimera", [POSITIONS]), bumped)
+        self.assertNotEqual(bumped, before)
+
+    def test_listeners_receive_changed_namespaces(self):
+        seen = []
+        add_version_listener(seen.append)
+        bump_cache_version(funds=["A", "B"], kinds=[TRADES])
+        remove_version_listener(seen.append)
+        bump_cache_version(fund="A", kinds=[TRADES])
+
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(seen[0], {"fund:A:trades", "fund:B:trades", "any:trades"})
+
+
+class TestScopedCacheData(_VersionsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        import flask_cache_utils
+        from flask_cache_utils import cache_data
+
+        cache = {}
+
+        class _Cache:
+            def get(self, key):
+                return cache.get(key)
+
+            def set(self, key, value, timeout=None):
+                cache[key] = value
+
+            def delete(self, key):
+                cache.pop(key, None)
+
+        patcher = patch.object(flask_cache_utils, '_get_cache', return_value=_Cache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.calls = []
+
+        @cache_data(ttl=300, kinds=[POSITIONS])
+        def load_positions(fund=None):
+            self.calls.append(fund)
+            return len(self.calls)
+
+        self.load_positions = load_positions
+
+        @cache_data(ttl=300, kinds=[FUNDS], fund_param=None)
+        def load_fund_list():
+            self.calls.append("funds")
+            return len(self.calls)
+
+        @cache_data(ttl=300, kinds=[FUNDS], fund_param="fund_name")
+        def load_thesis(fund_name):
+            self.calls.append(fund_name)
+            return len(self.calls)
+
+        self.load_fund_list = load_fund_list
+        self.load_thesis = load_thesis
+
+    def test_only_bumped_fund_is_reloaded(self):
+        self.load_positions(fund="A")
+        self.load_positions(fund="B")
+
+        bump_cache_version(fund="A", kinds=[POSITIONS])
+        self.load_positions(fund="A")
+        self.load_positions(fund="B")
+
+        self.assertEqual(self.calls, ["A", "B", "A"])
+
+    def test_other_kinds_do_not_invalidate(self):
+        self.load_positions(fund="A")
+        bump_cache_version(fund="A", kinds=[TRADES])
+        self.load_positions(fund="A")
+        self.assertEqual(self.calls, ["A"])
+
+    def test_fund_writes_invalidate_fund_list_and_thesis(self):
+        self.load_fund_list()
+        self.load_thesis("A")
+        self.load_thesis("B")
+
+        # e.g. a fund assigned to a user, or fund A's settings updated
+        bump_cache_version(fund="A", kinds=[FUNDS])
+        self.load_fund_list()
+        self.load_thesis("A")
+        self.load_thesis("B")
+
+        self.assertEqual(self.calls, ["funds", "A", "B", "funds", "A"])
+
+    def test_data_bumps_leave_fund_list_cached(self):
+        self.load_fund_list()
+        bump_cache_version(fund="A", kinds=[POSITIONS, TRADES, CASH])
+        self.load_fund_list()
+        self.assertEqual(self.calls, ["funds"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for the vectorized CSVRepository portfolio loader."""
+
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+import pandas as pd
+
+from data.repositories.csv_repository import CSVRepository
+from data.models.portfolio import Position
+
+
+class TestVectorizedPortfolioLoader(unittest.TestCase):
+    """The vectorized loader must match the row-by-row parsing it replaced."""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_portfolio_loader_"))
+        self.repository = CSVRepository(fund_name="TEST", data_directory=str(self.test_dir))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_timestamps_match_row_by_row_parsing(self):
+        """All timezone formats understood by _parse_csv_timestamp keep their wall-clock time."""
+        values = pd.Series([
+            "2025-01-02 10:00:00 PST",
+            "2025-07-02 16:00:00 PDT",
+            "2025-03-03 09:30:00 EST",
+            "2025-08-25 04:00:00-04:00",
+            "2025-01-04 10:00:00 UTC",
+            "2025-01-03 09:30:00",
+            "2025-01-02",
+        ])
+        parsed = self.repository._parse_csv_timestamps(values)
+
+        row_by_row = values.apply(self.repository._parse_csv_timestamp)
+        expected = pd.to_datetime(row_by_row.apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S')))
+        expected = expected.dt.tz_localize(row_by_row.iloc[0].tz)
+        pd.testing.assert_series_equal(parsed, expected, check_names=False)
+
+    def test_from_csv_columns_matches_from_csv_dict(self):
+        """Bulk construction yields the same positions as per-row construction."""
+        df = pd.DataFrame({
+            'Ticker': ['AAA', 'BBB', 'CCC'],
+            'Shares': [10.0, 5.5, 1.0],
+            'Average Price': [1.25, 20.0, 3.0],
+            'Cost Basis': [12.5, 110.0, 3.0],
+            'Stop Loss': [0.0, 18.0, float('nan')],
+            'Current Price': [1.5, 0.0, float('nan')],
+            'Company': ['A Co', 'B Co', float('nan')],
+            'Currency': ['CAD', 'USD', 'USD'],
+        })
+        bulk = Position.from_csv_columns({col: df[col].tolist() for col in df.columns})
+        per_row = [Position.from_csv_dict(row.to_dict()) for _, row in df.iterrows()]
+
+        self.assertEqual(len(bulk), 3)
+        for a, b in zip(bulk, per_row):
+            self.assertEqual(a.to_csv_dict(), b.to_csv_dict())
+        self.assertEqual(bulk[0].market_value, Decimal('15.0'))
+        self.assertIsNone(bulk[1].current_price)
+
+    def test_get_portfolio_data_groups_by_day(self):
+        """Snapshots are grouped per trading day with the latest timestamp and total value."""
+        pd.DataFrame({
+            'Date': ['2025-01-02 10:00:00 PST', '2025-01-02 13:00:00 PST', '2025-01-03 13:00:00 PST'],
+            'Ticker': ['AAA', 'BBB', 'AAA'],
+            'Shares': [2.0, 1.0, 2.0],
+            'Average Price': [1.0, 3.0, 1.0],
+            'Cost Basis': [2.0, 3.0, 2.0],
+            'Stop Loss': [0.0, 0.0, 0.0],
+            'Current Price': [1.5, 4.0, 2.0],
+            'Total Value': [3.0, 4.0, 4.0],
+            'PnL': [1.0, 1.0, 2.0],
+            'Action': ['HOLD', 'HOLD', 'HOLD'],
+            'Company': ['A Co', 'B Co', 'A Co'],
+            'Currency': ['USD', 'USD', 'USD'],
+        }).to_csv(self.repository.portfolio_file, index=False)
+
+        snapshots = self.repository.get_portfolio_data()
+
+        self.assertEqual(len(snapshots), 2)
+        self.assertEqual([p.ticker for p in snapshots[0].positions], ['AAA', 'BBB'])
+        self.assertEqual(snapshots[0].timestamp.hour, 13)
+        self.assertEqual(snapshots[0].total_value, Decimal('7.0'))
+        self.assertEqual(snapshots[1].total_value, Decimal('4.0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
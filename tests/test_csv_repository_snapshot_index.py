@@ -0,0 +1,166 @@
+"""Tests for the append-only, day-indexed portfolio snapshot writes in CSVRepository."""
+
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from data.repositories.base_repository import RepositoryError
+from data.repositories.csv_repository import CSVRepository
+from data.models.portfolio import Position, PortfolioSnapshot
+from data.models.trade import Trade
+
+
+def _snapshot(timestamp, tickers=("AAA", "BBB"), price="10.00"):
+    """Build a snapshot with one share of each ticker at the given price."""
+    positions = [
+        Position(
+            ticker=ticker,
+            shares=Decimal("1"),
+            avg_price=Decimal("5.00"),
+            cost_basis=Decimal("5.00"),
+            current_price=Decimal(price),
+            market_value=Decimal(price),
+            currency="USD",
+        )
+        for ticker in tickers
+    ]
+    return PortfolioSnapshot(positions=positions, timestamp=timestamp)
+
+
+class TestSnapshotDayIndex(unittest.TestCase):
+    """Saving snapshots should only touch the tail of the CSV when possible."""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_snapshot_index_"))
+        self.repository = CSVRepository(fund_name="TEST", data_directory=str(self.test_dir))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _read(self):
+        return pd.read_csv(self.repository.portfolio_file)
+
+    def test_replacing_today_truncates_tail_without_rewrite(self):
+        """Re-saving the latest day should not rewrite earlier rows."""
+        self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, 2, 10)))
+        self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, 3, 10)))
+
+        with patch.object(self.repository, '_rewrite_portfolio_days') as mock_rewrite:
+            self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, 3, 12), price="12.00"))
+        mock_rewrite.assert_not_called()
+
+        df = self._read()
+        self.assertEqual(len(df), 4)
+        latest = df[df['Date'].str.startswith('2025-01-03')]
+        self.assertEqual(latest['Current Price'].tolist(), [12.0, 12.0])
+        self.assertTrue(df['Date'].iloc[0].startswith('2025-01-02'))
+
+    def test_backdated_day_is_replaced(self):
+        """Replacing a day in the middle of the file keeps other days intact."""
+        self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, 2, 10)))
+        self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, 3, 10)))
+        self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, 2, 16), tickers=("AAA",)))
+
+        df = self._read()
+        day_two = df[df['Date'].str.startswith('2025-01-02')]
+        self.assertEqual(day_two['Ticker'].tolist(), ['AAA'])
+        self.assertEqual(len(df[df['Date'].str.startswith('2025-01-03')]), 2)
+
+    def test_intraday_save_preserves_market_close(self):
+        """An intraday save must not replace an existing 16:00 snapshot."""
+        self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, 2, 16)))
+        self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, 2, 12), price="99.00"))
+
+        df = self._read()
+        self.assertEqual(df['Current Price'].tolist(), [10.0, 10.0])
+
+    def test_external_edit_triggers_rescan(self):
+        """An index that no longer matches the CSV is rebuilt before use."""
+        self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, 2, 10)))
+        # Another tool rewrites the file with an extra day
+        df = self._read()
+        extra = df.copy()
+        extra['Date'] = '2025-01-03 10:00:00 PST'
+        pd.concat([df, extra]).to_csv(self.repository.portfolio_file, index=False)
+
+        self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, 3, 12), tickers=("AAA",)))
+
+        df = self._read()
+        self.assertEqual(len(df), 3)
+        self.assertEqual(df[df['Date'].str.startswith('2025-01-03')]['Ticker'].tolist(), ['AAA'])
+
+
+class TestBatchedSnapshotRebuild(unittest.TestCase):
+    """Backdated trades rebuild later snapshots in one sweep and one write."""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_snapshot_rebuild_"))
+        self.repository = CSVRepository(fund_name="TEST", data_directory=str(self.test_dir))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_save_portfolio_snapshots_rewrites_once_in_place(self):
+        """Several days are replaced with one rewrite and keep their order in the file."""
+        for day in (2, 3, 6):
+            self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, day, 16)))
+
+        updated = [
+            _snapshot(datetime(2025, 1, 3, 16), tickers=("AAA",), price="20.00"),
+            _snapshot(datetime(2025, 1, 6, 16), tickers=("AAA",), price="30.00"),
+        ]
+        with patch.object(self.repository, '_rewrite_portfolio_days',
+                          wraps=self.repository._rewrite_portfolio_days) as mock_rewrite:
+            self.repository.save_portfolio_snapshots(updated)
+        mock_rewrite.assert_called_once()
+
+        df = pd.read_csv(self.repository.portfolio_file)
+        self.assertEqual([d[:10] for d in df['Date']], ['2025-01-02', '2025-01-02', '2025-01-03', '2025-01-06'])
+        self.assertEqual(df['Current Price'].tolist(), [10.0, 10.0, 20.0, 30.0])
+
+    def test_failed_rewrite_leaves_portfolio_file_intact(self):
+        """A rewrite that fails before the swap keeps the original CSV byte for byte."""
+        for day in (2, 3, 6):
+            self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, day, 16)))
+        original = self.repository.portfolio_file.read_bytes()
+
+        updated = [_snapshot(datetime(2025, 1, 3, 16), tickers=("AAA",), price="20.00")]
+        with patch('data.repositories.csv_repository.os.replace', side_effect=OSError("disk full")):
+            with self.assertRaises(RepositoryError):
+                self.repository.save_portfolio_snapshots(updated)
+
+        self.assertEqual(self.repository.portfolio_file.read_bytes(), original)
+        self.assertEqual(list(self.test_dir.glob("*.tmp")), [])
+
+    def test_update_ticker_in_future_snapshots_single_sweep(self):
+        """Each later snapshot reflects exactly the trades up to its timestamp."""
+        for day in (2, 3, 6):
+            self.repository.save_portfolio_snapshot(_snapshot(datetime(2025, 1, day, 16), tickers=("AAA",)))
+        trades = [
+            Trade(ticker="AAA", action="BUY", shares=Decimal("2"), price=Decimal("5.00"),
+                  timestamp=datetime(2025, 1, 2, 9), currency="USD"),
+            Trade(ticker="AAA", action="BUY", shares=Decimal("3"), price=Decimal("6.00"),
+                  timestamp=datetime(2025, 1, 3, 9), currency="USD"),
+            Trade(ticker="AAA", action="SELL", shares=Decimal("1"), price=Decimal("7.00"),
+                  timestamp=datetime(2025, 1, 6, 9), currency="USD"),
+        ]
+        with patch.object(self.repository, 'get_trade_history', return_value=trades), \
+             patch.object(self.repository, 'save_portfolio_snapshots') as mock_save:
+            self.repository.update_ticker_in_future_snapshots("AAA", datetime(2025, 1, 2, 9))
+
+        mock_save.assert_called_once()
+        snapshots = mock_save.call_args[0][0]
+        shares = [s.get_position_by_ticker("AAA").shares for s in snapshots]
+        self.assertEqual(shares, [Decimal("2"), Decimal("5"), Decimal("4")])
+        # FIFO: the sell consumes one share of the first lot
+        self.assertEqual(snapshots[-1].get_position_by_ticker("AAA").cost_basis, Decimal("23.00"))
+
+
+if __name__ == '__main__':
+    unittest.main()
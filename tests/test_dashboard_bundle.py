@@ -0,0 +1,143 @@
+"""Tests for the dashboard panel builders and the /api/dashboard/bundle endpoint."""
+
+import inspect
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+POSITIONS = pd.DataFrame([
+    {'ticker': 'AAA', 'currency': 'USD', 'shares': 10, 'cost_basis': 100.0, 'current_price': 15.0,
+     'market_value': 150.0, 'unrealized_pnl': 50.0, 'securities': {'company_name': 'Triple A', 'sector': 'Tech'}},
+    {'ticker': 'BBB.TO', 'currency': 'CAD', 'shares': 5, 'cost_basis': 50.0, 'current_price': 10.0,
+     'market_value': 50.0, 'unrealized_pnl': 0.0},
+])
+TRADES = pd.DataFrame([
+    {'date': datetime(2025, 1, 3), 'ticker': 'AAA', 'shares': np.int64(-4), 'price': 15.0, 'amount': -60.0},
+    {'date': datetime(2025, 1, 2), 'ticker': 'AAA', 'shares': np.int64(14), 'price': 10.0, 'amount': 140.0},
+])
+DIVIDENDS = [
+    {'pay_date': '2025-01-05', 'ticker': 'AAA', 'amount_cad': 3.0, 'tax_paid': 0.45, 'shares_added': 0.2},
+    {'pay_date': '2024-12-05', 'ticker': 'BBB.TO', 'amount_cad': 1.0, 'tax_paid': 0, 'shares_added': 0},
+]
+
+
+@pytest.fixture
+def dashboard_routes(app):
+    from routes import dashboard_routes as module
+
+    loaders = {
+        'get_current_positions': POSITIONS,
+        'get_cash_balances': {'CAD': 0.0, 'USD': 0.0},
+        'get_trade_log': TRADES,
+        'fetch_dividend_log_flask': DIVIDENDS,
+        'get_first_trade_dates': {'AAA': datetime(2024, 6, 1)},
+        'fetch_latest_rates_bulk': {'USD': 1.4, 'CAD': 1.0},
+        'get_user_currency': 'CAD',
+        'get_user_theme': 'light',
+        'get_cache_version': 'v1',
+    }
+    mocks = {}
+    patchers = [patch.object(module, name, return_value=value) for name, value in loaders.items()]
+    for name, patcher in zip(loaders, patchers):
+        mocks[name] = patcher.start()
+    module.loader_mocks = mocks
+    yield module
+    for patcher in patchers:
+        patcher.stop()
+    del module.loader_mocks
+
+
+def test_holdings_panel_converts_to_display_currency(dashboard_routes):
+    data = dashboard_routes.DashboardData(None, 'CAD')
+    rows = {row['ticker']: row for row in dashboard_routes.build_holdings_panel(data)['data']}
+
+    assert rows['AAA']['value'] == pytest.approx(210.0)
+    assert rows['AAA']['weight'] == pytest.approx(210.0 / 260.0 * 100)
+    assert rows['AAA']['name'] == 'Triple A'
+    assert rows['AAA']['opened'] == '06-01-24'
+    assert rows['BBB.TO']['value'] == pytest.approx(50.0)
+
+
+def test_panels_share_one_data_load(dashboard_routes):
+    data = dashboard_routes.DashboardData('F', 'CAD')
+    dashboard_routes.build_holdings_panel(data)
+    dashboard_routes.build_movers_panel(data)
+
+    dashboard_routes.loader_mocks['get_current_positions'].assert_called_once_with('F')
+    assert set(data.load_times) >= {'positions', 'first_trade_dates', 'rates'}
+
+
+def test_activity_panel_signs_and_limits(dashboard_routes):
+    data = dashboard_routes.DashboardData(None, 'CAD')
+    rows = dashboard_routes.build_activity_panel(data, limit=5)['data']
+
+    dashboard_routes.loader_mocks['get_trade_log'].assert_called_once_with(limit=5, fund=None)
+    assert [(r['date'], r['action'], r['shares']) for r in rows] == [('2025-01-03', 'SELL', 4), ('2025-01-02', 'BUY', 14)]
+
+
+def test_dividends_panel_metrics(dashboard_routes):
+    panel = dashboard_routes.build_dividends_panel(dashboard_routes.DashboardData(None, 'CAD'))
+
+    assert panel['metrics']['total_dividends'] == pytest.approx(4.0)
+    assert panel['metrics']['largest_ticker'] == 'AAA'
+    assert panel['metrics']['payout_events'] == 2
+    assert [row['type'] for row in panel['log']] == ['DRIP', 'CASH']
+
+
+def _call_bundle(app, dashboard_routes, query):
+    return _call_view(app, dashboard_routes.get_dashboard_bundle, f'/api/dashboard/bundle?{query}')
+
+
+def _call_view(app, view, url):
+    view = inspect.unwrap(view)
+    with app.test_request_context(url):
+        response = view()
+        if isinstance(response, tuple):
+            response, status = response
+            response.status_code = status
+        body = response.get_data()
+    return response, body
+
+
+def test_bundle_json(app, dashboard_routes):
+    response, body = _call_bundle(app, dashboard_routes, 'panels=activity,dividends,holdings')
+
+    assert response.status_code == 200
+    payload = json.loads(body)
+    assert list(payload['panels']) == ['activity', 'dividends', 'holdings']
+    assert all(panel['status'] == 200 for panel in payload['panels'].values())
+    assert payload['version'] == 'v1'
+    # Positions are loaded once for the whole bundle
+    dashboard_routes.loader_mocks['get_current_positions'].assert_called_once()
+
+
+def test_bundle_ndjson_serializes_numpy_values(app, dashboard_routes):
+    response, body = _call_bundle(app, dashboard_routes, 'panels=activity,summary&stream=true&activity_limit=2')
+
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+    assert [line.get('panel') for line in lines[:-1]] == ['activity', 'summary']
+    assert lines[0]['status'] == 200
+    assert lines[0]['data']['data'][0]['shares'] == 4
+    assert lines[-1]['done'] is True
+
+
+def test_panel_endpoint_matches_bundle_panel(app, dashboard_routes):
+    _, bundle_body = _call_bundle(app, dashboard_routes, 'panels=activity&activity_limit=2')
+    response, body = _call_view(app, dashboard_routes.get_recent_activity, '/api/dashboard/activity?limit=2')
+
+    assert response.status_code == 200
+    assert json.loads(body) == json.loads(bundle_body)['panels']['activity']['data']
+
+
+@pytest.mark.parametrize('query', ['activity_limit=ten', 'movers_limit=', 'panels=nope'])
+def test_bundle_rejects_bad_parameters(app, dashboard_routes, query):
+    response, body = _call_bundle(app, dashboard_routes, query)
+
+    assert response.status_code == 400
+    assert 'error' in json.loads(body)
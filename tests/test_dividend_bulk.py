@@ -0,0 +1,182 @@
+"""Tests for the preloaded dividend job helpers (shares ledger, DRIP prices, bulk fetch)."""
+
+import sys
+import unittest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'web_dashboard'))
+
+from scheduler import jobs_dividends
+from scheduler.jobs_dividends import DividendEvent, DripPriceLookup, SharesLedger
+
+
+class TestSharesLedger(unittest.TestCase):
+
+    def test_ex_date_cutoff_excludes_trades_from_midnight_on(self):
+        ledger = SharesLedger([
+            {'ticker': 'AAA', 'shares': 10, 'date': '2025-03-01T15:00:00+00:00'},
+            {'ticker': 'AAA', 'shares': 5, 'date': '2025-03-09T23:59:59Z'},
+            {'ticker': 'AAA', 'shares': 7, 'date': '2025-03-10T00:00:00+00:00'},
+            {'ticker': 'AAA', 'shares': -3, 'date': datetime(2025, 3, 10, 14, 0)},
+        ])
+
+        self.assertEqual(ledger.eligible_shares('AAA', date(2025, 3, 1)), Decimal('0'))
+        self.assertEqual(ledger.eligible_shares('AAA', date(2025, 3, 10)), Decimal('15'))
+        self.assertEqual(ledger.eligible_shares('AAA', date(2025, 3, 11)), Decimal('19'))
+
+    def test_offset_timestamps_are_compared_in_utc(self):
+        # 20:00 in Toronto on the 9th is already the 10th in UTC
+        ledger = SharesLedger([{'ticker': 'AAA', 'shares': 4, 'date': '2025-03-09T20:00:00-04:00'}])
+
+        self.assertEqual(ledger.eligible_shares('AAA', date(2025, 3, 10)), Decimal('0'))
+        self.assertEqual(ledger.eligible_shares('AAA', date(2025, 3, 11)), Decimal('4'))
+
+    def test_net_short_and_unknown_tickers_are_zero(self):
+        ledger = SharesLedger([
+            {'ticker': 'AAA', 'shares': 2, 'date': '2025-01-02T15:00:00+00:00'},
+            {'ticker': 'AAA', 'shares': -5, 'date': '2025-01-03T15:00:00+00:00'},
+        ])
+
+        self.assertEqual(ledger.eligible_shares('AAA', date(2025, 2, 1)), Decimal('0'))
+        self.assertEqual(ledger.eligible_shares('ZZZ', date(2025, 2, 1)), Decimal('0'))
+
+    def test_add_trade_is_placed_in_date_order(self):
+        ledger = SharesLedger([{'ticker': 'AAA', 'shares': 10, 'date': '2025-03-01T15:00:00+00:00'}])
+        ledger.add_trade('AAA', datetime(2025, 2, 1, 15, 0, tzinfo=timezone.utc), Decimal('2.5'))
+        ledger.add_trade('BBB', datetime(2025, 2, 1, 15, 0), Decimal('1'))
+
+        self.assertEqual(ledger.eligible_shares('AAA', date(2025, 2, 2)), Decimal('2.5'))
+        self.assertEqual(ledger.eligible_shares('AAA', date(2025, 3, 2)), Decimal('12.5'))
+        self.assertEqual(ledger.eligible_shares('BBB', date(2025, 2, 2)), Decimal('1'))
+
+
+class TestDripCompounding(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('cache_version.bump_cache_version')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = MagicMock()
+        self.client.supabase.table.return_value.insert.return_value.execute.return_value.data = [{'id': 1}]
+
+    def _trade_inserts(self):
+        inserts = self.client.supabase.table.return_value.insert.call_args_list
+        return [c.args[0] for c in inserts if 'reason' in c.args[0]]
+
+    def test_second_dividend_sees_reinvested_shares(self):
+        ledger = SharesLedger([{'ticker': 'AAA.TO', 'shares': 100, 'date': '2025-01-02T15:00:00+00:00'}])
+        prices = MagicMock()
+        prices.price_on.return_value = Decimal('10')
+        events = [
+            DividendEvent(date(2025, 2, 1), date(2025, 2, 15), 0.5, 'yfinance'),
+            DividendEvent(date(2025, 3, 1), date(2025, 3, 15), 0.5, 'yfinance'),
+        ]
+
+        for evt in events:
+            self.assertTrue(jobs_dividends.insert_drip_transaction(
+                'F', 'AAA.TO', evt, 'tfsa', self.client, ledger=ledger, prices=prices))
+
+        # 100 shares -> 5 DRIP shares, then 105 shares -> 5.25 DRIP shares
+        self.assertEqual([row['shares'] for row in self._trade_inserts()], [5.0, 5.25])
+        self.assertEqual(ledger.eligible_shares('AAA.TO', date(2025, 4, 1)), Decimal('110.25'))
+        self.client.supabase.table.return_value.select.assert_not_called()
+
+    def test_failed_insert_does_not_touch_ledger(self):
+        self.client.supabase.table.return_value.insert.return_value.execute.return_value.data = []
+        ledger = SharesLedger([{'ticker': 'AAA.TO', 'shares': 100, 'date': '2025-01-02T15:00:00+00:00'}])
+        prices = MagicMock()
+        prices.price_on.return_value = Decimal('10')
+        evt = DividendEvent(date(2025, 2, 1), date(2025, 2, 15), 0.5, 'yfinance')
+
+        self.assertFalse(jobs_dividends.insert_drip_transaction(
+            'F', 'AAA.TO', evt, 'tfsa', self.client, ledger=ledger, prices=prices))
+        self.assertEqual(ledger.eligible_shares('AAA.TO', date(2025, 4, 1)), Decimal('100'))
+
+
+def _closes(values):
+    """Batch fetch result holding the given {day: close} series."""
+    index = pd.DatetimeIndex([pd.Timestamp(day) for day in values])
+    return SimpleNamespace(df=pd.DataFrame({'Close': list(values.values())}, index=index))
+
+
+class TestDripPriceLookup(unittest.TestCase):
+
+    def _lookup(self, results):
+        fetcher = MagicMock()
+        fetcher.fetch_price_data_batch.return_value = results
+        lookup = DripPriceLookup(market_fetcher=fetcher)
+        return lookup, fetcher
+
+    def test_batch_window_covers_pay_dates_and_lookahead(self):
+        lookup, fetcher = self._lookup({})
+        lookup.load({'BBB': [date(2025, 3, 14)], 'AAA': [date(2025, 3, 1), date(2025, 3, 3)]})
+
+        args, kwargs = fetcher.fetch_price_data_batch.call_args
+        self.assertEqual(args[0], ['AAA', 'BBB'])
+        self.assertEqual(kwargs['start'], datetime(2025, 3, 1))
+        self.assertEqual(kwargs['end'].date(), date(2025, 3, 17))
+
+    def test_weekend_pay_date_uses_next_close(self):
+        lookup, _ = self._lookup({'AAA': _closes({'2025-03-14': 9.0, '2025-03-15': float('nan'), '2025-03-17': 11.5})})
+        lookup.load({'AAA': [date(2025, 3, 15)]})
+
+        self.assertEqual(lookup.price_on('AAA', date(2025, 3, 14)), Decimal('9.0'))
+        self.assertEqual(lookup.price_on('AAA', date(2025, 3, 15)), Decimal('11.5'))
+
+    def test_no_close_within_lookahead_is_none(self):
+        lookup, _ = self._lookup({'AAA': _closes({'2025-03-20': 11.5})})
+        lookup.load({'AAA': [date(2025, 3, 15)]})
+
+        with patch.object(jobs_dividends, 'get_price_on_date') as single:
+            self.assertIsNone(lookup.price_on('AAA', date(2025, 3, 15)))
+        single.assert_not_called()
+
+    def test_tickers_missing_from_batch_fall_back_to_single_lookup(self):
+        lookup, _ = self._lookup({'AAA': None})
+        lookup.load({'AAA': [date(2025, 3, 14)]})
+
+        with patch.object(jobs_dividends, 'get_price_on_date', return_value=Decimal('7')) as single:
+            self.assertEqual(lookup.price_on('AAA', date(2025, 3, 14)), Decimal('7'))
+        single.assert_called_once_with('AAA', date(2025, 3, 14))
+
+    def test_failed_batch_falls_back_to_single_lookup(self):
+        lookup, fetcher = self._lookup({})
+        fetcher.fetch_price_data_batch.side_effect = RuntimeError("rate limited")
+        lookup.load({'AAA': [date(2025, 3, 14)]})
+
+        with patch.object(jobs_dividends, 'get_price_on_date', return_value=Decimal('7')) as single:
+            self.assertEqual(lookup.price_on('AAA', date(2025, 3, 14)), Decimal('7'))
+        single.assert_called_once()
+
+
+class TestFetchDividendDataBulk(unittest.TestCase):
+
+    def test_fetches_each_ticker_once_and_isolates_failures(self):
+        evt = DividendEvent(date(2025, 3, 1), date(2025, 3, 15), 0.5, 'nasdaq')
+
+        def fetch(ticker):
+            if ticker == 'BAD':
+                raise RuntimeError("boom")
+            return [evt]
+
+        with patch.object(jobs_dividends, 'fetch_dividend_data', side_effect=fetch) as fetcher:
+            result = jobs_dividends.fetch_dividend_data_bulk(['AAA', 'BAD', 'AAA', 'BBB'])
+
+        self.assertEqual(result, {'AAA': [evt], 'BAD': [], 'BBB': [evt]})
+        self.assertEqual(sorted(c.args[0] for c in fetcher.call_args_list), ['AAA', 'BAD', 'BBB'])
+
+    def test_no_tickers(self):
+        with patch.object(jobs_dividends, 'fetch_dividend_data') as fetcher:
+            self.assertEqual(jobs_dividends.fetch_dividend_data_bulk([]), {})
+        fetcher.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
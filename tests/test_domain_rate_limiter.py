@@ -0,0 +1,58 @@
+"""Tests for the per-domain rate limiter used by the RSS ingest pipeline."""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import research_utils
+from research_utils import DomainRateLimiter
+
+
+class TestDomainRateLimiter(unittest.TestCase):
+    """Only requests to the same domain wait on each other."""
+
+    def setUp(self):
+        self.now = 100.0
+        self.sleeps = []
+
+        def sleep(seconds):
+            self.sleeps.append(round(seconds, 6))
+            self.now += seconds
+
+        patchers = [
+            patch.object(research_utils.time, 'monotonic', side_effect=lambda: self.now),
+            patch.object(research_utils.time, 'sleep', side_effect=sleep),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_same_domain_is_spaced_out(self):
+        limiter = DomainRateLimiter(min_interval=2.0)
+        limiter.wait('https://www.example.com/a')
+        limiter.wait('https://example.com/b')
+
+        self.assertEqual(self.sleeps, [2.0])
+
+    def test_other_domains_do_not_wait(self):
+        limiter = DomainRateLimiter(min_interval=2.0)
+        limiter.wait('https://example.com/a')
+        limiter.wait('https://news.example.org/b')
+        limiter.wait('https://another.net/c')
+
+        self.assertEqual(self.sleeps, [])
+
+    def test_no_wait_once_interval_has_passed(self):
+        limiter = DomainRateLimiter(min_interval=2.0)
+        limiter.wait('https://example.com/a')
+        self.now += 5
+        limiter.wait('https://example.com/b')
+
+        self.assertEqual(self.sleeps, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
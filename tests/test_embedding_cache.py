@@ -0,0 +1,115 @@
+"""Tests for batched embedding generation and the embedding cache."""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import embedding_cache
+from embedding_cache import EmbeddingCache, content_hash
+from ollama_client import OllamaClient
+
+
+class _Response:
+    def __init__(self, status_code, payload=None, text=""):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.text = text
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+class TestGenerateEmbeddings(unittest.TestCase):
+    """Only uncached, distinct texts reach Ollama."""
+
+    def setUp(self):
+        self.cache = EmbeddingCache(persistent=False)
+        patcher = patch.object(embedding_cache, '_embedding_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = OllamaClient(base_url="http://localhost:11434")
+        self.client.enabled = True
+        self.requests = []
+
+        def post(url, json=None, timeout=None):
+            self.requests.append((url.rsplit('/', 1)[-1], json))
+            return _Response(200, {"embeddings": [[float(len(t))] for t in json["input"]]})
+
+        self.client.session = MagicMock()
+        self.client.session.post.side_effect = post
+
+    def test_batch_dedupes_and_preserves_order(self):
+        result = self.client.generate_embeddings(["aa", "b", "aa", "ccc"])
+
+        self.assertEqual(result, [[2.0], [1.0], [2.0], [3.0]])
+        self.assertEqual(self.requests, [("embed", {"model": "nomic-embed-text", "input": ["aa", "b", "ccc"]})])
+
+    def test_rerun_on_unchanged_text_skips_the_model(self):
+        self.client.generate_embeddings(["same article text"])
+        self.requests.clear()
+
+        self.assertEqual(self.client.generate_embedding("  same   article\ntext "), [17.0])
+        self.assertEqual(self.requests, [])
+
+    def test_cache_is_per_model(self):
+        self.assertNotEqual(content_hash("a", "text"), content_hash("b", "text"))
+
+    def test_large_input_is_split_into_batches(self):
+        with patch('ollama_client.OLLAMA_EMBED_BATCH_SIZE', 2):
+            result = self.client.generate_embeddings(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        self.assertEqual(result, [[1.0], [2.0], [3.0], [4.0], [5.0]])
+        self.assertEqual(sorted(len(body["input"]) for _, body in self.requests), [1, 2, 2])
+
+    def test_falls_back_to_single_endpoint_on_old_ollama(self):
+        def post(url, json=None, timeout=None):
+            self.requests.append(url.rsplit('/', 1)[-1])
+            if url.endswith("/api/embed"):
+                return _Response(404, text="404 page not found")
+            return _Response(200, {"embedding": [float(len(json["prompt"]))]})
+
+        self.client.session.post.side_effect = post
+
+        self.assertEqual(self.client.generate_embeddings(["a", "bb"]), [[1.0], [2.0]])
+        self.assertEqual(self.requests, ["embed", "embeddings", "embeddings"])
+
+    def test_failures_are_not_cached(self):
+        self.client.session.post.side_effect = lambda *a, **k: _Response(500)
+        self.assertEqual(self.client.generate_embeddings(["x"]), [[]])
+        self.assertEqual(self.cache.get_many([content_hash("nomic-embed-text", "x")]), {})
+
+
+class TestPersistentCache(unittest.TestCase):
+    """Database errors leave the cache usable from memory."""
+
+    def test_database_error_falls_back_to_memory(self):
+        postgres = MagicMock()
+        postgres.execute_query.side_effect = Exception("relation \"embedding_cache\" does not exist")
+        cache = EmbeddingCache(postgres_client=postgres)
+
+        self.assertEqual(cache.get_many(["k"]), {})
+        cache.put_many("m", {"k": [0.5]})
+
+        self.assertEqual(cache.get_many(["k"]), {"k": [0.5]})
+        postgres.execute_many.assert_not_called()
+
+    def test_rows_loaded_from_database(self):
+        postgres = MagicMock()
+        postgres.execute_query.return_value = [{"content_hash": "k", "embedding": [1, 2]}]
+        cache = EmbeddingCache(postgres_client=postgres)
+
+        self.assertEqual(cache.get_many(["k", "missing"]), {"k": [1.0, 2.0]})
+        cache.get_many(["k"])
+        self.assertEqual(postgres.execute_query.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
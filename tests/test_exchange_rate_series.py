@@ -0,0 +1,121 @@
+"""Tests for the in-memory ExchangeRateSeries."""
+
+import os
+import sys
+import unittest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from exchange_rates_utils import ExchangeRateSeries
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    """Just enough of the PostgREST builder for the series' reads."""
+
+    def __init__(self, store):
+        self.store = store
+        self.filters = []
+        self.max_rows = None
+
+    def eq(self, col, value):
+        self.filters.append(lambda r: r[col] == value)
+        return self
+
+    def gt(self, col, value):
+        self.filters.append(lambda r: r[col] > value)
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def limit(self, n):
+        self.max_rows = n
+        return self
+
+    def execute(self):
+        self.store.queries += 1
+        rows = sorted((r for r in self.store.rows if all(f(r) for f in self.filters)),
+                      key=lambda r: (r['timestamp'], r['id']))
+        return _Result(rows[:self.max_rows])
+
+
+class _FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+        self.supabase = self
+
+    def table(self, name):
+        store = self
+
+        class _Table:
+            def select(self, columns, count=None):
+                return _Query(store)
+        return _Table()
+
+
+def _row(day, rate, pair=('USD', 'CAD')):
+    return {
+        'id': f"{pair[0]}{pair[1]}-{day}",
+        'timestamp': f"2025-01-{day:02d}T00:00:00+00:00",
+        'rate': rate,
+        'from_currency': pair[0],
+        'to_currency': pair[1],
+    }
+
+
+class TestExchangeRateSeries(unittest.TestCase):
+    """As-of lookups answer from memory after a single load."""
+
+    def setUp(self):
+        self.client = _FakeClient([
+            _row(2, 1.40), _row(3, 1.41), _row(6, 1.43), _row(3, 0.70, pair=('CAD', 'USD')),
+        ])
+        self.series = ExchangeRateSeries('USD', 'CAD', client=self.client, refresh_interval=3600)
+
+    def test_as_of_lookup_uses_latest_rate_on_or_before(self):
+        self.assertEqual(self.series.rate_on(date(2025, 1, 3)), Decimal('1.41'))
+        self.assertEqual(self.series.rate_on(datetime(2025, 1, 5, 15)), Decimal('1.41'))
+        self.assertEqual(self.series.rate_on(date(2025, 1, 6)), Decimal('1.43'))
+        self.assertIsNone(self.series.rate_on(date(2025, 1, 1)))
+        self.assertEqual(self.client.queries, 1)
+
+    def test_vectorized_lookup_matches_scalar(self):
+        days = [date(2025, 1, d) for d in range(1, 9)]
+        rates = self.series.rates_on(days)
+
+        self.assertTrue(np.isnan(rates[0]))
+        for day, rate in zip(days[1:], rates[1:]):
+            self.assertAlmostEqual(rate, float(self.series.rate_on(day)))
+
+    def test_refresh_fetches_only_newer_rows(self):
+        self.series.rate_on(date(2025, 1, 3))
+        self.client.rows.append(_row(7, 1.44))
+        self.series.refresh()
+
+        self.assertEqual(self.series.latest(), Decimal('1.44'))
+        self.assertEqual(len(self.series), 4)
+
+    def test_merge_applies_written_rates(self):
+        self.series.rate_on(date(2025, 1, 3))
+        self.series.merge([
+            {'timestamp': datetime(2025, 1, 3, tzinfo=timezone.utc), 'rate': 1.50,
+             'from_currency': 'USD', 'to_currency': 'CAD'},
+            {'timestamp': '2025-01-04T00:00:00+00:00', 'rate': 9.99,
+             'from_currency': 'CAD', 'to_currency': 'USD'},
+        ])
+        self.assertEqual(self.series.rate_on(date(2025, 1, 4)), Decimal('1.5'))
+        self.assertEqual(self.client.queries, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
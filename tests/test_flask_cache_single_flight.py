@@ -0,0 +1,215 @@
+"""Tests for request coalescing and stale-while-revalidate in flask_cache_utils.cache_data."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import flask_cache_utils
+from flask_cache_utils import SimpleCache, cache_data, get_cache_stats
+
+
+class _CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SimpleCache()
+        patches = [
+            patch.object(flask_cache_utils, '_get_cache', return_value=self.cache),
+            patch.object(flask_cache_utils, 'CACHE_VERSION_AVAILABLE', False),
+            patch.dict(flask_cache_utils._stats, {name: 0 for name in flask_cache_utils._stats}),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestSingleFlight(_CacheTestCase):
+
+    def test_concurrent_misses_run_function_once(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        @cache_data(ttl=300)
+        def slow(key):
+            calls.append(key)
+            started.set()
+            release.wait(5)
+            return {"key": key}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow("a"))) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        # Let the followers reach the wait before the leader finishes
+        deadline = time.monotonic() + 5
+        while get_cache_stats()['waits'] < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(calls, ["a"])
+        self.assertEqual(results, [{"key": "a"}] * 5)
+        stats = get_cache_stats()
+        self.assertEqual((stats['misses'], stats['waits'], stats['in_flight']), (1, 4, 0))
+
+    def test_waiters_receive_the_leaders_exception(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        @cache_data(ttl=300)
+        def failing():
+            started.set()
+            release.wait(5)
+            raise ValueError("boom")
+
+        errors = []
+
+        def call():
+            try:
+                failing()
+            except ValueError as e:
+                errors.append(str(e))
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=call)
+        follower.start()
+        deadline = time.monotonic() + 5
+        while get_cache_stats()['waits'] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual(errors, ["boom", "boom"])
+        self.assertEqual(get_cache_stats()['in_flight'], 0)
+
+    def test_hits_are_counted(self):
+        @cache_data(ttl=300)
+        def load():
+            return 1
+
+        load()
+        load()
+        stats = get_cache_stats()
+        self.assertEqual((stats['misses'], stats['hits']), (1, 1))
+
+
+class TestCacheKeys(_CacheTestCase):
+
+    def test_same_named_functions_do_not_share_entries(self):
+        def make(value):
+            # Like app.py and admin_routes.py each defining _get_cached_application_logs
+            def load():
+                return value
+            load.__module__ = f"module_{value}"
+            return cache_data(ttl=300)(load)
+
+        first, second = make(1), make(2)
+        self.assertEqual((first(), second()), (1, 2))
+
+
+class TestStaleWhileRevalidate(_CacheTestCase):
+
+    def test_expired_value_is_served_while_refreshing(self):
+        values = iter([1, 2])
+        refreshed = threading.Event()
+
+        @cache_data(ttl=60, stale_while_revalidate=60)
+        def load():
+            value = next(values)
+            if value == 2:
+                refreshed.set()
+            return value
+
+        now = time.time()
+        with patch('flask_cache_utils.time.time', return_value=now):
+            self.assertEqual(load(), 1)
+        with patch('flask_cache_utils.time.time', return_value=now + 61):
+            self.assertEqual(load(), 1)
+            self.assertTrue(refreshed.wait(5))
+            deadline = time.monotonic() + 5
+            while get_cache_stats()['refreshes'] < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(load(), 2)
+
+        stats = get_cache_stats()
+        self.assertEqual((stats['misses'], stats['stale_hits'], stats['refreshes'], stats['hits']), (1, 1, 1, 1))
+
+    def test_failed_refresh_keeps_stale_value(self):
+        calls = []
+
+        @cache_data(ttl=60, stale_while_revalidate=60)
+        def load():
+            calls.append(1)
+            if len(calls) > 1:
+                raise RuntimeError("upstream down")
+            return "old"
+
+        now = time.time()
+        with patch('flask_cache_utils.time.time', return_value=now):
+            load()
+        with patch('flask_cache_utils.time.time', return_value=now + 61):
+            self.assertEqual(load(), "old")
+            deadline = time.monotonic() + 5
+            while get_cache_stats()['refresh_errors'] < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(load(), "old")
+            # The second stale hit starts another refresh; let it finish inside this test
+            deadline = time.monotonic() + 5
+            while get_cache_stats()['in_flight'] and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertGreaterEqual(get_cache_stats()['refresh_errors'], 1)
+        self.assertEqual(get_cache_stats()['in_flight'], 0)
+
+    def test_refresh_that_cannot_start_fails_its_waiters(self):
+        @cache_data(ttl=60, stale_while_revalidate=60)
+        def load():
+            return "value"
+
+        results = []
+
+        def follower():
+            try:
+                results.append(load())
+            except RuntimeError as e:
+                results.append(str(e))
+
+        def start_background(target):
+            # A caller misses (entry evicted) and joins the revalidation flight before it lands
+            self.cache.clear()
+            thread = threading.Thread(target=follower)
+            thread.start()
+            deadline = time.monotonic() + 5
+            while get_cache_stats()['waits'] < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.addCleanup(thread.join, 5)
+            raise RuntimeError("can't start new thread")
+
+        now = time.time()
+        with patch('flask_cache_utils.time.time', return_value=now):
+            load()
+        with patch('flask_cache_utils.time.time', return_value=now + 61), \
+             patch.object(flask_cache_utils, '_start_background', side_effect=start_background):
+            self.assertEqual(load(), "value")
+            deadline = time.monotonic() + 5
+            while not results and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertEqual(results, ["can't start new thread"])
+        stats = get_cache_stats()
+        self.assertEqual((stats['refresh_errors'], stats['in_flight']), (1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
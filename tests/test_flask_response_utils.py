@@ -0,0 +1,91 @@
+"""Tests for conditional GET (ETag/304) and compression of dashboard JSON responses."""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from flask import Flask
+
+import cache_version
+import flask_response_utils
+from cache_version import bump_cache_version, POSITIONS, TRADES
+from flask_response_utils import conditional_json, compress_response, json_response
+
+
+class TestConditionalJson(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patchers = [
+            patch.multiple(cache_version, VERSIONS_FILE=Path(tmp_dir.name) / ".cache_versions.json",
+                           _versions={}, _file_mtime=None, _last_poll=0.0, _listeners=[]),
+            patch('flask_auth_utils.get_user_id_flask', return_value='user-1'),
+            patch('user_preferences.get_user_currency', return_value='CAD'),
+            patch('user_preferences.get_user_theme', return_value='dark'),
+            patch.object(flask_response_utils, '_freshness_bucket', return_value=1),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.calls = 0
+        app = Flask(__name__)
+        app.after_request(compress_response)
+
+        @app.route('/positions')
+        @conditional_json(kinds=[POSITIONS])
+        def positions():
+            self.calls += 1
+            return json_response({"rows": list(range(2000))})
+
+        self.client = app.test_client()
+
+    def test_matching_etag_returns_304_without_running_view(self):
+        first = self.client.get('/positions?fund=A')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers['Cache-Control'], 'private, no-cache')
+        etag = first.headers['ETag']
+
+        second = self.client.get('/positions?fund=A', headers={'If-None-Match': etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers['ETag'], etag)
+        self.assertEqual(self.calls, 1)
+
+    def test_bump_for_the_fund_changes_etag(self):
+        etag = self.client.get('/positions?fund=A').headers['ETag']
+
+        bump_cache_version(fund="B", kinds=[POSITIONS])
+        bump_cache_version(fund="A", kinds=[TRADES])
+        self.assertEqual(self.client.get('/positions?fund=A', headers={'If-None-Match': etag}).status_code, 304)
+
+        bump_cache_version(fund="A", kinds=[POSITIONS])
+        response = self.client.get('/positions?fund=A', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_query_string_is_part_of_etag(self):
+        etag_a = self.client.get('/positions?fund=A').headers['ETag']
+        etag_b = self.client.get('/positions?fund=B').headers['ETag']
+        self.assertNotEqual(etag_a, etag_b)
+
+    def test_large_json_is_gzipped_when_accepted(self):
+        response = self.client.get('/positions', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.data))["rows"][-1], 1999)
+
+        plain = self.client.get('/positions')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertEqual(len(plain.get_json()["rows"]), 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for the fund_daily_values rollup helpers."""
+
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+
+from data.repositories.fund_daily_values import load_fund_daily_values, refresh_fund_daily_values
+
+
+class _Query:
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+
+    def eq(self, col, value):
+        self.filters.append(lambda r: r[col] == value)
+        return self
+
+    def gte(self, col, value):
+        self.filters.append(lambda r: str(r[col]) >= value)
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def limit(self, n):
+        return self
+
+    def execute(self):
+        rows = [r for r in self.rows if all(f(r) for f in self.filters)]
+        result = MagicMock()
+        result.data = rows
+        result.count = len(rows)
+        return result
+
+
+class _Supabase:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def table(self, name):
+        supabase = self
+
+        class _Table:
+            def select(self, columns, count=None):
+                return _Query(supabase.rows)
+        return _Table()
+
+
+class TestFundDailyValues(unittest.TestCase):
+    """Rollup reads stand in for position rows; failures fall back to positions."""
+
+    def test_load_filters_and_shapes_dates(self):
+        rows = [
+            {"id": "1", "fund": "F", "date": "2025-01-02", "currency": "USD", "total_value": 10.0},
+            {"id": "2", "fund": "F", "date": "2025-01-03", "currency": "USD", "total_value": 12.0},
+            {"id": "3", "fund": "G", "date": "2025-01-03", "currency": "CAD", "total_value": 5.0},
+        ]
+        loaded = load_fund_daily_values(_Supabase(rows), "F", date(2025, 1, 3))
+
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded[0]["date"], "2025-01-03T00:00:00+00:00")
+
+    def test_load_returns_none_when_unavailable(self):
+        """A missing table or an empty rollup makes callers read positions instead."""
+        broken = MagicMock()
+        broken.table.side_effect = Exception("relation does not exist")
+        self.assertIsNone(load_fund_daily_values(broken, "F"))
+        self.assertIsNone(load_fund_daily_values(_Supabase([]), "F"))
+
+    def test_refresh_calls_rpc_with_iso_dates(self):
+        supabase = MagicMock()
+        self.assertTrue(refresh_fund_daily_values(supabase, "F", date(2025, 1, 2), date(2025, 1, 6)))
+        supabase.rpc.assert_called_once_with(
+            "refresh_fund_daily_values",
+            {"p_fund": "F", "p_start_date": "2025-01-02", "p_end_date": "2025-01-06"},
+        )
+
+    def test_refresh_failure_is_swallowed(self):
+        supabase = MagicMock()
+        supabase.rpc.side_effect = Exception("function does not exist")
+        self.assertFalse(refresh_fund_daily_values(supabase, "F"))
+
+
+if __name__ == '__main__':
+    unittest.main()
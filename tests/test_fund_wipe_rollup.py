@@ -0,0 +1,39 @@
+"""Wiping or deleting a fund's positions must also clear its fund_daily_values rollup."""
+
+from unittest.mock import MagicMock, call, patch
+
+ROLLUP_REFRESH = call.rpc('refresh_fund_daily_values', {"p_fund": "F", "p_start_date": None, "p_end_date": None})
+
+
+def _call_route(app, view, fund_name, body=None):
+    """Run a fund route against a mocked Supabase client, skipping the admin check."""
+    from routes import fund_routes
+
+    supabase = MagicMock()
+    with patch.object(fund_routes, 'get_supabase_client', return_value=MagicMock(supabase=supabase)), \
+         patch.object(fund_routes, 'bump_cache_version'):
+        with app.test_request_context(json=body or {}):
+            response = getattr(fund_routes, view).__wrapped__(fund_name)
+    return response, supabase
+
+
+def _positions_delete_index(supabase):
+    for index, entry in enumerate(supabase.mock_calls):
+        if entry == call.table('portfolio_positions'):
+            return index
+    raise AssertionError("portfolio_positions was not touched")
+
+
+def test_wipe_refreshes_rollup_after_deleting_positions(app):
+    response, supabase = _call_route(app, 'wipe_fund_data', 'F', {'wipe_trades': False})
+
+    assert response.status_code == 200
+    assert ROLLUP_REFRESH in supabase.mock_calls
+    assert supabase.mock_calls.index(ROLLUP_REFRESH) > _positions_delete_index(supabase)
+
+
+def test_delete_fund_refreshes_rollup(app):
+    response, supabase = _call_route(app, 'delete_fund', 'F')
+
+    assert response.status_code == 200
+    assert supabase.mock_calls.index(ROLLUP_REFRESH) > _positions_delete_index(supabase)
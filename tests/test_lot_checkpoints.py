@@ -0,0 +1,126 @@
+"""Tests for persisted FIFO lot checkpoints."""
+
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from data.models.trade import Trade
+from portfolio.fifo_trade_processor import FIFOTradeProcessor
+from portfolio.lot_checkpoints import LotCheckpointStore
+
+
+def _trades(count, start=datetime(2025, 1, 1, 10)):
+    """Alternate buys of 10 shares and sells of 4 shares, one per day."""
+    trades = []
+    for i in range(count):
+        is_buy = i % 2 == 0
+        trades.append(Trade(
+            ticker="AAA",
+            action="BUY" if is_buy else "SELL",
+            shares=Decimal("10") if is_buy else Decimal("4"),
+            price=Decimal("1.10") + Decimal(i) / 100,
+            timestamp=start + timedelta(days=i),
+            currency="USD",
+        ))
+    return trades
+
+
+class TestLotCheckpoints(unittest.TestCase):
+    """Checkpointed start-up must produce the same lots as a full replay."""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_lot_checkpoints_"))
+        self.store = LotCheckpointStore(self.test_dir, interval=5)
+        self.repository = MagicMock()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _processor(self, trades):
+        self.repository.get_trade_history.return_value = trades
+        return FIFOTradeProcessor(self.repository, checkpoint_store=self.store)
+
+    @staticmethod
+    def _state(processor):
+        tracker = processor.lot_trackers["AAA"]
+        return [(lot.remaining_shares, lot.cost_basis, lot.purchase_date) for lot in tracker.lots]
+
+    def test_restart_replays_only_newer_trades(self):
+        """A second start-up restores the newest checkpoint and matches a full rebuild."""
+        trades = _trades(12)
+        first = self._processor(trades)
+        self.assertEqual([c['trade_count'] for c in self.store._read("AAA")], [5, 10])
+
+        tracker, covered = self.store.restore("AAA", trades)
+        self.assertEqual(covered, 10)
+        self.assertEqual(self._state(self._processor(trades)), self._state(first))
+
+    def test_changed_trade_log_ignores_stale_checkpoint(self):
+        """A trade inserted before a checkpoint makes that checkpoint unusable."""
+        trades = _trades(12)
+        self._processor(trades)
+
+        inserted = Trade(ticker="AAA", action="BUY", shares=Decimal("1"), price=Decimal("2"),
+                         timestamp=datetime(2025, 1, 7, 12), currency="USD")
+        updated = sorted(trades + [inserted], key=lambda t: t.timestamp)
+        _, covered = self.store.restore("AAA", updated)
+        self.assertEqual(covered, 5)
+
+        full = FIFOTradeProcessor(self.repository, checkpoint_store=LotCheckpointStore(self.test_dir / "other"))
+        self.repository.get_trade_history.return_value = updated
+        full._load_existing_lots()
+        self.assertEqual(self._state(self._processor(updated)), self._state(full))
+
+    def test_invalidate_from_keeps_earlier_checkpoints(self):
+        """A backdated trade drops only checkpoints covering its date or later."""
+        self._processor(_trades(12))
+        self.store.invalidate_from("AAA", datetime(2025, 1, 8).date())
+        self.assertEqual([c['trade_count'] for c in self.store._read("AAA")], [5])
+
+    def test_edit_to_earlier_trade_ignores_checkpoint(self):
+        """Changing a trade inside a checkpoint's prefix invalidates it, not just the last one."""
+        trades = _trades(12)
+        self._processor(trades)
+
+        trades[1].price = Decimal("9.99")
+        _, covered = self.store.restore("AAA", trades)
+        self.assertEqual(covered, 0)
+
+    def test_supabase_funds_get_separate_stores(self):
+        """Funds sharing SupabaseRepository's exchange-rate data_dir do not share checkpoints."""
+        def supabase_repo(fund):
+            repo = MagicMock(spec=['fund', 'fund_name', 'data_dir'])
+            repo.fund = repo.fund_name = fund
+            repo.data_dir = "trading_data/exchange_rates"
+            return repo
+
+        first = LotCheckpointStore.for_repository(supabase_repo("Fund A"))
+        second = LotCheckpointStore.for_repository(supabase_repo("Fund B"))
+        project_root = Path(__file__).resolve().parent.parent
+        self.assertEqual(first.root, project_root / "trading_data/funds/Fund A/.cache/lot_checkpoints")
+        self.assertNotEqual(first.root, second.root)
+
+    def test_checkpoints_of_another_fund_are_ignored(self):
+        """A file written for one fund is not restored by another fund's store."""
+        trades = _trades(12)
+        self.store = LotCheckpointStore(self.test_dir, interval=5, fund="Fund A")
+        self._processor(trades)
+
+        other = LotCheckpointStore(self.test_dir, interval=5, fund="Fund B")
+        self.assertEqual(other.restore("AAA", trades), (None, 0))
+
+    def test_decimal_state_round_trips_exactly(self):
+        """Checkpointed lots keep full Decimal precision."""
+        trades = _trades(5)
+        trades[1].shares = Decimal("3.3333")
+        first = self._processor(trades)
+        tracker, _ = self.store.restore("AAA", trades)
+        self.assertEqual(tracker.lots[0].remaining_shares, first.lot_trackers["AAA"].lots[0].remaining_shares)
+
+
+if __name__ == '__main__':
+    unittest.main()
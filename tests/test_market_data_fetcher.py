@@ -0,0 +1,131 @@
+"""Unit tests for MarketDataFetcher batch fetching.
+
+These tests mock yfinance so no network access is needed.
+"""
+
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+
+from market_data.data_fetcher import MarketDataFetcher, FetchResult
+from market_data.strategy_engine import FetchStrategyEngine
+
+
+def _ohlcv(closes):
+    """Build a small OHLCV frame with a tz-naive daily index."""
+    index = pd.date_range("2024-01-02", periods=len(closes), freq="D")
+    return pd.DataFrame({
+        'Open': closes,
+        'High': closes,
+        'Low': closes,
+        'Close': closes,
+        'Volume': [1000] * len(closes),
+    }, index=index)
+
+
+class TestFetchPriceDataBatch(unittest.TestCase):
+    """Test suite for MarketDataFetcher.fetch_price_data_batch."""
+
+    def setUp(self):
+        """Set up a fetcher with no cache and no CSV side effects."""
+        self.fetcher = MarketDataFetcher(strategy_engine=FetchStrategyEngine())
+        self.fetcher._portfolio_currency_cache = {}
+        self.fetcher._fundamentals_overrides = {}
+        self.start = datetime(2024, 1, 1)
+        self.end = datetime(2024, 1, 10)
+        patcher = patch.object(self.fetcher, '_normalize_ticker_in_csvs')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_single_bulk_request_for_all_tickers(self):
+        """All primary Yahoo tickers should be requested in one download."""
+        bulk = pd.concat(
+            {'AAPL': _ohlcv([100.0, 101.0]), 'MSFT': _ohlcv([200.0, 201.0])},
+            axis=1
+        )
+        with patch('yfinance.download', return_value=bulk) as mock_download, \
+             patch.object(self.fetcher, '_fetch_yahoo_data') as mock_single:
+            results = self.fetcher.fetch_price_data_batch(['AAPL', 'MSFT', 'AAPL'], self.start, self.end)
+
+        mock_download.assert_called_once()
+        self.assertEqual(sorted(mock_download.call_args[0][0]), ['AAPL', 'MSFT'])
+        mock_single.assert_not_called()
+        self.assertEqual(set(results.keys()), {'AAPL', 'MSFT'})
+        self.assertEqual(float(results['MSFT'].df['Close'].iloc[-1]), 201.0)
+        self.assertEqual(results['AAPL'].source, "yahoo (yahoo)")
+
+    def test_empty_tickers_fall_back_to_per_ticker_chain(self):
+        """Tickers missing from the bulk result should run the remaining strategies."""
+        bulk = pd.concat({'AAPL': _ohlcv([100.0])}, axis=1)
+        stooq_df = self.fetcher._normalize_ohlcv(_ohlcv([50.0]))
+        with patch('yfinance.download', return_value=bulk), \
+             patch.object(self.fetcher, '_fetch_yahoo_data') as mock_single, \
+             patch.object(self.fetcher, '_fetch_stooq_pdr',
+                          return_value=FetchResult(stooq_df, "stooq-pdr")) as mock_stooq:
+            results = self.fetcher.fetch_price_data_batch(['AAPL', 'XYZ'], self.start, self.end)
+
+        # The plain Yahoo strategy was already covered by the bulk request
+        self.assertNotIn('XYZ', [c.args[0] for c in mock_single.call_args_list])
+        mock_stooq.assert_called_once()
+        self.assertEqual(results['XYZ'].source, "stooq-pdr (stooq-pdr)")
+        self.assertFalse(results['AAPL'].df.empty)
+
+    def test_canadian_ticker_uses_to_suffix_in_bulk(self):
+        """Likely Canadian tickers without a suffix should be requested as .TO."""
+        self.fetcher._portfolio_currency_cache = {'CGL': 'CAD'}
+        bulk = pd.concat({'CGL.TO': _ohlcv([12.0])}, axis=1)
+        with patch('yfinance.download', return_value=bulk) as mock_download:
+            results = self.fetcher.fetch_price_data_batch(['CGL'], self.start, self.end)
+
+        self.assertEqual(mock_download.call_args[0][0], ['CGL.TO'])
+        self.assertEqual(results['CGL'].source, "yahoo (yahoo-ca-to)")
+
+    def test_cache_hits_skip_download(self):
+        """Cached tickers should not be included in the bulk request."""
+        class _Cache:
+            def get_cached_price(self, ticker, start=None, end=None):
+                return _ohlcv([1.0]) if ticker == 'AAPL' else None
+
+            def cache_price_data(self, ticker, df, source):
+                pass
+
+        self.fetcher.cache = _Cache()
+        bulk = pd.concat({'MSFT': _ohlcv([200.0])}, axis=1)
+        with patch('yfinance.download', return_value=bulk) as mock_download:
+            results = self.fetcher.fetch_price_data_batch(['AAPL', 'MSFT'], self.start, self.end)
+
+        self.assertEqual(mock_download.call_args[0][0], ['MSFT'])
+        self.assertEqual(results['AAPL'].source, "cache")
+
+    def test_open_yahoo_breaker_skips_bulk_download(self):
+        """An open Yahoo breaker should skip the bulk request and the Yahoo strategies."""
+        self.fetcher.strategy_engine = FetchStrategyEngine(min_calls=1)
+        self.fetcher.strategy_engine.get_breaker("yahoo").record_failure()
+        stooq_df = self.fetcher._normalize_ohlcv(_ohlcv([50.0]))
+        with patch('yfinance.download') as mock_download, \
+             patch.object(self.fetcher, '_fetch_stooq_pdr',
+                          return_value=FetchResult(stooq_df, "stooq-pdr")):
+            results = self.fetcher.fetch_price_data_batch(['AAPL'], self.start, self.end)
+
+        mock_download.assert_not_called()
+        self.assertEqual(results['AAPL'].source, "stooq-pdr (stooq-pdr)")
+
+    def test_bulk_failure_is_recorded_on_yahoo_breaker(self):
+        """A failed bulk request should count against Yahoo and fall back per ticker."""
+        stooq_df = self.fetcher._normalize_ohlcv(_ohlcv([50.0]))
+        with patch('yfinance.download', side_effect=RuntimeError("rate limited")), \
+             patch.object(self.fetcher, '_fetch_yahoo_data') as mock_single, \
+             patch.object(self.fetcher, '_fetch_stooq_pdr',
+                          return_value=FetchResult(stooq_df, "stooq-pdr")):
+            results = self.fetcher.fetch_price_data_batch(['AAPL'], self.start, self.end)
+
+        mock_single.assert_not_called()
+        self.assertEqual(results['AAPL'].source, "stooq-pdr (stooq-pdr)")
+        yahoo = self.fetcher.get_strategy_stats()['sources']['yahoo']
+        self.assertEqual((yahoo['attempts'], yahoo['failures']), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
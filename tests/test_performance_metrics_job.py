@@ -0,0 +1,147 @@
+"""Tests for the bulk performance_metrics aggregation and its job tracking."""
+
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'web_dashboard'))
+
+from scheduler import jobs_metrics
+
+
+class _Series:
+    """Stand-in ExchangeRateSeries answering from a day -> rate dict (NaN when missing)."""
+
+    def __init__(self, rates):
+        self.rates = rates
+
+    def rates_on(self, stamps):
+        return np.array([self.rates.get(stamp.date().isoformat(), np.nan) for stamp in stamps])
+
+
+def _positions(rows):
+    return pd.DataFrame(rows, columns=['fund', 'ticker', 'total_value', 'cost_basis', 'pnl', 'currency', 'date'])
+
+
+class TestAggregatePerformanceMetrics(unittest.TestCase):
+
+    def _aggregate(self, positions, rates):
+        with patch('exchange_rates_utils.get_exchange_rate_series', return_value=_Series(rates)):
+            return jobs_metrics._aggregate_performance_metrics(positions)
+
+    def test_usd_positions_are_converted_at_their_day_rate(self):
+        positions = _positions([
+            ('F', 'AAA', 100.0, 80.0, 20.0, 'USD', '2025-01-02T21:00:00+00:00'),
+            ('F', 'BBB', 50.0, 50.0, 0.0, 'CAD', '2025-01-02T21:00:00+00:00'),
+            ('F', 'AAA', 100.0, 80.0, 20.0, 'usd', '2025-01-03T21:00:00+00:00'),
+        ])
+        metrics = self._aggregate(positions, {'2025-01-02': 1.4, '2025-01-03': 1.5})
+
+        self.assertEqual(metrics['date'].tolist(), ['2025-01-02', '2025-01-03'])
+        self.assertEqual(metrics['total_value'].tolist(), [190.0, 150.0])
+        self.assertEqual(metrics['cost_basis'].tolist(), [162.0, 120.0])
+        self.assertEqual(metrics['unrealized_pnl'].tolist(), [28.0, 30.0])
+        self.assertEqual(metrics['total_trades'].tolist(), [2, 1])
+        self.assertEqual(metrics['performance_pct'].tolist(), [17.28, 25.0])
+
+    def test_missing_rate_falls_back_to_1_35(self):
+        positions = _positions([('F', 'AAA', 100.0, 100.0, 0.0, 'USD', '2025-01-02T21:00:00+00:00')])
+        metrics = self._aggregate(positions, {})
+        self.assertAlmostEqual(metrics['total_value'].iloc[0], 135.0)
+
+    def test_invalid_currency_is_summed_as_cad(self):
+        positions = _positions([('F', 'AAA', 10.0, 10.0, 0.0, 'nan', '2025-01-02T21:00:00+00:00')])
+        series = MagicMock()
+        with patch('exchange_rates_utils.get_exchange_rate_series', return_value=series):
+            metrics = jobs_metrics._aggregate_performance_metrics(positions)
+        self.assertEqual(metrics['total_value'].tolist(), [10.0])
+        series.rates_on.assert_not_called()
+
+
+class TestProcessPerformanceMetricsForRange(unittest.TestCase):
+
+    def setUp(self):
+        positions = _positions([
+            ('F', 'AAA', 10.0, 10.0, 0.0, 'CAD', '2025-01-02T21:00:00+00:00'),
+            ('G', 'AAA', 20.0, 10.0, 10.0, 'CAD', '2025-01-02T21:00:00+00:00'),
+            ('F', 'AAA', 30.0, 10.0, 20.0, 'CAD', '2025-01-03T21:00:00+00:00'),
+        ])
+        for patcher in (
+            patch.object(jobs_metrics, '_load_positions_for_range', return_value=positions),
+            patch.object(jobs_metrics, '_load_existing_metric_keys', return_value={('G', '2025-01-02')}),
+            patch('exchange_rates_utils.get_exchange_rate_series', return_value=_Series({})),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = MagicMock()
+
+    def _upserted(self):
+        return [row for c in self.client.supabase.table.return_value.upsert.call_args_list for row in c.args[0]]
+
+    def test_upserts_every_fund_and_day(self):
+        inserted, skipped, funds_by_date = jobs_metrics._process_performance_metrics_for_range(
+            self.client, date(2025, 1, 2), date(2025, 1, 3))
+
+        self.assertEqual((inserted, skipped), (3, 0))
+        self.assertEqual(funds_by_date, {'2025-01-02': ['F', 'G'], '2025-01-03': ['F']})
+        self.assertEqual([(r['fund'], r['date']) for r in self._upserted()],
+                         [('F', '2025-01-02'), ('F', '2025-01-03'), ('G', '2025-01-02')])
+
+    def test_skip_existing_leaves_stored_rows_alone(self):
+        inserted, skipped, funds_by_date = jobs_metrics._process_performance_metrics_for_range(
+            self.client, date(2025, 1, 2), date(2025, 1, 3), skip_existing=True)
+
+        self.assertEqual((inserted, skipped), (2, 1))
+        self.assertNotIn(('G', '2025-01-02'), [(r['fund'], r['date']) for r in self._upserted()])
+        # Skipped rows still count as days with data
+        self.assertEqual(funds_by_date['2025-01-02'], ['F', 'G'])
+
+
+class TestPopulatePerformanceMetricsJob(unittest.TestCase):
+
+    def setUp(self):
+        self.started, self.completed, self.failed = MagicMock(), MagicMock(), MagicMock()
+        for patcher in (
+            patch('utils.job_tracking.mark_job_started', self.started),
+            patch('utils.job_tracking.mark_job_completed', self.completed),
+            patch('utils.job_tracking.mark_job_failed', self.failed),
+            patch('supabase_client.get_shared_client', return_value=MagicMock()),
+            patch.object(jobs_metrics, 'log_job_execution'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_range_marks_every_date(self):
+        result = (2, 0, {'2025-01-02': ['F'], '2025-01-03': ['F']})
+        with patch.object(jobs_metrics, '_process_performance_metrics_for_range', return_value=result) as process:
+            jobs_metrics.populate_performance_metrics_job(from_date=date(2025, 1, 2), to_date=date(2025, 1, 4))
+
+        process.assert_called_once()
+        days = [date(2025, 1, 2), date(2025, 1, 3), date(2025, 1, 4)]
+        self.assertEqual([c.args[1] for c in self.started.call_args_list], days)
+        self.assertEqual([(c.args[1], c.args[3]) for c in self.completed.call_args_list],
+                         [(days[0], ['F']), (days[1], ['F']), (days[2], [])])
+        self.failed.assert_not_called()
+
+    def test_failed_range_falls_back_to_single_dates(self):
+        """Only the date that fails on its own is marked failed; the others complete."""
+        def process(client, start, end, fund_filter, skip_existing):
+            if start != end or start == date(2025, 1, 3):
+                raise RuntimeError("bad rows")
+            return (1, 0, {start.isoformat(): ['F']})
+
+        with patch.object(jobs_metrics, '_process_performance_metrics_for_range', side_effect=process):
+            jobs_metrics.populate_performance_metrics_job(from_date=date(2025, 1, 2), to_date=date(2025, 1, 4))
+
+        self.failed.assert_called_once_with('performance_metrics', date(2025, 1, 3), None, 'bad rows', 0)
+        self.assertEqual([c.args[1] for c in self.completed.call_args_list], [date(2025, 1, 2), date(2025, 1, 4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for plotly_utils figure serialization (typed arrays, NaN, datetimes)."""
+
+import dataclasses
+import decimal
+import json
+import os
+import sys
+import unittest
+import uuid
+from datetime import date
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import plotly_utils
+from plotly_utils import dumps_json, figure_to_dict, serialize_plotly_figure
+
+
+def _figure():
+    dates = pd.date_range('2024-01-01', periods=3)
+    return go.Figure([
+        go.Scatter(x=dates, y=np.array([100.5, np.nan, 102.0])),
+        go.Bar(x=['A', 'B', 'C'], y=np.array([1, 300, -2], dtype=np.int16)),
+    ])
+
+
+class TestPlotlySerialization(unittest.TestCase):
+
+    def _check(self, chart):
+        scatter, bar = chart['data']
+        self.assertEqual(scatter['y'], [100.5, None, 102.0])
+        self.assertTrue(scatter['x'][0].startswith('2024-01-01'))
+        self.assertEqual(bar['y'], [1, 300, -2])
+
+    def test_arrays_become_plain_lists(self):
+        self._check(json.loads(serialize_plotly_figure(_figure())))
+        self._check(figure_to_dict(_figure()))
+
+    def test_stdlib_fallback_matches(self):
+        with patch.object(plotly_utils, 'ORJSON_AVAILABLE', False):
+            self._check(json.loads(serialize_plotly_figure(_figure())))
+
+    def test_dumps_json_handles_numpy_and_pandas_scalars(self):
+        payload = {'value': np.float64(1.5), 'count': np.int64(3), 'when': pd.Timestamp('2024-01-02')}
+        decoded = json.loads(dumps_json(payload))
+        self.assertEqual(decoded['value'], 1.5)
+        self.assertEqual(decoded['count'], 3)
+        self.assertTrue(decoded['when'].startswith('2024-01-02'))
+
+    def test_dumps_json_handles_flask_provider_types(self):
+        @dataclasses.dataclass
+        class Point:
+            x: int
+            y: str
+
+        key = uuid.UUID('12345678-1234-5678-1234-567812345678')
+        payload = {'price': decimal.Decimal('12.50'), 'missing': pd.NA, 'id': key,
+                   'point': Point(1, 'a'), 'day': date(2024, 1, 2)}
+        for orjson_available in (plotly_utils.ORJSON_AVAILABLE, False):
+            with patch.object(plotly_utils, 'ORJSON_AVAILABLE', orjson_available):
+                decoded = json.loads(dumps_json(payload))
+            self.assertEqual(decoded, {'price': '12.50', 'missing': None, 'id': str(key),
+                                       'point': {'x': 1, 'y': 'a'}, 'day': '2024-01-02'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""Tests for the research database connection pool and streaming reads."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import psycopg2
+from psycopg2 import extensions
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import postgres_client as pc
+
+
+class _Cursor:
+    def __init__(self, conn, name=None):
+        self.conn = conn
+        self.name = name
+        self.itersize = 2000
+        self.fetch_sizes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.conn.executed.append(query)
+        self._rows = [{'id': i} for i in range(self.conn.row_count)]
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        return batch
+
+    def close(self):
+        pass
+
+
+class _Connection:
+    """Just enough of a psycopg2 connection for the pool."""
+
+    def __init__(self, row_count=0):
+        self.closed = 0
+        self.broken = False
+        self.row_count = row_count
+        self.executed = []
+        self.cursors = []
+        self.info = self
+
+    @property
+    def transaction_status(self):
+        return extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self, name=None, cursor_factory=None):
+        cursor = _Cursor(self, name)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class TestBlockingConnectionPool(unittest.TestCase):
+    """Checkouts wait for a free connection and skip dead ones."""
+
+    def setUp(self):
+        self.connections = []
+
+        def connect(*args, **kwargs):
+            conn = _Connection(row_count=5)
+            self.connections.append(conn)
+            return conn
+
+        patcher = patch.object(psycopg2, 'connect', side_effect=connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_exhausted_pool_waits_instead_of_raising(self):
+        connection_pool = pc._BlockingConnectionPool(1, 1, 'postgresql://x', timeout=5)
+        first = connection_pool.getconn()
+        acquired = []
+
+        waiter = threading.Thread(target=lambda: acquired.append(connection_pool.getconn()))
+        waiter.start()
+        time.sleep(0.05)
+        self.assertEqual(acquired, [])
+
+        connection_pool.putconn(first)
+        waiter.join(timeout=5)
+        self.assertEqual(acquired, [first])
+
+    def test_exhausted_pool_times_out(self):
+        connection_pool = pc._BlockingConnectionPool(1, 1, 'postgresql://x', timeout=0.05)
+        connection_pool.getconn()
+        with self.assertRaises(psycopg2.pool.PoolError):
+            connection_pool.getconn()
+
+    def test_dead_connection_is_replaced(self):
+        connection_pool = pc._BlockingConnectionPool(1, 2, 'postgresql://x')
+        stale = connection_pool.getconn()
+        connection_pool.putconn(stale)
+        stale.broken = True
+        connection_pool._last_used[id(stale)] = time.monotonic() - pc.HEALTH_CHECK_IDLE_SECONDS - 1
+
+        fresh = connection_pool.getconn()
+        self.assertIsNot(fresh, stale)
+        self.assertTrue(stale.closed)
+
+    def test_recently_used_connection_is_not_pinged(self):
+        connection_pool = pc._BlockingConnectionPool(1, 2, 'postgresql://x')
+        conn = connection_pool.getconn()
+        connection_pool.putconn(conn)
+        pings = len(conn.executed)
+
+        self.assertIs(connection_pool.getconn(), conn)
+        self.assertEqual(len(conn.executed), pings)
+
+
+class TestIterQuery(unittest.TestCase):
+    """iter_query streams rows through a named (server-side) cursor."""
+
+    def setUp(self):
+        self.conn = _Connection(row_count=5)
+        patcher = patch.object(psycopg2, 'connect', return_value=self.conn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = pc.PostgresClient('postgresql://iter-test', workload='test')
+        self.addCleanup(self.client.close_pool)
+
+    def test_rows_are_fetched_in_batches(self):
+        rows = list(self.client.iter_query("SELECT id FROM research_articles", batch_size=2))
+
+        self.assertEqual(rows, [{'id': i} for i in range(5)])
+        cursor = next(c for c in self.conn.cursors if c.name)
+        self.assertTrue(cursor.name.startswith('iter_'))
+        self.assertEqual(cursor.fetch_sizes, [2, 2, 2, 2])
+
+    def test_connection_is_returned_when_iteration_stops_early(self):
+        rows = self.client.iter_query("SELECT id FROM research_articles", batch_size=2)
+        next(rows)
+        rows.close()
+
+        connection_pool = pc.PostgresClient._pools[('postgresql://iter-test', 'test')]
+        self.assertEqual(connection_pool._used, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
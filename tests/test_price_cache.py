@@ -0,0 +1,213 @@
+"""Unit tests for PriceCache LRU/memory-budget behaviour and the on-disk PriceStore."""
+
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import Mock
+
+import pandas as pd
+
+from market_data.price_cache import PriceCache
+from market_data.price_store import PriceStore
+
+
+def _prices(days=10, start="2024-01-01"):
+    index = pd.date_range(start, periods=days, freq="D")
+    return pd.DataFrame({'Close': [float(i) for i in range(days)], 'Volume': [100] * days}, index=index)
+
+
+class TestPriceCache(unittest.TestCase):
+    """Test suite for PriceCache."""
+
+    def setUp(self):
+        """Point the cache at an empty temp directory so no persisted data loads."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.settings = Mock()
+        self.settings.get_data_directory.return_value = self.tmp.name
+        self.settings.get.side_effect = lambda key, default=None: default
+
+    def test_lru_eviction_by_entry_count(self):
+        """The least recently used ticker is evicted once max_cache_size is exceeded."""
+        cache = PriceCache(settings=self.settings, max_cache_size=2)
+        cache.cache_price_data('AAA', _prices())
+        cache.cache_price_data('BBB', _prices())
+        cache.get_cached_price('AAA')  # AAA becomes most recently used
+        cache.cache_price_data('CCC', _prices())
+
+        self.assertEqual(list(cache._cache.keys()), ['AAA', 'CCC'])
+
+    def test_eviction_by_memory_budget(self):
+        """Entries are evicted when the total footprint exceeds max_cache_bytes."""
+        one_entry = PriceCache(settings=self.settings)
+        one_entry.cache_price_data('AAA', _prices(100))
+        entry_bytes = one_entry.get_cache_stats()['total_bytes']
+
+        cache = PriceCache(settings=self.settings, max_cache_bytes=int(entry_bytes * 2.5))
+        for ticker in ['AAA', 'BBB', 'CCC', 'DDD']:
+            cache.cache_price_data(ticker, _prices(100))
+
+        stats = cache.get_cache_stats()
+        self.assertEqual(stats['total_entries'], 2)
+        self.assertLessEqual(stats['total_bytes'], stats['max_cache_bytes'])
+        self.assertEqual(list(cache._cache.keys()), ['CCC', 'DDD'])
+
+    def test_replacing_entry_keeps_byte_total_consistent(self):
+        """Re-caching a ticker replaces its byte count instead of adding to it."""
+        cache = PriceCache(settings=self.settings)
+        cache.cache_price_data('AAA', _prices(50))
+        first = cache.get_cache_stats()['total_bytes']
+        cache.cache_price_data('AAA', _prices(50))
+        self.assertEqual(cache.get_cache_stats()['total_bytes'], first)
+        cache.invalidate_ticker('AAA')
+        self.assertEqual(cache.get_cache_stats()['total_bytes'], 0)
+
+    def test_date_range_slice_is_inclusive(self):
+        """Date filters include both bounds, like the previous boolean-mask filter."""
+        cache = PriceCache(settings=self.settings)
+        cache.cache_price_data('AAA', _prices(10).iloc[::-1])  # unsorted input
+        df = cache.get_cached_price('AAA', datetime(2024, 1, 3), datetime(2024, 1, 5))
+        self.assertEqual(list(df['Close']), [2.0, 3.0, 4.0])
+        self.assertIsNone(cache.get_cached_price('AAA', datetime(2025, 1, 1)))
+
+    def test_returned_frame_is_a_copy(self):
+        """Callers editing a cache hit must not change the cached data."""
+        cache = PriceCache(settings=self.settings)
+        cache.cache_price_data('AAA', _prices())
+        for df in (cache.get_cached_price('AAA'), cache.get_cached_price('AAA', datetime(2024, 1, 3))):
+            df['Close'] = -1.0
+            df['Extra'] = 1
+        cached = cache.get_cached_price('AAA')
+        self.assertNotIn('Extra', cached.columns)
+        self.assertEqual(list(cached['Close']), [float(i) for i in range(10)])
+
+    def test_tz_aware_index_with_naive_bounds(self):
+        """Naive bounds are localized to a timezone-aware cached index."""
+        cache = PriceCache(settings=self.settings)
+        data = _prices(5)
+        data.index = data.index.tz_localize('America/New_York')
+        cache.cache_price_data('AAA', data)
+        df = cache.get_cached_price('AAA', datetime(2024, 1, 2), datetime(2024, 1, 3))
+        self.assertEqual(len(df), 2)
+
+    def test_persistent_cache_loads_lazily_per_ticker(self):
+        """A new cache reads nothing at startup and loads a ticker only when asked for."""
+        cache = PriceCache(settings=self.settings, default_ttl_minutes=60)
+        cache.cache_price_data('AAA', _prices())
+        cache.cache_price_data('BBB', _prices())
+        cache.save_persistent_cache()
+
+        reloaded = PriceCache(settings=self.settings, default_ttl_minutes=60)
+        self.assertEqual(len(reloaded._cache), 0)
+        df = reloaded.get_cached_price('AAA')
+        self.assertEqual(list(df['Close']), list(_prices()['Close']))
+        self.assertEqual(list(reloaded._cache.keys()), ['AAA'])
+
+    def test_failed_ticker_write_does_not_skip_the_rest(self):
+        """One ticker failing to save leaves only that ticker dirty; others and name caches are saved."""
+        cache = PriceCache(settings=self.settings, default_ttl_minutes=60)
+        for ticker in ('AAA', 'BBB', 'CCC'):
+            cache.cache_price_data(ticker, _prices())
+        cache._company_name_cache['AAA'] = 'Triple A Corp'
+
+        write = cache._store.write
+        def failing_write(ticker, *args):
+            if ticker == 'BBB':
+                raise OSError("disk full")
+            return write(ticker, *args)
+        cache._store.write = failing_write
+        cache.save_persistent_cache()
+
+        self.assertEqual(cache._dirty, {'BBB'})
+        reloaded = PriceCache(settings=self.settings, default_ttl_minutes=60)
+        self.assertIsNotNone(reloaded.get_cached_price('CCC'))
+        self.assertIsNone(reloaded.get_cached_price('BBB'))
+        self.assertEqual(reloaded._company_name_cache.get('AAA'), 'Triple A Corp')
+
+    def test_expired_store_entries_are_ignored(self):
+        """Stored entries past their TTL are treated as misses."""
+        cache = PriceCache(settings=self.settings, default_ttl_minutes=1)
+        cache.cache_price_data('AAA', _prices())
+        cache._cache['AAA'].timestamp = datetime(2020, 1, 1)
+        cache.save_persistent_cache()
+
+        reloaded = PriceCache(settings=self.settings)
+        self.assertIsNone(reloaded.get_cached_price('AAA'))
+
+    def test_evicted_unsaved_entries_spill_to_store(self):
+        """Evicting an unsaved entry persists it so a later miss can reload it."""
+        cache = PriceCache(settings=self.settings, max_cache_size=1, default_ttl_minutes=60)
+        cache.cache_price_data('AAA', _prices())
+        cache.cache_price_data('BBB', _prices())
+        self.assertEqual(list(cache._cache.keys()), ['BBB'])
+        self.assertIsNotNone(cache.get_cached_price('AAA'))
+
+    def test_invalidate_ticker_removes_stored_copy(self):
+        """Invalidating a ticker also drops its persisted data."""
+        cache = PriceCache(settings=self.settings, default_ttl_minutes=60)
+        cache.cache_price_data('AAA', _prices())
+        cache.save_persistent_cache()
+        cache.invalidate_ticker('AAA')
+        self.assertIsNone(PriceCache(settings=self.settings).get_cached_price('AAA'))
+
+
+class TestPriceStore(unittest.TestCase):
+    """Test suite for the per-ticker Parquet PriceStore."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = PriceStore(Path(self.tmp.name), max_parts=3)
+        self.ts = datetime(2024, 6, 1)
+        self.ttl = timedelta(minutes=15)
+
+    def _part_files(self, ticker):
+        return sorted(p["file"] for p in self.store.load_meta(ticker)["parts"])
+
+    def test_append_keeps_older_parts_untouched(self):
+        """New bars after the stored range are written as a new part."""
+        self.store.write('AAA', _prices(10, "2024-01-01"), "yahoo", self.ts, self.ttl)
+        first_parts = self._part_files('AAA')
+        self.store.write('AAA', _prices(5, "2024-01-11"), "yahoo", self.ts, self.ttl)
+
+        parts = self._part_files('AAA')
+        self.assertEqual(len(parts), 2)
+        self.assertTrue(set(first_parts).issubset(parts))
+        df, _ = self.store.load('AAA')
+        self.assertEqual(len(df), 15)
+
+    def test_overlapping_bars_replace_only_affected_rows(self):
+        """Re-writing recent bars replaces those dates and keeps older rows."""
+        self.store.write('AAA', _prices(10, "2024-01-01"), "yahoo", self.ts, self.ttl)
+        update = pd.DataFrame({'Close': [99.0], 'Volume': [5]}, index=pd.DatetimeIndex(["2024-01-10"]))
+        self.store.write('AAA', update, "yahoo", self.ts, self.ttl)
+
+        df, _ = self.store.load('AAA')
+        self.assertEqual(len(df), 10)
+        self.assertEqual(df['Close'].iloc[-1], 99.0)
+        self.assertEqual(df['Close'].iloc[0], 0.0)
+
+    def test_parts_are_compacted(self):
+        """Once a ticker has more than max_parts parts they are merged into one."""
+        for i in range(4):
+            self.store.write('AAA', _prices(2, f"2024-01-{1 + i * 2:02d}"), "yahoo", self.ts, self.ttl)
+        self.assertEqual(len(self._part_files('AAA')), 1)
+        self.assertEqual(len(self.store.load('AAA')[0]), 8)
+        on_disk = [p.name for p in (Path(self.tmp.name) / 'AAA').glob('*.parquet')]
+        self.assertEqual(len(on_disk), 1)
+
+    def test_decimal_prices_round_trip(self):
+        """Decimal price columns come back as Decimals."""
+        data = pd.DataFrame(
+            {'Close': [Decimal('1.5'), Decimal('123.123456')], 'Volume': [1, 2]},
+            index=pd.date_range("2024-01-01", periods=2, tz="America/New_York")
+        )
+        self.store.write('XMA.TO', data, "yahoo", self.ts, self.ttl)
+        df, meta = self.store.load('XMA.TO')
+        self.assertEqual(df['Close'].iloc[1], Decimal('123.123456'))
+        self.assertEqual(meta['source'], "yahoo")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Tests for ResearchRepository.search_similar_articles query shape and caching."""
+
+import os
+import sys
+import unittest
+from contextlib import contextmanager
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from research_repository import ResearchRepository
+
+
+class _Cursor:
+    def __init__(self, client):
+        self.client = client
+
+    def execute(self, query, params=None):
+        self.last_query = query
+        self.client.executed.append((" ".join(query.split()), params))
+
+    def fetchall(self):
+        return self.client.search_rows
+
+    def fetchone(self):
+        if 'pg_try_advisory_lock' in self.last_query:
+            return (self.client.lock_free,)
+        if 'pg_index' in self.last_query and self.client.index_rows:
+            return (self.client.index_rows[0]['indisvalid'],)
+        return None
+
+
+class _Connection:
+    def __init__(self, client):
+        self.client = client
+        self.autocommit = False
+
+    def cursor(self, cursor_factory=None):
+        return _Cursor(self.client)
+
+
+class _FakePostgres:
+    """Records queries; answers the repository's metadata lookups."""
+
+    def __init__(self, securities=None, search_rows=None, index_rows=None, lock_free=True):
+        self.securities = securities or {}
+        self.search_rows = search_rows or []
+        self.index_rows = index_rows or []
+        self.lock_free = lock_free
+        self.executed = []
+
+    def execute_query(self, query, params=None):
+        self.executed.append((" ".join(query.split()), params))
+        if 'information_schema.columns' in query:
+            return [{'column_name': 'tickers'}]
+        if 'FROM securities' in query:
+            row = self.securities.get(params[0])
+            return [row] if row else []
+        if 'pg_index' in query:
+            return self.index_rows
+        return []
+
+    @contextmanager
+    def get_connection(self):
+        yield _Connection(self)
+
+
+class TestSearchSimilarArticles(unittest.TestCase):
+    """Nearest neighbours are found by distance order; the threshold is applied afterwards."""
+
+    def setUp(self):
+        patcher = patch.multiple(ResearchRepository, _etf_sector_cache={}, _embedding_index_checked=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _search_queries(self, client):
+        return [q for q, _ in client.executed if 'FROM research_articles' in q and 'nearest' in q]
+
+    def test_query_orders_by_distance_and_filters_after_limit(self):
+        client = _FakePostgres(search_rows=[
+            {'id': 1, 'tickers': ['NVDA'], 'title': 't', 'distance': 0.1, 'similarity': 0.9, 'has_embedding': True},
+        ])
+        repo = ResearchRepository(postgres_client=client)
+
+        results = repo.search_similar_articles([0.1, 0.2], limit=7, min_similarity=0.6)
+
+        [query] = self._search_queries(client)
+        self.assertEqual(query.count('<=>'), 1)
+        self.assertIn('ORDER BY distance LIMIT %s', query)
+        self.assertIn('WHERE nearest.distance <= %s', query)
+        params = next(p for q, p in client.executed if q == query)
+        self.assertEqual(params[-2:], (7, 1 - 0.6))
+        self.assertNotIn('distance', results[0])
+        self.assertEqual(results[0]['similarity'], 0.9)
+
+    def test_etf_lookup_is_cached_between_searches(self):
+        client = _FakePostgres(securities={'XLK': {'sector': 'Technology', 'company_name': 'Tech Select ETF'}})
+        repo = ResearchRepository(postgres_client=client)
+
+        repo.search_similar_articles([0.1], ticker='XLK')
+        repo.search_similar_articles([0.1], ticker='XLK')
+
+        lookups = [q for q, _ in client.executed if 'FROM securities' in q]
+        self.assertEqual(len(lookups), 1)
+        for query in self._search_queries(client):
+            self.assertIn('sector = %s', query)
+
+    def test_filtered_search_widens_hnsw_candidates(self):
+        client = _FakePostgres()
+        repo = ResearchRepository(postgres_client=client)
+
+        repo.search_similar_articles([0.1], article_type='Market News')
+
+        settings = [p for q, p in client.executed if q.startswith('SET LOCAL hnsw.ef_search')]
+        self.assertEqual(settings, [(400,)])
+
+    def test_index_is_created_concurrently_when_missing(self):
+        client = _FakePostgres()
+        repo = ResearchRepository(postgres_client=client)
+
+        self.assertTrue(repo.ensure_embedding_index())
+        self.assertTrue(any('CREATE INDEX CONCURRENTLY' in q and 'hnsw' in q for q, _ in client.executed))
+        self.assertFalse(any(q.startswith('DROP INDEX') for q, _ in client.executed))
+
+    def test_valid_index_is_left_alone(self):
+        client = _FakePostgres(index_rows=[{'indisvalid': True}])
+        repo = ResearchRepository(postgres_client=client)
+
+        self.assertTrue(repo.ensure_embedding_index())
+        self.assertFalse(any('INDEX CONCURRENTLY' in q for q, _ in client.executed))
+
+    def test_invalid_index_is_dropped_and_rebuilt(self):
+        client = _FakePostgres(index_rows=[{'indisvalid': False}])
+        repo = ResearchRepository(postgres_client=client)
+
+        self.assertTrue(repo.ensure_embedding_index())
+        ddl = [q for q, _ in client.executed if 'INDEX CONCURRENTLY' in q]
+        self.assertEqual(len(ddl), 2)
+        self.assertTrue(ddl[0].startswith('DROP INDEX CONCURRENTLY IF EXISTS idx_research_articles_embedding_hnsw'))
+        self.assertTrue(ddl[1].startswith('CREATE INDEX CONCURRENTLY'))
+        self.assertTrue(client.executed[-1][0].startswith('SELECT pg_advisory_unlock'))
+
+    def test_build_in_another_process_is_left_alone(self):
+        # An in-progress CREATE INDEX CONCURRENTLY is also reported INVALID
+        client = _FakePostgres(index_rows=[{'indisvalid': False}], lock_free=False)
+        repo = ResearchRepository(postgres_client=client)
+
+        self.assertFalse(repo.ensure_embedding_index())
+        self.assertFalse(any('INDEX CONCURRENTLY' in q for q, _ in client.executed))
+        self.assertFalse(any('pg_advisory_unlock' in q for q, _ in client.executed))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Unit tests for the fetch strategy engine and per-source circuit breakers."""
+
+import threading
+import time
+import unittest
+
+import pandas as pd
+
+from market_data.data_fetcher import FetchResult
+from market_data.strategy_engine import (
+    CLOSED, HALF_OPEN, OPEN, FetchStrategyEngine, SourceCircuitBreaker
+)
+
+
+def _data():
+    return FetchResult(pd.DataFrame({'Close': [1.0]}), "stub")
+
+
+def _empty():
+    return FetchResult(pd.DataFrame(), "empty")
+
+
+def _error():
+    return FetchResult(pd.DataFrame(), "error")
+
+
+class TestSourceCircuitBreaker(unittest.TestCase):
+    """Test suite for SourceCircuitBreaker state transitions."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = SourceCircuitBreaker(
+            "yahoo", failure_threshold=0.5, min_calls=4, cooldown_seconds=30,
+            clock=lambda: self.now
+        )
+
+    def test_opens_after_failure_rate_crosses_threshold(self):
+        """Breaker stays closed until min_calls outcomes, then opens on high failure rate."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_half_open_probe_closes_on_success(self):
+        """After the cooldown only one probe is allowed; success closes the breaker."""
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.now = 31.0
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_probe_failure_reopens(self):
+        """A failed probe re-opens the breaker for another cooldown."""
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.now = 31.0
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.times_opened, 2)
+
+
+class TestFetchStrategyEngine(unittest.TestCase):
+    """Test suite for FetchStrategyEngine."""
+
+    def test_serial_chain_returns_first_data(self):
+        """Strategies run in order until one returns data."""
+        engine = FetchStrategyEngine()
+        calls = []
+        strategies = [
+            ("yahoo", lambda: calls.append("yahoo") or _empty()),
+            ("stooq-pdr", lambda: calls.append("stooq-pdr") or _data()),
+            ("stooq-csv", lambda: calls.append("stooq-csv") or _data()),
+        ]
+        winner, failed, skipped = engine.run("AAA", strategies)
+        self.assertEqual(winner[0], "stooq-pdr")
+        self.assertEqual(calls, ["yahoo", "stooq-pdr"])
+        self.assertEqual((failed, skipped), ([], []))
+
+    def test_degraded_source_is_skipped_across_tickers(self):
+        """Once Yahoo errors enough, later tickers skip every Yahoo strategy."""
+        engine = FetchStrategyEngine(min_calls=3, failure_threshold=0.5)
+        yahoo_calls = []
+
+        def yahoo():
+            yahoo_calls.append(1)
+            return _error()
+
+        strategies = [("yahoo", yahoo), ("stooq-csv", _data), ("yahoo-retry-simple", yahoo)]
+        for ticker in ["A", "B", "C"]:
+            engine.run(ticker, strategies)
+        self.assertEqual(len(yahoo_calls), 3)
+
+        winner, _, skipped = engine.run("D", strategies)
+        self.assertEqual(winner[0], "stooq-csv")
+        self.assertEqual(skipped, ["yahoo"])
+        self.assertEqual(len(yahoo_calls), 3)
+
+        stats = engine.get_strategy_stats()
+        self.assertEqual(stats["sources"]["yahoo"]["state"], OPEN)
+        self.assertEqual(stats["sources"]["yahoo"]["failures"], 3)
+        self.assertEqual(stats["sources"]["yahoo"]["skipped"], 1)
+        self.assertEqual(stats["sources"]["stooq-csv"]["successes"], 4)
+
+    def test_quick_empty_result_is_not_a_failure(self):
+        """An empty answer that comes back quickly means 'no data', not 'source down'."""
+        engine = FetchStrategyEngine(min_calls=1)
+        engine.run("A", [("yahoo-ca-to", _empty)])
+        self.assertEqual(engine.get_breaker("yahoo").state, CLOSED)
+
+    def test_hedging_races_slow_strategy(self):
+        """With hedging, a slow primary is raced by the next same-instrument strategy."""
+        engine = FetchStrategyEngine(hedge_delay_seconds=0.05)
+        release = threading.Event()
+
+        def slow_yahoo():
+            release.wait(2)
+            return _data()
+
+        started = time.monotonic()
+        winner, _, _ = engine.run("A", [("yahoo", slow_yahoo), ("stooq-csv", _data)])
+        release.set()
+        self.assertEqual(winner[0], "stooq-csv")
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(engine.get_strategy_stats()["hedged_launches"], 1)
+
+    def test_hedging_never_races_a_different_listing(self):
+        """A .TO listing is only tried after the base ticker strategy finishes."""
+        engine = FetchStrategyEngine(hedge_delay_seconds=0.01)
+        order = []
+
+        def slow_stooq():
+            time.sleep(0.1)
+            order.append("stooq-csv")
+            return _empty()
+
+        def ca_to():
+            order.append("yahoo-ca-to")
+            return _data()
+
+        winner, _, _ = engine.run("A", [("stooq-csv", slow_stooq), ("yahoo-ca-to", ca_to)])
+        self.assertEqual(winner[0], "yahoo-ca-to")
+        self.assertEqual(order, ["stooq-csv", "yahoo-ca-to"])
+        self.assertEqual(engine.get_strategy_stats()["hedged_launches"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
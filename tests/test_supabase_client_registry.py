@@ -0,0 +1,77 @@
+"""Tests for the shared SupabaseClient registry."""
+
+import base64
+import json
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import supabase_client as sc
+
+
+def _jwt(exp):
+    def part(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+    return f"{part({'alg': 'HS256', 'typ': 'JWT'})}.{part({'exp': exp, 'sub': 'user-1'})}.sig"
+
+
+@patch.dict(os.environ, {
+    'SUPABASE_URL': 'https://example.supabase.co',
+    'SUPABASE_ANON_KEY': 'anon-key',
+    'SUPABASE_SERVICE_ROLE_KEY': 'service-key',
+})
+class TestSharedClientRegistry(unittest.TestCase):
+    """Registry clients are reused per role and share one connection pool."""
+
+    def setUp(self):
+        self.requests = []
+
+        def handler(request):
+            if '/rest/v1/' in request.url.path:
+                self.requests.append(request.headers.get('authorization'))
+            return httpx.Response(200, json=[])
+
+        sc.clear_shared_clients()
+        sc._shared_http_client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    def tearDown(self):
+        sc.clear_shared_clients()
+
+    def test_clients_reused_per_role(self):
+        service = sc.get_shared_client(use_service_role=True)
+        anon = sc.get_shared_client()
+
+        self.assertIs(service, sc.get_shared_client(use_service_role=True))
+        self.assertIs(anon, sc.get_shared_client())
+        self.assertIsNot(service, anon)
+        self.assertIs(service.supabase.postgrest.session, anon.supabase.postgrest.session)
+
+    def test_each_role_sends_its_own_authorization(self):
+        """Sharing the HTTP session must not leak a user's token to other roles."""
+        token = _jwt(int(time.time()) + 3600)
+        user = sc.get_shared_client(user_token=token)
+        service = sc.get_shared_client(use_service_role=True)
+
+        user.supabase.table("funds").select("*").execute()
+        service.supabase.table("funds").select("*").execute()
+
+        self.assertEqual(self.requests, [f"Bearer {token}", "Bearer service-key"])
+
+    def test_expired_user_client_is_replaced(self):
+        token = _jwt(int(time.time()) + 3600)
+        first = sc.get_shared_client(user_token=token)
+        self.assertIs(first, sc.get_shared_client(user_token=token))
+
+        key = (token, None)
+        sc._user_clients[key] = (first, time.time() - 1)
+        self.assertIsNot(first, sc.get_shared_client(user_token=token))
+
+
+if __name__ == '__main__':
+    unittest.main()
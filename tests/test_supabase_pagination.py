@@ -0,0 +1,150 @@
+"""Tests for keyset-paginated Supabase reads.
+
+Uses a small in-memory stand-in for the PostgREST query builder.
+"""
+
+import re
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from data.repositories.supabase_pagination import SupabasePageReader
+
+
+class _Result:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _Query:
+    """Implements the subset of the supabase-py query builder the reader uses."""
+
+    _KEYSET = re.compile(r'(\w+)\.gt\."([^"]+)",and\(\1\.eq\."([^"]+)",(\w+)\.gt\."([^"]+)"\)')
+
+    def __init__(self, client, rows, count):
+        self.client = client
+        self.rows = rows
+        self.want_count = count
+        self.filters = []
+        self.orders = []
+        self.max_rows = None
+
+    def eq(self, col, value):
+        self.filters.append(lambda r: r[col] == value)
+        return self
+
+    def gte(self, col, value):
+        self.filters.append(lambda r: _ts(r[col]) >= _ts(value))
+        return self
+
+    def lt(self, col, value):
+        self.filters.append(lambda r: _ts(r[col]) < _ts(value))
+        return self
+
+    def or_(self, expr):
+        col, gt_value, _, id_col, id_value = self._KEYSET.match(expr).groups()
+        self.filters.append(
+            lambda r: _ts(r[col]) > _ts(gt_value)
+            or (_ts(r[col]) == _ts(gt_value) and r[id_col] > id_value)
+        )
+        return self
+
+    def order(self, col, desc=False):
+        self.orders.append((col, desc))
+        return self
+
+    def limit(self, n):
+        self.max_rows = n
+        return self
+
+    def execute(self):
+        self.client.requests += 1
+        rows = [r for r in self.rows if all(f(r) for f in self.filters)]
+        for col, desc in reversed(self.orders):
+            rows.sort(key=lambda r: r[col], reverse=desc)
+        count = len(rows) if self.want_count else None
+        if self.max_rows is not None:
+            rows = rows[:self.max_rows]
+        return _Result(rows, count)
+
+
+class _Table:
+    def __init__(self, client, rows):
+        self.client = client
+        self.rows = rows
+
+    def select(self, columns, count=None):
+        return _Query(self.client, self.rows, count)
+
+
+class _FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = 0
+
+    def table(self, name):
+        return _Table(self, self.rows)
+
+
+def _ts(value):
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def _rows(days, per_day, fund="F"):
+    """Several rows sharing each daily timestamp, like a portfolio snapshot."""
+    start = datetime(2024, 1, 1, 16, tzinfo=timezone.utc)
+    rows = []
+    for d in range(days):
+        for i in range(per_day):
+            rows.append({
+                "id": f"{d:04d}-{i:04d}",
+                "date": (start + timedelta(days=d)).isoformat(),
+                "fund": fund,
+            })
+    return rows
+
+
+class TestSupabasePageReader(unittest.TestCase):
+    """Keyset paging must return every row exactly once, in (date, id) order."""
+
+    def setUp(self):
+        self.rows = _rows(days=40, per_day=7) + _rows(days=5, per_day=3, fund="OTHER")
+        self.expected = sorted(
+            (r for r in self.rows if r["fund"] == "F"), key=lambda r: (r["date"], r["id"])
+        )
+
+    def _reader(self, client, **kwargs):
+        return SupabasePageReader(
+            client, "portfolio_positions", "date, fund",
+            lambda q: q.eq("fund", "F"), page_size=10, **kwargs
+        )
+
+    def test_sequential_pages_cover_all_rows(self):
+        """Pages break inside a shared timestamp without skipping or repeating rows."""
+        client = _FakeSupabase(self.rows)
+        pages = list(self._reader(client, max_workers=1).iter_pages())
+
+        self.assertTrue(all(len(p) <= 10 for p in pages))
+        self.assertEqual([r["id"] for p in pages for r in p], [r["id"] for r in self.expected])
+
+    def test_parallel_fetch_matches_sequential(self):
+        """Parallel date slices return the same rows in the same order."""
+        client = _FakeSupabase(self.rows)
+        rows = self._reader(client, max_workers=4).fetch_all()
+        self.assertEqual([r["id"] for r in rows], [r["id"] for r in self.expected])
+
+    def test_single_page_skips_parallel_setup(self):
+        """Small results are read with a count plus one page."""
+        client = _FakeSupabase(_rows(days=1, per_day=5))
+        rows = self._reader(client).fetch_all()
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(client.requests, 2)
+
+    def test_key_columns_added_to_select(self):
+        """The keyset columns are always selected."""
+        reader = SupabasePageReader(None, "t", "ticker, shares")
+        self.assertEqual(reader.columns, "ticker, shares, date, id")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Tests for indexed duplicate-trade detection and the Webull bulk import."""
+
+import csv
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from data.models.trade import Trade
+from utils.email_trade_parser import TradeFingerprintIndex, is_duplicate_trade
+
+
+def _trade(ticker="VEE", action="BUY", shares="4", price="44.59", minutes=0):
+    return Trade(
+        ticker=ticker,
+        action=action,
+        shares=Decimal(shares),
+        price=Decimal(price),
+        timestamp=datetime(2025, 9, 12, 13, 30, tzinfo=timezone.utc) + timedelta(minutes=minutes),
+        currency="CAD",
+    )
+
+
+class TestTradeFingerprintIndex(unittest.TestCase):
+
+    def test_matches_within_window_across_bucket_boundary(self):
+        index = TradeFingerprintIndex([_trade(minutes=4)])
+
+        self.assertTrue(index.contains_trade(_trade(minutes=0)))
+        self.assertTrue(index.contains_trade(_trade(minutes=9)))
+        self.assertFalse(index.contains_trade(_trade(minutes=10)))
+
+    def test_other_fields_must_match(self):
+        index = TradeFingerprintIndex([_trade()])
+
+        self.assertTrue(index.contains_trade(_trade(ticker=" vee ", action="buy")))
+        self.assertFalse(index.contains_trade(_trade(action="SELL")))
+        self.assertFalse(index.contains_trade(_trade(shares="5")))
+        self.assertFalse(index.contains_trade(_trade(price="44.60")))
+
+    def test_added_trades_are_found(self):
+        index = TradeFingerprintIndex()
+        self.assertFalse(index.contains_trade(_trade()))
+        index.add_trade(_trade())
+        self.assertTrue(index.contains_trade(_trade(minutes=2)))
+        self.assertEqual(len(index), 1)
+
+    def test_shared_index_skips_history_reload(self):
+        repository = MagicMock()
+        repository.get_trade_history.return_value = [_trade()]
+        index = TradeFingerprintIndex.from_repository(repository)
+
+        self.assertTrue(is_duplicate_trade(_trade(minutes=1), repository, index=index))
+        self.assertFalse(is_duplicate_trade(_trade(ticker="XEQT"), repository, index=index))
+        self.assertEqual(repository.get_trade_history.call_count, 1)
+
+
+class TestWebullBulkImport(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_webull_import_"))
+        self.fund_dir = self.test_dir / "TEST"
+        self.fund_dir.mkdir()
+        self.csv_path = self.test_dir / "webull.csv"
+        with open(self.csv_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Symbol", "Side", "Filled Qty", "Average Filled Price", "Filled Time", "Order Status"])
+            writer.writerow(["ABC", "Buy", "10", "5.00", "09/03/2025 10:00:00 EDT", "Filled"])
+            writer.writerow(["ABC", "Buy", "10", "5.00", "09/03/2025 10:02:00 EDT", "Filled"])
+            writer.writerow(["ABC", "Sell", "4", "6.00", "09/04/2025 11:00:00 EDT", "Filled"])
+
+        fund_manager = MagicMock()
+        fund_manager.funds_dir = self.test_dir
+        patcher = patch('utils.webull_importer.get_fund_manager', return_value=fund_manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _read(self, name):
+        with open(self.fund_dir / name, encoding='utf-8') as file:
+            return list(csv.DictReader(file))
+
+    def test_reimport_skips_existing_trades_but_keeps_identical_fills(self):
+        from utils.webull_importer import WebullImporter
+        importer = WebullImporter("TEST")
+
+        with patch.object(WebullImporter, '_get_company_name', return_value="ABC Corp"):
+            first = importer.import_webull_csv(str(self.csv_path))
+            second = importer.import_webull_csv(str(self.csv_path))
+
+        # The two identical buys two minutes apart are separate fills
+        self.assertEqual(first["trades_imported"], 3)
+        self.assertEqual(first["duplicates_skipped"], 0)
+        self.assertEqual(second["trades_imported"], 0)
+        self.assertEqual(second["duplicates_skipped"], 3)
+
+        self.assertEqual(len(self._read("llm_trade_log.csv")), 3)
+        [position] = self._read("llm_portfolio_update.csv")
+        self.assertEqual(position["Ticker"], "ABC")
+        self.assertEqual(int(position["Shares"]), 16)
+        self.assertEqual(list(self.fund_dir.glob(".*.tmp")), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
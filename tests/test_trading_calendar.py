@@ -0,0 +1,65 @@
+"""Tests for the precomputed TradingCalendar against per-day MarketHolidays checks."""
+
+import unittest
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.market_holidays import MarketHolidays, TradingCalendar
+
+
+class TestTradingCalendar(unittest.TestCase):
+
+    def setUp(self):
+        self.holidays = MarketHolidays()
+        self.days = [date(2023, 1, 1) + timedelta(days=i) for i in range(3 * 365)]
+
+    def test_vectorized_lookup_matches_per_day_checks(self):
+        for market in ("us", "canadian", "both", "any"):
+            expected = [self.holidays.is_trading_day(d, market=market) for d in self.days]
+            result = self.holidays.calendar(market).is_trading_day(self.days)
+            self.assertEqual(result.tolist(), expected, market)
+
+    def test_scalar_series_and_missing_values(self):
+        calendar = self.holidays.calendar("us")
+        self.assertFalse(calendar.is_trading_day(date(2024, 7, 4)))
+        self.assertTrue(calendar.is_trading_day("2024-07-05"))
+
+        # Timezone-aware values use their local day; NaT is never a trading day
+        series = pd.Series(pd.to_datetime(["2024-07-04 23:00", "2024-07-05 09:30", None])).dt.tz_localize("US/Eastern")
+        self.assertEqual(calendar.is_trading_day(series).tolist(), [False, True, False])
+
+    def test_ranges_and_offsets(self):
+        calendar = self.holidays.calendar("us")
+        days = calendar.trading_days_between(date(2024, 12, 20), date(2024, 12, 31))
+        self.assertEqual(days.dtype, np.dtype("datetime64[D]"))
+        self.assertEqual(len(days), 7)  # Christmas closed
+
+        self.assertEqual(calendar.next_trading_day(date(2024, 7, 3)), date(2024, 7, 5))
+        self.assertEqual(calendar.previous_trading_day(date(2024, 7, 5)), date(2024, 7, 3))
+        self.assertEqual(calendar.offset(date(2024, 1, 6), 1), date(2024, 1, 8))  # Saturday
+        self.assertEqual(calendar.offset(date(2024, 1, 6), 0), date(2024, 1, 8))
+        self.assertEqual(calendar.offset(date(2024, 1, 8), -2), date(2024, 1, 4))
+
+    def test_span_extends_on_demand(self):
+        calendar = TradingCalendar(self.holidays, "both", start_year=2024, end_year=2024)
+        self.assertFalse(calendar.is_trading_day(date(1999, 12, 25)))
+        self.assertTrue(calendar.is_trading_day(date(2031, 3, 4)))
+        self.assertEqual(calendar.offset(date(2024, 12, 31), 1), date(2025, 1, 2))
+
+    def test_range_helpers_delegate_to_calendar(self):
+        days = self.holidays.get_trading_days_in_range(date(2024, 2, 16), date(2024, 2, 21), market="any")
+        # Presidents' Day and Family Day fall on the same Monday
+        self.assertEqual(days, [date(2024, 2, 16), date(2024, 2, 20), date(2024, 2, 21)])
+        self.assertIsInstance(days[0], date)
+
+    def test_unknown_market_is_rejected(self):
+        with self.assertRaises(ValueError):
+            TradingCalendar(self.holidays, "tokyo")
+        with self.assertRaises(ValueError):
+            self.holidays.get_next_trading_day(date(2024, 1, 1), market="tokyo")
+
+
+if __name__ == '__main__':
+    unittest.main()
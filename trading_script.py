@@ -1099,6 +1099,7 @@ def run_portfolio_workflow(args: argparse.Namespace, settings: Settings, reposit
             cache_hits = 0
             api_calls = 0
 
+            missing_tickers = []
             for ticker in tickers:
                 try:
                     # First, try to get cached data
@@ -1110,21 +1111,31 @@ def run_portfolio_workflow(args: argparse.Namespace, settings: Settings, reposit
                         cache_hits += 1
                         logger.debug(f"Cache hit for {ticker}: {len(cached_data)} rows")
                     else:
-                        # Cache miss - fetch fresh data
-                        result = market_data_fetcher.fetch_price_data(ticker, start_date, end_date)
-                        if not result.df.empty:
-                            market_data[ticker] = result.df
-                            # Update price cache with fresh data
-                            price_cache.cache_price_data(ticker, result.df, result.source)
-                            api_calls += 1
-                            logger.debug(f"API fetch for {ticker}: {len(result.df)} rows from {result.source}")
-                        else:
-                            market_data[ticker] = pd.DataFrame()
-                            logger.warning(f"No data returned for {ticker}")
+                        missing_tickers.append(ticker)
 
                 except Exception as e:
-                    logger.warning(f"Failed to fetch data for {ticker}: {e}")
-                    market_data[ticker] = pd.DataFrame()
+                    logger.warning(f"Failed to read cached data for {ticker}: {e}")
+                    missing_tickers.append(ticker)
+
+            if missing_tickers:
+                # Cache misses - fetch all of them with one bulk request plus per-ticker fallbacks
+                try:
+                    results = market_data_fetcher.fetch_price_data_batch(missing_tickers, start_date, end_date)
+                except Exception as e:
+                    logger.warning(f"Batch fetch failed for {len(missing_tickers)} tickers: {e}")
+                    results = {}
+
+                for ticker in missing_tickers:
+                    result = results.get(ticker)
+                    if result is not None and not result.df.empty:
+                        market_data[ticker] = result.df
+                        # Update price cache with fresh data
+                        price_cache.cache_price_data(ticker, result.df, result.source)
+                        api_calls += 1
+                        logger.debug(f"API fetch for {ticker}: {len(result.df)} rows from {result.source}")
+                    else:
+                        market_data[ticker] = pd.DataFrame()
+                        logger.warning(f"No data returned for {ticker}")
 
             # Report optimization results
             market_data_time = time.time() - market_data_start
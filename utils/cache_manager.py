@@ -14,6 +14,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from config.settings import Settings, get_settings
 from market_data.price_cache import PriceCache
 from market_data.data_fetcher import MarketDataFetcher
+from market_data.strategy_engine import get_strategy_engine
 from financial.currency_handler import CurrencyHandler
 from utils.windows_cache_utils import is_windows, clear_cache_directory_windows
 
@@ -67,6 +68,9 @@ class CacheManager:
         else:
             stats["price_cache"] = {"total_entries": 0, "total_rows": 0}
 
+        # Fetch strategy / source health stats (shared across all fetchers)
+        stats["fetch_strategies"] = get_strategy_engine().get_strategy_stats()
+
         # Cache directory stats
         cache_dirs = self.get_cache_directories()
         for name, cache_dir in cache_dirs.items():
@@ -8,10 +8,11 @@ Supports various email formats from different brokers and trading platforms.
 
 import re
 import sys
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 import logging
 
 # Ensure project root is in path for imports
@@ -25,6 +26,10 @@ from utils.ticker_utils import normalize_ticker_symbol
 
 logger = logging.getLogger(__name__)
 
+# Trades closer than this (same ticker/action/shares/price) are duplicates
+DUPLICATE_WINDOW_SECONDS = 300
+DUPLICATE_EPSILON = Decimal('0.000001')
+
 
 class EmailTradeParser:
     """Parser for extracting trade information from email notifications."""
@@ -403,7 +408,102 @@ def parse_trade_from_email(email_text: str) -> Optional[Trade]:
     return parser.parse_email_trade(email_text)
 
 
-def is_duplicate_trade(trade: Trade, repository) -> bool:
+class TradeFingerprintIndex:
+    """Index of trade fingerprints for duplicate detection.
+    
+    Fingerprints are bucketed by (ticker, action, 5-minute window), so a lookup
+    only compares against trades in the same and adjacent windows instead of
+    the whole trade log. Build it once per import session and add() each trade
+    as it is saved.
+    """
+    
+    def __init__(self, trades: Iterable[Trade] = ()):
+        self._buckets: Dict[Tuple[str, str, int], List[Tuple[Decimal, Decimal, float]]] = defaultdict(list)
+        # Trades without a usable timestamp match on the other fields alone
+        self._untimed: Dict[Tuple[str, str], List[Tuple[Decimal, Decimal]]] = defaultdict(list)
+        self._size = 0
+        for trade in trades:
+            self.add_trade(trade)
+    
+    @classmethod
+    def from_repository(cls, repository) -> 'TradeFingerprintIndex':
+        """Build the index from a repository's full trade history."""
+        return cls(repository.get_trade_history() or [])
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @staticmethod
+    def _epoch(timestamp) -> Optional[float]:
+        """Seconds since epoch; naive timestamps are taken to be in the trading timezone."""
+        if timestamp is None:
+            return None
+        try:
+            if timestamp.tzinfo is None:
+                from utils.timezone_utils import get_trading_timezone
+                timestamp = timestamp.replace(tzinfo=get_trading_timezone())
+            return timestamp.timestamp()
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _key(ticker: str, action: str) -> Tuple[str, str]:
+        return str(ticker).upper().strip(), str(action).upper().strip()
+    
+    def add(self, ticker: str, action: str, shares, price, timestamp) -> None:
+        """Record a trade's fingerprint."""
+        try:
+            fingerprint = (Decimal(str(shares)), Decimal(str(price)))
+        except Exception:
+            return
+        key = self._key(ticker, action)
+        epoch = self._epoch(timestamp)
+        if epoch is None:
+            self._untimed[key].append(fingerprint)
+        else:
+            self._buckets[key + (int(epoch // DUPLICATE_WINDOW_SECONDS),)].append(fingerprint + (epoch,))
+        self._size += 1
+    
+    def contains(self, ticker: str, action: str, shares, price, timestamp) -> bool:
+        """True if an indexed trade has the same ticker and action, shares and
+        price within 1e-6, and a timestamp within ±5 minutes."""
+        try:
+            t_shares = Decimal(str(shares))
+            t_price = Decimal(str(price))
+        except Exception:
+            return False
+        
+        def same(e_shares: Decimal, e_price: Decimal) -> bool:
+            return abs(e_shares - t_shares) <= DUPLICATE_EPSILON and abs(e_price - t_price) <= DUPLICATE_EPSILON
+        
+        key = self._key(ticker, action)
+        if any(same(e_shares, e_price) for e_shares, e_price in self._untimed.get(key, ())):
+            return True
+        
+        epoch = self._epoch(timestamp)
+        if epoch is None:
+            # No time to compare: match on the other fields in any window
+            candidates = (entry for bucket_key, entries in self._buckets.items()
+                          if bucket_key[:2] == key for entry in entries)
+            return any(same(e_shares, e_price) for e_shares, e_price, _ in candidates)
+        
+        bucket = int(epoch // DUPLICATE_WINDOW_SECONDS)
+        for neighbour in (bucket - 1, bucket, bucket + 1):
+            for e_shares, e_price, e_epoch in self._buckets.get(key + (neighbour,), ()):
+                if abs(e_epoch - epoch) <= DUPLICATE_WINDOW_SECONDS and same(e_shares, e_price):
+                    return True
+        return False
+    
+    def add_trade(self, trade: Trade) -> None:
+        """Record a Trade's fingerprint."""
+        self.add(trade.ticker, trade.action, trade.shares, trade.price, trade.timestamp)
+    
+    def contains_trade(self, trade: Trade) -> bool:
+        """True if a duplicate of trade has been indexed."""
+        return self.contains(trade.ticker, trade.action, trade.shares, trade.price, trade.timestamp)
+
+
+def is_duplicate_trade(trade: Trade, repository, index: Optional[TradeFingerprintIndex] = None) -> bool:
     """Check if a trade already exists in the trade log (idempotent guard).
     
     A trade is considered duplicate if another trade exists with:
@@ -412,58 +512,29 @@ def is_duplicate_trade(trade: Trade, repository) -> bool:
     - Shares equal within 1e-6
     - Price equal within 1e-6
     - Timestamp within ±5 minutes
+    
+    Pass the session's TradeFingerprintIndex to avoid reloading the trade
+    history for every trade; without one it is built from the repository.
     """
     try:
-        from decimal import Decimal
-        from datetime import timedelta
-        # Load existing trades via repository for consistent parsing
-        existing = repository.get_trade_history()
-        if not existing:
-            return False
-        t_ticker = trade.ticker.upper().strip()
-        t_action = trade.action.upper().strip()
-        t_shares = Decimal(str(trade.shares))
-        t_price = Decimal(str(trade.price))
-        t_time = trade.timestamp
-        eps = Decimal('0.000001')
-        for ex in existing:
-            if ex.ticker.upper().strip() != t_ticker:
-                continue
-            if ex.action.upper().strip() != t_action:
-                continue
-            try:
-                e_shares = Decimal(str(ex.shares))
-                e_price = Decimal(str(ex.price))
-            except Exception:
-                continue
-            if abs(e_shares - t_shares) > eps:
-                continue
-            if abs(e_price - t_price) > eps:
-                continue
-            try:
-                dt = ex.timestamp
-                if dt.tzinfo is None and t_time.tzinfo is not None:
-                    # Assume same TZ if missing
-                    dt = dt.replace(tzinfo=t_time.tzinfo)
-                delta = abs((dt - t_time).total_seconds())
-            except Exception:
-                # Fallback: consider duplicate on matching all other fields
-                delta = 0
-            if delta <= 300:  # within 5 minutes
-                return True
-        return False
+        if index is None:
+            index = TradeFingerprintIndex.from_repository(repository)
+        return index.contains_trade(trade)
     except Exception as e:
         logger.debug(f"Duplicate check failed: {e}")
         return False
 
 
-def add_trade_from_email(email_text: str, data_dir: str, fund_name: str = None) -> bool:
+def add_trade_from_email(email_text: str, data_dir: str, fund_name: str = None,
+                         duplicate_index: Optional[TradeFingerprintIndex] = None) -> bool:
     """Parse email text and add the trade to the trading system.
 
     Args:
         email_text: Raw email text containing trade information
         data_dir: Directory containing trading data files
         fund_name: Fund name for Supabase operations (optional)
+        duplicate_index: Index shared across a session of imports (optional);
+            the added trade is recorded in it
 
     Returns:
         True if trade was successfully added, False otherwise
@@ -493,7 +564,7 @@ def add_trade_from_email(email_text: str, data_dir: str, fund_name: str = None)
             repository = CSVRepository(data_dir)
 
         # Idempotency guard: skip exact duplicates
-        if is_duplicate_trade(trade, repository):
+        if is_duplicate_trade(trade, repository, index=duplicate_index):
             print("ℹ️  Duplicate trade detected; skipping insert.")
             return True
 
@@ -533,6 +604,9 @@ def add_trade_from_email(email_text: str, data_dir: str, fund_name: str = None)
             print("   Manual portfolio rebuild may be needed")
             return False
 
+        if duplicate_index is not None:
+            duplicate_index.add_trade(trade)
+
         # Check if this is a sell trade that might close the position
         if trade.action == 'SELL':
             try:
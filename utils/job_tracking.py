@@ -54,7 +54,7 @@ def mark_job_started(
         fund_name: Specific fund being processed, None if all funds
     """
     try:
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
     except ImportError:
         # Try relative import from web_dashboard
         import sys
@@ -63,10 +63,10 @@ def mark_job_started(
         web_dashboard_dir = current_file.parent.parent / 'web_dashboard'
         if str(web_dashboard_dir) not in sys.path:
             sys.path.insert(0, str(web_dashboard_dir))
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
     
     try:
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         # Use empty string instead of None for fund_name to avoid PostgreSQL NULL uniqueness issue
         # PostgreSQL treats NULL != NULL, so UNIQUE constraint doesn't prevent duplicates with NULLs
         effective_fund_name = fund_name if fund_name is not None else ''
@@ -104,7 +104,7 @@ def mark_job_completed(
         message: Optional success message to display (stored in error_message field for display)
     """
     try:
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
     except ImportError:
         # Try relative import from web_dashboard
         import sys
@@ -113,10 +113,10 @@ def mark_job_completed(
         web_dashboard_dir = current_file.parent.parent / 'web_dashboard'
         if str(web_dashboard_dir) not in sys.path:
             sys.path.insert(0, str(web_dashboard_dir))
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
     
     try:
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         
         # Use empty string instead of None for fund_name (PostgreSQL NULL uniqueness issue)
         effective_fund_name = fund_name if fund_name is not None else ''
@@ -175,7 +175,7 @@ def mark_job_failed(
         duration_ms: Execution duration in milliseconds (optional)
     """
     try:
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
     except ImportError:
         # Try relative import from web_dashboard
         import sys
@@ -184,10 +184,10 @@ def mark_job_failed(
         web_dashboard_dir = current_file.parent.parent / 'web_dashboard'
         if str(web_dashboard_dir) not in sys.path:
             sys.path.insert(0, str(web_dashboard_dir))
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
     
     try:
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         # Use empty string instead of None for fund_name (PostgreSQL NULL uniqueness issue)
         effective_fund_name = fund_name if fund_name is not None else ''
         data = {
@@ -230,7 +230,7 @@ def is_job_completed(
         True if job completed successfully, False otherwise
     """
     try:
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
     except ImportError:
         # Try relative import from web_dashboard
         import sys
@@ -239,10 +239,10 @@ def is_job_completed(
         web_dashboard_dir = current_file.parent.parent / 'web_dashboard'
         if str(web_dashboard_dir) not in sys.path:
             sys.path.insert(0, str(web_dashboard_dir))
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
     
     try:
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         result = client.supabase.table("job_executions")\
             .select("status")\
             .eq("job_name", job_name)\
@@ -285,7 +285,7 @@ def get_incomplete_jobs(
         List of job execution records that are incomplete
     """
     try:
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
     except ImportError:
         # Try relative import from web_dashboard
         import sys
@@ -294,10 +294,10 @@ def get_incomplete_jobs(
         web_dashboard_dir = current_file.parent.parent / 'web_dashboard'
         if str(web_dashboard_dir) not in sys.path:
             sys.path.insert(0, str(web_dashboard_dir))
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
     
     try:
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         result = client.supabase.table("job_executions")\
             .select("*")\
             .eq("job_name", job_name)\
@@ -324,10 +324,10 @@ def cleanup_stale_running_jobs(max_age_hours: int = 24) -> int:
     Returns:
         Number of jobs cleaned up
     """
-    from supabase_client import SupabaseClient
+    from supabase_client import get_shared_client
     
     try:
-        client = SupabaseClient()
+        client = get_shared_client()
         cutoff_time = datetime.now(timezone.utc).timestamp() - (max_age_hours * 3600)
         cutoff_dt = datetime.fromtimestamp(cutoff_time, tz=timezone.utc)
         
@@ -382,8 +382,8 @@ def add_to_retry_queue(
         context: Optional JSONB context (batch ranges, chunk numbers, etc.)
     """
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         # Use empty string instead of None for entity_id (PostgreSQL NULL uniqueness issue)
         effective_entity_id = entity_id if entity_id is not None else ''
@@ -445,10 +445,10 @@ def get_pending_retries(
         List of retry queue records
     """
     try:
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
         from datetime import timedelta
         
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         
         # Calculate cutoff date
         cutoff_date = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).date()
@@ -485,8 +485,8 @@ def mark_retrying(
         entity_type: Type of entity
     """
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         effective_entity_id = entity_id if entity_id is not None else ''
         
@@ -541,8 +541,8 @@ def mark_resolved(
         entity_type: Type of entity
     """
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         effective_entity_id = entity_id if entity_id is not None else ''
         
@@ -580,8 +580,8 @@ def mark_abandoned(
         entity_type: Type of entity
     """
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         effective_entity_id = entity_id if entity_id is not None else ''
         
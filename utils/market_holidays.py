@@ -4,14 +4,28 @@ Market holiday detection for US and Canadian stock markets.
 This module provides comprehensive holiday detection for both US and Canadian
 stock markets, including shared holidays and market-specific closures.
 Supports dynamic calculation of holidays for any year.
+
+TradingCalendar precomputes a market's trading days as a sorted NumPy array,
+for vectorized membership tests and range/offset arithmetic without walking
+day by day.
 """
 
 from datetime import datetime, date, timedelta
-from typing import Set, List, Optional, Dict
+from typing import Set, List, Optional, Dict, Union
 import logging
+import threading
+
+import numpy as np
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+MARKETS = ("us", "canadian", "both", "any")
+
+# Span of years a TradingCalendar covers initially (extended on demand)
+CALENDAR_YEARS_BACK = 10
+CALENDAR_YEARS_AHEAD = 2
+
 class MarketHolidays:
     """
     Market holiday detection for US and Canadian stock markets.
@@ -24,6 +38,7 @@ class MarketHolidays:
     def __init__(self):
         """Initialize market holiday calculator."""
         self._holiday_cache = {}  # Cache for calculated holidays by year
+        self._calendars = {}  # TradingCalendar by market
     
     def _get_easter_sunday(self, year: int) -> date:
         """
@@ -216,6 +231,21 @@ class MarketHolidays:
         else:
             raise ValueError("Market must be 'us', 'canadian', 'both', or 'any'")
     
+    def calendar(self, market: str = "both") -> "TradingCalendar":
+        """
+        Get the precomputed trading calendar for a market (built once per instance).
+        
+        Args:
+            market: "us", "canadian", "both", or "any"
+            
+        Returns:
+            TradingCalendar for the market
+        """
+        calendar = self._calendars.get(market)
+        if calendar is None:
+            calendar = self._calendars.setdefault(market, TradingCalendar(self, market))
+        return calendar
+    
     def get_next_trading_day(self, start_date: date, market: str = "both") -> date:
         """
         Get the next trading day after the given date.
@@ -227,11 +257,7 @@ class MarketHolidays:
         Returns:
             Next trading day
         """
-        current_date = start_date + timedelta(days=1)
-        while not self.is_trading_day(current_date, market):
-            current_date += timedelta(days=1)
-        
-        return current_date
+        return self.calendar(market).next_trading_day(start_date)
     
     def get_previous_trading_day(self, start_date: date, market: str = "both") -> date:
         """
@@ -244,11 +270,7 @@ class MarketHolidays:
         Returns:
             Previous trading day
         """
-        current_date = start_date - timedelta(days=1)
-        while not self.is_trading_day(current_date, market):
-            current_date -= timedelta(days=1)
-        
-        return current_date
+        return self.calendar(market).previous_trading_day(start_date)
     
     def get_trading_days_in_range(self, start_date: date, end_date: date, market: str = "both") -> List[date]:
         """
@@ -262,15 +284,7 @@ class MarketHolidays:
         Returns:
             List of trading days
         """
-        trading_days = []
-        current_date = start_date
-        
-        while current_date <= end_date:
-            if self.is_trading_day(current_date, market):
-                trading_days.append(current_date)
-            current_date += timedelta(days=1)
-        
-        return trading_days
+        return _to_dates(self.calendar(market).trading_days_between(start_date, end_date))
 
     def get_holidays_for_range(self, start_date: date, end_date: date, market: str = "us") -> List[date]:
         """
@@ -363,5 +377,158 @@ class MarketHolidays:
         return None
 
 
+DateLike = Union[date, datetime, pd.Timestamp, np.datetime64, str]
+
+
+def _to_days(values) -> np.ndarray:
+    """Convert dates, timestamps or strings (scalar or array-like) to datetime64[D].
+    
+    Timezone-aware values keep their local calendar day; invalid values become NaT.
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(values, errors='coerce'))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype('datetime64[D]')
+
+
+def _to_dates(days: np.ndarray) -> List[date]:
+    """datetime64[D] array to a list of datetime.date."""
+    return days.astype(object).tolist()
+
+
+class TradingCalendar:
+    """
+    Precomputed trading days for one market.
+    
+    Trading days are held as a sorted datetime64[D] array covering whole years,
+    so membership tests, ranges and "n trading days from" lookups are binary
+    searches instead of per-day weekend and holiday checks. The span grows
+    automatically when a date outside it is requested.
+    """
+    
+    def __init__(self, holidays: Optional[MarketHolidays] = None, market: str = "both",
+                 start_year: Optional[int] = None, end_year: Optional[int] = None):
+        """
+        Initialize the calendar.
+        
+        Args:
+            holidays: Holiday source (a new MarketHolidays if None)
+            market: "us", "canadian", "both", or "any" (same meaning as MarketHolidays.is_trading_day)
+            start_year: First year covered (default: CALENDAR_YEARS_BACK years ago)
+            end_year: Last year covered (default: CALENDAR_YEARS_AHEAD years ahead)
+        """
+        if market not in MARKETS:
+            raise ValueError("Market must be 'us', 'canadian', 'both', or 'any'")
+        self.holidays = holidays or MarketHolidays()
+        self.market = market
+        self._lock = threading.Lock()
+        this_year = date.today().year
+        self._start_year = start_year or this_year - CALENDAR_YEARS_BACK
+        self._end_year = end_year or this_year + CALENDAR_YEARS_AHEAD
+        self._days = self._build(self._start_year, self._end_year)
+    
+    def _closed_days(self, year: int) -> Set[date]:
+        """Weekday closures for the market in a year."""
+        year_holidays = self.holidays._get_holidays_for_year(year)
+        us_closed = year_holidays['us'] | year_holidays['shared']
+        canadian_closed = year_holidays['canadian'] | year_holidays['shared']
+        if self.market == "us":
+            return us_closed
+        if self.market == "canadian":
+            return canadian_closed
+        if self.market == "both":
+            return us_closed | canadian_closed
+        return us_closed & canadian_closed
+    
+    def _build(self, start_year: int, end_year: int) -> np.ndarray:
+        days = np.arange(np.datetime64(f"{start_year}-01-01"), np.datetime64(f"{end_year + 1}-01-01"),
+                         dtype='datetime64[D]')
+        # 1970-01-01 was a Thursday; Monday = 0 as in date.weekday()
+        open_mask = (days.astype(np.int64) + 3) % 7 < 5
+        closed = [day for year in range(start_year, end_year + 1) for day in self._closed_days(year)]
+        if closed:
+            open_mask &= ~np.isin(days, np.array(closed, dtype='datetime64[D]'))
+        return days[open_mask]
+    
+    def _cover(self, days: np.ndarray) -> np.ndarray:
+        """Extend the precomputed span to include the given days; returns the trading-day array."""
+        valid = days[~np.isnat(days)]
+        if valid.size:
+            first_year = int(str(valid.min())[:4])
+            last_year = int(str(valid.max())[:4])
+            if first_year < self._start_year or last_year > self._end_year:
+                with self._lock:
+                    start_year = min(first_year, self._start_year)
+                    end_year = max(last_year, self._end_year)
+                    if (start_year, end_year) != (self._start_year, self._end_year):
+                        self._days = self._build(start_year, end_year)
+                        self._start_year, self._end_year = start_year, end_year
+        return self._days
+    
+    @property
+    def days(self) -> np.ndarray:
+        """All precomputed trading days (sorted datetime64[D])."""
+        return self._days
+    
+    def is_trading_day(self, values):
+        """
+        Check whether dates are trading days.
+        
+        Args:
+            values: A date-like scalar, or an array-like/Series/DatetimeIndex of them
+            
+        Returns:
+            bool for a scalar, otherwise a boolean ndarray (False for missing values)
+        """
+        scalar = np.ndim(values) == 0 and not isinstance(values, (pd.Series, pd.Index))
+        days = _to_days([values] if scalar else values)
+        trading_days = self._cover(days)
+        positions = np.searchsorted(trading_days, days)
+        found = positions < len(trading_days)
+        found[found] = trading_days[positions[found]] == days[found]
+        return bool(found[0]) if scalar else found
+    
+    def trading_days_between(self, start_date: DateLike, end_date: DateLike) -> np.ndarray:
+        """
+        Get the trading days from start_date to end_date (both inclusive).
+        
+        Returns:
+            Sorted datetime64[D] array (use .astype(object) for datetime.date values)
+        """
+        start, end = _to_days([start_date, end_date])
+        trading_days = self._cover(np.array([start, end]))
+        return trading_days[np.searchsorted(trading_days, start, 'left'):np.searchsorted(trading_days, end, 'right')]
+    
+    def offset(self, start_date: DateLike, n: int) -> date:
+        """
+        Get the trading day n sessions after (n > 0) or before (n < 0) a date.
+        
+        A non-trading start date counts from its position in the calendar, so
+        offset(saturday, 1) is the following Monday; n = 0 rolls forward to
+        the first trading day on or after start_date.
+        """
+        day = _to_days([start_date])[0]
+        while True:
+            trading_days = self._cover(np.array([day]))
+            if n > 0:
+                index = int(np.searchsorted(trading_days, day, 'right')) + n - 1
+            else:
+                index = int(np.searchsorted(trading_days, day, 'left')) + n
+            if 0 <= index < len(trading_days):
+                return trading_days[index].astype(object)
+            # Out of the precomputed span - extend by the year(s) needed and retry
+            year = int(str(day)[:4])
+            spread = abs(n) // 240 + 1
+            self._cover(np.array([f"{year - spread}-01-01", f"{year + spread}-12-31"], dtype='datetime64[D]'))
+    
+    def next_trading_day(self, start_date: DateLike) -> date:
+        """Get the first trading day after start_date."""
+        return self.offset(start_date, 1)
+    
+    def previous_trading_day(self, start_date: DateLike) -> date:
+        """Get the last trading day before start_date."""
+        return self.offset(start_date, -1)
+
+
 # Global instance for easy access
 MARKET_HOLIDAYS = MarketHolidays()
@@ -7,6 +7,7 @@ and convert them to the trading bot's internal format.
 
 import csv
 import json
+import os
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
@@ -18,6 +19,12 @@ from utils.fund_manager import get_fund_manager
 
 logger = logging.getLogger(__name__)
 
+PORTFOLIO_FIELDNAMES = [
+    "Date", "Ticker", "Shares", "Average Price", "Cost Basis", "Stop Loss",
+    "Current Price", "Total Value", "PnL", "Action", "Company", "Currency"
+]
+TRADE_LOG_FIELDNAMES = ["Date", "Ticker", "Shares", "Price", "Cost Basis", "PnL", "Reason", "Currency"]
+
 
 class WebullImporter:
     """Handles import of Webull trade data into the trading system."""
@@ -81,6 +88,7 @@ class WebullImporter:
                 "trades_processed": len(trades),
                 "trades_imported": import_results["trades_imported"],
                 "trades_skipped": import_results["trades_skipped"],
+                "duplicates_skipped": import_results["duplicates_skipped"],
                 "portfolio_updates": import_results["portfolio_updates"],
                 "trade_log_entries": import_results["trade_log_entries"]
             }
@@ -294,30 +302,46 @@ class WebullImporter:
     def _import_trades(self, trades: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Import trades into the trading system.
         
+        The whole file is applied in memory and both CSVs are written once at
+        the end. Trades already in the trade log before the import are skipped
+        using a fingerprint index, so the import is linear in the number of
+        trades. Identical rows within the file are kept: partial fills at the
+        same price and minute are separate trades.
+        
         Args:
             trades: List of parsed trade dictionaries
             
         Returns:
             Import results dictionary
         """
+        from utils.timezone_utils import parse_csv_timestamp
+        
         trades_imported = 0
         trades_skipped = 0
+        duplicates_skipped = 0
         portfolio_updates = 0
         trade_log_entries = 0
         
         # Load existing portfolio data
-        portfolio_data = self._load_portfolio_data()
+        positions = {position.get("Ticker"): position for position in self._load_portfolio_data()}
         trade_log_data = self._load_trade_log_data()
+        duplicate_index = self._build_duplicate_index(trade_log_data)
         
         for trade in trades:
             try:
-                # Add to trade log
                 trade_log_entry = self._create_trade_log_entry(trade)
+                fingerprint = (trade["symbol"], trade["action"], trade["quantity"], trade["price"],
+                               parse_csv_timestamp(trade_log_entry["Date"]))
+                if duplicate_index.contains(*fingerprint):
+                    duplicates_skipped += 1
+                    continue
+                
+                # Add to trade log
                 trade_log_data.append(trade_log_entry)
                 trade_log_entries += 1
                 
                 # Update portfolio
-                portfolio_updated = self._update_portfolio(portfolio_data, trade)
+                portfolio_updated = self._update_portfolio(positions, trade)
                 if portfolio_updated:
                     portfolio_updates += 1
                 
@@ -328,17 +352,34 @@ class WebullImporter:
                 trades_skipped += 1
                 continue
         
+        if duplicates_skipped:
+            print_info(f"Skipped {duplicates_skipped} trades already in the trade log")
+        
         # Save updated data
-        self._save_portfolio_data(portfolio_data)
-        self._save_trade_log_data(trade_log_data)
+        self._commit_import(list(positions.values()), trade_log_data)
         
         return {
             "trades_imported": trades_imported,
             "trades_skipped": trades_skipped,
+            "duplicates_skipped": duplicates_skipped,
             "portfolio_updates": portfolio_updates,
             "trade_log_entries": trade_log_entries
         }
     
+    def _build_duplicate_index(self, trade_log_data: List[Dict[str, Any]]):
+        """Fingerprint index over the existing trade log rows."""
+        from data.models.trade import Trade
+        from utils.email_trade_parser import TradeFingerprintIndex
+        from utils.timezone_utils import parse_csv_timestamp
+        
+        index = TradeFingerprintIndex()
+        for row in trade_log_data:
+            try:
+                index.add_trade(Trade.from_csv_dict(row, timestamp=parse_csv_timestamp(row.get("Date"))))
+            except Exception as e:
+                logger.debug(f"Skipping unreadable trade log row for duplicate check: {e}")
+        return index
+    
     def _create_trade_log_entry(self, trade: Dict[str, Any]) -> Dict[str, Any]:
         """Create a trade log entry from a trade.
 
@@ -377,11 +418,11 @@ class WebullImporter:
             "Currency": trade["currency"]
         }
     
-    def _update_portfolio(self, portfolio_data: List[Dict[str, Any]], trade: Dict[str, Any]) -> bool:
+    def _update_portfolio(self, positions: Dict[str, Dict[str, Any]], trade: Dict[str, Any]) -> bool:
         """Update portfolio data with a trade.
         
         Args:
-            portfolio_data: Current portfolio data
+            positions: Current portfolio rows keyed by ticker
             trade: Trade to process
             
         Returns:
@@ -393,16 +434,12 @@ class WebullImporter:
         price = trade["price"]
         
         # Find existing position
-        existing_position = None
-        for i, position in enumerate(portfolio_data):
-            if position.get("Ticker") == symbol:
-                existing_position = i
-                break
+        existing_position = positions.get(symbol)
         
         if action == "Buy":
             if existing_position is not None:
                 # Update existing position
-                position = portfolio_data[existing_position]
+                position = existing_position
                 old_shares = int(position.get("Shares", 0))
                 old_avg_price = Decimal(str(position.get("Average Price", 0)))
                 old_cost_basis = Decimal(str(position.get("Cost Basis", 0)))
@@ -432,13 +469,13 @@ class WebullImporter:
                     "Company": self._get_company_name(symbol, currency=trade["currency"]),
                     "Currency": trade["currency"]
                 }
-                portfolio_data.append(new_position)
+                positions[symbol] = new_position
             
             return True
             
         elif action == "Sell":
             if existing_position is not None:
-                position = portfolio_data[existing_position]
+                position = existing_position
                 current_shares = int(position.get("Shares", 0))
                 
                 if current_shares >= quantity:
@@ -457,7 +494,7 @@ class WebullImporter:
                         position["PnL"] = float((remaining_shares * price) - remaining_cost_basis)
                     else:
                         # Complete sell - remove position
-                        portfolio_data.pop(existing_position)
+                        del positions[symbol]
                 else:
                     # Short sell or error
                     print_warning(f"Cannot sell {quantity} shares of {symbol} - only {current_shares} available")
@@ -487,20 +524,7 @@ class WebullImporter:
     
     def _save_portfolio_data(self, portfolio_data: List[Dict[str, Any]]) -> None:
         """Save portfolio data to CSV."""
-        portfolio_file = self.fund_dir / "llm_portfolio_update.csv"
-        
-        if not portfolio_data:
-            return
-        
-        fieldnames = [
-            "Date", "Ticker", "Shares", "Average Price", "Cost Basis", "Stop Loss",
-            "Current Price", "Total Value", "PnL", "Action", "Company", "Currency"
-        ]
-        
-        with open(portfolio_file, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(portfolio_data)
+        self._commit_import(portfolio_data, [])
     
     def _load_trade_log_data(self) -> List[Dict[str, Any]]:
         """Load existing trade log data from CSV."""
@@ -519,17 +543,36 @@ class WebullImporter:
     
     def _save_trade_log_data(self, trade_log_data: List[Dict[str, Any]]) -> None:
         """Save trade log data to CSV."""
-        trade_log_file = self.fund_dir / "llm_trade_log.csv"
-        
-        if not trade_log_data:
-            return
+        self._commit_import([], trade_log_data)
+    
+    def _commit_import(self, portfolio_data: List[Dict[str, Any]], trade_log_data: List[Dict[str, Any]]) -> None:
+        """Write the portfolio and trade log CSVs together.
         
-        fieldnames = ["Date", "Ticker", "Shares", "Price", "Cost Basis", "PnL", "Reason", "Currency"]
+        Both files are written to temporary files first and only swapped in
+        once both writes succeeded, so a failed import leaves the fund's CSVs
+        untouched. Empty data leaves the corresponding file as it is.
+        """
+        pending = []
+        if portfolio_data:
+            pending.append((self.fund_dir / "llm_portfolio_update.csv", PORTFOLIO_FIELDNAMES, portfolio_data))
+        if trade_log_data:
+            pending.append((self.fund_dir / "llm_trade_log.csv", TRADE_LOG_FIELDNAMES, trade_log_data))
         
-        with open(trade_log_file, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(trade_log_data)
+        staged = []
+        try:
+            for target, fieldnames, rows in pending:
+                tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+                staged.append((tmp_path, target))
+                with open(tmp_path, 'w', newline='', encoding='utf-8') as file:
+                    writer = csv.DictWriter(file, fieldnames=fieldnames)
+                    writer.writeheader()
+                    writer.writerows(rows)
+            for tmp_path, target in staged:
+                os.replace(tmp_path, target)
+        finally:
+            for tmp_path, _ in staged:
+                if tmp_path.exists():
+                    tmp_path.unlink()
 
     def _detect_currency(self, ticker: str) -> str:
         """Detect currency based on ticker characteristics."""
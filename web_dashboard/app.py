@@ -35,6 +35,7 @@ import logging
 import requests
 from flask_cors import CORS
 from flask_cache_utils import cache_data, cache_resource
+from cache_version import POSITIONS, TRADES, CASH, BENCHMARKS, CONGRESS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -2013,7 +2014,7 @@ def api_ticker_list():
             "type": type(e).__name__
         }), 500
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, kinds=[POSITIONS, TRADES], fund_param=None)
 def _get_ticker_info_cached(ticker: str, user_is_admin: bool, auth_token: Optional[str]):
     """Get ticker info with caching (300s TTL)"""
     from postgres_client import PostgresClient
@@ -2027,7 +2028,7 @@ def _get_ticker_info_cached(ticker: str, user_is_admin: bool, auth_token: Option
     
     # Initialize Postgres client
     try:
-        postgres_client = PostgresClient()
+        postgres_client = PostgresClient(workload="web")
     except Exception as e:
         logger.warning(f"PostgresClient initialization failed: {e}")
         postgres_client = None
@@ -2109,7 +2110,7 @@ def api_ticker_info():
             "type": type(e).__name__
         }), 500
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, kinds=[POSITIONS], fund_param=None)
 def _get_ticker_price_history_cached(ticker: str, days: int, user_is_admin: bool, auth_token: Optional[str]):
     """Get ticker price history with caching (300s TTL)"""
     from supabase_client import SupabaseClient
@@ -2162,7 +2163,7 @@ def api_ticker_price_history():
             "type": type(e).__name__
         }), 500
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, kinds=[POSITIONS, BENCHMARKS], fund_param=None)
 def _get_ticker_chart_data_cached(ticker: str, use_solid: bool, user_is_admin: bool, auth_token: Optional[str]):
     """Get ticker chart data with caching (300s TTL) - theme applied separately"""
     from supabase_client import SupabaseClient
@@ -2341,7 +2342,7 @@ def api_ai_search():
         logger.error(f"Error performing search: {e}")
         return jsonify({"error": str(e)}), 500
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, kinds=[POSITIONS, TRADES, CASH])
 def _get_context_data_packet(user_id: str, fund: str):
     """Get context data packet with caching (300s TTL)"""
     from flask_data_utils import (
@@ -2804,7 +2805,7 @@ def api_ai_repository():
             return jsonify({"error": "Failed to generate embedding"}), 500
         
         # Search repository
-        repo = ResearchRepository()
+        repo = ResearchRepository(workload="web")
         articles = repo.search_similar_articles(
             query_embedding=query_embedding,
             limit=max_results,
@@ -2835,7 +2836,7 @@ def api_ai_portfolio_intelligence():
             return jsonify({"error": "Fund is required"}), 400
         
         # Initialize repository
-        repo = ResearchRepository()
+        repo = ResearchRepository(workload="web")
         
         # Get portfolio tickers
         portfolio_tickers = set()
@@ -3127,12 +3128,12 @@ def get_postgres_client_congress():
     """Get PostgreSQL client instance for congress trades analysis data"""
     try:
         from postgres_client import PostgresClient
-        return PostgresClient()
+        return PostgresClient(workload="web")
     except Exception as e:
         logger.warning(f"PostgreSQL not available (AI analysis disabled): {e}")
         return None
 
-@cache_data(ttl=3600)
+@cache_data(ttl=3600, kinds=[CONGRESS], fund_param=None)
 def get_unique_tickers_congress(_supabase_client, refresh_key: int, _cache_version: Optional[str] = None) -> List[str]:
     """Get all unique tickers from congress_trades table (cached 1 hour)"""
     if _cache_version is None:
@@ -3178,7 +3179,7 @@ def get_unique_tickers_congress(_supabase_client, refresh_key: int, _cache_versi
         logger.error(f"Error fetching unique tickers: {e}", exc_info=True)
         return []
 
-@cache_data(ttl=3600)
+@cache_data(ttl=3600, kinds=[CONGRESS], fund_param=None)
 def get_unique_politicians_congress(_supabase_client, refresh_key: int, _cache_version: Optional[str] = None) -> List[str]:
     """Get all unique politicians from congress_trades table (cached 1 hour)"""
     if _cache_version is None:
@@ -3224,7 +3225,7 @@ def get_unique_politicians_congress(_supabase_client, refresh_key: int, _cache_v
         logger.error(f"Error fetching unique politicians: {e}", exc_info=True)
         return []
 
-@cache_data(ttl=60)
+@cache_data(ttl=60, kinds=[CONGRESS], fund_param=None)
 def get_analysis_data_congress(_postgres_client, refresh_key: int) -> Dict[int, Dict[str, Any]]:
     """Get AI analysis data from PostgreSQL (cached 60s)"""
     if _postgres_client is None:
@@ -3246,7 +3247,7 @@ def get_analysis_data_congress(_postgres_client, refresh_key: int) -> Dict[int,
         logger.error(f"Error fetching analysis data: {e}")
         return {}
 
-@cache_data(ttl=60)
+@cache_data(ttl=60, kinds=[CONGRESS], fund_param=None)
 def get_congress_trades_cached(
     _supabase_client,
     refresh_key: int,
@@ -14,6 +14,7 @@ Features:
 """
 
 import logging
+import threading
 import time
 from typing import Optional
 from urllib.parse import quote, urlparse
@@ -47,20 +48,22 @@ ARCHIVE_DOMAINS = [
 # Rate limiting: max 1 submission per second
 _last_submission_time = 0
 _submission_rate_limit = 1.0  # seconds
+_submission_lock = threading.Lock()  # Submissions can come from concurrent extraction workers
 
 
 def _rate_limit_submission() -> None:
     """Enforce rate limiting for archive submissions."""
     global _last_submission_time
-    current_time = time.time()
-    time_since_last = current_time - _last_submission_time
-    
-    if time_since_last < _submission_rate_limit:
-        sleep_time = _submission_rate_limit - time_since_last
-        logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
-        time.sleep(sleep_time)
-    
-    _last_submission_time = time.time()
+    with _submission_lock:
+        current_time = time.time()
+        time_since_last = current_time - _last_submission_time
+        
+        if time_since_last < _submission_rate_limit:
+            sleep_time = _submission_rate_limit - time_since_last
+            logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
+            time.sleep(sleep_time)
+        
+        _last_submission_time = time.time()
 
 
 def check_archived(url: str, timeout: int = 10) -> Optional[str]:
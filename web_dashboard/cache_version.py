@@ -2,65 +2,226 @@
 Cache Version Management
 ========================
 
-Provides a mechanism for background jobs to invalidate Streamlit's cache
-by updating a shared version file. When jobs update portfolio data, they
-bump the cache version, causing cached functions to re-fetch fresh data.
+Versions that cached functions fold into their cache keys, so that writers
+can invalidate exactly the data they changed. Versions are kept per
+namespace: a data kind (positions, trades, cash, contributions, ...)
+optionally scoped to one fund, plus a global version for full invalidation.
 
-Usage in background jobs:
+Versions live in memory. Bumps are also written to a small shared JSON file
+so that other processes (e.g. a separately running scheduler) see them; that
+file is only re-read when its modification time changes, checked at most
+once per POLL_INTERVAL_SECONDS. Listeners registered with
+add_version_listener are told which namespaces changed.
+
+Usage in background jobs / trade entry:
     from cache_version import bump_cache_version
-    
-    # After updating portfolio data
+
+    # After updating one fund's positions
+    bump_cache_version(fund="Project Chimera", kinds=["positions"])
+
+    # Invalidate everything (admin "bump cache" button)
     bump_cache_version()
 
 Usage in cached functions:
     from cache_version import get_cache_version
-    
-    @st.cache_data(ttl=300)
-    def get_portfolio_data(_cache_version=None):
-        if _cache_version is None:
-            _cache_version = get_cache_version()
-        # ... fetch data ...
+
+    # Changes whenever this fund's positions or trades (or everything) are bumped
+    version = get_cache_version(fund="Project Chimera", kinds=["positions", "trades"])
 """
 
+import json
 import os
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
-# Cache version file location (in web_dashboard directory)
-VERSION_FILE = Path(__file__).parent / ".cache_version"
+# Shared version file location (in web_dashboard directory)
+VERSIONS_FILE = Path(__file__).parent / ".cache_versions.json"
 
+# How often readers look for bumps made by other processes
+POLL_INTERVAL_SECONDS = 1.0
 
-def get_cache_version() -> str:
-    """Get current cache version from file.
-    
-    Returns:
-        Cache version string (timestamp or BUILD_TIMESTAMP)
-    """
+# Data kinds that writers bump
+POSITIONS = "positions"
+TRADES = "trades"
+CASH = "cash"
+CONTRIBUTIONS = "contributions"
+DIVIDENDS = "dividends"
+BENCHMARKS = "benchmarks"
+FUNDS = "funds"  # Fund list, fund settings/thesis and user fund assignments
+CONGRESS = "congress"  # Congress trades and their AI analysis
+
+GLOBAL_NAMESPACE = "global"
+
+_versions: Dict[str, str] = {}
+_listeners: List[Callable[[Set[str]], None]] = []
+_lock = threading.RLock()
+_file_mtime: Optional[float] = None
+_last_poll = 0.0
+_bump_counter = 0
+
+
+def _fund_namespace(fund: str, kind: str) -> str:
+    return f"fund:{fund}:{kind}"
+
+
+def _any_fund_namespace(kind: str) -> str:
+    """Bumped whenever `kind` changes for any fund; used by cross-fund results."""
+    return f"any:{kind}"
+
+
+def _all_funds_namespace(kind: str) -> str:
+    """Bumped when `kind` changes for all funds at once (fund unknown)."""
+    return f"all:{kind}"
+
+
+def _default_version() -> str:
+    # Deployment time, so a new build starts with fresh keys
+    return os.getenv("BUILD_TIMESTAMP", "0")
+
+
+def _new_version() -> str:
+    global _bump_counter
+    _bump_counter += 1
+    return f"{datetime.now().isoformat()}#{os.getpid()}-{_bump_counter}"
+
+
+def _notify(changed: Set[str]) -> None:
+    if not changed:
+        return
+    for listener in list(_listeners):
+        try:
+            listener(changed)
+        except Exception as e:
+            logger.warning(f"Cache version listener failed: {e}")
+
+
+def _poll_file(force: bool = False) -> None:
+    """Merge versions bumped by other processes (cheap stat; read only on change)."""
+    global _file_mtime, _last_poll
+    now = time.monotonic()
+    if not force and now - _last_poll < POLL_INTERVAL_SECONDS:
+        return
+    _last_poll = now
+    try:
+        mtime = VERSIONS_FILE.stat().st_mtime
+    except OSError:
+        return
+    if mtime == _file_mtime:
+        return
     try:
-        if VERSION_FILE.exists():
-            version = VERSION_FILE.read_text().strip()
-            if version:
-                return version
+        stored = json.loads(VERSIONS_FILE.read_text() or "{}")
     except Exception as e:
-        logger.debug(f"Could not read cache version file: {e}")
-    
-    # Fallback to BUILD_TIMESTAMP (deployment time) or current time
-    return os.getenv("BUILD_TIMESTAMP", datetime.now().strftime("%Y%m%d_%H%M%S"))
+        logger.debug(f"Could not read cache versions file: {e}")
+        return
+    with _lock:
+        _file_mtime = mtime
+        changed = {ns for ns, version in stored.items() if _versions.get(ns) != version}
+        _versions.update(stored)
+    _notify(changed)
+
+
+def _write_file(changed: Set[str]) -> None:
+    """Persist this process's bumps for other processes (atomic replace)."""
+    global _file_mtime
+    tmp_path = VERSIONS_FILE.with_suffix(f".{os.getpid()}.tmp")
+    with _lock:
+        try:
+            stored = json.loads(VERSIONS_FILE.read_text() or "{}") if VERSIONS_FILE.exists() else {}
+        except Exception:
+            stored = {}
+        # Only our own bumps: other namespaces may have been bumped elsewhere since our last poll
+        stored.update({namespace: _versions[namespace] for namespace in changed})
+        tmp_path.write_text(json.dumps(stored, sort_keys=True))
+        os.replace(tmp_path, VERSIONS_FILE)
+        _file_mtime = VERSIONS_FILE.stat().st_mtime
+
+
+def get_cache_version(fund: Optional[str] = None, kinds: Optional[Iterable[str]] = None) -> str:
+    """Get the current version for cached data.
+
+    Args:
+        fund: Fund the cached data belongs to (None = data spanning all funds)
+        kinds: Data kinds the cached data depends on. None returns the global
+            version only, which changes on full invalidation.
+
+    Returns:
+        Version string; changes whenever any namespace it covers is bumped
+    """
+    _poll_file()
+    with _lock:
+        parts = [_versions.get(GLOBAL_NAMESPACE, _default_version())]
+        for kind in sorted(set(kinds or ())):
+            if fund:
+                parts.append(_versions.get(_fund_namespace(fund, kind), "0"))
+                parts.append(_versions.get(_all_funds_namespace(kind), "0"))
+            else:
+                parts.append(_versions.get(_any_fund_namespace(kind), "0"))
+    return parts[0] if len(parts) == 1 else "|".join(parts)
+
 
+def bump_cache_version(fund: Optional[str] = None, kinds: Optional[Iterable[str]] = None,
+                       funds: Optional[Iterable[str]] = None) -> None:
+    """Invalidate cached data.
 
-def bump_cache_version() -> None:
-    """Update cache version to current timestamp.
-    
-    Call this after updating portfolio data to invalidate Streamlit's cache.
+    With no arguments everything is invalidated. Otherwise only results that
+    depend on the given kinds (for the given funds) are.
     Safe to call even if it fails - will just log a warning.
+
+    Args:
+        fund: Fund whose data changed (None with kinds = the kinds changed for every fund)
+        kinds: Data kinds that changed, e.g. [POSITIONS, CASH]
+        funds: Several funds whose data changed (combined with fund)
     """
     try:
-        new_version = datetime.now().isoformat()
-        VERSION_FILE.write_text(new_version)
-        logger.info(f"Cache version bumped to: {new_version}")
+        _poll_file(force=True)
+        fund_list = [f for f in ([fund] if fund else []) + list(funds or []) if f]
+        kind_list = list(kinds or [])
+
+        with _lock:
+            changed: Set[str] = set()
+            if not kind_list and not fund_list:
+                changed.add(GLOBAL_NAMESPACE)
+            elif not kind_list:
+                raise ValueError("kinds must be given when bumping specific funds")
+            else:
+                for kind in kind_list:
+                    changed.add(_any_fund_namespace(kind))
+                    if fund_list:
+                        changed.update(_fund_namespace(f, kind) for f in fund_list)
+                    else:
+                        changed.add(_all_funds_namespace(kind))
+            version = _new_version()
+            for namespace in changed:
+                _versions[namespace] = version
+
     except Exception as e:
         logger.warning(f"Failed to bump cache version: {e}")
         # Don't raise - cache bumping failure shouldn't break the job
+        return
+
+    try:
+        _write_file(changed)
+    except Exception as e:
+        # This process still sees the bump; other processes fall back to TTLs
+        logger.warning(f"Failed to share cache version bump with other processes: {e}")
+    _notify(changed)
+    logger.info(f"Cache version bumped: {', '.join(sorted(changed))}")
+
+
+def add_version_listener(listener: Callable[[Set[str]], None]) -> None:
+    """Call listener(changed_namespaces) after every bump seen by this process."""
+    with _lock:
+        _listeners.append(listener)
+
+
+def remove_version_listener(listener: Callable[[Set[str]], None]) -> None:
+    """Stop notifying a listener added with add_version_listener."""
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
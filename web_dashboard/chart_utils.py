@@ -42,29 +42,42 @@ BENCHMARK_CONFIG = {
 MARKET_HOLIDAYS = MarketHolidays()
 
 
+def _add_vrects(fig: go.Figure, spans: List[Tuple[datetime, datetime]], fillcolor: str,
+                labels: Optional[List[str]] = None) -> None:
+    """Add full-height shaded spans, as fig.add_vrect would, in one batch.
+    
+    fig.add_vrect re-validates the layout on every call, which made shading a
+    multi-year chart take seconds.
+    """
+    if not spans:
+        return
+    fig.layout.shapes += tuple(
+        go.layout.Shape(type="rect", xref="x", yref="y domain", x0=x0, x1=x1, y0=0, y1=1,
+                        fillcolor=fillcolor, layer="below", line_width=0)
+        for x0, x1 in spans
+    )
+    if labels:
+        fig.layout.annotations += tuple(
+            go.layout.Annotation(xref="x", yref="y domain", x=x0, y=1, text=label, showarrow=False,
+                                 xanchor="left", yanchor="top", font=dict(size=10, color="gray"))
+            for (x0, _), label in zip(spans, labels)
+        )
+
+
 def _add_holiday_shading(fig: go.Figure, start_date: datetime, end_date: datetime,
                          market: str = 'us',
                          holiday_color: Optional[str] = 'rgba(211, 211, 211, 0.3)') -> None:
     """Add shading for market holidays using the centralized utility."""
-    holidays_in_range = MARKET_HOLIDAYS.get_holidays_for_range(start_date.date(), end_date.date(), market=market)
+    holidays_in_range = sorted(MARKET_HOLIDAYS.get_holidays_for_range(start_date.date(), end_date.date(), market=market))
 
+    spans = []
+    labels = []
     for holiday_date in holidays_in_range:
         start_shade = datetime.combine(holiday_date, datetime.min.time())
-        end_shade = start_shade + timedelta(days=1)
+        spans.append((start_shade, start_shade + timedelta(days=1)))
+        labels.append(MARKET_HOLIDAYS.get_holiday_name(holiday_date) or "Holiday")
 
-        holiday_name = MARKET_HOLIDAYS.get_holiday_name(holiday_date) or "Holiday"
-
-        fig.add_vrect(
-            x0=start_shade,
-            x1=end_shade,
-            fillcolor=holiday_color,
-            layer="below",
-            line_width=0,
-            annotation_text=holiday_name,
-            annotation_position="top left",
-            annotation_font_size=10,
-            annotation_font_color="gray"
-        )
+    _add_vrects(fig, spans, holiday_color, labels)
 
 
 # Theme-aware chart helpers
@@ -247,11 +260,9 @@ def _filter_trading_days(df: pd.DataFrame, date_column: str = 'date', market: st
     # Use errors='coerce' to handle invalid date strings gracefully (converts to NaT)
     df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
 
-    # Use the is_trading_day method from the utility
-    # Handle NaT values gracefully: treat them as non-trading days (filter them out)
-    trading_days_mask = df[date_column].apply(
-        lambda x: False if pd.isna(x) else MARKET_HOLIDAYS.is_trading_day(x.date(), market=market)
-    )
+    # One vectorized lookup against the precomputed trading calendar
+    # NaT values are treated as non-trading days (filtered out)
+    trading_days_mask = MARKET_HOLIDAYS.calendar(market).is_trading_day(df[date_column])
 
     return df[trading_days_mask]
 
@@ -284,43 +295,12 @@ def _add_weekend_shading(fig: go.Figure, start_date: datetime, end_date: datetim
     if hasattr(end_date_only, 'date'):
         end_date_only = end_date_only.date()
     
-    # Handle case where chart starts on a Sunday - shade the weekend that includes it
-    start_weekday = start_date_only.weekday()
-    if start_weekday == 6:  # Sunday
-        # Shade from previous Saturday 00:00 to Monday 00:00 (entire weekend)
-        previous_saturday = start_date_only - timedelta(days=1)
-        saturday_midnight = datetime.combine(previous_saturday, datetime.min.time())
-        monday_midnight = datetime.combine(start_date_only + timedelta(days=1), datetime.min.time())
-        
-        fig.add_vrect(
-            x0=saturday_midnight,
-            x1=monday_midnight,
-            fillcolor=weekend_color,
-            layer="below",
-            line_width=0,
-        )
-    
-    # Iterate through all dates to find Saturdays (start of weekends)
-    current_date = start_date_only
-    while current_date <= end_date_only:
-        weekday = current_date.weekday()
-        
-        if weekday == 5:  # Saturday (start of weekend)
-            # Shade from Saturday 00:00 to Monday 00:00 (entire weekend)
-            saturday_midnight = datetime.combine(current_date, datetime.min.time())
-            monday_midnight = datetime.combine(current_date + timedelta(days=2), datetime.min.time())
-            
-            fig.add_vrect(
-                x0=saturday_midnight,
-                x1=monday_midnight,
-                fillcolor=weekend_color,
-                layer="below",
-                line_width=0,
-            )
-            # Skip to Monday (we've covered the weekend)
-            current_date += timedelta(days=2)
-        else:
-            current_date += timedelta(days=1)
+    # Shade every weekend (Saturday 00:00 to Monday 00:00) that overlaps the range,
+    # including the one containing a Sunday start date
+    first_saturday = start_date_only - timedelta(days=1) if start_date_only.weekday() == 6 else start_date_only
+    saturdays = pd.date_range(first_saturday, end_date_only, freq='W-SAT')
+    spans = [(saturday.to_pydatetime(), (saturday + pd.Timedelta(days=2)).to_pydatetime()) for saturday in saturdays]
+    _add_vrects(fig, spans, weekend_color)
 
 
 @log_execution_time()
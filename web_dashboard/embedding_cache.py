@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Embedding Cache
+===============
+
+Embeddings keyed by a hash of the model name and normalized text, kept in a
+small in-process LRU backed by the ``embedding_cache`` table in the research
+Postgres (see schema/40_embedding_cache.sql).
+
+If the research database is unavailable the cache falls back to memory only
+for a few minutes before trying again; it never makes embedding generation fail.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Seconds to stay memory-only after a database error
+PERSISTENCE_RETRY_SECONDS = 300
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different copies share a cache entry."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def content_hash(model: str, text: str) -> str:
+    """Cache key for an embedding of text by model."""
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-level (memory, Postgres) embedding cache. Thread-safe."""
+
+    def __init__(self, postgres_client=None, memory_size: int = 2048, persistent: bool = True):
+        """
+        Args:
+            postgres_client: PostgresClient for the persistent level (created lazily if None)
+            memory_size: Maximum entries kept in memory
+            persistent: Set False to keep the cache in memory only
+        """
+        self._client = postgres_client
+        self._persistent = persistent
+        self._retry_at = 0.0
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._memory_size = memory_size
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        if not self._persistent or time.monotonic() < self._retry_at:
+            return None
+        if self._client is None:
+            try:
+                from postgres_client import PostgresClient
+                self._client = PostgresClient()
+            except Exception as e:
+                self._suspend_persistence(e)
+                return None
+        return self._client
+
+    def _suspend_persistence(self, error: Exception) -> None:
+        logger.warning(f"Embedding cache is memory-only for {PERSISTENCE_RETRY_SECONDS}s: {error}")
+        self._retry_at = time.monotonic() + PERSISTENCE_RETRY_SECONDS
+
+    def _remember(self, key: str, embedding: List[float]) -> None:
+        with self._lock:
+            self._memory[key] = embedding
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_size:
+                self._memory.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """Look up embeddings by key.
+
+        Returns:
+            Dict of key -> embedding for the keys that were found
+        """
+        found: Dict[str, List[float]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                embedding = self._memory.get(key)
+                if embedding is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = embedding
+
+        client = self._get_client() if missing else None
+        if client is not None:
+            try:
+                rows = client.execute_query(
+                    "SELECT content_hash, embedding FROM embedding_cache WHERE content_hash = ANY(%s)",
+                    (missing,)
+                )
+            except Exception as e:
+                self._suspend_persistence(e)
+                rows = []
+            for row in rows:
+                embedding = [float(x) for x in row['embedding']]
+                found[row['content_hash']] = embedding
+                self._remember(row['content_hash'], embedding)
+        return found
+
+    def put_many(self, model: str, embeddings: Dict[str, List[float]]) -> None:
+        """Store embeddings (key -> vector) produced by model."""
+        embeddings = {key: value for key, value in embeddings.items() if value}
+        if not embeddings:
+            return
+        for key, embedding in embeddings.items():
+            self._remember(key, embedding)
+
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.execute_many(
+                "INSERT INTO embedding_cache (content_hash, model, embedding) VALUES (%s, %s, %s) "
+                "ON CONFLICT (content_hash) DO NOTHING",
+                [(key, model, [float(x) for x in embedding]) for key, embedding in embeddings.items()]
+            )
+        except Exception as e:
+            self._suspend_persistence(e)
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache()
+    return _embedding_cache
@@ -9,21 +9,26 @@ Provides backward compatibility with utils.currency_converter functions.
 
 import sys
 from pathlib import Path
-from datetime import datetime, timezone, timedelta
-from typing import Dict, Optional, List
+from datetime import date as date_type, datetime, timezone, timedelta
+from typing import Any, Dict, Iterable, Optional, List, Tuple
 from decimal import Decimal
+import bisect
 import logging
+import threading
+import time
+
+import numpy as np
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from web_dashboard.supabase_client import SupabaseClient
+from web_dashboard.supabase_client import SupabaseClient, get_shared_client
 
 logger = logging.getLogger(__name__)
 
 
 def get_supabase_client(use_service_role: bool = False) -> Optional[SupabaseClient]:
-    """Get Supabase client instance.
+    """Get the shared Supabase client instance.
     
     Args:
         use_service_role: If True, use service role key (bypasses RLS)
@@ -32,12 +37,198 @@ def get_supabase_client(use_service_role: bool = False) -> Optional[SupabaseClie
         SupabaseClient instance or None if initialization fails
     """
     try:
-        return SupabaseClient(use_service_role=use_service_role)
+        return get_shared_client(use_service_role=use_service_role)
     except Exception as e:
         logger.error(f"Failed to initialize Supabase client: {e}")
         return None
 
 
+def _to_utc_datetime(value: Any) -> datetime:
+    """Normalize a date, datetime or ISO string to an aware UTC datetime (naive = UTC)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    elif isinstance(value, date_type) and not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class ExchangeRateSeries:
+    """In-memory history of one currency pair with as-of lookups.
+
+    The pair's rates are loaded once into timestamp-sorted arrays; a lookup
+    returns the latest rate on or before the requested time (the same answer
+    as SupabaseClient.get_exchange_rate) by binary search. Rates newer than
+    the loaded history are fetched incrementally, at most once per
+    ``refresh_interval`` seconds, so long-running processes pick up rows
+    written by refresh_exchange_rates_job.
+
+    Use get_exchange_rate_series() to share one instance per pair.
+    """
+
+    def __init__(self, from_currency: str = 'USD', to_currency: str = 'CAD',
+                 client: Optional[SupabaseClient] = None, refresh_interval: float = 300.0):
+        """
+        Initialize the series (nothing is loaded until the first lookup).
+
+        Args:
+            from_currency: Source currency
+            to_currency: Target currency
+            client: SupabaseClient to read from (default: created on first load)
+            refresh_interval: Minimum seconds between incremental refreshes
+        """
+        self.from_currency = from_currency
+        self.to_currency = to_currency
+        self.refresh_interval = refresh_interval
+        self._client = client
+        self._lock = threading.RLock()
+        self._times: List[datetime] = []
+        self._rates: List[Decimal] = []
+        self._times_ns = np.empty(0, dtype='int64')
+        self._rates_float = np.empty(0, dtype='float64')
+        self._loaded = False
+        self._last_refresh = 0.0
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def rate_on(self, when: Any) -> Optional[Decimal]:
+        """Latest rate on or before a date/datetime, or None if there is none."""
+        target = _to_utc_datetime(when)
+        with self._lock:
+            self._ensure_fresh(target)
+            idx = bisect.bisect_right(self._times, target) - 1
+            return self._rates[idx] if idx >= 0 else None
+
+    def latest(self) -> Optional[Decimal]:
+        """Most recent rate, or None if the pair has no rates."""
+        with self._lock:
+            self._ensure_fresh(datetime.now(timezone.utc))
+            return self._rates[-1] if self._rates else None
+
+    def rates_on(self, dates: Iterable[Any]) -> np.ndarray:
+        """Vectorized as-of lookup.
+
+        Args:
+            dates: Dates, datetimes, ISO strings or a datetime-like pandas/numpy array
+                (naive values are treated as UTC)
+
+        Returns:
+            Float array of rates aligned with ``dates``; NaN where no earlier rate exists
+        """
+        import pandas as pd
+        if not hasattr(dates, 'dtype'):
+            dates = list(dates)
+        stamps = pd.DatetimeIndex(pd.to_datetime(dates, utc=True)).as_unit('ns')
+        if len(stamps):
+            self._ensure_fresh(stamps.max().to_pydatetime())
+        with self._lock:
+            times_ns, rates = self._times_ns, self._rates_float
+        if len(stamps) == 0 or len(times_ns) == 0:
+            return np.full(len(stamps), np.nan)
+        idx = np.searchsorted(times_ns, stamps.asi8, side='right') - 1
+        out = rates[np.clip(idx, 0, None)]
+        return np.where(idx >= 0, out, np.nan)
+
+    def merge(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Add or replace rates from exchange_rates rows ({'timestamp', 'rate'}).
+
+        Writers call this after upserting so lookups in this process see the
+        new rates without another query. Rows for other pairs are ignored.
+        """
+        with self._lock:
+            if not self._loaded:
+                return  # The first load will read them from the database
+            self._merge_rows(rows)
+
+    def refresh(self) -> None:
+        """Fetch rates newer than the loaded history (full load on first use)."""
+        with self._lock:
+            client = self._get_client()
+            if client is None:
+                self._last_refresh = time.monotonic()
+                return
+            from data.repositories.supabase_pagination import SupabasePageReader
+            after = self._times[-1].isoformat() if self._times else None
+
+            def apply_filters(query):
+                query = query.eq("from_currency", self.from_currency).eq("to_currency", self.to_currency)
+                return query.gt("timestamp", after) if after else query
+
+            try:
+                rows = SupabasePageReader(
+                    client.supabase, "exchange_rates", "timestamp, rate, from_currency, to_currency",
+                    apply_filters, order_column="timestamp", max_workers=1
+                ).fetch_all()
+            except Exception as e:
+                logger.error(f"Error loading {self.from_currency}/{self.to_currency} exchange rates: {e}")
+                rows = []
+            self._merge_rows(rows)
+            if not self._loaded:
+                logger.info(f"Loaded {len(self._times)} {self.from_currency}/{self.to_currency} exchange rates")
+            self._loaded = True
+            self._last_refresh = time.monotonic()
+
+    def _ensure_fresh(self, target: datetime) -> None:
+        """Load on first use; refresh when asked for a time past the loaded history."""
+        with self._lock:
+            if not self._loaded:
+                self.refresh()
+            elif (not self._times or target > self._times[-1]) and \
+                    time.monotonic() - self._last_refresh >= self.refresh_interval:
+                self.refresh()
+
+    def _merge_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        merged: Dict[datetime, Decimal] = dict(zip(self._times, self._rates))
+        changed = False
+        for row in rows:
+            if row.get('from_currency', self.from_currency) != self.from_currency or \
+                    row.get('to_currency', self.to_currency) != self.to_currency:
+                continue
+            if row.get('timestamp') is None or row.get('rate') is None:
+                continue
+            try:
+                merged[_to_utc_datetime(row['timestamp'])] = Decimal(str(row['rate']))
+                changed = True
+            except Exception as e:
+                logger.warning(f"Could not parse rate entry: {e}")
+        if not changed:
+            return
+        self._times = sorted(merged)
+        self._rates = [merged[t] for t in self._times]
+        import pandas as pd
+        self._times_ns = pd.DatetimeIndex(self._times).as_unit('ns').asi8
+        self._rates_float = np.array([float(r) for r in self._rates], dtype='float64')
+
+    def _get_client(self) -> Optional[SupabaseClient]:
+        if self._client is None:
+            self._client = get_supabase_client()
+        return self._client
+
+
+_series_registry: Dict[Tuple[str, str], ExchangeRateSeries] = {}
+_series_registry_lock = threading.Lock()
+
+
+def get_exchange_rate_series(from_currency: str = 'USD', to_currency: str = 'CAD') -> ExchangeRateSeries:
+    """Process-wide ExchangeRateSeries for a currency pair."""
+    key = (from_currency.upper(), to_currency.upper())
+    with _series_registry_lock:
+        series = _series_registry.get(key)
+        if series is None:
+            series = _series_registry[key] = ExchangeRateSeries(*key)
+        return series
+
+
+def _merge_into_series(rows: List[Dict[str, Any]]) -> None:
+    """Push freshly written rates into any loaded series for their pairs."""
+    with _series_registry_lock:
+        series_list = list(_series_registry.values())
+    for series in series_list:
+        series.merge(rows)
+
+
 def load_exchange_rates_from_db(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
@@ -188,6 +379,12 @@ def reload_exchange_rate_for_date(
         success = client.upsert_exchange_rate(date, Decimal(str(rate)), from_currency, to_currency)
         
         if success:
+            _merge_into_series([{
+                'timestamp': date.replace(hour=0, minute=0, second=0, microsecond=0),
+                'rate': rate,
+                'from_currency': from_currency,
+                'to_currency': to_currency
+            }])
             logger.info(f"✅ Reloaded exchange rate for {date.date()}: {rate}")
             return Decimal(str(rate))
         else:
@@ -256,6 +453,7 @@ def reload_exchange_rates_for_range(
                     
                     if rates_to_upsert:
                         if client.upsert_exchange_rates(rates_to_upsert):
+                            _merge_into_series(rates_to_upsert)
                             logger.info(f"✅ Reloaded {len(rates_to_upsert)} actual historical rates from Bank of Canada")
                             return len(rates_to_upsert)
             
@@ -357,6 +555,7 @@ def sync_exchange_rates_from_csv(csv_path: Path, use_service_role: bool = True)
         success = client.upsert_exchange_rates(rates)
         
         if success:
+            _merge_into_series(rates)
             logger.info(f"✅ Synced {len(rates)} exchange rates from CSV to database")
         else:
             logger.error("Failed to sync exchange rates to database")
@@ -385,15 +584,11 @@ def get_exchange_rate_for_date_from_db(
     Returns:
         Exchange rate as Decimal
     """
-    client = get_supabase_client()
-    if not client:
-        logger.warning("Could not initialize Supabase client, using default rate")
-        return Decimal('1.35')
-    
+    series = get_exchange_rate_series(from_currency, to_currency)
     if target_date is None:
-        rate = client.get_latest_exchange_rate(from_currency, to_currency)
+        rate = series.latest()
     else:
-        rate = client.get_exchange_rate(target_date, from_currency, to_currency)
+        rate = series.rate_on(target_date)
     
     if rate is None:
         logger.warning(f"No exchange rate found, using default: 1.35")
@@ -21,18 +21,25 @@ Usage:
 Features:
     - TTL-based expiration (like Streamlit's ttl parameter)
     - Automatic cache key generation from function arguments
-    - Cache version support (for manual invalidation)
+    - Cache version support (for manual invalidation), optionally scoped to the
+      fund and data kinds a function reads (see cache_version)
     - Multiple backend support (SimpleCache, Redis, Memcached)
     - Thread-safe caching
+    - Single-flight: concurrent misses for the same key run the function once
+    - Optional stale-while-revalidate: serve the previous value while one
+      background thread refreshes it
 """
 
 import hashlib
+import inspect
 import json
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
 from functools import wraps
-from typing import Any, Callable, Optional, Dict
-from flask import current_app, has_app_context
+from typing import Any, Callable, Optional, Dict, Iterable
+from flask import current_app, has_app_context, has_request_context, copy_current_request_context
 
 logger = logging.getLogger(__name__)
 
@@ -175,6 +182,11 @@ def _get_cache():
         return _simple_cache
 
 
+def _qualified_name(func: Callable) -> str:
+    """Module-qualified name, so same-named functions in different modules get their own keys."""
+    return f"{func.__module__}.{func.__qualname__}"
+
+
 def _make_cache_key(func_name: str, args: tuple, kwargs: dict, cache_version: Optional[str] = None) -> str:
     """
     Generate a cache key from function name and arguments.
@@ -249,7 +261,98 @@ def _get_cache_ttl() -> int:
             return 3600  # 1 hour outside market hours
 
 
-def cache_data(ttl: Optional[int] = None, show_spinner: bool = False, use_market_hours: bool = False):
+# Longest a caller waits for another thread computing the same key before computing it itself
+SINGLE_FLIGHT_WAIT_SECONDS = 60
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'waits': 0, 'refreshes': 0, 'refresh_errors': 0}
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+class _Flight:
+    """One in-progress computation of a cache key that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+
+def _join_or_lead(cache_key: str):
+    """Return (flight, is_leader) for cache_key."""
+    with _flights_lock:
+        flight = _flights.get(cache_key)
+        if flight is not None:
+            return flight, False
+        flight = _flights[cache_key] = _Flight()
+        return flight, True
+
+
+def _land(cache_key: str, flight: _Flight) -> None:
+    with _flights_lock:
+        if _flights.get(cache_key) is flight:
+            del _flights[cache_key]
+    flight.done.set()
+
+
+class _StaleEntry:
+    """Cached value stored by stale-while-revalidate functions, with its freshness deadline."""
+
+    __slots__ = ('value', 'fresh_until')
+
+    def __init__(self, value: Any, fresh_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+
+    def __getstate__(self):
+        return (self.value, self.fresh_until)
+
+    def __setstate__(self, state):
+        self.value, self.fresh_until = state
+
+
+def _start_background(target: Callable[[], None]) -> None:
+    """Run target on a daemon thread with the caller's Flask request (or app) context."""
+    if has_request_context():
+        target = copy_current_request_context(target)
+    elif has_app_context():
+        app = current_app._get_current_object()
+        inner = target
+
+        def target():
+            with app.app_context():
+                inner()
+    threading.Thread(target=target, daemon=True, name="cache-revalidate").start()
+
+
+def _scoped_cache_version(func: Callable, args: tuple, kwargs: dict,
+                          kinds: Iterable[str], fund_param: Optional[str]) -> Optional[str]:
+    """Version covering the data kinds a call reads, for the fund it was called with."""
+    if not CACHE_VERSION_AVAILABLE:
+        return None
+    fund = None
+    if fund_param:
+        try:
+            fund = inspect.signature(func).bind_partial(*args, **kwargs).arguments.get(fund_param)
+        except TypeError:
+            fund = None
+    try:
+        return get_cache_version(fund=fund, kinds=kinds)
+    except Exception:
+        return None
+
+
+def cache_data(ttl: Optional[int] = None, show_spinner: bool = False, use_market_hours: bool = False,
+               kinds: Optional[Iterable[str]] = None, fund_param: Optional[str] = "fund",
+               stale_while_revalidate: Optional[int] = None):
     """
     Decorator for caching function results (similar to @st.cache_data).
     
@@ -258,62 +361,153 @@ def cache_data(ttl: Optional[int] = None, show_spinner: bool = False, use_market
              If use_market_hours=True, this parameter is ignored and TTL is calculated dynamically.
         show_spinner: Not used in Flask (no UI spinner), kept for API compatibility.
         use_market_hours: If True, use market-hours-aware TTL (300s during market hours, 3600s outside).
+        kinds: Data kinds the function reads (cache_version.POSITIONS, TRADES, ...). Results are
+             invalidated when those kinds are bumped for the call's fund. Without kinds, only a
+             full bump_cache_version() (or the TTL) invalidates results.
+        fund_param: Name of the argument holding the fund (None or a None value = all funds)
+        stale_while_revalidate: Seconds past the TTL during which the expired value is still
+             returned while a single background thread recomputes it. Requires a TTL.
+    
+    Concurrent misses for the same key are coalesced: one caller runs the function and
+    the others wait for its result (or its exception).
     
     Usage:
         @cache_data(ttl=300)  # Cache for 5 minutes (static)
         def get_expensive_data(param1, param2):
             return expensive_operation()
         
-        @cache_data(use_market_hours=True)  # Dynamic TTL based on market hours
+        @cache_data(use_market_hours=True, kinds=[POSITIONS])  # Dynamic TTL, per-fund invalidation
         def get_portfolio_data(fund: str):
             return fetch_portfolio(fund)
     """
+    kinds = tuple(kinds or ())
+    
     def decorator(func: Callable) -> Callable:
+        func_name = _qualified_name(func)
+
+        def _cache_get(cache, cache_key):
+            # Flask-Caching: use cache.get() which returns None if not found
+            try:
+                return cache.get(cache_key)
+            except Exception as cache_error:
+                logger.warning(f"Cache get error for {func.__name__}: {cache_error}", exc_info=True)
+                return None
+        
+        def _cache_set(cache, cache_key, result, effective_ttl, stale_window):
+            # Store in cache
+            try:
+                if stale_window and result is not None:
+                    entry = _StaleEntry(result, time.time() + effective_ttl)
+                    cache.set(cache_key, entry, timeout=effective_ttl + stale_window)
+                else:
+                    cache.set(cache_key, result, timeout=effective_ttl)
+            except Exception as cache_error:
+                logger.warning(f"Cache set error for {func.__name__}: {cache_error}", exc_info=True)
+                # Continue without caching if cache.set fails
+        
+        def _revalidate(cache, cache_key, args, kwargs, effective_ttl, stale_window):
+            flight, is_leader = _join_or_lead(cache_key)
+            if not is_leader:
+                return  # Already being refreshed
+            
+            def refresh():
+                try:
+                    result = func(*args, **kwargs)
+                    _cache_set(cache, cache_key, result, effective_ttl, stale_window)
+                    flight.result = result
+                    _count('refreshes')
+                except Exception as e:
+                    # Keep serving the stale value until it falls out of the window
+                    flight.error = e
+                    _count('refresh_errors')
+                    logger.warning(f"Background refresh of {func.__name__} failed: {e}")
+                finally:
+                    _land(cache_key, flight)
+            
+            try:
+                _start_background(refresh)
+            except Exception as e:
+                # Callers that joined this flight on a miss get the error instead of None
+                flight.error = e
+                _count('refresh_errors')
+                logger.warning(f"Could not start background refresh of {func.__name__}: {e}")
+                _land(cache_key, flight)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Extract cache_version from kwargs if present (for manual invalidation)
             cache_version = kwargs.pop('_cache_version', None)
+            if cache_version is None and kinds:
+                cache_version = _scoped_cache_version(func, args, kwargs, kinds, fund_param)
             
             # Determine TTL
             if use_market_hours:
                 effective_ttl = _get_cache_ttl()
             else:
                 effective_ttl = ttl
+            stale_window = stale_while_revalidate if effective_ttl else None
             
             # Generate cache key
-            cache_key = _make_cache_key(func.__name__, args, kwargs, cache_version)
+            cache_key = _make_cache_key(func_name, args, kwargs, cache_version)
             
             # Try to get from cache
             cache = _get_cache()
-            # Flask-Caching: use cache.get() which returns None if not found
-            try:
-                cached_value = cache.get(cache_key)
-            except Exception as cache_error:
-                logger.warning(f"Cache get error for {func.__name__}: {cache_error}", exc_info=True)
-                cached_value = None
+            cached_value = _cache_get(cache, cache_key)
+            
+            if isinstance(cached_value, _StaleEntry):
+                if time.time() >= cached_value.fresh_until:
+                    logger.debug(f"Serving stale {func.__name__} with key {cache_key[:16]}... while revalidating")
+                    _count('stale_hits')
+                    _revalidate(cache, cache_key, args, kwargs, effective_ttl, stale_window)
+                    return cached_value.value
+                cached_value = cached_value.value
             
             if cached_value is not None:
                 logger.debug(f"Cache hit for {func.__name__} with key {cache_key[:16]}...")
+                _count('hits')
                 return cached_value
             
-            # Cache miss - execute function
-            logger.debug(f"Cache miss for {func.__name__} with key {cache_key[:16]}...")
-            result = func(*args, **kwargs)
+            flight, is_leader = _join_or_lead(cache_key)
+            if not is_leader:
+                # Another thread is already computing this key - share its result
+                _count('waits')
+                if flight.done.wait(SINGLE_FLIGHT_WAIT_SECONDS):
+                    if flight.error is not None:
+                        raise flight.error
+                    return flight.result
+                logger.warning(f"Timed out waiting for {func.__name__} to be computed by another request")
+                return func(*args, **kwargs)
             
-            # Store in cache
             try:
-                cache.set(cache_key, result, timeout=effective_ttl)
-            except Exception as cache_error:
-                logger.warning(f"Cache set error for {func.__name__}: {cache_error}", exc_info=True)
-                # Continue without caching if cache.set fails
-            
-            return result
+                # The previous leader may have filled the cache between our get and taking the lead
+                cached_value = _cache_get(cache, cache_key)
+                if isinstance(cached_value, _StaleEntry):
+                    cached_value = cached_value.value
+                if cached_value is not None:
+                    _count('hits')
+                    flight.result = cached_value
+                    return cached_value
+                
+                # Cache miss - execute function
+                logger.debug(f"Cache miss for {func.__name__} with key {cache_key[:16]}...")
+                _count('misses')
+                result = func(*args, **kwargs)
+                _cache_set(cache, cache_key, result, effective_ttl, stale_window)
+                flight.result = result
+                return result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                _land(cache_key, flight)
         
         # Add cache clearing method to function
         def clear_cache(*args, **kwargs):
             """Clear cache for this function with specific arguments."""
             cache_version = kwargs.pop('_cache_version', None)
-            cache_key = _make_cache_key(func.__name__, args, kwargs, cache_version)
+            if cache_version is None and kinds:
+                cache_version = _scoped_cache_version(func, args, kwargs, kinds, fund_param)
+            cache_key = _make_cache_key(func_name, args, kwargs, cache_version)
             cache = _get_cache()
             cache.delete(cache_key)
         
@@ -352,13 +546,15 @@ def cache_resource(func: Optional[Callable] = None):
 
 def _cache_resource_impl(func: Callable) -> Callable:
     """Internal implementation of cache_resource decorator."""
+    func_name = _qualified_name(func)
+
     @wraps(func)
     def wrapper(*args, **kwargs):
         # Extract cache_version from kwargs if present
         cache_version = kwargs.pop('_cache_version', None)
         
         # Generate cache key
-        cache_key = _make_cache_key(func.__name__, args, kwargs, cache_version)
+        cache_key = _make_cache_key(func_name, args, kwargs, cache_version)
         
         # Try to get from cache
         cache = _get_cache()
@@ -390,7 +586,7 @@ def _cache_resource_impl(func: Callable) -> Callable:
     def clear_cache(*args, **kwargs):
         """Clear cache for this resource with specific arguments."""
         cache_version = kwargs.pop('_cache_version', None)
-        cache_key = _make_cache_key(func.__name__, args, kwargs, cache_version)
+        cache_key = _make_cache_key(func_name, args, kwargs, cache_version)
         cache = _get_cache()
         cache.delete(cache_key)
     
@@ -413,8 +609,18 @@ def clear_all_caches():
 
 
 def get_cache_stats() -> Dict[str, Any]:
-    """Get cache statistics (if supported by backend)."""
+    """Get cache statistics (if supported by backend).
+    
+    Besides backend details, includes this process's cache_data counters: hits,
+    stale_hits (served while revalidating), misses (function executed), waits
+    (coalesced onto another caller's computation), refreshes and refresh_errors
+    (background revalidations), plus the number of computations in flight.
+    """
     cache = _get_cache()
+    with _stats_lock:
+        counters = dict(_stats)
+    with _flights_lock:
+        counters['in_flight'] = len(_flights)
     
     if hasattr(cache, 'cache'):
         # Flask-Caching with SimpleCache
@@ -423,7 +629,8 @@ def get_cache_stats() -> Dict[str, Any]:
             return {
                 'total_keys': len(cache_dict),
                 'backend': 'SimpleCache',
-                'keys': list(cache_dict.keys())[:10]  # First 10 keys as sample
+                'keys': list(cache_dict.keys())[:10],  # First 10 keys as sample
+                **counters
             }
     
     # Simple cache stats
@@ -431,11 +638,13 @@ def get_cache_stats() -> Dict[str, Any]:
         return {
             'total_keys': len(cache._cache),
             'backend': 'SimpleCache',
-            'keys': list(cache._cache.keys())[:10]
+            'keys': list(cache._cache.keys())[:10],
+            **counters
         }
     
     return {
         'total_keys': 'unknown',
         'backend': 'unknown',
-        'keys': []
+        'keys': [],
+        **counters
     }
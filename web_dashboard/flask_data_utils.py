@@ -14,6 +14,7 @@ from datetime import datetime
 from supabase_client import SupabaseClient
 from flask_auth_utils import get_user_id_flask
 from flask_cache_utils import cache_data
+from cache_version import POSITIONS, TRADES, CASH, DIVIDENDS, FUNDS
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +45,7 @@ def get_supabase_client_flask() -> Optional[SupabaseClient]:
         return None
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, kinds=[FUNDS], fund_param=None)
 def get_available_funds_flask() -> List[str]:
     """Get list of available funds for current Flask user (cached 5min)"""
     try:
@@ -74,15 +75,9 @@ def get_available_funds_flask() -> List[str]:
         return []
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, kinds=[POSITIONS], stale_while_revalidate=300)
 def get_current_positions_flask(fund: Optional[str] = None, _cache_version: Optional[str] = None) -> pd.DataFrame:
     """Get current positions for Flask (cached 5min, with cache_version support)"""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
     client = get_supabase_client_flask()
     if not client:
         return pd.DataFrame()
@@ -132,15 +127,9 @@ def get_current_positions_flask(fund: Optional[str] = None, _cache_version: Opti
         return pd.DataFrame()
 
 
-@cache_data(ttl=None)  # Cache forever - historical trades don't change
+@cache_data(ttl=None, kinds=[TRADES])  # Cache until this fund's trades change
 def get_trade_log_flask(limit: int = 1000, fund: Optional[str] = None, _cache_version: Optional[str] = None) -> pd.DataFrame:
     """Get trade log for Flask (cached forever, with cache_version support)"""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
     client = get_supabase_client_flask()
     if not client:
         return pd.DataFrame()
@@ -162,15 +151,9 @@ def get_trade_log_flask(limit: int = 1000, fund: Optional[str] = None, _cache_ve
         return pd.DataFrame()
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, kinds=[CASH])
 def get_cash_balances_flask(fund: Optional[str] = None, _cache_version: Optional[str] = None) -> Dict[str, float]:
     """Get cash balances by currency for Flask (cached 5min, with cache_version support)"""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
     client = get_supabase_client_flask()
     if not client:
         return {"CAD": 0.0, "USD": 0.0}
@@ -217,7 +200,7 @@ def get_cash_balances_flask(fund: Optional[str] = None, _cache_version: Optional
         return {"CAD": 0.0, "USD": 0.0}
 
 
-@cache_data(ttl=3600)  # Cache for 1 hour - thesis changes infrequently
+@cache_data(ttl=3600, kinds=[FUNDS], fund_param="fund_name")  # Cache for 1 hour - thesis changes infrequently
 def get_fund_thesis_data_flask(fund_name: str) -> Optional[Dict[str, Any]]:
     """Get thesis data for a fund from the database view (Flask version, cached 1hr)"""
     client = get_supabase_client_flask()
@@ -278,7 +261,7 @@ def calculate_performance_metrics_flask(fund: Optional[str] = None) -> Dict[str,
     }
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, kinds=[POSITIONS], stale_while_revalidate=300)
 def calculate_portfolio_value_over_time_flask(fund: str, days: Optional[int] = None, display_currency: Optional[str] = None, _cache_version: Optional[str] = None) -> pd.DataFrame:
     """Calculate portfolio value over time (Flask version - Robust)
     
@@ -288,13 +271,6 @@ def calculate_portfolio_value_over_time_flask(fund: str, days: Optional[int] = N
     - Normalizes performance index to start at 100
     - Uses authenticated client (RLS safe)
     """
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
-            
     client = get_supabase_client_flask()
     if not client:
         return pd.DataFrame()
@@ -408,7 +384,7 @@ def calculate_portfolio_value_over_time_flask(fund: str, days: Optional[int] = N
         return pd.DataFrame()
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, kinds=[DIVIDENDS])
 def fetch_dividend_log_flask(days_lookback: int = 365, fund: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Fetch dividend log from Supabase (Flask version).
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Flask Response Utilities
+========================
+
+Helpers that make polled JSON APIs cheap when nothing has changed:
+
+- Conditional GET: @conditional_json derives an ETag from the data version of
+  the requested fund (see cache_version), the user's display preferences and
+  the query string. A client that sends a matching If-None-Match gets a 304
+  without the view running. Browsers do this automatically for responses
+  carrying an ETag and "Cache-Control: private, no-cache".
+- Compression: compress_response (an after_request hook) gzips JSON bodies,
+  or uses brotli when the optional brotli package is installed.
+- json_response: numpy/pandas-aware JSON via plotly_utils.dumps_json (orjson
+  when available).
+
+Usage:
+    bp.after_request(compress_response)
+
+    @bp.route('/api/thing')
+    @conditional_json(kinds=[POSITIONS])
+    def get_thing():
+        return json_response(build_thing())
+"""
+
+import gzip
+import hashlib
+import logging
+import time
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional
+
+from flask import Response, make_response, request
+
+from plotly_utils import dumps_json
+
+logger = logging.getLogger(__name__)
+
+# Optional brotli support (better ratio than gzip for large chart JSON)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    from cache_version import get_cache_version
+    CACHE_VERSION_AVAILABLE = True
+except ImportError:
+    CACHE_VERSION_AVAILABLE = False
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = 1024
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson'}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def json_response(payload: Any, status: int = 200) -> Response:
+    """JSON Response for payloads that may contain numpy, pandas or datetime values."""
+    return Response(dumps_json(payload), status=status, mimetype='application/json')
+
+
+def _freshness_bucket() -> int:
+    """Changes once per data cache TTL, so data not covered by version bumps still refreshes."""
+    from flask_cache_utils import _get_cache_ttl
+    ttl = _get_cache_ttl() or 300
+    return int(time.time() // ttl)
+
+
+def request_etag(kinds: Iterable[str], fund_param: str = 'fund') -> Optional[str]:
+    """ETag for the current request's data, or None if no data version is available.
+
+    Covers the data version for the fund in the query string, the user and their
+    currency/theme preferences, the path and query string, and a TTL-sized time bucket.
+    """
+    if not CACHE_VERSION_AVAILABLE:
+        return None
+    from flask_auth_utils import get_user_id_flask
+    from user_preferences import get_user_currency, get_user_theme
+
+    fund = request.args.get(fund_param) if fund_param else None
+    if not fund or fund.lower() == 'all':
+        fund = None
+    try:
+        parts = [
+            get_cache_version(fund=fund, kinds=kinds),
+            get_user_id_flask() or '',
+            get_user_currency() or 'CAD',
+            get_user_theme() or 'system',
+            request.path,
+            '&'.join(f"{key}={value}" for key, value in sorted(request.args.items(multi=True))),
+            _freshness_bucket(),
+        ]
+    except Exception as e:
+        logger.debug(f"Could not compute ETag for {request.path}: {e}")
+        return None
+    return hashlib.sha256("|".join(str(part) for part in parts).encode('utf-8')).hexdigest()[:32]
+
+
+def _mark_revalidate(response: Response, etag: str) -> Response:
+    # Weak: the same data may be sent gzip/brotli/identity encoded
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def conditional_json(kinds: Iterable[str], fund_param: str = 'fund'):
+    """Decorator answering If-None-Match with 304 while the data version is unchanged.
+
+    Args:
+        kinds: Data kinds the view reads (cache_version.POSITIONS, TRADES, ...)
+        fund_param: Query parameter holding the fund ('all' or missing = all funds)
+    """
+    kinds = tuple(kinds)
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = request_etag(kinds, fund_param)
+            if etag and request.if_none_match.contains_weak(etag):
+                return _mark_revalidate(Response(status=304), etag)
+
+            response = make_response(view(*args, **kwargs))
+            if etag and response.status_code == 200:
+                _mark_revalidate(response, etag)
+            return response
+        return wrapper
+    return decorator
+
+
+def compress_response(response: Response) -> Response:
+    """after_request hook: compress large JSON bodies for clients that accept it."""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+
+    accept = request.accept_encodings
+    if BROTLI_AVAILABLE and accept['br']:
+        response.set_data(brotli.compress(data, quality=BROTLI_QUALITY))
+        response.headers['Content-Encoding'] = 'br'
+    elif accept['gzip']:
+        response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
@@ -162,6 +162,10 @@ class FundMigrator:
                 # Insert new positions
                 result = self.client.supabase.table("portfolio_positions").insert(positions).execute()
                 print(f"  ✅ Migrated {len(positions)} portfolio positions")
+                
+                # Rebuild the fund's daily value rollup from the migrated positions
+                from data.repositories.fund_daily_values import refresh_fund_daily_values
+                refresh_fund_daily_values(self.client.supabase, fund_name)
             else:
                 print(f"  🔍 [DRY RUN] Would migrate {len(positions)} portfolio positions")
             
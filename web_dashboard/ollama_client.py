@@ -12,6 +12,7 @@ import json
 import logging
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generator, Optional, List, Dict, Any
 import requests
 from requests.adapters import HTTPAdapter
@@ -30,6 +31,9 @@ OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://host.docker.internal:1143
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
 OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "120"))
 OLLAMA_ENABLED = os.getenv("OLLAMA_ENABLED", "true").lower() == "true"
+# Batch embedding: texts per /api/embed request and requests in flight at once
+OLLAMA_EMBED_BATCH_SIZE = int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "16"))
+OLLAMA_EMBED_CONCURRENCY = int(os.getenv("OLLAMA_EMBED_CONCURRENCY", "2"))
 
 
 class OllamaClient:
@@ -878,6 +882,9 @@ If no tickers, sectors, themes, companies, or relationships are found, use empty
     def generate_embedding(self, text: str, model: str = "nomic-embed-text") -> List[float]:
         """Generate embedding vector for text using Ollama embedding API.
         
+        Served from the embedding cache when the same (normalized) text was
+        embedded before; see generate_embeddings.
+        
         Args:
             text: Text to generate embedding for
             model: Embedding model name (defaults to nomic-embed-text)
@@ -885,10 +892,101 @@ If no tickers, sectors, themes, companies, or relationships are found, use empty
         Returns:
             List of floats (768 dimensions for nomic-embed-text)
         """
+        return self.generate_embeddings([text], model=model)[0]
+    
+    def generate_embeddings(
+        self,
+        texts: List[str],
+        model: str = "nomic-embed-text",
+        use_cache: bool = True
+    ) -> List[List[float]]:
+        """Generate embeddings for many texts.
+        
+        Texts already in the embedding cache (keyed by model and normalized
+        text) are not sent to Ollama. The rest are deduplicated and embedded in
+        batches of OLLAMA_EMBED_BATCH_SIZE with at most OLLAMA_EMBED_CONCURRENCY
+        requests in flight.
+        
+        Args:
+            texts: Texts to embed
+            model: Embedding model name (defaults to nomic-embed-text)
+            use_cache: Read and write the embedding cache
+            
+        Returns:
+            One embedding per input text, in order ([] where generation failed)
+        """
+        if not texts:
+            return []
         if not self.enabled:
             logger.warning("Ollama embedding generation rejected: AI assistant disabled")
-            return []
+            return [[] for _ in texts]
+        
+        from embedding_cache import content_hash, get_embedding_cache
+        
+        keys = [content_hash(model, text) for text in texts]
+        cache = get_embedding_cache() if use_cache else None
+        embeddings = cache.get_many(keys) if cache else {}
+        
+        # One request per distinct uncached text
+        pending = {key: text for key, text in zip(keys, texts) if key not in embeddings}
+        if pending:
+            logger.debug(f"Embedding {len(pending)} of {len(texts)} texts with {model} ({len(texts) - len(pending)} cached)")
+            pending_keys = list(pending)
+            batches = [
+                pending_keys[i:i + OLLAMA_EMBED_BATCH_SIZE]
+                for i in range(0, len(pending_keys), OLLAMA_EMBED_BATCH_SIZE)
+            ]
+            
+            def embed_batch(batch_keys: List[str]) -> Dict[str, List[float]]:
+                vectors = self._embed_batch([pending[key] for key in batch_keys], model)
+                return {key: vector for key, vector in zip(batch_keys, vectors) if vector}
+            
+            if len(batches) == 1:
+                generated = embed_batch(batches[0])
+            else:
+                generated = {}
+                with ThreadPoolExecutor(max_workers=max(1, OLLAMA_EMBED_CONCURRENCY)) as executor:
+                    for result in executor.map(embed_batch, batches):
+                        generated.update(result)
+            
+            if cache and generated:
+                cache.put_many(model, generated)
+            embeddings.update(generated)
         
+        return [embeddings.get(key, []) for key in keys]
+    
+    def _embed_batch(self, texts: List[str], model: str) -> List[List[float]]:
+        """Embed texts with one /api/embed request.
+        
+        Falls back to one /api/embeddings request per text for Ollama
+        versions without the batch endpoint.
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/embed",
+                json={"model": model, "input": texts},
+                timeout=self.timeout
+            )
+            if response.status_code == 404 and "model" not in response.text.lower():
+                return [self._embed_single(text, model) for text in texts]
+            response.raise_for_status()
+            
+            embeddings = response.json().get("embeddings") or []
+            if len(embeddings) != len(texts):
+                logger.warning(f"Expected {len(texts)} embeddings from model {model}, got {len(embeddings)}")
+                return [[] for _ in texts]
+            return embeddings
+            
+        except requests.exceptions.Timeout:
+            logger.error(f"❌ Ollama embedding request timed out after {self.timeout}s")
+        except requests.exceptions.ConnectionError as e:
+            logger.error(f"❌ Cannot connect to Ollama API at {self.base_url}: {e}")
+        except Exception as e:
+            logger.error(f"❌ Error generating embeddings: {e}", exc_info=True)
+        return [[] for _ in texts]
+    
+    def _embed_single(self, text: str, model: str) -> List[float]:
+        """Embed one text with the legacy /api/embeddings endpoint."""
         # Prepare request payload
         payload = {
             "model": model,
@@ -31,6 +31,7 @@ from navigation import render_navigation
 
 # Import shared utilities
 from admin_utils import perf_timer, get_cached_funds, get_cached_fund_names, get_fund_statistics_batched
+from cache_version import bump_cache_version, POSITIONS, TRADES, CASH, CONTRIBUTIONS, DIVIDENDS, FUNDS
 
 # Import log_handler to register PERF logging level
 try:
@@ -182,6 +183,7 @@ else:
                                 .eq("name", fund_name)\
                                 .execute()
                             st.cache_data.clear()  # Clear cache after update
+                            bump_cache_version(fund=fund_name, kinds=[FUNDS])
                             st.toast(f"✅ {fund_name} marked as {'production' if new_status else 'test/dev'}", icon="✅")
                             st.rerun()
                         except Exception as e:
@@ -239,6 +241,7 @@ else:
                 }).eq("name", edit_fund).execute()
                 
                 st.cache_data.clear()
+                bump_cache_version(fund=edit_fund, kinds=[FUNDS])
                 st.toast(f"✅ Updated details for '{edit_fund}'", icon="✅")
                 st.rerun()
             except Exception as e:
@@ -282,6 +285,7 @@ else:
                     ]).execute()
                     
                     st.cache_data.clear()  # Clear cache after adding fund
+                    bump_cache_version(fund=new_fund_name, kinds=[FUNDS, CASH])
                     st.toast(f"✅ Fund '{new_fund_name}' created!", icon="✅")
                     st.rerun()
                 except Exception as e:
@@ -313,6 +317,7 @@ else:
                     # Update funds table - ON UPDATE CASCADE will update all related tables
                     client.supabase.table("funds").update({"name": new_name}).eq("name", rename_fund).execute()
                     st.cache_data.clear()  # Clear cache after renaming
+                    bump_cache_version()  # Every cached result keyed by the old name is now stale
                     st.toast(f"✅ Fund renamed to '{new_name}'", icon="✅")
                     st.rerun()
                 except Exception as e:
@@ -345,8 +350,10 @@ else:
                         fund_info = client.supabase.table("funds").select("is_production").eq("name", wipe_fund).execute()
                         is_production = fund_info.data[0].get("is_production", False) if fund_info.data else False
                         
-                        # Clear portfolio_positions
+                        # Clear portfolio_positions and the daily value rollup built from them
+                        from data.repositories.fund_daily_values import refresh_fund_daily_values
                         client.supabase.table("portfolio_positions").delete().eq("fund", wipe_fund).execute()
+                        refresh_fund_daily_values(client.supabase, wipe_fund)
                         
                         # SAFETY: Only clear trades for NON-production funds
                         if not is_production:
@@ -404,6 +411,9 @@ else:
                             if len(batch.data) < 500:
                                 break
                         
+                        from data.repositories.fund_daily_values import refresh_fund_daily_values
+                        refresh_fund_daily_values(service_client.supabase, wipe_pos_fund)
+                        
                         st.toast(f"✅ Wiped {deleted_total} portfolio positions for '{wipe_pos_fund}'", icon="✅")
                         st.success(f"Trades and contributions preserved. Use 'Rebuild Portfolio' to regenerate.")
                         st.rerun()
@@ -657,7 +667,9 @@ else:
                 else:
                     try:
                         # First clear all dependent data (FK constraints use ON DELETE RESTRICT)
+                        from data.repositories.fund_daily_values import refresh_fund_daily_values
                         client.supabase.table("portfolio_positions").delete().eq("fund", delete_fund).execute()
+                        refresh_fund_daily_values(client.supabase, delete_fund)
                         client.supabase.table("trade_log").delete().eq("fund", delete_fund).execute()
                         client.supabase.table("cash_balances").delete().eq("fund", delete_fund).execute()
                         client.supabase.table("fund_contributions").delete().eq("fund", delete_fund).execute()
@@ -669,6 +681,7 @@ else:
                         
                         # Now delete the fund itself
                         client.supabase.table("funds").delete().eq("name", delete_fund).execute()
+                        bump_cache_version(fund=delete_fund, kinds=[POSITIONS, TRADES, CASH, CONTRIBUTIONS, DIVIDENDS, FUNDS])
                         
                         st.toast(f"✅ Fund '{delete_fund}' permanently deleted", icon="✅")
                         st.rerun()
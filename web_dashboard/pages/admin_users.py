@@ -24,6 +24,7 @@ from navigation import render_navigation
 
 # Import shared utilities
 from admin_utils import perf_timer, get_cached_users, get_cached_contributors, get_cached_fund_names
+from cache_version import bump_cache_version, FUNDS
 
 # Page configuration
 st.set_page_config(page_title="User & Access Management", page_icon="👥", layout="wide")
@@ -201,6 +202,7 @@ with tab_users:
                                         
                                         if result_data and result_data.get('success'):
                                             st.cache_data.clear()
+                                            bump_cache_version(fund=assign_fund, kinds=[FUNDS])
                                             st.toast(f"✅ {result_data.get('message')}", icon="✅")
                                             st.rerun()
                                         elif result_data and result_data.get('already_assigned'):
@@ -229,6 +231,7 @@ with tab_users:
                                             
                                             if result.data:
                                                 st.cache_data.clear()
+                                                bump_cache_version(fund=remove_fund, kinds=[FUNDS])
                                                 st.toast(f"✅ Removed {remove_fund} from {email}", icon="✅")
                                                 st.rerun()
                                             else:
@@ -12,6 +12,9 @@ WHY THIS IS NEEDED:
   numpy arrays in binary format that JavaScript cannot parse correctly
 - This causes charts to display incorrect values (e.g., 1, 2, 3, 4 instead of 100, 101, 102)
 
+- Plotly >= 6 goes further and stores numpy arrays as base64 "typed arrays"
+  ({"dtype": "f8", "bdata": ...}), which plotly.js only understands from 2.28 on
+
 USAGE:
 ------
     from plotly_utils import serialize_plotly_figure
@@ -19,18 +22,31 @@ USAGE:
     fig = create_portfolio_value_chart(...)
     chart_json = serialize_plotly_figure(fig)
     return Response(chart_json, mimetype='application/json')
+
+Serialization uses orjson when installed (native numpy support, several times
+faster for large figures) and falls back to the standard json module.
 """
 
+import base64
+import dataclasses
+import decimal
 import json
 import logging
+import uuid
 import numpy as np
 import pandas as pd
-from datetime import datetime as dt
+from datetime import date, datetime as dt
 from typing import Any, Union
 import plotly.graph_objs as go
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 def convert_datetime_to_str(value: Any) -> Union[str, None]:
     """Convert various datetime types to ISO format string.
@@ -105,48 +121,110 @@ def convert_numpy_to_list(obj: Any) -> Any:
         return obj
 
 
+def _decode_typed_array(obj: dict) -> list:
+    """Decode a Plotly typed array ({"dtype", "bdata"[, "shape"]}) into nested lists."""
+    arr = np.frombuffer(base64.b64decode(obj['bdata']), dtype=np.dtype(obj['dtype']).newbyteorder('<'))
+    shape = obj.get('shape')
+    if shape:
+        arr = arr.reshape([int(dim) for dim in str(shape).split(',')])
+    return arr.tolist()
+
+
+def _expand_typed_arrays(obj: Any) -> Any:
+    """Replace Plotly typed arrays with lists, leaving numpy arrays for the encoder.
+    
+    Only dicts and lists that contain containers are walked, so long lists of
+    plain numbers are not visited element by element.
+    """
+    if isinstance(obj, dict):
+        if 'bdata' in obj and 'dtype' in obj:
+            try:
+                return _decode_typed_array(obj)
+            except Exception as e:
+                logger.warning(f"Failed to decode typed array: {e}")
+                return []
+        return {k: _expand_typed_arrays(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        if any(isinstance(item, (dict, list, tuple)) for item in obj):
+            return [_expand_typed_arrays(item) for item in obj]
+        return obj
+    return obj
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode the numpy/pandas/datetime values the JSON encoders don't handle natively.
+    
+    Decimal, UUID and dataclass values are encoded like Flask's default JSON
+    provider does (str, str and dict), so responses don't change when a route
+    moves from jsonify to dumps_json.
+    """
+    if obj is pd.NA:
+        return None
+    if isinstance(obj, np.ndarray):
+        if np.issubdtype(obj.dtype, np.datetime64):
+            return [convert_datetime_to_str(x) for x in obj]
+        return obj.tolist()
+    if isinstance(obj, (pd.Timestamp, np.datetime64, dt)):
+        return convert_datetime_to_str(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return _json_default(obj.to_numpy())
+    if hasattr(obj, 'to_plotly_json'):
+        return obj.to_plotly_json()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _sanitize_floats(obj: Any) -> Any:
+    """NaN/Infinity -> None for the stdlib fallback (orjson already does this)."""
+    if isinstance(obj, float):
+        return None if obj != obj or obj in (float('inf'), float('-inf')) else obj
+    if isinstance(obj, dict):
+        return {k: _sanitize_floats(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_sanitize_floats(v) for v in obj]
+    return obj
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize obj (which may contain numpy, pandas and datetime values) to UTF-8 JSON.
+    
+    NaN and infinite floats become null so that the output is valid for JSON.parse.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    # Round-trip through default so that numpy floats are sanitized too
+    plain = json.loads(json.dumps(obj, default=_json_default))
+    return json.dumps(_sanitize_floats(plain), allow_nan=False).encode('utf-8')
+
+
+def figure_to_dict(fig: go.Figure) -> dict:
+    """Plain-Python dict for a figure (lists instead of numpy or typed arrays)."""
+    data = dumps_json(_expand_typed_arrays(fig.to_plotly_json()))
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
 def serialize_plotly_figure(fig: go.Figure, pre_convert_traces: bool = True) -> str:
     """Serialize a Plotly figure to JSON string with proper numpy array conversion.
     
     This is the recommended way to serialize Plotly figures in Flask routes.
-    It ensures numpy arrays are converted to Python lists before JSON serialization,
+    It ensures numpy arrays (and Plotly typed arrays) become plain JSON lists,
     preventing frontend parsing errors.
     
     Args:
         fig: Plotly Figure object
-        pre_convert_traces: If True, converts numpy arrays in traces before JSON encoding
-                          (faster, but may miss nested structures)
+        pre_convert_traces: Kept for compatibility; arrays are always converted
         
     Returns:
         JSON string ready for Response
     """
-    import plotly.utils
-    
-    # Pre-convert numpy arrays in traces for better performance
-    if pre_convert_traces:
-        for trace in fig.data:
-            if hasattr(trace, 'y') and trace.y is not None:
-                if isinstance(trace.y, np.ndarray):
-                    trace.y = trace.y.tolist()
-                elif hasattr(trace.y, '__iter__') and not isinstance(trace.y, (list, str)):
-                    # Handle numpy array-like objects
-                    trace.y = [float(x) if isinstance(x, (np.floating, np.integer)) else x for x in trace.y]
-            if hasattr(trace, 'x') and trace.x is not None:
-                # Convert x-axis (dates) to strings
-                if isinstance(trace.x, np.ndarray):
-                    # Check if it's datetime64 array
-                    if np.issubdtype(trace.x.dtype, np.datetime64):
-                        trace.x = [convert_datetime_to_str(x) for x in trace.x]
-                    else:
-                        trace.x = trace.x.tolist()
-                elif hasattr(trace.x, '__iter__') and not isinstance(trace.x, (list, str)):
-                    # Convert datetime objects to ISO strings
-                    trace.x = [convert_datetime_to_str(x) if isinstance(x, (pd.Timestamp, np.datetime64, dt)) else x for x in trace.x]
-    
-    # Serialize to JSON using PlotlyJSONEncoder
-    chart_data = json.loads(json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder))
-    
-    # Additional safety: Convert any remaining numpy types and datetime objects
-    chart_data = convert_numpy_to_list(chart_data)
-    
-    return json.dumps(chart_data)
+    return dumps_json(_expand_typed_arrays(fig.to_plotly_json())).decode('utf-8')
@@ -6,8 +6,11 @@ Handles research articles storage with connection pooling
 
 import os
 import logging
+import threading
+import time
+import uuid
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from contextlib import contextmanager
 from dotenv import load_dotenv
 
@@ -24,7 +27,7 @@ try:
     import psycopg2
     from psycopg2 import pool, sql
     from psycopg2.extras import RealDictCursor
-    from psycopg2 import OperationalError, Error
+    from psycopg2 import OperationalError, InterfaceError, Error
 except ImportError:
     print("[ERROR] psycopg2 not available")
     print("[SOLUTION] Install with: pip install psycopg2-binary")
@@ -33,39 +36,143 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+# Pool size (min, max) per workload. Each workload gets its own pool so a burst
+# of scheduler jobs cannot starve web requests of connections (and vice versa).
+# min is also how many idle connections are kept open between uses.
+# Override the maximum with RESEARCH_DB_POOL_MAX_<WORKLOAD>, e.g. RESEARCH_DB_POOL_MAX_WEB=20.
+POOL_SIZES: Dict[str, Tuple[int, int]] = {
+    "default": (1, 5),
+    "scheduler": (2, 8),   # APScheduler runs up to 7 jobs concurrently
+    "web": (2, 10),        # Flask request threads
+}
+
+# Connections idle longer than this are pinged before being handed out
+HEALTH_CHECK_IDLE_SECONDS = 30.0
+
+# Rows fetched per round trip by iter_query
+DEFAULT_ITER_BATCH_SIZE = 1000
+
+
+def _pool_size(workload: str) -> Tuple[int, int]:
+    """Resolve (min, max) connections for a workload, honouring env overrides"""
+    min_conn, max_conn = POOL_SIZES.get(workload, POOL_SIZES["default"])
+    override = os.getenv(f"RESEARCH_DB_POOL_MAX_{workload.upper()}")
+    if override:
+        try:
+            max_conn = max(int(override), 1)
+        except ValueError:
+            logger.warning(f"Ignoring invalid RESEARCH_DB_POOL_MAX_{workload.upper()}={override!r}")
+    return min(min_conn, max_conn), max_conn
+
+
+class _BlockingConnectionPool(pool.ThreadedConnectionPool):
+    """ThreadedConnectionPool that waits for a free connection and checks its health.
+
+    ThreadedConnectionPool raises PoolError as soon as every connection is
+    checked out; here callers block (up to ``timeout`` seconds) instead.
+    Connections that were closed by the server, or that fail a ``SELECT 1``
+    after sitting idle, are discarded and replaced on checkout.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, *args, timeout: float = 30.0, **kwargs):
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._timeout = timeout
+        self._last_used: Dict[int, float] = {}
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=self._timeout):
+            raise pool.PoolError(f"timed out after {self._timeout:.0f}s waiting for a connection")
+        try:
+            # Every idle connection may have gone stale (e.g. after a server
+            # restart); once those are discarded the pool opens a fresh one.
+            for _ in range(self.maxconn):
+                conn = super().getconn(key)
+                if self._is_healthy(conn):
+                    return conn
+                logger.info("Discarding stale Postgres connection")
+                super().putconn(conn, key, close=True)
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+            if conn is not None:
+                # Connections beyond minconn are closed rather than kept idle
+                if conn.closed:
+                    self._last_used.pop(id(conn), None)
+                else:
+                    self._last_used[id(conn)] = time.monotonic()
+
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < HEALTH_CHECK_IDLE_SECONDS:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except (OperationalError, InterfaceError):
+            return False
+
+
 class PostgresClient:
-    """Client for interacting with local Postgres database"""
+    """Client for interacting with local Postgres database
+    
+    Connection pools are shared per (database URL, workload) across all
+    instances and are safe to use from multiple threads.
+    """
     
-    _connection_pool: Optional[pool.SimpleConnectionPool] = None
-    _min_connections = 1
-    _max_connections = 5
+    _pools: Dict[Tuple[str, str], _BlockingConnectionPool] = {}
+    _pools_lock = threading.Lock()
     
-    def __init__(self, database_url: Optional[str] = None):
+    def __init__(self, database_url: Optional[str] = None, workload: str = "default"):
         """Initialize Postgres client
         
         Args:
             database_url: Optional connection string. If not provided, uses RESEARCH_DATABASE_URL from environment.
+            workload: Pool to draw connections from ("default", "scheduler" or "web"); see POOL_SIZES
         """
         self.database_url = database_url or os.getenv("RESEARCH_DATABASE_URL")
+        self.workload = workload
         
         if not self.database_url:
             raise ValueError("RESEARCH_DATABASE_URL must be set in environment or provided as parameter")
         
         # Initialize connection pool if not already created
-        if PostgresClient._connection_pool is None:
-            self._create_connection_pool()
+        self._get_pool()
     
-    def _create_connection_pool(self) -> None:
+    def _get_pool(self) -> _BlockingConnectionPool:
+        """Return this client's pool, creating it on first use"""
+        key = (self.database_url, self.workload)
+        existing = PostgresClient._pools.get(key)
+        if existing is not None and not existing.closed:
+            return existing
+        with PostgresClient._pools_lock:
+            existing = PostgresClient._pools.get(key)
+            if existing is None or existing.closed:
+                PostgresClient._pools[key] = self._create_connection_pool()
+            return PostgresClient._pools[key]
+    
+    def _create_connection_pool(self) -> _BlockingConnectionPool:
         """Create connection pool for database connections"""
+        min_connections, max_connections = _pool_size(self.workload)
         try:
-            PostgresClient._connection_pool = psycopg2.pool.SimpleConnectionPool(
-                PostgresClient._min_connections,
-                PostgresClient._max_connections,
+            connection_pool = _BlockingConnectionPool(
+                min_connections,
+                max_connections,
                 self.database_url
             )
-            
-            if not PostgresClient._connection_pool:
-                raise ValueError("Failed to create connection pool")
+            logger.debug(f"Created '{self.workload}' Postgres pool ({min_connections}-{max_connections} connections)")
+            return connection_pool
                 
         except psycopg2.OperationalError as e:
             logger.error(f"❌ Connection error: {e}")
@@ -110,19 +217,24 @@ class PostgresClient:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM ...")
         """
-        if PostgresClient._connection_pool is None:
-            self._create_connection_pool()
-        
-        conn = PostgresClient._connection_pool.getconn()
+        connection_pool = self._get_pool()
+        conn = connection_pool.getconn()
+        broken = False
         try:
             yield conn
             conn.commit()
         except Exception as e:
-            conn.rollback()
+            # A dropped connection can't be rolled back; close it instead of returning it to the pool
+            broken = conn.closed or isinstance(e, (OperationalError, InterfaceError))
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except (OperationalError, InterfaceError):
+                    broken = True
             logger.error(f"Database error: {e}")
             raise
         finally:
-            PostgresClient._connection_pool.putconn(conn)
+            connection_pool.putconn(conn, close=broken)
     
     def test_connection(self) -> bool:
         """Test database connection"""
@@ -169,6 +281,39 @@ class PostgresClient:
             logger.error(f"❌ Error executing query: {e}")
             raise
     
+    def iter_query(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = DEFAULT_ITER_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """Stream a SELECT query's rows as dictionaries using a server-side cursor
+        
+        Rows are fetched ``batch_size`` at a time, so only one batch is held in
+        memory. The connection stays checked out until the iterator is
+        exhausted or closed; iterate it fully or wrap it in
+        ``contextlib.closing`` when stopping early.
+        
+        Args:
+            query: SQL query string
+            params: Optional tuple of parameters for parameterized query
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            One dictionary per row
+        """
+        with self.get_connection() as conn:
+            # Named cursors are server-side; the name only has to be unique per connection
+            cursor = conn.cursor(name=f"iter_{uuid.uuid4().hex}", cursor_factory=RealDictCursor)
+            cursor.itersize = batch_size
+            try:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                if not conn.closed:
+                    cursor.close()
+    
     def execute_update(self, query: str, params: Optional[tuple] = None) -> int:
         """Execute an INSERT/UPDATE/DELETE query
         
@@ -212,10 +357,11 @@ class PostgresClient:
             raise
     
     def close_pool(self) -> None:
-        """Close all connections in the pool"""
-        if PostgresClient._connection_pool:
-            PostgresClient._connection_pool.closeall()
-            PostgresClient._connection_pool = None
+        """Close all connections in this client's pool"""
+        with PostgresClient._pools_lock:
+            connection_pool = PostgresClient._pools.pop((self.database_url, self.workload), None)
+        if connection_pool and not connection_pool.closed:
+            connection_pool.closeall()
     
     def __del__(self):
         """Cleanup on object destruction"""
@@ -6,26 +6,48 @@ Handles CRUD operations for research articles stored in local Postgres
 
 import json
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from typing import Optional, List, Dict, Any, Iterator, Set, Union
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 from postgres_client import PostgresClient
+from psycopg2.extras import RealDictCursor
 
 logger = logging.getLogger(__name__)
 
+# ANN index over research_articles.embedding (see schema/41_research_embedding_index.sql)
+EMBEDDING_INDEX_NAME = "idx_research_articles_embedding_hnsw"
+EMBEDDING_INDEX_VALID_QUERY = (
+    "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = %s"
+)
+# Candidates the HNSW scan collects per query; raised when filters discard some of them
+HNSW_EF_SEARCH = 100
+HNSW_EF_SEARCH_FILTERED = 400
+# How long ETF/sector metadata from `securities` is reused
+SECURITY_METADATA_TTL_SECONDS = 3600
+
 
 class ResearchRepository:
     """Repository for research articles stored in local Postgres"""
     
-    def __init__(self, postgres_client: Optional[PostgresClient] = None):
+    # Process-wide: ETF sector by ticker (None = not an ETF) with fetch time
+    _etf_sector_cache: Dict[str, Any] = {}
+    _etf_sector_lock = threading.Lock()
+    # Process-wide: whether ensure_embedding_index has been started
+    _embedding_index_checked = False
+    _embedding_index_lock = threading.Lock()
+    
+    def __init__(self, postgres_client: Optional[PostgresClient] = None, workload: str = "default"):
         """Initialize research repository
         
         Args:
             postgres_client: Optional PostgresClient instance. If not provided, creates a new one.
+            workload: Connection pool for a newly created client ("default", "scheduler" or "web")
         """
         try:
-            self.client = postgres_client or PostgresClient()
+            self.client = postgres_client or PostgresClient(workload=workload)
             # Check which ticker column exists (for backward compatibility)
             self._has_tickers_column = self._check_tickers_column_exists()
             logger.debug(f"ResearchRepository initialized successfully (tickers column: {self._has_tickers_column})")
@@ -856,6 +878,98 @@ class ResearchRepository:
             logger.error(f"❌ Error updating article fund: {e}")
             return False
     
+    def ensure_embedding_index(self) -> bool:
+        """Create the HNSW index on research_articles.embedding if it is missing.
+        
+        The index is built CONCURRENTLY so inserts continue while it builds.
+        Every process (each web worker and the scheduler) calls this, so
+        builders take an advisory lock first and a process that cannot get it
+        leaves the build to the one holding it. Postgres reports an index as
+        INVALID both while it is being built and after a failed concurrent
+        build; under the lock only the second case is possible, so the lock
+        holder drops such an index and rebuilds it.
+        
+        Returns:
+            True if a valid index exists (or was created)
+        """
+        try:
+            existing = self.client.execute_query(EMBEDDING_INDEX_VALID_QUERY, (EMBEDDING_INDEX_NAME,))
+            if existing and existing[0].get('indisvalid'):
+                return True
+            
+            with self.client.get_connection() as conn:
+                # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block
+                conn.autocommit = True
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", (EMBEDDING_INDEX_NAME,))
+                    if not cursor.fetchone()[0]:
+                        logger.info(f"{EMBEDDING_INDEX_NAME} is being built by another process")
+                        return False
+                    try:
+                        # Re-check under the lock: the previous holder may have just finished
+                        cursor.execute(EMBEDDING_INDEX_VALID_QUERY, (EMBEDDING_INDEX_NAME,))
+                        row = cursor.fetchone()
+                        if row and row[0]:
+                            return True
+                        if row:
+                            logger.warning(f"{EMBEDDING_INDEX_NAME} is INVALID (interrupted build) - rebuilding")
+                            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {EMBEDDING_INDEX_NAME}")
+                        logger.info(f"Building {EMBEDDING_INDEX_NAME} on research_articles (this can take a while)...")
+                        cursor.execute(
+                            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {EMBEDDING_INDEX_NAME} "
+                            "ON research_articles USING hnsw (embedding vector_cosine_ops)"
+                        )
+                    finally:
+                        cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", (EMBEDDING_INDEX_NAME,))
+                finally:
+                    conn.autocommit = False
+            logger.info(f"✅ Built {EMBEDDING_INDEX_NAME}")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not create {EMBEDDING_INDEX_NAME} (similarity search will scan the table): {e}")
+            return False
+    
+    def _ensure_embedding_index_once(self) -> None:
+        """Start ensure_embedding_index in the background, once per process."""
+        with ResearchRepository._embedding_index_lock:
+            if ResearchRepository._embedding_index_checked:
+                return
+            ResearchRepository._embedding_index_checked = True
+        threading.Thread(target=self.ensure_embedding_index, name="embedding-index", daemon=True).start()
+    
+    def _get_etf_sector(self, ticker: str) -> Optional[str]:
+        """Return the sector of an ETF ticker, or None if the ticker is not an ETF.
+        
+        Cached in process for SECURITY_METADATA_TTL_SECONDS.
+        """
+        now = time.monotonic()
+        with ResearchRepository._etf_sector_lock:
+            cached = ResearchRepository._etf_sector_cache.get(ticker)
+        if cached is not None and now - cached[1] < SECURITY_METADATA_TTL_SECONDS:
+            return cached[0]
+        
+        etf_sector = None
+        try:
+            sector_query = "SELECT sector, company_name FROM securities WHERE ticker = %s"
+            sector_result = self.client.execute_query(sector_query, (ticker,))
+            
+            if sector_result:
+                sec = sector_result[0]
+                company_name = sec.get('company_name', '') or ''
+                is_etf = ('etf' in ticker.lower() or (company_name and 'etf' in company_name.lower()))
+                if is_etf:
+                    etf_sector = sec.get('sector')
+                    logger.debug(f"Ticker {ticker} is an ETF with sector: {etf_sector}")
+        except Exception as e:
+            # Don't cache failures; try again next time
+            logger.debug(f"Could not check ETF status for {ticker}: {e}")
+            return None
+        
+        with ResearchRepository._etf_sector_lock:
+            ResearchRepository._etf_sector_cache[ticker] = (etf_sector, now)
+        return etf_sector
+    
     def search_similar_articles(
         self,
         query_embedding: List[float],
@@ -866,6 +980,10 @@ class ResearchRepository:
     ) -> List[Dict[str, Any]]:
         """Search for articles similar to the query embedding using vector similarity.
         
+        The nearest ``limit`` articles are found by ordering on cosine distance
+        (so the HNSW index can serve the query) and the similarity threshold
+        is applied to those candidates afterwards.
+        
         Args:
             query_embedding: Vector embedding of the search query (768 dimensions)
             limit: Maximum number of results to return
@@ -877,6 +995,8 @@ class ResearchRepository:
             List of article dictionaries with similarity scores
         """
         try:
+            self._ensure_embedding_index_once()
+            
             # Convert embedding list to PostgreSQL vector format
             embedding_str = "[" + ",".join(str(float(x)) for x in query_embedding) + "]"
             
@@ -889,31 +1009,16 @@ class ResearchRepository:
                 SELECT 
                     id, {ticker_column}, sector, article_type, title, url, summary, content,
                     source, published_at, fetched_at, relevance_score,
-                    1 - (embedding <=> %s::vector) as similarity,
-                    (embedding IS NOT NULL) as has_embedding
+                    embedding <=> %s::vector as distance
                 FROM research_articles
                 WHERE embedding IS NOT NULL
-                  AND 1 - (embedding <=> %s::vector) >= %s
             """
-            params = [embedding_str, embedding_str, min_similarity]
+            params = [embedding_str]
             
             # Add optional filters
             if ticker:
                 # Check if this is an ETF and get its sector
-                etf_sector = None
-                try:
-                    sector_query = "SELECT sector, company_name FROM securities WHERE ticker = %s"
-                    sector_result = self.client.execute_query(sector_query, (ticker,))
-                    
-                    if sector_result:
-                        sec = sector_result[0]
-                        company_name = sec.get('company_name', '') or ''
-                        is_etf = ('etf' in ticker.lower() or (company_name and 'etf' in company_name.lower()))
-                        if is_etf:
-                            etf_sector = sec.get('sector')
-                            logger.debug(f"Ticker {ticker} is an ETF with sector: {etf_sector}")
-                except Exception as e:
-                    logger.debug(f"Could not check ETF status for {ticker}: {e}")
+                etf_sector = self._get_etf_sector(ticker)
                 
                 # Include sector articles for ETFs
                 if self._has_tickers_column:
@@ -937,23 +1042,30 @@ class ResearchRepository:
                 query += " AND article_type = %s"
                 params.append(article_type)
             
-            # Order by similarity and limit
-            query += " ORDER BY similarity DESC LIMIT %s"
+            # Nearest neighbours first (index-assisted), then the similarity threshold
+            query += " ORDER BY distance LIMIT %s"
             params.append(limit)
+            query = f"""
+                SELECT nearest.*, 1 - nearest.distance as similarity, true as has_embedding
+                FROM ({query}) nearest
+                WHERE nearest.distance <= %s
+                ORDER BY nearest.distance
+            """
+            params.append(1 - min_similarity)
             
-            results = self.client.execute_query(query, tuple(params))
+            ef_search = HNSW_EF_SEARCH_FILTERED if (ticker or article_type) else HNSW_EF_SEARCH
+            with self.client.get_connection() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                # Transaction-scoped; a no-op placeholder setting when pgvector has no HNSW support
+                cursor.execute("SET LOCAL hnsw.ef_search = %s", (max(ef_search, limit),))
+                cursor.execute(query, tuple(params))
+                results = [dict(row) for row in cursor.fetchall()]
             
             # Process datetime fields and normalize ticker data
             normalized_results = []
             for article in results:
-                article = self._normalize_ticker_data(article)
-                if article.get('published_at') and isinstance(article['published_at'], datetime):
-                    if article['published_at'].tzinfo is None:
-                        article['published_at'] = article['published_at'].replace(tzinfo=timezone.utc)
-                if article.get('fetched_at') and isinstance(article['fetched_at'], datetime):
-                    if article['fetched_at'].tzinfo is None:
-                        article['fetched_at'] = article['fetched_at'].replace(tzinfo=timezone.utc)
-                normalized_results.append(article)
+                article.pop('distance', None)
+                normalized_results.append(self._normalize_listed_article(article))
             
             logger.info(f"✅ Found {len(normalized_results)} similar articles (min_similarity={min_similarity})")
             return normalized_results
@@ -1038,6 +1150,25 @@ class ResearchRepository:
             logger.error(f"❌ Error checking if article exists: {e}")
             return False
     
+    def get_existing_urls(self, urls: List[str]) -> Set[str]:
+        """Return which of the given URLs already have an article (one query)
+        
+        Args:
+            urls: Article URLs to check
+            
+        Returns:
+            Set of URLs that already exist; empty on error
+        """
+        if not urls:
+            return set()
+        try:
+            query = "SELECT url FROM research_articles WHERE url = ANY(%s)"
+            results = self.client.execute_query(query, (list(urls),))
+            return {row['url'] for row in results}
+        except Exception as e:
+            logger.error(f"❌ Error checking which articles exist: {e}")
+            return set()
+    
     def get_article_statistics(self, days: int = 30) -> Dict[str, Any]:
         """Get statistics about articles
         
@@ -1138,6 +1269,73 @@ class ResearchRepository:
             logger.error(f"❌ Error getting unique tickers: {e}")
             return []
     
+    def _append_article_filters(
+        self,
+        query: str,
+        params: List[Any],
+        article_type: Optional[str],
+        source: Optional[str],
+        search_text: Optional[str],
+        embedding_filter: Optional[bool],
+        tickers_filter: Optional[List[str]]
+    ) -> str:
+        """Append the optional article list filters to a query, extending params in place"""
+        if article_type:
+            query += " AND article_type = %s"
+            params.append(article_type)
+        
+        if source:
+            query += " AND source = %s"
+            params.append(source)
+        
+        if search_text:
+            query += " AND (title ILIKE %s OR summary ILIKE %s OR content ILIKE %s)"
+            search_pattern = f"%{search_text}%"
+            params.extend([search_pattern, search_pattern, search_pattern])
+        
+        if embedding_filter is not None:
+            if embedding_filter:
+                query += " AND embedding IS NOT NULL"
+            else:
+                query += " AND embedding IS NULL"
+        
+        # Filter by tickers if provided (for owned tickers filter)
+        if tickers_filter and self._has_tickers_column:
+            # Use PostgreSQL array overlap operator to find articles with any matching ticker
+            query += " AND tickers && %s::text[]"
+            params.append(list(tickers_filter))
+        
+        return query
+    
+    def _normalize_listed_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize ticker data to the 'tickers' array format and make timestamps UTC-aware"""
+        # Note: RealDictCursor already returns TIMESTAMP columns as datetime objects
+        # so no conversion is needed. Just ensure timezone awareness if needed.
+        article = self._normalize_ticker_data(article)
+        for column in ('published_at', 'fetched_at'):
+            value = article.get(column)
+            if isinstance(value, datetime) and value.tzinfo is None:
+                article[column] = value.replace(tzinfo=timezone.utc)
+        return article
+    
+    def _stream_articles(
+        self,
+        query: str,
+        params: List[Any],
+        limit: Optional[int],
+        offset: int,
+        batch_size: int
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over an article list query through a server-side cursor"""
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+        if offset:
+            query += " OFFSET %s"
+            params.append(offset)
+        for article in self.client.iter_query(query, tuple(params), batch_size=batch_size):
+            yield self._normalize_listed_article(article)
+    
     def get_articles_by_date_range(
         self,
         start_date: datetime,
@@ -1147,9 +1345,11 @@ class ResearchRepository:
         search_text: Optional[str] = None,
         embedding_filter: Optional[bool] = None,
         tickers_filter: Optional[List[str]] = None,
-        limit: int = 100,
-        offset: int = 0
-    ) -> List[Dict[str, Any]]:
+        limit: Optional[int] = 100,
+        offset: int = 0,
+        stream: bool = False,
+        batch_size: int = 500
+    ) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
         """Get articles within a date range with optional filters
         
         Args:
@@ -1162,9 +1362,13 @@ class ResearchRepository:
             tickers_filter: Optional list of tickers to filter by (articles must have at least one matching ticker)
             limit: Maximum number of results
             offset: Number of results to skip
+            stream: If True, return an iterator that reads matching articles through a
+                server-side cursor instead of loading them all; limit may then be None
+                to walk every matching article
+            batch_size: Rows fetched per round trip when streaming
             
         Returns:
-            List of article dictionaries
+            List of article dictionaries, or an iterator of them when stream=True
         """
         try:
             # Ensure timezone-aware datetimes
@@ -1187,49 +1391,19 @@ class ResearchRepository:
             # Convert to ISO format strings for PostgreSQL
             params = [start_date.isoformat(), end_date.isoformat()]
             
-            if article_type:
-                query += " AND article_type = %s"
-                params.append(article_type)
-            
-            if source:
-                query += " AND source = %s"
-                params.append(source)
-            
-            if search_text:
-                query += " AND (title ILIKE %s OR summary ILIKE %s OR content ILIKE %s)"
-                search_pattern = f"%{search_text}%"
-                params.extend([search_pattern, search_pattern, search_pattern])
-            
-            if embedding_filter is not None:
-                if embedding_filter:
-                    query += " AND embedding IS NOT NULL"
-                else:
-                    query += " AND embedding IS NULL"
-            
-            # Filter by tickers if provided (for owned tickers filter)
-            if tickers_filter and self._has_tickers_column:
-                # Use PostgreSQL array overlap operator to find articles with any matching ticker
-                query += " AND tickers && %s::text[]"
-                params.append(list(tickers_filter))
+            query = self._append_article_filters(
+                query, params, article_type, source, search_text, embedding_filter, tickers_filter
+            )
+            query += " ORDER BY fetched_at DESC"
+            if stream:
+                return self._stream_articles(query, params, limit, offset, batch_size)
             
-            query += " ORDER BY fetched_at DESC LIMIT %s OFFSET %s"
+            query += " LIMIT %s OFFSET %s"
             params.extend([limit, offset])
             
             results = self.client.execute_query(query, tuple(params))
             
-            # Note: RealDictCursor already returns TIMESTAMP columns as datetime objects
-            # so no conversion is needed. Just ensure timezone awareness if needed.
-            # Normalize ticker data to always use 'tickers' array format
-            normalized_results = []
-            for article in results:
-                article = self._normalize_ticker_data(article)
-                if article.get('published_at') and isinstance(article['published_at'], datetime):
-                    if article['published_at'].tzinfo is None:
-                        article['published_at'] = article['published_at'].replace(tzinfo=timezone.utc)
-                if article.get('fetched_at') and isinstance(article['fetched_at'], datetime):
-                    if article['fetched_at'].tzinfo is None:
-                        article['fetched_at'] = article['fetched_at'].replace(tzinfo=timezone.utc)
-                normalized_results.append(article)
+            normalized_results = [self._normalize_listed_article(article) for article in results]
             
             logger.debug(f"Retrieved {len(normalized_results)} articles for date range")
             return normalized_results
@@ -1245,9 +1419,11 @@ class ResearchRepository:
         search_text: Optional[str] = None,
         embedding_filter: Optional[bool] = None,
         tickers_filter: Optional[List[str]] = None,
-        limit: int = 100,
-        offset: int = 0
-    ) -> List[Dict[str, Any]]:
+        limit: Optional[int] = 100,
+        offset: int = 0,
+        stream: bool = False,
+        batch_size: int = 500
+    ) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
         """Get all articles without date filtering
         
         Args:
@@ -1258,9 +1434,13 @@ class ResearchRepository:
             tickers_filter: Optional list of tickers to filter by (articles must have at least one matching ticker)
             limit: Maximum number of results
             offset: Number of results to skip
+            stream: If True, return an iterator that reads matching articles through a
+                server-side cursor instead of loading them all; limit may then be None
+                to walk every matching article
+            batch_size: Rows fetched per round trip when streaming
             
         Returns:
-            List of article dictionaries
+            List of article dictionaries, or an iterator of them when stream=True
         """
         try:
             # Select appropriate ticker column based on schema version
@@ -1275,49 +1455,19 @@ class ResearchRepository:
             """
             params = []
             
-            if article_type:
-                query += " AND article_type = %s"
-                params.append(article_type)
-            
-            if source:
-                query += " AND source = %s"
-                params.append(source)
-            
-            if search_text:
-                query += " AND (title ILIKE %s OR summary ILIKE %s OR content ILIKE %s)"
-                search_pattern = f"%{search_text}%"
-                params.extend([search_pattern, search_pattern, search_pattern])
-            
-            if embedding_filter is not None:
-                if embedding_filter:
-                    query += " AND embedding IS NOT NULL"
-                else:
-                    query += " AND embedding IS NULL"
-            
-            # Filter by tickers if provided (for owned tickers filter)
-            if tickers_filter and self._has_tickers_column:
-                # Use PostgreSQL array overlap operator to find articles with any matching ticker
-                query += " AND tickers && %s::text[]"
-                params.append(list(tickers_filter))
+            query = self._append_article_filters(
+                query, params, article_type, source, search_text, embedding_filter, tickers_filter
+            )
+            query += " ORDER BY fetched_at DESC"
+            if stream:
+                return self._stream_articles(query, params, limit, offset, batch_size)
             
-            query += " ORDER BY fetched_at DESC LIMIT %s OFFSET %s"
+            query += " LIMIT %s OFFSET %s"
             params.extend([limit, offset])
             
             results = self.client.execute_query(query, tuple(params))
             
-            # Note: RealDictCursor already returns TIMESTAMP columns as datetime objects
-            # so no conversion is needed. Just ensure timezone awareness if needed.
-            # Normalize ticker data to always use 'tickers' array format (same as get_articles_by_date_range)
-            normalized_results = []
-            for article in results:
-                article = self._normalize_ticker_data(article)
-                if article.get('published_at') and isinstance(article['published_at'], datetime):
-                    if article['published_at'].tzinfo is None:
-                        article['published_at'] = article['published_at'].replace(tzinfo=timezone.utc)
-                if article.get('fetched_at') and isinstance(article['fetched_at'], datetime):
-                    if article['fetched_at'].tzinfo is None:
-                        article['fetched_at'] = article['fetched_at'].replace(tzinfo=timezone.utc)
-                normalized_results.append(article)
+            normalized_results = [self._normalize_listed_article(article) for article in results]
             
             logger.debug(f"Retrieved {len(normalized_results)} articles (all time)")
             return normalized_results
@@ -8,6 +8,8 @@ Helper functions for extracting and processing research articles.
 
 import logging
 import re
+import threading
+import time
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urlparse
@@ -311,6 +313,35 @@ def extract_source_from_url(url: str) -> str:
         return "unknown"
 
 
+class DomainRateLimiter:
+    """Spaces out requests to the same host while letting other hosts proceed.
+    
+    Thread-safe: each caller reserves the next free slot for its domain and
+    sleeps outside the lock, so a slow domain never blocks requests to others.
+    """
+    
+    def __init__(self, min_interval: float = 1.0):
+        """
+        Args:
+            min_interval: Minimum seconds between requests to the same domain
+        """
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def wait(self, url: str) -> None:
+        """Block until a request to url's domain is allowed."""
+        domain = urlparse(url).netloc.lower()
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, now))
+            self._next_slot[domain] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 def validate_ticker_format(ticker: Optional[str], max_length: int = 20) -> bool:
     """Validate ticker symbol format.
     
@@ -20,6 +20,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from auth import require_admin
 from supabase_client import SupabaseClient
 from flask_cache_utils import cache_data
+from cache_version import bump_cache_version, CONTRIBUTIONS, POSITIONS, TRADES, CASH, FUNDS
 import time
 from datetime import datetime
 import json
@@ -234,7 +235,7 @@ def _get_cached_ollama_log_lines():
 admin_bp = Blueprint('admin', __name__)
 
 # Cached helper functions
-@cache_data(ttl=60)
+@cache_data(ttl=60, kinds=[FUNDS], fund_param=None)
 def _get_cached_users_flask():
     """Get all users with their fund assignments (cached for 60s)"""
     try:
@@ -247,7 +248,7 @@ def _get_cached_users_flask():
         logger.error(f"Error in _get_cached_users_flask: {e}", exc_info=True)
         return []
 
-@cache_data(ttl=60)
+@cache_data(ttl=60, kinds=[CONTRIBUTIONS], fund_param=None)
 def _get_cached_contributors_flask():
     """Get all contributors (cached for 60s)"""
     try:
@@ -1613,6 +1614,7 @@ def api_submit_trade():
             "date": trade_dt.isoformat()
         }
         admin_client.supabase.table("trade_log").insert(trade_data).execute()
+        bump_cache_version(fund=fund, kinds=[TRADES])
         
         # 5. Process Portfolio Update
         try:
@@ -1647,6 +1649,7 @@ def api_submit_trade():
             processor = TradeProcessor(repository)
             # trade_already_saved=True because we just inserted it above
             processor.process_trade_entry(trade_obj, clear_caches=True, trade_already_saved=True)
+            bump_cache_version(fund=fund, kinds=[POSITIONS, CASH])
             
         except Exception as proc_e:
             logger.error(f"Portfolio processor error: {proc_e}", exc_info=True)
@@ -1846,6 +1849,7 @@ def api_add_contribution():
         # Service role client
         client = SupabaseClient(use_service_role=True)
         client.supabase.table("fund_contributions").insert(payload).execute()
+        bump_cache_version(fund=fund, kinds=[CONTRIBUTIONS])
         
         return jsonify({"success": True, "message": f"{c_type} recorded successfully"})
     except Exception as e:
@@ -1,16 +1,19 @@
 
-from flask import Blueprint, jsonify, request, render_template, redirect, url_for, Response
+from flask import Blueprint, jsonify, request, render_template, redirect, url_for, Response, stream_with_context
 import logging
 import time
 import pandas as pd
 from datetime import datetime, timezone
-import json
+from typing import Any, Dict, List, Optional
 
 from auth import require_auth
 from flask_auth_utils import get_user_email_flask
 from user_preferences import get_user_theme, get_user_currency, get_user_selected_fund, get_user_preference
 from flask_data_utils import fetch_dividend_log_flask
 from chart_utils import create_currency_exposure_chart
+from cache_version import get_cache_version, POSITIONS, TRADES, CASH, CONTRIBUTIONS, DIVIDENDS, BENCHMARKS
+from flask_response_utils import conditional_json, compress_response, json_response
+from plotly_utils import dumps_json
 from streamlit_utils import (
     get_current_positions,
     get_trade_log,
@@ -27,6 +30,7 @@ from streamlit_utils import (
 logger = logging.getLogger(__name__)
 
 dashboard_bp = Blueprint('dashboard', __name__)
+dashboard_bp.after_request(compress_response)
 
 @dashboard_bp.route('/v2/dashboard')
 @require_auth
@@ -120,8 +124,656 @@ def get_latest_timestamp():
         logger.error(f"Error fetching latest timestamp: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+CHART_THEMES = ['dark', 'light', 'midnight-tokyo', 'abyss']
+
+PERFORMANCE_RANGE_DAYS = {
+    '1M': 30,
+    '3M': 90,
+    '6M': 180,
+    '1Y': 365,
+    'ALL': None
+}
+
+# Panels served by /api/dashboard/bundle, in the order they are computed
+DASHBOARD_PANELS = ['summary', 'holdings', 'movers', 'allocation', 'currency', 'pnl', 'dividends', 'activity', 'performance']
+
+
+class DashboardData:
+    """Positions, cash, exchange rates, trades and dividends for one fund and display currency.
+    
+    Each dataset is loaded the first time a panel asks for it and then shared by
+    every panel built from the same instance, so a bundle request hits the
+    database once per dataset instead of once per panel.
+    """
+    
+    def __init__(self, fund: Optional[str], display_currency: str):
+        self.fund = fund
+        self.display_currency = display_currency
+        self.load_times: Dict[str, float] = {}
+        self._loaded: Dict[Any, Any] = {}
+        self._rate_map: Dict[str, float] = {}
+        self._rates_requested: set = set()
+    
+    def _load(self, key, loader):
+        if key not in self._loaded:
+            start = time.time()
+            self._loaded[key] = loader()
+            self.load_times[key if isinstance(key, str) else key[0]] = time.time() - start
+        return self._loaded[key]
+    
+    @property
+    def positions(self) -> pd.DataFrame:
+        return self._load('positions', lambda: get_current_positions(self.fund))
+    
+    @property
+    def cash_balances(self) -> Dict[str, float]:
+        return self._load('cash_balances', lambda: get_cash_balances(self.fund))
+    
+    @property
+    def dividends(self) -> List[Dict[str, Any]]:
+        return self._load('dividends', lambda: fetch_dividend_log_flask(days_lookback=365, fund=self.fund))
+    
+    @property
+    def first_trade_dates(self) -> Dict[str, datetime]:
+        return self._load('first_trade_dates', lambda: get_first_trade_dates(self.fund))
+    
+    def trades(self, limit: int) -> pd.DataFrame:
+        return self._load(('trades', limit), lambda: get_trade_log(limit=limit, fund=self.fund))
+    
+    def position_currencies(self) -> List[str]:
+        if self.positions.empty:
+            return []
+        return self.positions['currency'].fillna('CAD').astype(str).str.upper().unique().tolist()
+    
+    def rates_for(self, currencies) -> Dict[str, float]:
+        """Rates from each currency to the display currency (fetches only currencies not seen yet)."""
+        missing = {str(c).upper() for c in currencies} - self._rates_requested
+        if missing:
+            start = time.time()
+            self._rate_map.update(fetch_latest_rates_bulk(sorted(missing), self.display_currency))
+            self._rates_requested.update(missing)
+            self.load_times['rates'] = self.load_times.get('rates', 0.0) + time.time() - start
+        return self._rate_map
+    
+    def get_rate(self, currency) -> float:
+        return self._rate_map.get(str(currency).upper(), 1.0)
+
+
+def _resolve_chart_theme(client_theme: str) -> str:
+    """Theme requested by the client, else the user's preference (light if unsupported)."""
+    if not client_theme or client_theme not in CHART_THEMES:
+        user_theme = get_user_theme() or 'system'
+        return user_theme if user_theme in CHART_THEMES else 'light'
+    return client_theme
+
+
+def _empty_chart_payload(text: str) -> Dict[str, Any]:
+    import plotly.graph_objs as go
+    from plotly_utils import figure_to_dict
+    fig = go.Figure()
+    fig.add_annotation(
+        text=text,
+        xref="paper", yref="paper",
+        x=0.5, y=0.5, showarrow=False
+    )
+    return figure_to_dict(fig)
+
+
+def _themed_chart_payload(fig, theme: str, grid: bool = False, shapes: bool = False, legend: bool = True) -> Dict[str, Any]:
+    """Serialize a Plotly figure (with numpy array conversion) and apply the chart theme to its layout."""
+    from chart_utils import get_chart_theme_config
+    from plotly_utils import figure_to_dict
+    
+    chart_data = figure_to_dict(fig)
+    theme_config = get_chart_theme_config(theme)
+    
+    # Update layout for theme
+    if 'layout' in chart_data:
+        chart_data['layout']['template'] = theme_config['template']
+        chart_data['layout']['paper_bgcolor'] = theme_config['paper_bgcolor']
+        chart_data['layout']['plot_bgcolor'] = theme_config['plot_bgcolor']
+        chart_data['layout']['font'] = {'color': theme_config['font_color']}
+        
+        if grid:
+            # Update grid colors for both axes if they exist
+            if 'xaxis' in chart_data['layout']:
+                chart_data['layout']['xaxis']['gridcolor'] = theme_config['grid_color']
+                chart_data['layout']['xaxis']['zerolinecolor'] = theme_config['grid_color']
+            if 'yaxis' in chart_data['layout']:
+                chart_data['layout']['yaxis']['gridcolor'] = theme_config['grid_color']
+                chart_data['layout']['yaxis']['zerolinecolor'] = theme_config['grid_color']
+        
+        # Update legend background if it exists
+        if legend and 'legend' in chart_data['layout']:
+            chart_data['layout']['legend']['bgcolor'] = theme_config['legend_bg_color']
+        
+        # Update shapes (baseline line and weekend shading)
+        if shapes and 'shapes' in chart_data['layout']:
+            for shape in chart_data['layout']['shapes']:
+                if shape.get('type') == 'line' and shape.get('y0') == shape.get('y1'):
+                    # This is the baseline hline
+                    if 'line' in shape:
+                        shape['line']['color'] = theme_config['baseline_line_color']
+                elif shape.get('type') == 'rect' and 'fillcolor' in shape:
+                    # This is weekend shading
+                    shape['fillcolor'] = theme_config['weekend_shading_color']
+    
+    return chart_data
+
+
+# --- Panel builders (shared by the individual endpoints and the bundle) ---
+
+def build_summary_panel(data: DashboardData) -> Dict[str, Any]:
+    """Top-level metrics: total value, cash, day change, unrealized P&L, thesis and counts."""
+    fund = data.fund
+    display_currency = data.display_currency
+    
+    # Fetch Data
+    logger.debug(f"[Dashboard API] Fetching positions for fund={fund}")
+    positions_df = data.positions
+    logger.debug(f"[Dashboard API] Positions fetched: {len(positions_df)} rows")
+    
+    logger.debug(f"[Dashboard API] Fetching cash balances for fund={fund}")
+    cash_balances = data.cash_balances
+    logger.debug(f"[Dashboard API] Cash balances: {cash_balances}")
+    
+    # Calculate Rates
+    all_currencies = set(data.position_currencies())
+    all_currencies.update([str(c).upper() for c in cash_balances.keys()])
+    
+    logger.debug(f"[Dashboard API] Currencies found: {all_currencies}")
+    rate_map = data.rates_for(all_currencies)
+    logger.debug(f"[Dashboard API] Exchange rates fetched: {len(rate_map)} rates")
+    get_rate = data.get_rate
+    
+    # Metrics Calculation
+    portfolio_value_no_cash = 0.0
+    total_pnl = 0.0
+    day_pnl = 0.0
+    
+    if not positions_df.empty:
+        rates = positions_df['currency'].fillna('CAD').astype(str).str.upper().map(get_rate)
+        portfolio_value_no_cash = (positions_df['market_value'].fillna(0) * rates).sum()
+        total_pnl = (positions_df['unrealized_pnl'].fillna(0) * rates).sum()
+        
+        if 'daily_pnl' in positions_df.columns:
+             day_pnl = (positions_df['daily_pnl'].fillna(0) * rates).sum()
+    
+    # Cash
+    total_cash = 0.0
+    for curr, amount in cash_balances.items():
+        if amount > 0:
+            total_cash += amount * get_rate(curr)
+            
+    total_value = portfolio_value_no_cash + total_cash
+    
+    # Percentages
+    day_pnl_pct = 0.0
+    if (total_value - day_pnl) > 0:
+        day_pnl_pct = (day_pnl / (total_value - day_pnl)) * 100
+        
+    unrealized_pnl_pct = 0.0
+    cost_basis = portfolio_value_no_cash - total_pnl
+    if cost_basis > 0:
+        unrealized_pnl_pct = (total_pnl / cost_basis) * 100
+        
+    # Thesis Data
+    logger.debug(f"[Dashboard API] Fetching thesis data for fund={fund}")
+    thesis = get_fund_thesis_data(fund) if fund else None
+    logger.debug(f"[Dashboard API] Thesis data: {'found' if thesis else 'not found'}")
+    
+    # Investor & Holdings Count
+    investor_count = get_investor_count(fund)
+    holdings_count = len(positions_df) if not positions_df.empty else 0
+    
+    # Calculate Exchange Rates for Display
+    # fetch_latest_rates_bulk returns rate FROM key TO display_currency
+    # If display_currency is CAD:
+    # USD -> CAD rate is in rate_map['USD'] (e.g. 1.40)
+    # CAD -> USD rate is 1 / rate_map['USD'] (e.g. 0.71)
+    # If display_currency is USD:
+    # CAD -> USD rate is in rate_map['CAD'] (e.g. 0.71)
+    # USD -> CAD rate is 1 / rate_map['CAD'] (e.g. 1.40)
+    
+    usd_cad_rate = 1.0
+    cad_usd_rate = 1.0
+    
+    if display_currency == 'CAD':
+        usd_cad_rate = rate_map.get('USD', 1.0)
+        if usd_cad_rate > 0:
+            cad_usd_rate = 1.0 / usd_cad_rate
+    elif display_currency == 'USD':
+        cad_usd_rate = rate_map.get('CAD', 1.0)
+        if cad_usd_rate > 0:
+            usd_cad_rate = 1.0 / cad_usd_rate
+    
+    exchange_rates = {
+        "USD_CAD": usd_cad_rate,
+        "CAD_USD": cad_usd_rate
+    }
+    
+    return {
+        "total_value": total_value,
+        "cash_balance": total_cash,
+        "day_change": day_pnl,
+        "day_change_pct": day_pnl_pct,
+        "unrealized_pnl": total_pnl,
+        "unrealized_pnl_pct": unrealized_pnl_pct,
+        "display_currency": display_currency,
+        "thesis": thesis,
+        "investor_count": investor_count,
+        "holdings_count": holdings_count,
+        "exchange_rates": exchange_rates,
+        "from_cache": False
+    }
+
+
+def build_performance_panel(data: DashboardData, time_range: str = 'ALL', use_solid: bool = False,
+                            theme: str = 'light') -> Dict[str, Any]:
+    """Portfolio value over time (normalized) with benchmarks, as themed Plotly JSON."""
+    from chart_utils import create_portfolio_value_chart
+    from flask_data_utils import calculate_portfolio_value_over_time_flask as calculate_portfolio_value_over_time
+    
+    fund = data.fund
+    display_currency = data.display_currency
+    days = PERFORMANCE_RANGE_DAYS.get(time_range)
+    logger.debug(f"[Dashboard API] Calculating portfolio value over time - days={days}, fund={fund}")
+    
+    df = calculate_portfolio_value_over_time(fund, days=days, display_currency=display_currency)
+    logger.debug(f"[Dashboard API] Portfolio value data fetched: {len(df)} rows")
+    
+    # DEBUG: Log performance_index values to diagnose the 0,1,2,3... issue
+    if not df.empty and 'performance_index' in df.columns:
+        first_10_idx = df['performance_index'].head(10).tolist()
+        last_10_idx = df['performance_index'].tail(10).tolist()
+        logger.info(f"[DEBUG] Performance Index BEFORE chart creation - First 10: {first_10_idx}, Last 10: {last_10_idx}, Min: {df['performance_index'].min():.2f}, Max: {df['performance_index'].max():.2f}")
+        if 'cost_basis' in df.columns:
+            first_investment = df[df['cost_basis'] > 0]
+            if not first_investment.empty:
+                logger.info(f"[DEBUG] First investment day: {first_investment.iloc[0]['date']}, cost_basis: {first_investment.iloc[0]['cost_basis']}, performance_index: {first_investment.iloc[0]['performance_index']}")
+    
+    if df.empty:
+        logger.warning(f"[Dashboard API] No portfolio value data found for fund={fund}, range={time_range}")
+        return _empty_chart_payload("No data available")
+    
+    # All benchmarks are now passed to the chart (S&P 500 visible, others in legend)
+    all_benchmarks = ['sp500', 'qqq', 'russell2000', 'vti']
+    
+    # Create Plotly chart using shared function (same as Streamlit)
+    fig = create_portfolio_value_chart(
+        df,
+        fund_name=fund,
+        show_normalized=True,  # Show percentage change from baseline
+        show_benchmarks=all_benchmarks,  # All benchmarks (S&P 500 visible, others in legend)
+        show_weekend_shading=True,
+        use_solid_lines=use_solid,
+        display_currency=display_currency
+    )
+    
+    # DEBUG: Log the actual y-values being sent to the chart
+    if fig.data and len(fig.data) > 0:
+        portfolio_trace = fig.data[0]  # First trace is usually the portfolio
+        if hasattr(portfolio_trace, 'y') and portfolio_trace.y is not None:
+            y_values = list(portfolio_trace.y)[:20] if len(portfolio_trace.y) > 20 else list(portfolio_trace.y)
+            logger.info(f"[DEBUG] Chart y-values (first 20): {y_values}, Total points: {len(portfolio_trace.y)}")
+    
+    chart_data = _themed_chart_payload(fig, theme, grid=True, shapes=True)
+    
+    # DEBUG: Log the y-values in the JSON being sent to frontend
+    if 'data' in chart_data and len(chart_data['data']) > 0:
+        portfolio_data = chart_data['data'][0]
+        if 'y' in portfolio_data:
+            y_values_json = portfolio_data['y'][:20] if len(portfolio_data['y']) > 20 else portfolio_data['y']
+            logger.info(f"[DEBUG] JSON y-values being sent to frontend (first 20): {y_values_json}")
+    
+    logger.info(f"[Dashboard API] Performance chart created - {len(df)} data points, use_solid={use_solid}, theme={theme}")
+    return chart_data
+
+
+def build_allocation_panel(data: DashboardData, theme: str = 'light') -> Dict[str, Any]:
+    """Sector allocation pie chart as themed Plotly JSON."""
+    from chart_utils import create_sector_allocation_chart
+    
+    logger.debug("[Dashboard API] Fetching positions for allocation chart")
+    positions_df = data.positions
+    logger.debug(f"[Dashboard API] Positions fetched: {len(positions_df)} rows")
+    
+    # Debug: Log sample of market_value data
+    if not positions_df.empty and 'market_value' in positions_df.columns:
+        sample_values = positions_df['market_value'].head(10).tolist()
+        total_market_value = positions_df['market_value'].sum()
+        logger.info(f"[Dashboard API] Sample market_value values: {sample_values}")
+        logger.info(f"[Dashboard API] Total market_value: {total_market_value}")
+        logger.info(f"[Dashboard API] Market_value column type: {positions_df['market_value'].dtype}")
+        logger.info(f"[Dashboard API] Market_value null count: {positions_df['market_value'].isna().sum()}")
+    
+    if positions_df.empty:
+        logger.warning(f"[Dashboard API] No positions found for allocation chart - fund={data.fund}")
+        return _empty_chart_payload("No data available")
+    
+    # Create Plotly pie chart using shared function (same as Streamlit)
+    # Pass display_currency to ensure all values are converted before aggregation
+    fig = create_sector_allocation_chart(positions_df, fund_name=data.fund, display_currency=data.display_currency)
+    
+    # Update height to match container (700px) and increase bottom margin for legend
+    fig.update_layout(
+        height=700,
+        margin=dict(l=20, r=20, t=50, b=100)  # Increased bottom margin for legend
+    )
+    
+    logger.info(f"[Dashboard API] Sector allocation chart created - theme={theme}")
+    return _themed_chart_payload(fig, theme)
+
+
+def build_pnl_panel(data: DashboardData, theme: str = 'light') -> Dict[str, Any]:
+    """P&L by position bar chart (including dividends) as themed Plotly JSON."""
+    from chart_utils import create_pnl_chart
+    
+    logger.debug("[Dashboard API] Fetching positions for P&L chart")
+    positions_df = data.positions
+    logger.debug(f"[Dashboard API] Positions fetched: {len(positions_df)} rows")
+    
+    if positions_df.empty:
+        logger.warning(f"[Dashboard API] No positions found for P&L chart - fund={data.fund}")
+        return _empty_chart_payload("No P&L data available")
+    
+    # Check for P&L columns
+    if 'pnl' not in positions_df.columns and 'unrealized_pnl' not in positions_df.columns:
+        logger.warning("[Dashboard API] No P&L columns found in positions data")
+        return _empty_chart_payload("No P&L data available")
+    
+    # Fetch dividend data
+    dividend_data = []
+    try:
+        dividend_data = data.dividends
+        logger.debug(f"[Dashboard API] Dividend data fetched: {len(dividend_data)} records")
+    except Exception as e:
+        logger.warning(f"[Dashboard API] Could not fetch dividend data: {e}")
+    
+    # Create P&L chart using shared function (same as Streamlit)
+    fig = create_pnl_chart(
+        positions_df,
+        fund_name=data.fund,
+        display_currency=data.display_currency,
+        dividend_data=dividend_data
+    )
+    
+    # Update height to match container (500px)
+    fig.update_layout(
+        height=500,
+        margin=dict(l=20, r=20, t=50, b=100)
+    )
+    
+    logger.info(f"[Dashboard API] P&L chart created - theme={theme}")
+    return _themed_chart_payload(fig, theme)
+
+
+def build_holdings_panel(data: DashboardData) -> Dict[str, Any]:
+    """Rows for the holdings table, values converted to the display currency."""
+    logger.debug("[Dashboard API] Fetching positions for holdings table")
+    positions_df = data.positions
+    logger.debug(f"[Dashboard API] Positions fetched: {len(positions_df)} rows")
+    
+    if positions_df.empty:
+        logger.warning(f"[Dashboard API] No positions found for holdings - fund={data.fund}")
+        return {"data": []}
+    
+    # Get first trade dates for "Opened" column
+    first_trade_dates = data.first_trade_dates
+        
+    # Get rates
+    data.rates_for(data.position_currencies())
+    get_rate = data.get_rate
+    
+    # Process data and calculate converted values first
+    converted_data = []
+    for idx, row in positions_df.iterrows():
+        rate = get_rate(row.get('currency', 'CAD'))
+        market_val = (row.get('market_value', 0) or 0) * rate
+        converted_data.append(market_val)
+    
+    # Calculate total portfolio value in display currency for weight calculation
+    total_portfolio_value = sum(converted_data) if converted_data else 0
+    
+    # Process data
+    rows = []
+    for idx, row in positions_df.iterrows():
+        ticker = row.get('ticker')
+        
+        # Handle nested securities data
+        company_name = ticker # Default
+        sector = ""
+        if isinstance(row.get('securities'), dict):
+            company_name = row['securities'].get('company_name') or ticker
+            sector = row['securities'].get('sector') or ""
+        
+        # Use 'shares' from latest_positions view (not 'quantity')
+        shares = row.get('shares', 0) or 0
+        cost_basis = row.get('cost_basis', 0) or 0
+        current_price = row.get('current_price', 0) or 0
+        
+        # Calculate average price from cost_basis / shares
+        avg_price = (cost_basis / shares) if shares > 0 else 0
+        
+        # Values in Display Currency
+        rate = get_rate(row.get('currency', 'CAD'))
+        market_val = (row.get('market_value', 0) or 0) * rate
+        pnl = (row.get('unrealized_pnl', 0) or 0) * rate
+        day_pnl = (row.get('daily_pnl', 0) or 0) * rate
+        five_day_pnl = (row.get('five_day_pnl', 0) or 0) * rate
+        
+        # Use P&L percentages from view (already calculated correctly)
+        pnl_pct = row.get('return_pct', 0) or 0
+        day_pnl_pct = row.get('daily_pnl_pct', 0) or 0
+        five_day_pnl_pct = row.get('five_day_pnl_pct', 0) or 0
+        
+        # Calculate weight as percentage of total portfolio (in display currency)
+        weight = (market_val / total_portfolio_value * 100) if total_portfolio_value > 0 else 0
+        
+        # Get opened date
+        opened_date = None
+        if ticker in first_trade_dates:
+            try:
+                opened_date = first_trade_dates[ticker].strftime('%m-%d-%y')
+            except:
+                opened_date = None
+        
+        # Get stop loss if available (might not be in view)
+        stop_loss = row.get('stop_loss', None)
+            
+        rows.append({
+            "ticker": ticker,
+            "name": company_name,
+            "sector": sector,
+            "shares": shares,
+            "opened": opened_date,
+            "avg_price": avg_price * rate,  # Avg price in display currency
+            "price": current_price * rate,  # Current price in display currency
+            "value": market_val,
+            "day_change": day_pnl,
+            "day_change_pct": day_pnl_pct,
+            "total_return": pnl,
+            "total_return_pct": pnl_pct,
+            "five_day_pnl": five_day_pnl,
+            "five_day_pnl_pct": five_day_pnl_pct,
+            "weight": weight,
+            "stop_loss": stop_loss,
+            "currency": row.get('currency', 'CAD') # Original currency
+        })
+        
+    # Sort by weight desc (matching console app default)
+    rows.sort(key=lambda x: x.get('weight', 0), reverse=True)
+    
+    logger.info(f"[Dashboard API] Holdings data prepared - {len(rows)} holdings")
+    return {"data": rows}
+
+
+def build_activity_panel(data: DashboardData, limit: int = 10) -> Dict[str, Any]:
+    """Most recent transactions."""
+    logger.debug("[Dashboard API] Fetching trade log for activity")
+    trades_df = data.trades(limit)
+    logger.debug(f"[Dashboard API] Trade log fetched: {len(trades_df)} rows")
+    
+    if trades_df.empty:
+        logger.warning(f"[Dashboard API] No trades found for activity - fund={data.fund}")
+        return {"data": []}
+    
+    rows = []
+    for _, row in trades_df.iterrows():
+        # Format logic
+        date_str = row['date'].strftime('%Y-%m-%d') if hasattr(row['date'], 'strftime') else str(row['date'])
+        ticker = row.get('ticker')
+        action = "BUY" if row.get('shares', 0) > 0 else "SELL"
+        
+        rows.append({
+            "date": date_str,
+            "ticker": ticker,
+            "action": action,
+            "shares": abs(row.get('shares', 0)),
+            "price": row.get('price', 0),
+            "amount": abs(row.get('amount', 0)) # Assuming amount col exists, else calculate
+        })
+    
+    logger.info(f"[Dashboard API] Activity data prepared - {len(rows)} activities")
+    return {"data": rows}
+
+
+def build_dividends_panel(data: DashboardData) -> Dict[str, Any]:
+    """Dividend metrics (last twelve months) and the dividend log."""
+    # Fetch dividend data (last 365 days for LTM metrics)
+    # Returns a list of dicts, not a DataFrame
+    dividend_list = data.dividends
+    
+    if not dividend_list:
+        return {
+            "metrics": {
+                "total_dividends": 0.0,
+                "total_us_tax": 0.0,
+                "largest_dividend": 0.0,
+                "largest_ticker": "N/A",
+                "reinvested_shares": 0.0,
+                "payout_events": 0
+            },
+            "log": []
+        }
+        
+    # Calculate Metrics (LTM) from list of dicts
+    # Note: DB column is 'amount_cad' not 'amount', and 'pay_date' not 'date'
+    total_dividends = sum(float(d.get('amount_cad', 0) or 0) for d in dividend_list)
+    total_us_tax = sum(float(d.get('tax_paid', 0) or 0) for d in dividend_list)
+    
+    # Find largest dividend
+    largest_dividend = 0.0
+    largest_ticker = "N/A"
+    for d in dividend_list:
+        amt = float(d.get('amount_cad', 0) or 0)
+        if amt > largest_dividend:
+            largest_dividend = amt
+            largest_ticker = d.get('ticker', 'N/A')
+    
+    # Calculate Reinvested Shares (DRIP)
+    total_reinvested = sum(float(d.get('shares_added', 0) or 0) for d in dividend_list)
+        
+    payout_events = len(dividend_list)
+    
+    # Prepare Log (for table) - already sorted by pay_date desc from query
+    log_data = []
+    for row in dividend_list:
+        pay_date = row.get('pay_date', '')
+        log_data.append({
+            "date": pay_date if isinstance(pay_date, str) else str(pay_date),
+            "ticker": row.get('ticker', ''),
+            "amount": float(row.get('amount_cad', 0) or 0),
+            "tax": float(row.get('tax_paid', 0) or 0),
+            "shares": float(row.get('shares_added', 0) or 0),
+            "type": "DRIP" if float(row.get('shares_added', 0) or 0) > 0 else "CASH"
+        })
+        
+    return {
+        "metrics": {
+            "total_dividends": total_dividends,
+            "total_us_tax": total_us_tax,
+            "largest_dividend": largest_dividend,
+            "largest_ticker": largest_ticker,
+            "reinvested_shares": total_reinvested,
+            "payout_events": payout_events
+        },
+        "log": log_data,
+        "currency": data.display_currency
+    }
+
+
+def build_currency_panel(data: DashboardData, theme: str = 'light') -> Dict[str, Any]:
+    """Currency exposure chart as themed Plotly JSON."""
+    # Create chart using shared utility
+    # Streamlit version: create_currency_exposure_chart(positions_df, cash_balances)
+    fig = create_currency_exposure_chart(data.positions, data.cash_balances)
+    
+    if not fig:
+        raise ValueError("Could not create chart")
+         
+    # Update height
+    fig.update_layout(height=350, margin=dict(l=20, r=20, t=30, b=20))
+    
+    return _themed_chart_payload(fig, theme, legend=False)
+
+
+def build_movers_panel(data: DashboardData, limit: int = 10) -> Dict[str, Any]:
+    """Top gainers and losers for the day."""
+    positions_df = data.positions
+    
+    if positions_df.empty:
+        logger.warning(f"[Dashboard API] No positions found for movers - fund={data.fund}")
+        return {"gainers": [], "losers": []}
+    
+    movers = get_biggest_movers(positions_df, data.display_currency, limit=limit)
+    
+    def df_to_list(df):
+        if df.empty:
+            return []
+        result = []
+        for _, row in df.iterrows():
+            item = {
+                "ticker": row.get('ticker', ''),
+                "company_name": row.get('company_name', row.get('ticker', '')),
+            }
+            if 'daily_pnl_pct' in row:
+                item["daily_pnl_pct"] = float(row['daily_pnl_pct']) if pd.notna(row['daily_pnl_pct']) else None
+            elif 'return_pct' in row:
+                item["daily_pnl_pct"] = float(row['return_pct']) if pd.notna(row['return_pct']) else None
+            if 'pnl_display' in row:
+                item["daily_pnl"] = float(row['pnl_display']) if pd.notna(row['pnl_display']) else None
+            if 'five_day_pnl_pct' in row:
+                item["five_day_pnl_pct"] = float(row['five_day_pnl_pct']) if pd.notna(row['five_day_pnl_pct']) else None
+            if 'five_day_pnl_display' in row:
+                item["five_day_pnl"] = float(row['five_day_pnl_display']) if pd.notna(row['five_day_pnl_display']) else None
+            if 'return_pct' in row and 'daily_pnl_pct' in df.columns:
+                item["total_return_pct"] = float(row['return_pct']) if pd.notna(row['return_pct']) else None
+            if 'total_pnl_display' in row:
+                item["total_pnl"] = float(row['total_pnl_display']) if pd.notna(row['total_pnl_display']) else None
+            if 'current_price' in row:
+                item["current_price"] = float(row['current_price']) if pd.notna(row['current_price']) else None
+            if 'market_value' in row:
+                item["market_value"] = float(row['market_value']) if pd.notna(row['market_value']) else None
+            result.append(item)
+        return result
+    
+    gainers = df_to_list(movers['gainers'])
+    losers = df_to_list(movers['losers'])
+    
+    logger.info(f"[Dashboard API] Movers data prepared - {len(gainers)} gainers, {len(losers)} losers")
+    return {
+        "gainers": gainers,
+        "losers": losers,
+        "display_currency": data.display_currency
+    }
+
+
+# --- Endpoints ---
+
 @dashboard_bp.route('/api/dashboard/summary', methods=['GET'])
 @require_auth
+@conditional_json(kinds=[POSITIONS, CASH, CONTRIBUTIONS])
 def get_dashboard_summary():
     """Get top-level dashboard metrics"""
     fund = request.args.get('fund')
@@ -135,111 +787,12 @@ def get_dashboard_summary():
     start_time = time.time()
     
     try:
-        # Fetch Data
-        logger.debug(f"[Dashboard API] Fetching positions for fund={fund}")
-        positions_df = get_current_positions(fund)
-        logger.debug(f"[Dashboard API] Positions fetched: {len(positions_df)} rows")
-        
-        logger.debug(f"[Dashboard API] Fetching cash balances for fund={fund}")
-        cash_balances = get_cash_balances(fund)
-        logger.debug(f"[Dashboard API] Cash balances: {cash_balances}")
-        
-        # Calculate Rates
-        all_currencies = set()
-        if not positions_df.empty:
-            all_currencies.update(positions_df['currency'].fillna('CAD').astype(str).str.upper().unique().tolist())
-        all_currencies.update([str(c).upper() for c in cash_balances.keys()])
-        
-        logger.debug(f"[Dashboard API] Currencies found: {all_currencies}")
-        rate_map = fetch_latest_rates_bulk(list(all_currencies), display_currency)
-        logger.debug(f"[Dashboard API] Exchange rates fetched: {len(rate_map)} rates")
-        def get_rate(curr): return rate_map.get(str(curr).upper(), 1.0)
-        
-        # Metrics Calculation
-        portfolio_value_no_cash = 0.0
-        total_pnl = 0.0
-        day_pnl = 0.0
-        
-        if not positions_df.empty:
-            rates = positions_df['currency'].fillna('CAD').astype(str).str.upper().map(get_rate)
-            portfolio_value_no_cash = (positions_df['market_value'].fillna(0) * rates).sum()
-            total_pnl = (positions_df['unrealized_pnl'].fillna(0) * rates).sum()
-            
-            if 'daily_pnl' in positions_df.columns:
-                 day_pnl = (positions_df['daily_pnl'].fillna(0) * rates).sum()
-        
-        # Cash
-        total_cash = 0.0
-        for curr, amount in cash_balances.items():
-            if amount > 0:
-                total_cash += amount * get_rate(curr)
-                
-        total_value = portfolio_value_no_cash + total_cash
-        
-        # Percentages
-        day_pnl_pct = 0.0
-        if (total_value - day_pnl) > 0:
-            day_pnl_pct = (day_pnl / (total_value - day_pnl)) * 100
-            
-        unrealized_pnl_pct = 0.0
-        cost_basis = portfolio_value_no_cash - total_pnl
-        if cost_basis > 0:
-            unrealized_pnl_pct = (total_pnl / cost_basis) * 100
-            
-        # Thesis Data
-        logger.debug(f"[Dashboard API] Fetching thesis data for fund={fund}")
-        thesis = get_fund_thesis_data(fund) if fund else None
-        logger.debug(f"[Dashboard API] Thesis data: {'found' if thesis else 'not found'}")
-        
-        # Investor & Holdings Count
-        investor_count = get_investor_count(fund)
-        holdings_count = len(positions_df) if not positions_df.empty else 0
-        
-        # Calculate Exchange Rates for Display
-        # fetch_latest_rates_bulk returns rate FROM key TO display_currency
-        # If display_currency is CAD:
-        # USD -> CAD rate is in rate_map['USD'] (e.g. 1.40)
-        # CAD -> USD rate is 1 / rate_map['USD'] (e.g. 0.71)
-        # If display_currency is USD:
-        # CAD -> USD rate is in rate_map['CAD'] (e.g. 0.71)
-        # USD -> CAD rate is 1 / rate_map['CAD'] (e.g. 1.40)
-        
-        usd_cad_rate = 1.0
-        cad_usd_rate = 1.0
-        
-        if display_currency == 'CAD':
-            usd_cad_rate = rate_map.get('USD', 1.0)
-            if usd_cad_rate > 0:
-                cad_usd_rate = 1.0 / usd_cad_rate
-        elif display_currency == 'USD':
-            cad_usd_rate = rate_map.get('CAD', 1.0)
-            if cad_usd_rate > 0:
-                usd_cad_rate = 1.0 / cad_usd_rate
-        
-        exchange_rates = {
-            "USD_CAD": usd_cad_rate,
-            "CAD_USD": cad_usd_rate
-        }
-        
+        response = build_summary_panel(DashboardData(fund, display_currency))
         processing_time = time.time() - start_time
-        response = {
-            "total_value": total_value,
-            "cash_balance": total_cash,
-            "day_change": day_pnl,
-            "day_change_pct": day_pnl_pct,
-            "unrealized_pnl": total_pnl,
-            "unrealized_pnl_pct": unrealized_pnl_pct,
-            "display_currency": display_currency,
-            "thesis": thesis,
-            "investor_count": investor_count,
-            "holdings_count": holdings_count,
-            "exchange_rates": exchange_rates,
-            "from_cache": False,
-            "processing_time": processing_time
-        }
+        response["processing_time"] = processing_time
         
-        logger.info(f"[Dashboard API] Summary calculated successfully - total_value={total_value:.2f} {display_currency}, processing_time={processing_time:.3f}s")
-        return jsonify(response)
+        logger.info(f"[Dashboard API] Summary calculated successfully - total_value={response['total_value']:.2f} {display_currency}, processing_time={processing_time:.3f}s")
+        return json_response(response)
         
     except Exception as e:
         processing_time = time.time() - start_time
@@ -247,6 +800,7 @@ def get_dashboard_summary():
         return jsonify({"error": str(e), "processing_time": processing_time}), 500
 
 @dashboard_bp.route('/api/dashboard/charts/performance', methods=['GET'])
+@conditional_json(kinds=[POSITIONS, BENCHMARKS])
 def get_performance_chart():
     """Get portfolio performance chart as Plotly JSON.
     
@@ -266,12 +820,9 @@ def get_performance_chart():
     Error Responses:
         500: Server error during data fetch
     """
-    import plotly.utils
-    from chart_utils import create_portfolio_value_chart
-    
     fund = request.args.get('fund') or None
-    # Convert empty string to None
-    if fund == '':
+    # Translate 'All' or empty to None for the backend
+    if not fund or fund.lower() == 'all':
         fund = None
     time_range = request.args.get('range', 'ALL') # '1M', '3M', '6M', '1Y', 'ALL'
     use_solid = request.args.get('use_solid', 'false').lower() == 'true'
@@ -281,136 +832,15 @@ def get_performance_chart():
     start_time = time.time()
     
     try:
-        # Translate 'All' or empty to None for the backend
-        if not fund or fund.lower() == 'all':
-            fund = None
-            
-        from flask_data_utils import calculate_portfolio_value_over_time_flask as calculate_portfolio_value_over_time
-        
-        days_map = {
-            '1M': 30,
-            '3M': 90,
-            '6M': 180,
-            '1Y': 365,
-            'ALL': None
-        }
-        days = days_map.get(time_range)
-        logger.debug(f"[Dashboard API] Calculating portfolio value over time - days={days}, fund={fund}")
-        
-        df = calculate_portfolio_value_over_time(fund, days=days, display_currency=display_currency)
-        logger.debug(f"[Dashboard API] Portfolio value data fetched: {len(df)} rows")
-        
-        # DEBUG: Log performance_index values to diagnose the 0,1,2,3... issue
-        if not df.empty and 'performance_index' in df.columns:
-            first_10_idx = df['performance_index'].head(10).tolist()
-            last_10_idx = df['performance_index'].tail(10).tolist()
-            logger.info(f"[DEBUG] Performance Index BEFORE chart creation - First 10: {first_10_idx}, Last 10: {last_10_idx}, Min: {df['performance_index'].min():.2f}, Max: {df['performance_index'].max():.2f}")
-            if 'cost_basis' in df.columns:
-                first_investment = df[df['cost_basis'] > 0]
-                if not first_investment.empty:
-                    logger.info(f"[DEBUG] First investment day: {first_investment.iloc[0]['date']}, cost_basis: {first_investment.iloc[0]['cost_basis']}, performance_index: {first_investment.iloc[0]['performance_index']}")
-        
-        if df.empty:
-            logger.warning(f"[Dashboard API] No portfolio value data found for fund={fund}, range={time_range}")
-            # Return empty Plotly chart
-            import plotly.graph_objs as go
-            fig = go.Figure()
-            fig.add_annotation(
-                text="No data available",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            from plotly_utils import serialize_plotly_figure
-            return Response(
-                serialize_plotly_figure(fig),
-                mimetype='application/json'
-            )
-        
-        # All benchmarks are now passed to the chart (S&P 500 visible, others in legend)
-        all_benchmarks = ['sp500', 'qqq', 'russell2000', 'vti']
-        
-        # Create Plotly chart using shared function (same as Streamlit)
-        fig = create_portfolio_value_chart(
-            df,
-            fund_name=fund,
-            show_normalized=True,  # Show percentage change from baseline
-            show_benchmarks=all_benchmarks,  # All benchmarks (S&P 500 visible, others in legend)
-            show_weekend_shading=True,
-            use_solid_lines=use_solid,
-            display_currency=display_currency
-        )
-        
-        # DEBUG: Log the actual y-values being sent to the chart
-        if fig.data and len(fig.data) > 0:
-            portfolio_trace = fig.data[0]  # First trace is usually the portfolio
-            if hasattr(portfolio_trace, 'y') and portfolio_trace.y is not None:
-                y_values = list(portfolio_trace.y)[:20] if len(portfolio_trace.y) > 20 else list(portfolio_trace.y)
-                logger.info(f"[DEBUG] Chart y-values (first 20): {y_values}, Total points: {len(portfolio_trace.y)}")
-        
         # Apply theme to chart (similar to ticker chart)
-        client_theme = request.args.get('theme', '').strip().lower()
-        if not client_theme or client_theme not in ['dark', 'light', 'midnight-tokyo', 'abyss']:
-            # Get user theme preference from backend
-            user_theme = get_user_theme() or 'system'
-            theme = user_theme if user_theme in ['dark', 'light', 'midnight-tokyo', 'abyss'] else 'light'
-        else:
-            theme = client_theme
-        
-        # Apply theme to chart data (convert to dict, apply theme, return as JSON)
-        from chart_utils import get_chart_theme_config
-        from plotly_utils import serialize_plotly_figure
-        
-        # Serialize figure with numpy array conversion
-        chart_json = serialize_plotly_figure(fig)
-        chart_data = json.loads(chart_json)
-        
-        # DEBUG: Log the y-values in the JSON being sent to frontend
-        if 'data' in chart_data and len(chart_data['data']) > 0:
-            portfolio_data = chart_data['data'][0]
-            if 'y' in portfolio_data:
-                y_values_json = portfolio_data['y'][:20] if len(portfolio_data['y']) > 20 else portfolio_data['y']
-                logger.info(f"[DEBUG] JSON y-values being sent to frontend (first 20): {y_values_json}")
-        
-        theme_config = get_chart_theme_config(theme)
-        
-        # Update layout for theme
-        if 'layout' in chart_data:
-            chart_data['layout']['template'] = theme_config['template']
-            chart_data['layout']['paper_bgcolor'] = theme_config['paper_bgcolor']
-            chart_data['layout']['plot_bgcolor'] = theme_config['plot_bgcolor']
-            chart_data['layout']['font'] = {'color': theme_config['font_color']}
-            
-            # Update grid colors for both axes if they exist
-            if 'xaxis' in chart_data['layout']:
-                chart_data['layout']['xaxis']['gridcolor'] = theme_config['grid_color']
-                chart_data['layout']['xaxis']['zerolinecolor'] = theme_config['grid_color']
-            if 'yaxis' in chart_data['layout']:
-                chart_data['layout']['yaxis']['gridcolor'] = theme_config['grid_color']
-                chart_data['layout']['yaxis']['zerolinecolor'] = theme_config['grid_color']
-            
-            # Update legend background if it exists
-            if 'legend' in chart_data['layout']:
-                chart_data['layout']['legend']['bgcolor'] = theme_config['legend_bg_color']
-            
-            # Update shapes (baseline line and weekend shading)
-            if 'shapes' in chart_data['layout']:
-                for shape in chart_data['layout']['shapes']:
-                    if shape.get('type') == 'line' and shape.get('y0') == shape.get('y1'):
-                        # This is the baseline hline
-                        if 'line' in shape:
-                            shape['line']['color'] = theme_config['baseline_line_color']
-                    elif shape.get('type') == 'rect' and 'fillcolor' in shape:
-                        # This is weekend shading
-                        shape['fillcolor'] = theme_config['weekend_shading_color']
+        theme = _resolve_chart_theme(request.args.get('theme', '').strip().lower())
+        chart_data = build_performance_panel(DashboardData(fund, display_currency), time_range, use_solid, theme)
         
         processing_time = time.time() - start_time
-        logger.info(f"[Dashboard API] Performance chart created - {len(df)} data points, use_solid={use_solid}, theme={theme}, processing_time={processing_time:.3f}s")
+        logger.info(f"[Dashboard API] Performance chart served - processing_time={processing_time:.3f}s")
         
         # Return Plotly JSON with theme applied
-        return Response(
-            json.dumps(chart_data),
-            mimetype='application/json'
-        )
+        return json_response(chart_data)
         
     except Exception as e:
         processing_time = time.time() - start_time
@@ -418,6 +848,7 @@ def get_performance_chart():
         return jsonify({"error": str(e), "processing_time": processing_time}), 500
 
 @dashboard_bp.route('/api/dashboard/charts/allocation', methods=['GET'])
+@conditional_json(kinds=[POSITIONS])
 def get_allocation_charts():
     """Get allocation chart as Plotly JSON (Sector pie chart).
     
@@ -435,10 +866,6 @@ def get_allocation_charts():
     Error Responses:
         500: Server error during data fetch
     """
-    import plotly.utils
-    from chart_utils import create_sector_allocation_chart
-    from user_preferences import get_user_theme
-    
     fund = request.args.get('fund')
     # Convert 'all' or empty string to None for aggregate view
     if not fund or fund.lower() == 'all':
@@ -451,82 +878,13 @@ def get_allocation_charts():
     start_time = time.time()
     
     try:
-        logger.debug(f"[Dashboard API] Fetching positions for allocation chart")
-        positions_df = get_current_positions(fund)
-        logger.debug(f"[Dashboard API] Positions fetched: {len(positions_df)} rows")
-        
-        # Debug: Log sample of market_value data
-        if not positions_df.empty and 'market_value' in positions_df.columns:
-            sample_values = positions_df['market_value'].head(10).tolist()
-            total_market_value = positions_df['market_value'].sum()
-            logger.info(f"[Dashboard API] Sample market_value values: {sample_values}")
-            logger.info(f"[Dashboard API] Total market_value: {total_market_value}")
-            logger.info(f"[Dashboard API] Market_value column type: {positions_df['market_value'].dtype}")
-            logger.info(f"[Dashboard API] Market_value null count: {positions_df['market_value'].isna().sum()}")
-        
-        if positions_df.empty:
-            logger.warning(f"[Dashboard API] No positions found for allocation chart - fund={fund}")
-            # Return empty Plotly chart
-            import plotly.graph_objs as go
-            fig = go.Figure()
-            fig.add_annotation(
-                text="No data available",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            from plotly_utils import serialize_plotly_figure
-            return Response(
-                serialize_plotly_figure(fig),
-                mimetype='application/json'
-            )
-        
-        # Create Plotly pie chart using shared function (same as Streamlit)
-        # Pass display_currency to ensure all values are converted before aggregation
-        fig = create_sector_allocation_chart(positions_df, fund_name=fund, display_currency=display_currency)
-        
-        # Update height to match container (700px) and increase bottom margin for legend
-        fig.update_layout(
-            height=700,
-            margin=dict(l=20, r=20, t=50, b=100)  # Increased bottom margin for legend
-        )
-        
-        # Apply theme to chart (similar to ticker chart)
-        if not client_theme or client_theme not in ['dark', 'light', 'midnight-tokyo', 'abyss']:
-            # Get user theme preference from backend
-            from user_preferences import get_user_theme
-            user_theme = get_user_theme() or 'system'
-            theme = user_theme if user_theme in ['dark', 'light', 'midnight-tokyo', 'abyss'] else 'light'
-        else:
-            theme = client_theme
-        
-        # Apply theme to chart data (convert to dict, apply theme, return as JSON)
-        from chart_utils import get_chart_theme_config
-        from plotly_utils import serialize_plotly_figure
-        
-        # Serialize figure with numpy array conversion
-        chart_json = serialize_plotly_figure(fig)
-        chart_data = json.loads(chart_json)
-        theme_config = get_chart_theme_config(theme)
-        
-        # Update layout for theme
-        if 'layout' in chart_data:
-            chart_data['layout']['template'] = theme_config['template']
-            chart_data['layout']['paper_bgcolor'] = theme_config['paper_bgcolor']
-            chart_data['layout']['plot_bgcolor'] = theme_config['plot_bgcolor']
-            chart_data['layout']['font'] = {'color': theme_config['font_color']}
-            
-            # Update legend background if it exists
-            if 'legend' in chart_data['layout']:
-                chart_data['layout']['legend']['bgcolor'] = theme_config['legend_bg_color']
+        chart_data = build_allocation_panel(DashboardData(fund, display_currency), _resolve_chart_theme(client_theme))
         
         processing_time = time.time() - start_time
-        logger.info(f"[Dashboard API] Sector allocation chart created - theme={theme}, processing_time={processing_time:.3f}s")
+        logger.info(f"[Dashboard API] Sector allocation chart served - processing_time={processing_time:.3f}s")
         
         # Return Plotly JSON with theme applied
-        return Response(
-            json.dumps(chart_data),
-            mimetype='application/json'
-        )
+        return json_response(chart_data)
         
     except Exception as e:
         processing_time = time.time() - start_time
@@ -535,6 +893,7 @@ def get_allocation_charts():
 
 @dashboard_bp.route('/api/dashboard/charts/pnl', methods=['GET'])
 @require_auth
+@conditional_json(kinds=[POSITIONS, DIVIDENDS])
 def get_pnl_chart():
     """Get P&L by Position chart as Plotly JSON.
     
@@ -552,10 +911,6 @@ def get_pnl_chart():
     Error Responses:
         500: Server error during data fetch
     """
-    from chart_utils import create_pnl_chart, get_chart_theme_config
-    from plotly_utils import serialize_plotly_figure
-    from flask_data_utils import fetch_dividend_log_flask
-    
     fund = request.args.get('fund')
     # Convert 'all' or empty string to None for aggregate view
     if not fund or fund.lower() == 'all':
@@ -568,94 +923,13 @@ def get_pnl_chart():
     start_time = time.time()
     
     try:
-        logger.debug(f"[Dashboard API] Fetching positions for P&L chart")
-        positions_df = get_current_positions(fund)
-        logger.debug(f"[Dashboard API] Positions fetched: {len(positions_df)} rows")
-        
-        if positions_df.empty:
-            logger.warning(f"[Dashboard API] No positions found for P&L chart - fund={fund}")
-            # Return empty Plotly chart
-            import plotly.graph_objs as go
-            fig = go.Figure()
-            fig.add_annotation(
-                text="No P&L data available",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return Response(
-                serialize_plotly_figure(fig),
-                mimetype='application/json'
-            )
-        
-        # Check for P&L columns
-        if 'pnl' not in positions_df.columns and 'unrealized_pnl' not in positions_df.columns:
-            logger.warning(f"[Dashboard API] No P&L columns found in positions data")
-            import plotly.graph_objs as go
-            fig = go.Figure()
-            fig.add_annotation(
-                text="No P&L data available",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return Response(
-                serialize_plotly_figure(fig),
-                mimetype='application/json'
-            )
-        
-        # Fetch dividend data
-        dividend_data = []
-        try:
-            dividend_data = fetch_dividend_log_flask(days_lookback=365, fund=fund)
-            logger.debug(f"[Dashboard API] Dividend data fetched: {len(dividend_data)} records")
-        except Exception as e:
-            logger.warning(f"[Dashboard API] Could not fetch dividend data: {e}")
-        
-        # Create P&L chart using shared function (same as Streamlit)
-        fig = create_pnl_chart(
-            positions_df,
-            fund_name=fund,
-            display_currency=display_currency,
-            dividend_data=dividend_data
-        )
-        
-        # Update height to match container (500px)
-        fig.update_layout(
-            height=500,
-            margin=dict(l=20, r=20, t=50, b=100)
-        )
-        
-        # Apply theme to chart
-        if not client_theme or client_theme not in ['dark', 'light', 'midnight-tokyo', 'abyss']:
-            # Get user theme preference from backend
-            user_theme = get_user_theme() or 'system'
-            theme = user_theme if user_theme in ['dark', 'light', 'midnight-tokyo', 'abyss'] else 'light'
-        else:
-            theme = client_theme
-        
-        # Serialize figure with numpy array conversion
-        chart_json = serialize_plotly_figure(fig)
-        chart_data = json.loads(chart_json)
-        theme_config = get_chart_theme_config(theme)
-        
-        # Update layout for theme
-        if 'layout' in chart_data:
-            chart_data['layout']['template'] = theme_config['template']
-            chart_data['layout']['paper_bgcolor'] = theme_config['paper_bgcolor']
-            chart_data['layout']['plot_bgcolor'] = theme_config['plot_bgcolor']
-            chart_data['layout']['font'] = {'color': theme_config['font_color']}
-            
-            # Update legend background if it exists
-            if 'legend' in chart_data['layout']:
-                chart_data['layout']['legend']['bgcolor'] = theme_config['legend_bg_color']
+        chart_data = build_pnl_panel(DashboardData(fund, display_currency), _resolve_chart_theme(client_theme))
         
         processing_time = time.time() - start_time
-        logger.info(f"[Dashboard API] P&L chart created - theme={theme}, processing_time={processing_time:.3f}s")
+        logger.info(f"[Dashboard API] P&L chart served - processing_time={processing_time:.3f}s")
         
         # Return Plotly JSON with theme applied
-        return Response(
-            json.dumps(chart_data),
-            mimetype='application/json'
-        )
+        return json_response(chart_data)
         
     except Exception as e:
         processing_time = time.time() - start_time
@@ -663,6 +937,7 @@ def get_pnl_chart():
         return jsonify({"error": str(e), "processing_time": processing_time}), 500
 
 @dashboard_bp.route('/api/dashboard/holdings', methods=['GET'])
+@conditional_json(kinds=[POSITIONS, TRADES])
 def get_holdings_data():
     """Get content for holdings table"""
     fund = request.args.get('fund')
@@ -676,106 +951,7 @@ def get_holdings_data():
     start_time = time.time()
     
     try:
-        logger.debug(f"[Dashboard API] Fetching positions for holdings table")
-        positions_df = get_current_positions(fund)
-        logger.debug(f"[Dashboard API] Positions fetched: {len(positions_df)} rows")
-        
-        if positions_df.empty:
-            logger.warning(f"[Dashboard API] No positions found for holdings - fund={fund}")
-            return jsonify({"data": []})
-        
-        # Get first trade dates for "Opened" column
-        first_trade_dates = get_first_trade_dates(fund)
-            
-        # Get rates
-        all_currencies = positions_df['currency'].fillna('CAD').astype(str).str.upper().unique().tolist()
-        rate_map = fetch_latest_rates_bulk(all_currencies, display_currency)
-        def get_rate(curr): return rate_map.get(str(curr).upper(), 1.0)
-        rates = positions_df['currency'].fillna('CAD').astype(str).str.upper().map(get_rate)
-        
-        # Process data and calculate converted values first
-        converted_data = []
-        for idx, row in positions_df.iterrows():
-            rate = get_rate(row.get('currency', 'CAD'))
-            market_val = (row.get('market_value', 0) or 0) * rate
-            converted_data.append(market_val)
-        
-        # Calculate total portfolio value in display currency for weight calculation
-        total_portfolio_value = sum(converted_data) if converted_data else 0
-        
-        # Process data
-        data = []
-        for idx, row in positions_df.iterrows():
-            ticker = row.get('ticker')
-            
-            # Handle nested securities data
-            company_name = ticker # Default
-            sector = ""
-            if isinstance(row.get('securities'), dict):
-                company_name = row['securities'].get('company_name') or ticker
-                sector = row['securities'].get('sector') or ""
-            
-            # Use 'shares' from latest_positions view (not 'quantity')
-            shares = row.get('shares', 0) or 0
-            cost_basis = row.get('cost_basis', 0) or 0
-            current_price = row.get('current_price', 0) or 0
-            
-            # Calculate average price from cost_basis / shares
-            avg_price = (cost_basis / shares) if shares > 0 else 0
-            
-            # Values in Display Currency
-            rate = get_rate(row.get('currency', 'CAD'))
-            market_val = (row.get('market_value', 0) or 0) * rate
-            pnl = (row.get('unrealized_pnl', 0) or 0) * rate
-            day_pnl = (row.get('daily_pnl', 0) or 0) * rate
-            five_day_pnl = (row.get('five_day_pnl', 0) or 0) * rate
-            
-            # Use P&L percentages from view (already calculated correctly)
-            pnl_pct = row.get('return_pct', 0) or 0
-            day_pnl_pct = row.get('daily_pnl_pct', 0) or 0
-            five_day_pnl_pct = row.get('five_day_pnl_pct', 0) or 0
-            
-            # Calculate weight as percentage of total portfolio (in display currency)
-            weight = (market_val / total_portfolio_value * 100) if total_portfolio_value > 0 else 0
-            
-            # Get opened date
-            opened_date = None
-            if ticker in first_trade_dates:
-                try:
-                    opened_date = first_trade_dates[ticker].strftime('%m-%d-%y')
-                except:
-                    opened_date = None
-            
-            # Get stop loss if available (might not be in view)
-            stop_loss = row.get('stop_loss', None)
-                
-            data.append({
-                "ticker": ticker,
-                "name": company_name,
-                "sector": sector,
-                "shares": shares,
-                "opened": opened_date,
-                "avg_price": avg_price * rate,  # Avg price in display currency
-                "price": current_price * rate,  # Current price in display currency
-                "value": market_val,
-                "day_change": day_pnl,
-                "day_change_pct": day_pnl_pct,
-                "total_return": pnl,
-                "total_return_pct": pnl_pct,
-                "five_day_pnl": five_day_pnl,
-                "five_day_pnl_pct": five_day_pnl_pct,
-                "weight": weight,
-                "stop_loss": stop_loss,
-                "currency": row.get('currency', 'CAD') # Original currency
-            })
-            
-        # Sort by weight desc (matching console app default)
-        data.sort(key=lambda x: x.get('weight', 0), reverse=True)
-        
-        processing_time = time.time() - start_time
-        logger.info(f"[Dashboard API] Holdings data prepared - {len(data)} holdings, processing_time={processing_time:.3f}s")
-        
-        return jsonify({"data": data})
+        return json_response(build_holdings_panel(DashboardData(fund, display_currency)))
         
     except Exception as e:
         processing_time = time.time() - start_time
@@ -783,6 +959,7 @@ def get_holdings_data():
         return jsonify({"error": str(e), "processing_time": processing_time}), 500
 
 @dashboard_bp.route('/api/dashboard/activity', methods=['GET'])
+@conditional_json(kinds=[TRADES])
 def get_recent_activity():
     """Get recent transactions"""
     fund = request.args.get('fund')
@@ -797,34 +974,7 @@ def get_recent_activity():
     start_time = time.time()
     
     try:
-        logger.debug(f"[Dashboard API] Fetching trade log for activity")
-        trades_df = get_trade_log(limit=limit, fund=fund)
-        logger.debug(f"[Dashboard API] Trade log fetched: {len(trades_df)} rows")
-        
-        if trades_df.empty:
-            logger.warning(f"[Dashboard API] No trades found for activity - fund={fund}")
-            return jsonify({"data": []})
-        
-        data = []
-        for _, row in trades_df.iterrows():
-            # Format logic
-            date_str = row['date'].strftime('%Y-%m-%d') if hasattr(row['date'], 'strftime') else str(row['date'])
-            ticker = row.get('ticker')
-            action = "BUY" if row.get('shares', 0) > 0 else "SELL"
-            
-            data.append({
-                "date": date_str,
-                "ticker": ticker,
-                "action": action,
-                "shares": abs(row.get('shares', 0)),
-                "price": row.get('price', 0),
-                "amount": abs(row.get('amount', 0)) # Assuming amount col exists, else calculate
-            })
-            
-        processing_time = time.time() - start_time
-        logger.info(f"[Dashboard API] Activity data prepared - {len(data)} activities, processing_time={processing_time:.3f}s")
-        
-        return jsonify({"data": data})
+        return json_response(build_activity_panel(DashboardData(fund, display_currency), limit))
         
     except Exception as e:
         processing_time = time.time() - start_time
@@ -833,6 +983,7 @@ def get_recent_activity():
 
 @dashboard_bp.route('/api/dashboard/dividends', methods=['GET'])
 @require_auth
+@conditional_json(kinds=[DIVIDENDS])
 def get_dividend_data():
     """Get dividend metrics and log.
     
@@ -846,73 +997,14 @@ def get_dividend_data():
     display_currency = get_user_currency() or 'CAD'
     
     try:
-        # Fetch dividend data (last 365 days for LTM metrics)
-        # Returns a list of dicts, not a DataFrame
-        dividend_list = fetch_dividend_log_flask(days_lookback=365, fund=fund)
-        
-        if not dividend_list:
-            return jsonify({
-                "metrics": {
-                    "total_dividends": 0.0,
-                    "total_us_tax": 0.0,
-                    "largest_dividend": 0.0,
-                    "largest_ticker": "N/A",
-                    "reinvested_shares": 0.0,
-                    "payout_events": 0
-                },
-                "log": []
-            })
-            
-        # Calculate Metrics (LTM) from list of dicts
-        # Note: DB column is 'amount_cad' not 'amount', and 'pay_date' not 'date'
-        total_dividends = sum(float(d.get('amount_cad', 0) or 0) for d in dividend_list)
-        total_us_tax = sum(float(d.get('tax_paid', 0) or 0) for d in dividend_list)
-        
-        # Find largest dividend
-        largest_dividend = 0.0
-        largest_ticker = "N/A"
-        for d in dividend_list:
-            amt = float(d.get('amount_cad', 0) or 0)
-            if amt > largest_dividend:
-                largest_dividend = amt
-                largest_ticker = d.get('ticker', 'N/A')
-        
-        # Calculate Reinvested Shares (DRIP)
-        total_reinvested = sum(float(d.get('shares_added', 0) or 0) for d in dividend_list)
-            
-        payout_events = len(dividend_list)
-        
-        # Prepare Log (for table) - already sorted by pay_date desc from query
-        log_data = []
-        for row in dividend_list:
-            pay_date = row.get('pay_date', '')
-            log_data.append({
-                "date": pay_date if isinstance(pay_date, str) else str(pay_date),
-                "ticker": row.get('ticker', ''),
-                "amount": float(row.get('amount_cad', 0) or 0),
-                "tax": float(row.get('tax_paid', 0) or 0),
-                "shares": float(row.get('shares_added', 0) or 0),
-                "type": "DRIP" if float(row.get('shares_added', 0) or 0) > 0 else "CASH"
-            })
-            
-        return jsonify({
-            "metrics": {
-                "total_dividends": total_dividends,
-                "total_us_tax": total_us_tax,
-                "largest_dividend": largest_dividend,
-                "largest_ticker": largest_ticker,
-                "reinvested_shares": total_reinvested,
-                "payout_events": payout_events
-            },
-            "log": log_data,
-            "currency": display_currency
-        })
+        return json_response(build_dividends_panel(DashboardData(fund, display_currency)))
         
     except Exception as e:
         logger.error(f"Error fetching dividend data: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
 @dashboard_bp.route('/api/dashboard/charts/currency', methods=['GET'])
+@conditional_json(kinds=[POSITIONS, CASH])
 def get_currency_chart():
     """Get currency exposure chart as Plotly JSON."""
     fund = request.args.get('fund')
@@ -922,36 +1014,8 @@ def get_currency_chart():
     theme = request.args.get('theme', 'light')
     
     try:
-        positions_df = get_current_positions(fund)
-        cash_balances = get_cash_balances(fund)
-        
-        # Create chart using shared utility
-        # Note: create_currency_exposure_chart takes positions_df and cash_balances
-        # We need to make sure we're using the right version or args
-        # Streamlit version: create_currency_exposure_chart(positions_df, cash_balances)
-        from chart_utils import create_currency_exposure_chart, get_chart_theme_config
-        from plotly_utils import serialize_plotly_figure
-        
-        fig = create_currency_exposure_chart(positions_df, cash_balances)
-        
-        if not fig:
-             return jsonify({"error": "Could not create chart"}), 500
-             
-        # Update height
-        fig.update_layout(height=350, margin=dict(l=20, r=20, t=30, b=20))
-        
-        # Apply theme
-        chart_json = serialize_plotly_figure(fig)
-        chart_data = json.loads(chart_json)
-        theme_config = get_chart_theme_config(theme)
-        
-        if 'layout' in chart_data:
-            chart_data['layout']['template'] = theme_config['template']
-            chart_data['layout']['paper_bgcolor'] = theme_config['paper_bgcolor']
-            chart_data['layout']['plot_bgcolor'] = theme_config['plot_bgcolor']
-            chart_data['layout']['font'] = {'color': theme_config['font_color']}
-            
-        return Response(json.dumps(chart_data), mimetype='application/json')
+        chart_data = build_currency_panel(DashboardData(fund, get_user_currency() or 'CAD'), theme)
+        return json_response(chart_data)
         
     except Exception as e:
         logger.error(f"Error creating currency chart: {e}", exc_info=True)
@@ -959,6 +1023,7 @@ def get_currency_chart():
 
 @dashboard_bp.route('/api/dashboard/movers', methods=['GET'])
 @require_auth
+@conditional_json(kinds=[POSITIONS])
 def get_movers_data():
     """Get top gainers and losers for the day.
     
@@ -982,58 +1047,134 @@ def get_movers_data():
     start_time = time.time()
     
     try:
-        positions_df = get_current_positions(fund)
-        
-        if positions_df.empty:
-            logger.warning(f"[Dashboard API] No positions found for movers - fund={fund}")
-            return jsonify({"gainers": [], "losers": []})
-        
-        movers = get_biggest_movers(positions_df, display_currency, limit=limit)
-        
-        def df_to_list(df):
-            if df.empty:
-                return []
-            result = []
-            for _, row in df.iterrows():
-                item = {
-                    "ticker": row.get('ticker', ''),
-                    "company_name": row.get('company_name', row.get('ticker', '')),
-                }
-                if 'daily_pnl_pct' in row:
-                    item["daily_pnl_pct"] = float(row['daily_pnl_pct']) if pd.notna(row['daily_pnl_pct']) else None
-                elif 'return_pct' in row:
-                    item["daily_pnl_pct"] = float(row['return_pct']) if pd.notna(row['return_pct']) else None
-                if 'pnl_display' in row:
-                    item["daily_pnl"] = float(row['pnl_display']) if pd.notna(row['pnl_display']) else None
-                if 'five_day_pnl_pct' in row:
-                    item["five_day_pnl_pct"] = float(row['five_day_pnl_pct']) if pd.notna(row['five_day_pnl_pct']) else None
-                if 'five_day_pnl_display' in row:
-                    item["five_day_pnl"] = float(row['five_day_pnl_display']) if pd.notna(row['five_day_pnl_display']) else None
-                if 'return_pct' in row and 'daily_pnl_pct' in df.columns:
-                    item["total_return_pct"] = float(row['return_pct']) if pd.notna(row['return_pct']) else None
-                if 'total_pnl_display' in row:
-                    item["total_pnl"] = float(row['total_pnl_display']) if pd.notna(row['total_pnl_display']) else None
-                if 'current_price' in row:
-                    item["current_price"] = float(row['current_price']) if pd.notna(row['current_price']) else None
-                if 'market_value' in row:
-                    item["market_value"] = float(row['market_value']) if pd.notna(row['market_value']) else None
-                result.append(item)
-            return result
-        
-        gainers = df_to_list(movers['gainers'])
-        losers = df_to_list(movers['losers'])
-        
-        processing_time = time.time() - start_time
-        logger.info(f"[Dashboard API] Movers data prepared - {len(gainers)} gainers, {len(losers)} losers, processing_time={processing_time:.3f}s")
-        
-        return jsonify({
-            "gainers": gainers,
-            "losers": losers,
-            "display_currency": display_currency,
-            "processing_time": processing_time
-        })
+        response = build_movers_panel(DashboardData(fund, display_currency), limit)
+        response["processing_time"] = time.time() - start_time
+        return json_response(response)
         
     except Exception as e:
         processing_time = time.time() - start_time
         logger.error(f"[Dashboard API] Error fetching movers (took {processing_time:.3f}s): {e}", exc_info=True)
         return jsonify({"error": str(e), "processing_time": processing_time}), 500
+
+def iter_dashboard_panels(data: DashboardData, panels: List[str], options: Dict[str, Any]):
+    """Build panels one at a time from shared data.
+    
+    Yields:
+        (panel name, HTTP-style status, payload, seconds spent on the panel). A failing
+        panel yields status 500 with an error payload; the remaining panels are still built.
+    """
+    theme = options.get('theme', 'light')
+    builders = {
+        'summary': lambda: build_summary_panel(data),
+        'performance': lambda: build_performance_panel(data, options.get('range', 'ALL'), options.get('use_solid', False), theme),
+        'allocation': lambda: build_allocation_panel(data, theme),
+        'pnl': lambda: build_pnl_panel(data, theme),
+        'holdings': lambda: build_holdings_panel(data),
+        'activity': lambda: build_activity_panel(data, options.get('activity_limit', 10)),
+        'dividends': lambda: build_dividends_panel(data),
+        'currency': lambda: build_currency_panel(data, theme),
+        'movers': lambda: build_movers_panel(data, options.get('movers_limit', 10)),
+    }
+    for name in panels:
+        start = time.time()
+        try:
+            payload, status = builders[name](), 200
+        except Exception as e:
+            logger.error(f"[Dashboard API] Error building {name} panel for fund={data.fund}: {e}", exc_info=True)
+            payload, status = {"error": str(e)}, 500
+        yield name, status, payload, time.time() - start
+
+@dashboard_bp.route('/api/dashboard/bundle', methods=['GET'])
+@require_auth
+@conditional_json(kinds=[POSITIONS, TRADES, CASH, CONTRIBUTIONS, DIVIDENDS, BENCHMARKS])
+def get_dashboard_bundle():
+    """Get every dashboard panel in one request, sharing a single data load.
+    
+    Positions, cash balances, exchange rates, trades and dividends are fetched once
+    and every panel is computed from them, instead of each panel endpoint loading
+    (and converting) the same data again.
+    
+    GET /api/dashboard/bundle
+    
+    Query Parameters:
+        fund (str): Fund name (optional)
+        panels (str): Comma-separated subset of panels (default: all) - summary, holdings,
+            movers, allocation, currency, pnl, dividends, activity, performance
+        range (str): Performance chart range (default: 'ALL')
+        use_solid (str): 'true' to use solid benchmark lines (default: 'false')
+        theme (str): Chart theme (optional)
+        activity_limit (int): Recent transactions to return (default: 10)
+        movers_limit (int): Movers per category (default: 10)
+        stream (str): 'true' to stream panels as newline-delimited JSON as each one is ready
+        
+    Returns:
+        JSON response with:
+            - panels: {name: {status, data, elapsed}} - data matches the panel's own endpoint
+            - load_times: Seconds spent loading each shared dataset
+            - version: Data version the panels were computed from
+            - processing_time: Total seconds
+        With stream=true, one JSON object per line: {panel, status, data, elapsed} for each
+        panel, then {done, load_times, version, processing_time}.
+        
+    Error Responses:
+        400: Unknown panel name, or activity_limit/movers_limit is not an integer
+    """
+    fund = request.args.get('fund')
+    if not fund or fund.lower() == 'all':
+        fund = None
+    
+    requested = request.args.get('panels')
+    panels = [p.strip() for p in requested.split(',') if p.strip()] if requested else list(DASHBOARD_PANELS)
+    unknown = [p for p in panels if p not in DASHBOARD_PANELS]
+    if unknown:
+        return jsonify({"error": f"Unknown panels: {', '.join(unknown)}"}), 400
+    
+    try:
+        activity_limit = int(request.args.get('activity_limit', 10))
+        movers_limit = int(request.args.get('movers_limit', 10))
+    except ValueError:
+        return jsonify({"error": "activity_limit and movers_limit must be integers"}), 400
+    
+    display_currency = get_user_currency() or 'CAD'
+    options = {
+        'range': request.args.get('range', 'ALL'),
+        'use_solid': request.args.get('use_solid', 'false').lower() == 'true',
+        'theme': _resolve_chart_theme(request.args.get('theme', '').strip().lower()),
+        'activity_limit': activity_limit,
+        'movers_limit': movers_limit,
+    }
+    stream = request.args.get('stream', 'false').lower() == 'true'
+    
+    logger.info(f"[Dashboard API] /api/dashboard/bundle called - fund={fund}, currency={display_currency}, panels={panels}, stream={stream}")
+    start_time = time.time()
+    
+    version = get_cache_version(fund=fund, kinds=[POSITIONS, TRADES, CASH, DIVIDENDS])
+    data = DashboardData(fund, display_currency)
+    
+    if stream:
+        def generate():
+            # Same serializer as json_response, so numpy/pandas/datetime values cannot break the stream
+            for name, status, payload, elapsed in iter_dashboard_panels(data, panels, options):
+                yield dumps_json({"panel": name, "status": status, "data": payload, "elapsed": elapsed}) + b"\n"
+            yield dumps_json({
+                "done": True,
+                "load_times": data.load_times,
+                "version": version,
+                "processing_time": time.time() - start_time
+            }) + b"\n"
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    results = {
+        name: {"status": status, "data": payload, "elapsed": elapsed}
+        for name, status, payload, elapsed in iter_dashboard_panels(data, panels, options)
+    }
+    processing_time = time.time() - start_time
+    logger.info(f"[Dashboard API] Bundle built - {len(results)} panels, load_times={data.load_times}, processing_time={processing_time:.3f}s")
+    
+    return json_response({
+        "panels": results,
+        "load_times": data.load_times,
+        "version": version,
+        "processing_time": processing_time
+    })
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request, current_app
 from auth import require_admin, is_admin
 from streamlit_utils import get_supabase_client, SupabaseClient
+from cache_version import bump_cache_version, POSITIONS, TRADES, CASH, CONTRIBUTIONS, DIVIDENDS, FUNDS
 import logging
 import os
 import sys
@@ -106,6 +107,7 @@ def create_fund():
             {"fund": name, "currency": "CAD", "amount": 0},
             {"fund": name, "currency": "USD", "amount": 0}
         ]).execute()
+        bump_cache_version(fund=name, kinds=[FUNDS, CASH])
         
         return jsonify({"message": f"Fund '{name}' created successfully"}), 201
         
@@ -132,6 +134,7 @@ def update_fund(fund_name):
             return jsonify({"message": "No changes provided"})
             
         client.supabase.table("funds").update(updates).eq("name", fund_name).execute()
+        bump_cache_version(fund=fund_name, kinds=[FUNDS])
         
         return jsonify({"message": f"Fund '{fund_name}' updated successfully"})
         
@@ -161,6 +164,8 @@ def rename_fund():
         # Update (Cascade should handle relations if DB is configured correctly, otherwise this might fail)
         # Assuming ON UPDATE CASCADE is set up in Postgres
         client.supabase.table("funds").update({"name": new_name}).eq("name", old_name).execute()
+        # Every cached result keyed by the old name is now stale
+        bump_cache_version()
         
         return jsonify({"message": f"Fund renamed from '{old_name}' to '{new_name}'"})
         
@@ -183,9 +188,14 @@ def delete_fund(fund_name):
                 client.supabase.table(table).delete().eq("fund", fund_name).execute()
             except Exception as e:
                 logger.warning(f"Error cleaning up {table} for {fund_name}: {e}")
+        
+        # Drop the fund's daily value rollup rows along with its positions
+        from data.repositories.fund_daily_values import refresh_fund_daily_values
+        refresh_fund_daily_values(client.supabase, fund_name)
                 
         # Delete fund
         client.supabase.table("funds").delete().eq("name", fund_name).execute()
+        bump_cache_version(fund=fund_name, kinds=[POSITIONS, TRADES, CASH, CONTRIBUTIONS, DIVIDENDS, FUNDS])
         
         return jsonify({"message": f"Fund '{fund_name}' deleted successfully"})
         
@@ -204,7 +214,9 @@ def wipe_fund_data(fund_name):
         client = get_supabase_client()
         
         # Wipe positions
+        from data.repositories.fund_daily_values import refresh_fund_daily_values
         client.supabase.table("portfolio_positions").delete().eq("fund", fund_name).execute()
+        refresh_fund_daily_values(client.supabase, fund_name)
         
         # Wipe trades if requested
         if wipe_trades:
@@ -219,6 +231,7 @@ def wipe_fund_data(fund_name):
             
         # Reset cash
         client.supabase.table("cash_balances").update({"amount": 0}).eq("fund", fund_name).execute()
+        bump_cache_version(fund=fund_name, kinds=[POSITIONS, TRADES, CASH] if wipe_trades else [POSITIONS, CASH])
         
         return jsonify({"message": f"Data wiped for '{fund_name}'"})
         
@@ -45,7 +45,7 @@ def startup_backfill_check() -> None:
         if web_dashboard_path not in sys.path:
             sys.path.insert(0, web_dashboard_path)
         
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
         
         # Defensive imports with retry logic
         try:
@@ -70,7 +70,7 @@ def startup_backfill_check() -> None:
             from utils.job_tracking import is_job_completed
         
         # Use service role key to bypass RLS (background job needs full access)
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         market_holidays = MarketHolidays()
 
         
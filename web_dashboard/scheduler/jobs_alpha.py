@@ -81,7 +81,7 @@ def alpha_research_job() -> None:
             return
         
         # Initialize research repository
-        research_repo = ResearchRepository()
+        research_repo = ResearchRepository(workload="scheduler")
         
         # Load config
         domains = get_alpha_research_domains()
@@ -96,7 +96,7 @@ def fetch_congress_trades_job() -> None:
         
         # Import dependencies (lazy imports)
         try:
-            from supabase_client import SupabaseClient
+            from supabase_client import get_shared_client
             from ollama_client import get_ollama_client
             from web_dashboard.utils.politician_mapping import lookup_politician_metadata, resolve_politician_name
             from settings import get_summarizing_model
@@ -117,7 +117,7 @@ def fetch_congress_trades_job() -> None:
             return
         
         # Initialize clients
-        supabase_client = SupabaseClient(use_service_role=True)
+        supabase_client = get_shared_client(use_service_role=True)
         ollama_client = get_ollama_client()
         
         if not ollama_client:
@@ -520,6 +520,13 @@ def fetch_congress_trades_job() -> None:
             except Exception as e:
                 logger.error(f"Unexpected error processing {chamber}: {e}", exc_info=True)
         
+        if new_trades or ai_analyzed:
+            try:
+                from cache_version import bump_cache_version, CONGRESS
+                bump_cache_version(kinds=[CONGRESS])
+            except Exception as cache_error:
+                logger.warning(f"⚠️  Failed to bump cache version: {cache_error}")
+        
         # Log completion
         duration_ms = int((time.time() - start_time) * 1000)
         message = f"Found {total_trades_found} trades: {new_trades} new, {skipped_duplicates} duplicates, {skipped_no_ticker} no ticker, {ai_analyzed} AI analyzed, {errors} errors"
@@ -581,7 +588,7 @@ def analyze_congress_trades_job() -> None:
         
         # Import dependencies (lazy imports)
         try:
-            from supabase_client import SupabaseClient
+            from supabase_client import get_shared_client
             from ollama_client import OllamaClient
         except ImportError as e:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -609,7 +616,7 @@ def analyze_congress_trades_job() -> None:
         from settings import get_summarizing_model
         
         # Initialize clients
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         ollama = OllamaClient()
         
         # Get model from settings (defaults to granite3.3:8b from model_config.json)
@@ -683,7 +690,7 @@ def analyze_congress_trades_job() -> None:
                         # Save to PostgreSQL (separate database to save Supabase costs)
                         try:
                             from postgres_client import PostgresClient
-                            postgres = PostgresClient()
+                            postgres = PostgresClient(workload="scheduler")
                             
                             postgres.execute_update(
                                 """
@@ -715,6 +722,13 @@ def analyze_congress_trades_job() -> None:
                     total_errors += 1
                     # Continue processing other trades
             
+            if total_processed:
+                try:
+                    from cache_version import bump_cache_version, CONGRESS
+                    bump_cache_version(kinds=[CONGRESS])
+                except Exception as cache_error:
+                    logger.warning(f"⚠️  Failed to bump cache version: {cache_error}")
+            
             # Log completion
             duration_ms = int((time.time() - start_time) * 1000)
             message = f"Processed {total_processed} trades, {total_errors} errors"
@@ -864,6 +878,12 @@ def rescore_congress_sessions_job(limit: int = 1000, batch_size: int = 10, model
         return_code = process.wait()
         
         if return_code == 0:
+            try:
+                from cache_version import bump_cache_version, CONGRESS
+                bump_cache_version(kinds=[CONGRESS])
+            except Exception as cache_error:
+                logger.warning(f"⚠️  Failed to bump cache version: {cache_error}")
+            
             duration_ms = int((time.time() - start_time) * 1000)
             # Find completion message
             completed_lines = [line for line in full_output if 'Completed processing' in line]
@@ -14,8 +14,12 @@ import time
 import requests
 import json
 import base64
-from datetime import datetime, date, timedelta, time as dt_time
-from typing import Dict, List, Optional, Tuple, NamedTuple
+from bisect import bisect_left, insort
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, date, timedelta, timezone, time as dt_time
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Tuple, NamedTuple
 from decimal import Decimal
 import pytz
 from dataclasses import dataclass
@@ -57,6 +61,11 @@ from scheduler.scheduler_core import log_job_execution
 
 logger = logging.getLogger(__name__)
 
+# Tickers whose dividend sources are queried at the same time
+DIVIDEND_FETCH_WORKERS = 8
+# Days after the pay date searched for a DRIP price (weekends/holidays)
+DRIP_PRICE_LOOKAHEAD_DAYS = 3
+
 
 @dataclass
 class DividendEvent:
@@ -321,6 +330,137 @@ def fetch_dividend_data(ticker: str) -> List[DividendEvent]:
     return list(merged_map.values())
 
 
+def fetch_dividend_data_bulk(tickers: Iterable[str], max_workers: int = DIVIDEND_FETCH_WORKERS) -> Dict[str, List[DividendEvent]]:
+    """
+    Run fetch_dividend_data for many tickers concurrently, once per ticker.
+    Returns {ticker: events}; tickers whose lookup failed map to [].
+    """
+    unique_tickers = sorted(set(tickers))
+    if not unique_tickers:
+        return {}
+    
+    events_by_ticker = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_tickers))) as executor:
+        futures = {executor.submit(fetch_dividend_data, ticker): ticker for ticker in unique_tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                events_by_ticker[ticker] = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching dividends for {ticker}: {e}")
+                events_by_ticker[ticker] = []
+    return events_by_ticker
+
+
+def _to_utc(value: Any) -> datetime:
+    """Parse a trade_log timestamp (naive = UTC)."""
+    parsed = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+
+class SharesLedger:
+    """
+    Running share counts per ticker from one fund's trade log.
+    Answers calculate_eligible_shares for any ex-date by binary search over
+    cumulative sums, so the trade log is read once per fund instead of once
+    per dividend.
+    """
+    
+    def __init__(self, trades: Iterable[Dict[str, Any]]):
+        self._trades: Dict[str, List[Tuple[datetime, Decimal]]] = defaultdict(list)
+        for trade in trades:
+            self._trades[trade['ticker']].append(
+                (_to_utc(trade['date']), Decimal(str(trade.get('shares', 0) or 0)))
+            )
+        self._times: Dict[str, List[datetime]] = {}
+        self._cumulative: Dict[str, List[Decimal]] = {}
+        for ticker in list(self._trades):
+            self._reindex(ticker)
+    
+    @classmethod
+    def load(cls, client, fund: str, tickers: Iterable[str]) -> 'SharesLedger':
+        """Read a fund's trades for the given tickers (one paged query)."""
+        from data.repositories.supabase_pagination import SupabasePageReader
+        
+        ticker_list = sorted(set(tickers))
+        reader = SupabasePageReader(
+            client.supabase, "trade_log", "ticker, shares, date",
+            lambda query: query.eq("fund", fund).in_("ticker", ticker_list)
+        )
+        return cls(reader.fetch_all())
+    
+    def _reindex(self, ticker: str) -> None:
+        rows = sorted(self._trades[ticker], key=lambda row: row[0])
+        self._trades[ticker] = rows
+        self._times[ticker] = [when for when, _ in rows]
+        self._cumulative[ticker] = list(accumulate(shares for _, shares in rows))
+    
+    def eligible_shares(self, ticker: str, ex_date: date) -> Decimal:
+        """Shares held before ex_date (same rule as calculate_eligible_shares)."""
+        times = self._times.get(ticker)
+        if not times:
+            return Decimal('0')
+        cutoff = datetime.combine(ex_date, dt_time(0, 0, 0), tzinfo=timezone.utc)
+        idx = bisect_left(times, cutoff)
+        net_shares = self._cumulative[ticker][idx - 1] if idx else Decimal('0')
+        return max(net_shares, Decimal('0'))
+    
+    def add_trade(self, ticker: str, when: datetime, shares: Decimal) -> None:
+        """Record a trade written during this run (e.g. a DRIP purchase)."""
+        insort(self._trades[ticker], (_to_utc(when), shares), key=lambda row: row[0])
+        self._reindex(ticker)
+
+
+class DripPriceLookup:
+    """
+    Closing prices around dividend pay dates.
+    Every ticker's window is fetched in one batch request instead of up to
+    four single-day fetches per dividend.
+    """
+    
+    def __init__(self, market_fetcher=None):
+        self._market_fetcher = market_fetcher
+        self._closes: Dict[str, Dict[date, Decimal]] = {}
+    
+    def load(self, pay_dates: Dict[str, Iterable[date]]) -> None:
+        """Fetch closes covering each ticker's pay dates (plus the lookahead days)."""
+        all_dates = [d for dates in pay_dates.values() for d in dates]
+        if not all_dates:
+            return
+        if self._market_fetcher is None:
+            from market_data.data_fetcher import MarketDataFetcher
+            self._market_fetcher = MarketDataFetcher()
+        
+        start_dt = datetime.combine(min(all_dates), dt_time(0, 0, 0))
+        end_dt = datetime.combine(max(all_dates) + timedelta(days=DRIP_PRICE_LOOKAHEAD_DAYS), dt_time(23, 59, 59, 999999))
+        try:
+            results = self._market_fetcher.fetch_price_data_batch(sorted(pay_dates), start=start_dt, end=end_dt)
+        except Exception as e:
+            logger.warning(f"Batch price fetch failed for DRIP prices: {e}")
+            return
+        
+        for ticker, result in results.items():
+            if result is None or result.df is None or result.df.empty or 'Close' not in result.df:
+                continue
+            closes = {}
+            for when, close in result.df['Close'].items():
+                if close == close:  # Skip NaN
+                    closes[when.date() if hasattr(when, 'date') else when] = Decimal(str(close))
+            self._closes[ticker] = closes
+    
+    def price_on(self, ticker: str, target_date: date) -> Optional[Decimal]:
+        """Close on target_date or the next few days (same search as get_price_on_date)."""
+        closes = self._closes.get(ticker)
+        if closes is None:
+            # Not in the batch - fall back to the per-day lookup
+            return get_price_on_date(ticker, target_date)
+        for i in range(DRIP_PRICE_LOOKAHEAD_DAYS + 1):
+            price = closes.get(target_date + timedelta(days=i))
+            if price is not None:
+                return price
+        return None
+
+
 def calculate_eligible_shares(fund: str, ticker: str, ex_date: date, client) -> Decimal:
     """
     Calculate shares owned on day BEFORE ex_date.
@@ -380,12 +520,21 @@ def get_price_on_date(ticker: str, target_date: date) -> Optional[Decimal]:
 
 def insert_drip_transaction(
     fund: str, ticker: str, evt: DividendEvent,
-    fund_type: str, client
+    fund_type: str, client,
+    ledger: Optional[SharesLedger] = None,
+    prices: Optional[DripPriceLookup] = None
 ) -> bool:
-    """Insert DRIP transaction into DB."""
+    """
+    Insert DRIP transaction into DB.
+    The job passes a preloaded ledger/prices; without them shares and price
+    are queried individually.
+    """
     try:
         # 1. Calc Shares
-        eligible_shares = calculate_eligible_shares(fund, ticker, evt.ex_date, client)
+        if ledger is not None:
+            eligible_shares = ledger.eligible_shares(ticker, evt.ex_date)
+        else:
+            eligible_shares = calculate_eligible_shares(fund, ticker, evt.ex_date, client)
         if eligible_shares <= 0:
             return False
             
@@ -398,7 +547,10 @@ def insert_drip_transaction(
             return False
             
         # 3. Get Price & Reinvest
-        drip_price = get_price_on_date(ticker, evt.pay_date)
+        if prices is not None:
+            drip_price = prices.price_on(ticker, evt.pay_date)
+        else:
+            drip_price = get_price_on_date(ticker, evt.pay_date)
         if not drip_price:
             logger.warning(f"Could not get price for {ticker} on {evt.pay_date}")
             return False
@@ -449,6 +601,13 @@ def insert_drip_transaction(
         
         client.supabase.table("dividend_log").insert(div_entry).execute()
         
+        if ledger is not None:
+            # Later dividends in this run see the reinvested shares
+            ledger.add_trade(ticker, utc_dt, reinvested_shares)
+        
+        from cache_version import bump_cache_version, DIVIDENDS, TRADES, POSITIONS
+        bump_cache_version(fund=fund, kinds=[DIVIDENDS, TRADES, POSITIONS])
+        
         logger.info(f"✅ DRIP {fund}/{ticker}: {reinvested_shares:.4f} shares @ ${drip_price} (Source: {evt.source})")
         return True
         
@@ -484,8 +643,8 @@ def process_dividends_job(lookback_days: int = 7) -> None:
         logger.warning(f"Could not mark job started: {e}")
     
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         print(f"[{__name__}] Starting dividend processing job (3-Layer Strategy, lookback={lookback_days}d)...", file=sys.stderr, flush=True)
         logger.info(f"Starting dividend processing job (3-Layer Strategy, lookback={lookback_days}d)...")
@@ -522,29 +681,59 @@ def process_dividends_job(lookback_days: int = 7) -> None:
         today = date.today()
         lookback = today - timedelta(days=lookback_days)
         
+        # 1. Fetch Data - once per ticker, however many funds hold it
+        events_by_ticker = fetch_dividend_data_bulk(ticker for _, ticker in holdings)
+        
+        # 2. Select new events in the window
+        candidates: Dict[str, List[Tuple[str, DividendEvent]]] = defaultdict(list)
         for fund, ticker in holdings:
-            try:
-                # 1. Fetch Data
-                events = fetch_dividend_data(ticker)
-                if not events:
+            for evt in events_by_ticker.get(ticker, []):
+                # Filter: Pay date must be in recent window (or today)
+                if not (lookback <= evt.pay_date <= today):
                     continue
                     
+                # Check Duplicate
+                if (fund, ticker, evt.pay_date.isoformat()) in processed_keys:
+                    continue
+                if (fund, ticker, evt.ex_date.isoformat()) in processed_keys:
+                    continue
+                candidates[fund].append((ticker, evt))
+        
+        # 3. One trade log read per fund
+        ledgers: Dict[str, SharesLedger] = {}
+        for fund, fund_events in candidates.items():
+            try:
+                ledgers[fund] = SharesLedger.load(client, fund, (ticker for ticker, _ in fund_events))
+            except Exception as e:
+                logger.error(f"Error loading trades for {fund}: {e}")
+                stats['errors'] += 1
+        
+        # 4. One price request for every dividend that will be reinvested
+        pay_dates: Dict[str, set] = defaultdict(set)
+        for fund, ledger in ledgers.items():
+            for ticker, evt in candidates[fund]:
+                if ledger.eligible_shares(ticker, evt.ex_date) > 0:
+                    pay_dates[ticker].add(evt.pay_date)
+        prices = DripPriceLookup()
+        prices.load(pay_dates)
+        
+        # 5. Process Events (oldest first, so DRIPs compound correctly)
+        for fund, ledger in ledgers.items():
+            try:
                 fund_type = get_fund_type(fund, client)
-                
-                # 2. Process Events
-                for evt in events:
-                    # Filter: Pay date must be in recent window (or today)
-                    if not (lookback <= evt.pay_date <= today):
-                        continue
-                        
-                    # Check Duplicate
+            except Exception as e:
+                logger.error(f"Error getting fund type for {fund}: {e}")
+                stats['errors'] += 1
+                continue
+            
+            for ticker, evt in sorted(candidates[fund], key=lambda item: (item[1].ex_date, item[0])):
+                try:
+                    # Same dividend reported twice (e.g. by different sources)
                     if (fund, ticker, evt.pay_date.isoformat()) in processed_keys:
                         continue
-                    if (fund, ticker, evt.ex_date.isoformat()) in processed_keys:
-                        continue
-                        
+                    
                     # Process
-                    success = insert_drip_transaction(fund, ticker, evt, fund_type, client)
+                    success = insert_drip_transaction(fund, ticker, evt, fund_type, client, ledger=ledger, prices=prices)
                     if success:
                         stats['processed'] += 1
                         # Add to processed set to prevent double counting in same run
@@ -552,9 +741,9 @@ def process_dividends_job(lookback_days: int = 7) -> None:
                     else:
                         stats['skipped'] += 1
                         
-            except Exception as e:
-                logger.error(f"Error processing {ticker}: {e}")
-                stats['errors'] += 1
+                except Exception as e:
+                    logger.error(f"Error processing {ticker}: {e}")
+                    stats['errors'] += 1
                 
         duration = int((time.time() - start_time) * 1000)
         msg = f"Processed {stats['processed']}, Skipped {stats['skipped']}, Errors {stats['errors']}"
@@ -22,7 +22,7 @@ import requests
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from supabase_client import SupabaseClient
+from supabase_client import SupabaseClient, get_shared_client
 from research_repository import ResearchRepository
 
 logger = logging.getLogger(__name__)
@@ -470,8 +470,8 @@ def etf_watchtower_job():
     
     logger.info("🏛️ Starting ETF Watchtower Job...")
     
-    db = SupabaseClient(use_service_role=True)  # Use service role for writes
-    repo = ResearchRepository()
+    db = get_shared_client(use_service_role=True)  # Use service role for writes
+    repo = ResearchRepository(workload="scheduler")
     today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
     
     total_changes = 0
@@ -7,12 +7,13 @@ Jobs for refreshing benchmark data, exchange rates, and performance metrics.
 
 import logging
 import time
-from datetime import datetime, timezone, timedelta, date, time as dt_time
-from decimal import Decimal
-from collections import defaultdict
+from datetime import datetime, timezone, timedelta, date
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+import pandas as pd
+
 # Add parent directory to path if needed (standard boilerplate for these jobs)
 import sys
 
@@ -73,7 +74,7 @@ def benchmark_refresh_job() -> None:
         # Import dependencies
         try:
             import yfinance as yf
-            from supabase_client import SupabaseClient
+            from supabase_client import get_shared_client
         except ImportError as e:
             duration_ms = int((time.time() - start_time) * 1000)
             message = f"Missing dependency: {e}"
@@ -82,7 +83,7 @@ def benchmark_refresh_job() -> None:
             return
         
         # Initialize Supabase client (use service role for writing)
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         
         # Define benchmarks to refresh
         benchmarks = [
@@ -146,8 +147,8 @@ def benchmark_refresh_job() -> None:
         
         # Clear cache to ensure fresh data is used in charts
         try:
-            from cache_version import bump_cache_version
-            bump_cache_version()
+            from cache_version import bump_cache_version, BENCHMARKS
+            bump_cache_version(kinds=[BENCHMARKS])
             logger.info("🔄 Cache version bumped - charts will use fresh benchmark data")
         except Exception as cache_error:
             logger.warning(f"⚠️  Failed to bump cache version: {cache_error}")
@@ -274,122 +275,150 @@ def refresh_exchange_rates_job() -> None:
 
 
 
-def _process_performance_metrics_for_date(
+# Rows per performance_metrics upsert request
+METRICS_UPSERT_BATCH_SIZE = 500
+
+
+def _load_positions_for_range(client, start_date: date, end_date: date,
+                              fund_filter: Optional[str] = None) -> pd.DataFrame:
+    """Load every position row from start_date to end_date (inclusive), paging by (date, id)."""
+    from data.repositories.supabase_pagination import SupabasePageReader
+    
+    def apply_filters(query):
+        query = query.gte("date", f"{start_date}T00:00:00")\
+            .lt("date", f"{end_date + timedelta(days=1)}T00:00:00")
+        return query.eq("fund", fund_filter) if fund_filter else query
+    
+    rows = SupabasePageReader(
+        client.supabase, "portfolio_positions",
+        "fund, ticker, total_value, cost_basis, pnl, currency, date", apply_filters
+    ).fetch_all()
+    return pd.DataFrame(rows)
+
+
+def _normalize_currencies(positions: pd.DataFrame) -> pd.Series:
+    """Upper-cased position currencies; missing or invalid values ('nan', None, '') become CAD."""
+    currency = positions['currency'] if 'currency' in positions else pd.Series(None, index=positions.index)
+    normalized = currency.where(currency.map(lambda value: isinstance(value, str)), '')\
+        .astype(str).str.strip().str.upper()
+    invalid = normalized.isin(['NAN', 'NONE', 'NULL', ''])
+    if invalid.any():
+        bad = positions.loc[invalid]
+        examples = ", ".join(f"{fund}/{ticker}" for fund, ticker in
+                             zip(bad['fund'].head(5), bad.get('ticker', pd.Series('unknown', index=bad.index)).head(5)))
+        logger.warning(f"⚠️ {int(invalid.sum())} position(s) have an invalid currency (e.g. {examples}). Defaulting to CAD.")
+    return normalized.mask(invalid, 'CAD')
+
+
+def _aggregate_performance_metrics(positions: pd.DataFrame) -> pd.DataFrame:
+    """Sum position rows into one performance_metrics row per fund and day (values in CAD).
+    
+    USD positions are converted at the USD/CAD rate in effect at the start of their
+    day (one vectorized as-of lookup for all days); other currencies are summed as is.
+    """
+    from exchange_rates_utils import get_exchange_rate_series
+    
+    frame = pd.DataFrame({
+        'fund': positions['fund'],
+        'date': positions['date'].astype(str).str[:10],
+        'currency': _normalize_currencies(positions),
+    })
+    rate = pd.Series(1.0, index=frame.index)
+    is_usd = frame['currency'] == 'USD'
+    if is_usd.any():
+        days = frame.loc[is_usd, 'date'].unique()
+        day_rates = get_exchange_rate_series('USD', 'CAD').rates_on(pd.to_datetime(days, utc=True))
+        # Same default get_exchange_rate_for_date_from_db falls back to
+        day_rates = np.where(np.isnan(day_rates), 1.35, day_rates)
+        rate[is_usd] = frame.loc[is_usd, 'date'].map(dict(zip(days, day_rates)))
+    for column in ('total_value', 'cost_basis', 'pnl'):
+        frame[column] = pd.to_numeric(positions[column], errors='coerce').fillna(0.0).astype(float) * rate
+    
+    metrics = frame.groupby(['fund', 'date'], sort=True).agg(
+        total_value=('total_value', 'sum'),
+        cost_basis=('cost_basis', 'sum'),
+        unrealized_pnl=('pnl', 'sum'),
+        total_trades=('fund', 'size'),
+    ).reset_index()
+    cost_basis = metrics['cost_basis']
+    metrics['performance_pct'] = np.where(
+        cost_basis > 0, metrics['unrealized_pnl'] / cost_basis.where(cost_basis > 0, 1.0) * 100, 0.0
+    ).round(2)
+    return metrics
+
+
+def _load_existing_metric_keys(client, start_date: date, end_date: date,
+                               fund_filter: Optional[str] = None) -> set:
+    """(fund, 'YYYY-MM-DD') pairs that already have performance_metrics rows in the range."""
+    from data.repositories.supabase_pagination import SupabasePageReader
+    
+    def apply_filters(query):
+        query = query.gte("date", str(start_date)).lte("date", str(end_date))
+        return query.eq("fund", fund_filter) if fund_filter else query
+    
+    rows = SupabasePageReader(client.supabase, "performance_metrics", "fund, date", apply_filters).fetch_all()
+    return {(row['fund'], str(row['date'])[:10]) for row in rows}
+
+
+def _process_performance_metrics_for_range(
     client,
-    target_date: date,
+    start_date: date,
+    end_date: date,
     fund_filter: Optional[str] = None,
     skip_existing: bool = False
-) -> tuple[int, int, list[str]]:
-    """Process performance metrics for a single date.
+) -> tuple[int, int, dict[str, list[str]]]:
+    """Compute and store performance metrics for every fund and day in a date range.
+    
+    Positions for the whole range are read in one paged query, converted to CAD with
+    one exchange-rate lookup, aggregated per (fund, day), and written in batched upserts.
     
     Args:
         client: SupabaseClient instance
-        target_date: Date to process
+        start_date: First date to process
+        end_date: Last date to process (inclusive)
         fund_filter: Optional fund name to filter by
-        skip_existing: If True, skip dates that already have metrics
+        skip_existing: If True, skip fund/dates that already have metrics
     
     Returns:
-        Tuple of (rows_inserted, rows_skipped, list of fund names processed)
+        Tuple of (rows_inserted, rows_skipped, fund names per 'YYYY-MM-DD' day with position data)
     """
-    # Get all funds that have data for target_date
-    positions_query = client.supabase.table("portfolio_positions")\
-        .select("fund, total_value, cost_basis, pnl, currency, date")\
-        .gte("date", f"{target_date}T00:00:00")\
-        .lt("date", f"{target_date}T23:59:59.999999")
+    positions = _load_positions_for_range(client, start_date, end_date, fund_filter)
+    if positions.empty:
+        return (0, 0, {})
     
-    if fund_filter:
-        positions_query = positions_query.eq("fund", fund_filter)
+    metrics = _aggregate_performance_metrics(positions)
+    funds_by_date = {day: sorted(group.tolist()) for day, group in metrics.groupby('date')['fund']}
     
-    positions_result = positions_query.execute()
-    
-    if not positions_result.data:
-        return (0, 0, [])
-    
-    # Group by fund and aggregate
-    fund_totals = defaultdict(lambda: {
-        'total_value': Decimal('0'),
-        'cost_basis': Decimal('0'),
-        'unrealized_pnl': Decimal('0'),
-        'total_trades': 0
-    })
-    
-    # Load exchange rates if needed for USD conversion
-    from exchange_rates_utils import get_exchange_rate_for_date_from_db
-    
-    for pos in positions_result.data:
-        fund = pos['fund']
-        original_currency = pos.get('currency', 'CAD')
-        currency = original_currency
-        # Validate currency: treat 'nan', None, or empty strings as 'CAD'
-        if not currency or not isinstance(currency, str):
-            currency = 'CAD'
-            logger.warning(f"⚠️ Position in fund '{fund}' has invalid currency (None/non-string). Defaulting to CAD.")
-        else:
-            currency = currency.strip().upper()
-            if currency in ('NAN', 'NONE', 'NULL', ''):
-                logger.warning(f"⚠️ Position in fund '{fund}' ticker '{pos.get('ticker', 'unknown')}' has invalid currency '{original_currency}'. Defaulting to CAD.")
-                currency = 'CAD'
-        
-        # Convert to Decimal for precision
-        total_value = Decimal(str(pos.get('total_value', 0) or 0))
-        cost_basis = Decimal(str(pos.get('cost_basis', 0) or 0))
-        pnl = Decimal(str(pos.get('pnl', 0) or 0))
-        
-        # Convert USD to CAD if needed
-        if currency == 'USD':
-            rate = get_exchange_rate_for_date_from_db(
-                datetime.combine(target_date, dt_time(0, 0, 0)),
-                'USD',
-                'CAD'
-            )
-            if rate:
-                rate_decimal = Decimal(str(rate))
-                total_value *= rate_decimal
-                cost_basis *= rate_decimal
-                pnl *= rate_decimal
-        
-        fund_totals[fund]['total_value'] += total_value
-        fund_totals[fund]['cost_basis'] += cost_basis
-        fund_totals[fund]['unrealized_pnl'] += pnl
-        fund_totals[fund]['total_trades'] += 1
-    
-    # Insert/update performance_metrics for each fund
-    rows_inserted = 0
     rows_skipped = 0
-    for fund, totals in fund_totals.items():
-        # Check if we should skip existing entries
-        if skip_existing:
-            existing = client.supabase.table("performance_metrics")\
-                .select("id")\
-                .eq("fund", fund)\
-                .eq("date", str(target_date))\
-                .execute()
-            
-            if existing.data:
-                rows_skipped += 1
-                continue  # This fund+date already exists, skip
-        
-        performance_pct = (
-            (float(totals['unrealized_pnl']) / float(totals['cost_basis']) * 100)
-            if totals['cost_basis'] > 0 else 0.0
-        )
-        
-        # Upsert into performance_metrics
-        client.supabase.table("performance_metrics").upsert({
+    if skip_existing:
+        existing = _load_existing_metric_keys(client, start_date, end_date, fund_filter)
+        keep = [(fund, day) not in existing for fund, day in zip(metrics['fund'], metrics['date'])]
+        rows_skipped = len(metrics) - sum(keep)
+        metrics = metrics[keep]
+    
+    rows = [
+        {
             'fund': fund,
-            'date': str(target_date),
-            'total_value': float(totals['total_value']),
-            'cost_basis': float(totals['cost_basis']),
-            'unrealized_pnl': float(totals['unrealized_pnl']),
-            'performance_pct': round(performance_pct, 2),
-            'total_trades': totals['total_trades'],
+            'date': day,
+            'total_value': float(total_value),
+            'cost_basis': float(cost_basis),
+            'unrealized_pnl': float(unrealized_pnl),
+            'performance_pct': float(performance_pct),
+            'total_trades': int(total_trades),
             'winning_trades': 0,  # Not calculated in this version
             'losing_trades': 0     # Not calculated in this version
-        }, on_conflict='fund,date').execute()
-        
-        rows_inserted += 1
+        }
+        for fund, day, total_value, cost_basis, unrealized_pnl, total_trades, performance_pct in metrics[
+            ['fund', 'date', 'total_value', 'cost_basis', 'unrealized_pnl', 'total_trades', 'performance_pct']
+        ].itertuples(index=False, name=None)
+    ]
     
-    return (rows_inserted, rows_skipped, list(fund_totals.keys()))
+    for offset in range(0, len(rows), METRICS_UPSERT_BATCH_SIZE):
+        client.supabase.table("performance_metrics")\
+            .upsert(rows[offset:offset + METRICS_UPSERT_BATCH_SIZE], on_conflict='fund,date')\
+            .execute()
+    
+    return (len(rows), rows_skipped, funds_by_date)
 
 
 def populate_performance_metrics_job(
@@ -421,10 +450,10 @@ def populate_performance_metrics_job(
         logger.info("Starting performance metrics population job...")
         
         # Import here to avoid circular imports
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
         
         # Use service role key to bypass RLS (background job needs full access)
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         
         # Determine which dates to process
         dates_to_process = []
@@ -434,11 +463,6 @@ def populate_performance_metrics_job(
             if from_date > to_date:
                 raise ValueError(f"from_date ({from_date}) must be <= to_date ({to_date})")
             
-            # Warn if range is large
-            days_in_range = (to_date - from_date).days + 1
-            if days_in_range > 30:
-                logger.warning(f"⚠️ Processing large date range: {days_in_range} days ({from_date} to {to_date}). This may take a while.")
-            
             # Generate list of dates in range
             current_date = from_date
             while current_date <= to_date:
@@ -451,45 +475,48 @@ def populate_performance_metrics_job(
             # Default: yesterday
             dates_to_process = [(datetime.now(timezone.utc) - timedelta(days=1)).date()]
         
-        # Process each date
-        total_rows_inserted = 0
-        total_rows_skipped = 0
-        total_dates_processed = 0
-        total_dates_failed = 0
-        all_funds_processed = set()
-        
+        # Every date is tracked on its own so the watchdog can retry just the failed ones
         for process_date in dates_to_process:
+            mark_job_started('performance_metrics', process_date)
+        
+        # Process the whole range at once; if that fails, fall back to one date at a
+        # time so a bad day does not take the rest of the range down with it
+        failed_dates = {}
+        try:
+            total_rows_inserted, total_rows_skipped, funds_by_date = _process_performance_metrics_for_range(
+                client, dates_to_process[0], dates_to_process[-1], fund_filter, skip_existing
+            )
+        except Exception as range_error:
+            total_rows_inserted, total_rows_skipped, funds_by_date = 0, 0, {}
+            if len(dates_to_process) == 1:
+                failed_dates[dates_to_process[0]] = str(range_error)
+            else:
+                logger.warning(f"⚠️ Range pass failed ({range_error}); processing {len(dates_to_process)} dates one at a time")
+                for process_date in dates_to_process:
+                    try:
+                        rows_inserted, rows_skipped, date_funds = _process_performance_metrics_for_range(
+                            client, process_date, process_date, fund_filter, skip_existing
+                        )
+                        total_rows_inserted += rows_inserted
+                        total_rows_skipped += rows_skipped
+                        funds_by_date.update(date_funds)
+                    except Exception as date_error:
+                        failed_dates[process_date] = str(date_error)
+        
+        for process_date, error in failed_dates.items():
+            logger.error(f"❌ Error processing {process_date}: {error}")
             try:
-                # Mark job as started in database
-                mark_job_started('performance_metrics', process_date)
-                
-                # Process this date
-                rows_inserted, rows_skipped, funds = _process_performance_metrics_for_date(
-                    client, process_date, fund_filter, skip_existing
-                )
-                
-                if rows_inserted == 0 and rows_skipped == 0:
-                    # No data for this date
-                    logger.info(f"ℹ️ No position data found for {process_date}")
-                    continue
-                
-                total_rows_inserted += rows_inserted
-                total_rows_skipped += rows_skipped
-                all_funds_processed.update(funds)
-                total_dates_processed += 1
-                
-                # Log progress for date ranges
-                if len(dates_to_process) > 1:
-                    logger.info(f"✅ Processed {process_date}: {rows_inserted} inserted, {rows_skipped} skipped")
-                
-            except Exception as date_error:
-                total_dates_failed += 1
-                logger.error(f"❌ Error processing {process_date}: {date_error}")
-                # Continue with next date even if one fails
-                try:
-                    mark_job_failed('performance_metrics', process_date, None, str(date_error), 0)
-                except Exception:
-                    pass
+                mark_job_failed('performance_metrics', process_date, None, error, 0)
+            except Exception:
+                pass
+        
+        total_dates_processed = len(funds_by_date)
+        total_dates_failed = len(failed_dates)
+        
+        if not funds_by_date and not failed_dates:
+            logger.info(f"ℹ️ No position data found for {dates_to_process[0]} to {dates_to_process[-1]}")
+        elif len(dates_to_process) > 1:
+            logger.info(f"✅ Processed {total_dates_processed} date(s) with data: {total_rows_inserted} inserted, {total_rows_skipped} skipped")
         
         # Final summary
         duration_ms = int((time.time() - start_time) * 1000)
@@ -502,16 +529,20 @@ def populate_performance_metrics_job(
         else:
             # Single date summary
             process_date = dates_to_process[0]
-            if total_rows_skipped > 0:
+            if total_dates_failed > 0:
+                message = f"Failed to populate metrics for {process_date}: {failed_dates[process_date]}"
+            elif total_rows_skipped > 0:
                 message = f"Populated {total_rows_inserted} fund(s) for {process_date} (skipped {total_rows_skipped} existing)"
             else:
                 message = f"Populated {total_rows_inserted} fund(s) for {process_date}"
         
-        log_job_execution(job_id, success=True, message=message, duration_ms=duration_ms)
+        log_job_execution(job_id, success=total_dates_failed < len(dates_to_process), message=message, duration_ms=duration_ms)
         
-        # Mark completion for the last date processed (or first if none processed)
-        if dates_to_process:
-            mark_job_completed('performance_metrics', dates_to_process[-1], None, list(all_funds_processed), duration_ms=duration_ms)
+        # Mark completion for every date that did not fail
+        for process_date in dates_to_process:
+            if process_date not in failed_dates:
+                mark_job_completed('performance_metrics', process_date, None,
+                                   funds_by_date.get(str(process_date), []), duration_ms=duration_ms)
         
         logger.info(f"✅ {message}")
         
@@ -521,7 +552,7 @@ def populate_performance_metrics_job(
         log_job_execution(job_id, success=False, message=message, duration_ms=duration_ms)
         try:
             from utils.job_tracking import mark_job_failed
-            error_date = target_date if target_date else (datetime.now(timezone.utc) - timedelta(days=1)).date()
+            error_date = target_date or to_date or (datetime.now(timezone.utc) - timedelta(days=1)).date()
             mark_job_failed('performance_metrics', error_date, None, message, duration_ms=duration_ms)
         except Exception:
             pass  # Don't fail if tracking fails
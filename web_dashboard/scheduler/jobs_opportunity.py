@@ -82,7 +82,7 @@ def opportunity_discovery_job() -> None:
             return
         
         # Initialize research repository
-        research_repo = ResearchRepository()
+        research_repo = ResearchRepository(workload="scheduler")
         
         # Load domain blacklist
         from settings import get_research_domain_blacklist
@@ -178,6 +178,89 @@ def _ensure_sys_path_setup() -> None:
             pass  # Even logging failed
 
 
+def _parse_position_date(value: str) -> date:
+    """Day of a portfolio_positions/trade_log date value (ISO timestamp or plain date)."""
+    if 'T' in value:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+    return datetime.strptime(value[:10], '%Y-%m-%d').date()
+
+
+def _existing_position_dates(supabase, fund_name: str, start_date: date, end_date: date) -> set:
+    """Days in [start_date, end_date) on which a fund has positions.
+    
+    Reads portfolio_positions.date_only directly rather than the
+    fund_daily_values rollup, so a stale rollup cannot make missing days
+    look present. The window starts after the fund's latest position, so
+    this normally reads few or no rows.
+    """
+    from data.repositories.supabase_pagination import SupabasePageReader
+    
+    def apply_filters(query):
+        return query.eq("fund", fund_name)\
+            .gte("date_only", start_date.isoformat())\
+            .lt("date_only", end_date.isoformat())
+    
+    rows = SupabasePageReader(supabase, "portfolio_positions", "date_only", apply_filters).fetch_all()
+    return {_parse_position_date(str(row['date_only'])) for row in rows if row.get('date_only')}
+
+
+def _find_missing_trading_days(supabase, fund_names: list, target_date: date, market_holidays) -> list:
+    """Find trading days before target_date that funds have no positions for.
+    
+    A fund's window starts the day after its latest position (or at its first
+    trade if it has none). The days already present in each window are read
+    from the fund's position rows in one paged query per fund and subtracted
+    from a trading calendar computed once for all funds
+    (MarketHolidays.calendar), so the number of queries does not grow with
+    the length of the gap.
+    
+    Returns:
+        List of (fund_name, window_start, sorted missing days) for funds with gaps
+    """
+    windows = []
+    for fund_name in fund_names:
+        latest_date_result = supabase.table("portfolio_positions")\
+            .select("date")\
+            .eq("fund", fund_name)\
+            .order("date", desc=True)\
+            .limit(1)\
+            .execute()
+        
+        if latest_date_result.data:
+            window_start = _parse_position_date(latest_date_result.data[0]['date']) + timedelta(days=1)
+        else:
+            # No data for this fund - backfill from its earliest trade
+            trades_result = supabase.table("trade_log")\
+                .select("date")\
+                .eq("fund", fund_name)\
+                .order("date")\
+                .limit(1)\
+                .execute()
+            if not trades_result.data:
+                continue
+            window_start = _parse_position_date(trades_result.data[0]['date'])
+        
+        if window_start < target_date:
+            windows.append((fund_name, window_start))
+    
+    if not windows:
+        return []
+    
+    calendar = market_holidays.calendar("any")
+    last_day = target_date - timedelta(days=1)
+    
+    funds_needing_backfill = []
+    for fund_name, window_start in windows:
+        expected = calendar.trading_days_between(window_start, last_day).astype(object)
+        if not len(expected):
+            continue
+        present = _existing_position_dates(supabase, fund_name, window_start, target_date)
+        missing_days = sorted(set(expected) - present)
+        if missing_days:
+            funds_needing_backfill.append((fund_name, window_start, missing_days))
+    return funds_needing_backfill
+
+
 def update_portfolio_prices_job(
     target_date: Optional[date] = None,
     from_date: Optional[date] = None,
@@ -262,7 +345,7 @@ def update_portfolio_prices_job(
             from market_data.price_cache import PriceCache
             from market_data.market_hours import MarketHours
             from utils.market_holidays import MarketHolidays
-            from supabase_client import SupabaseClient
+            from supabase_client import get_shared_client
             from utils.job_tracking import mark_job_started, mark_job_completed, mark_job_failed
             
             # Initialize components
@@ -278,7 +361,7 @@ def update_portfolio_prices_job(
             market_hours = MarketHours()
             market_holidays = MarketHolidays()
             # Use service role key to bypass RLS (background job needs full access)
-            client = SupabaseClient(use_service_role=True)
+            client = get_shared_client(use_service_role=True)
             
             # Handle date range mode
             if use_date_range and from_date and to_date:
@@ -439,86 +522,9 @@ def update_portfolio_prices_job(
             # This ensures we don't have gaps in the data
             logger.info("Checking for missing dates that need backfill...")
             try:
-                # Check each fund individually for missing dates
-                funds_needing_backfill = []
-                
-                for fund_name, _ in funds:
-                    # Find the latest date with data for THIS fund
-                    latest_date_result = client.supabase.table("portfolio_positions")\
-                        .select("date")\
-                        .eq("fund", fund_name)\
-                        .order("date", desc=True)\
-                        .limit(1)\
-                        .execute()
-                
-                    if latest_date_result.data:
-                        latest_date_str = latest_date_result.data[0]['date']
-                        if 'T' in latest_date_str:
-                            latest_date = datetime.fromisoformat(latest_date_str.replace('Z', '+00:00')).date()
-                        else:
-                            latest_date = datetime.strptime(latest_date_str, '%Y-%m-%d').date()
-                        
-                        # Check if there are missing trading days between latest_date and target_date
-                        missing_days = []
-                        check_date = latest_date + timedelta(days=1)
-                        while check_date < target_date:
-                            if market_holidays.is_trading_day(check_date, market="any"):
-                                # Verify data doesn't exist for this date for THIS fund
-                                start_of_day = datetime.combine(check_date, dt_time(0, 0, 0)).isoformat()
-                                end_of_day = datetime.combine(check_date, dt_time(23, 59, 59, 999999)).isoformat()
-                                
-                                data_check = client.supabase.table("portfolio_positions")\
-                                    .select("id", count='exact')\
-                                    .eq("fund", fund_name)\
-                                    .gte("date", start_of_day)\
-                                    .lt("date", end_of_day)\
-                                    .limit(1)\
-                                    .execute()
-                                
-                                if not (data_check.count and data_check.count > 0):
-                                    missing_days.append(check_date)
-                            check_date += timedelta(days=1)
-                        
-                        if missing_days:
-                            funds_needing_backfill.append((fund_name, latest_date, missing_days))
-                    else:
-                        # No data for this fund - find earliest trade and backfill from there
-                        trades_result = client.supabase.table("trade_log")\
-                            .select("date")\
-                            .eq("fund", fund_name)\
-                            .order("date")\
-                            .limit(1)\
-                            .execute()
-                        
-                        if trades_result.data:
-                            earliest_trade_str = trades_result.data[0]['date']
-                            if 'T' in earliest_trade_str:
-                                earliest_trade = datetime.fromisoformat(earliest_trade_str.replace('Z', '+00:00')).date()
-                            else:
-                                earliest_trade = datetime.strptime(earliest_trade_str, '%Y-%m-%d').date()
-                            
-                            # Find all missing trading days from earliest trade to target_date
-                            missing_days = []
-                            check_date = earliest_trade
-                            while check_date < target_date:
-                                if market_holidays.is_trading_day(check_date, market="any"):
-                                    start_of_day = datetime.combine(check_date, dt_time(0, 0, 0)).isoformat()
-                                    end_of_day = datetime.combine(check_date, dt_time(23, 59, 59, 999999)).isoformat()
-                                    
-                                    data_check = client.supabase.table("portfolio_positions")\
-                                        .select("id", count='exact')\
-                                        .eq("fund", fund_name)\
-                                        .gte("date", start_of_day)\
-                                        .lt("date", end_of_day)\
-                                        .limit(1)\
-                                        .execute()
-                                    
-                                    if not (data_check.count and data_check.count > 0):
-                                        missing_days.append(check_date)
-                                check_date += timedelta(days=1)
-                            
-                            if missing_days:
-                                funds_needing_backfill.append((fund_name, earliest_trade, missing_days))
+                funds_needing_backfill = _find_missing_trading_days(
+                    client.supabase, [fund_name for fund_name, _ in funds], target_date, market_holidays
+                )
             
                 # If any funds need backfill, do it now
                 if funds_needing_backfill:
@@ -905,6 +911,11 @@ def update_portfolio_prices_job(
                             # Don't increment counters for failed upsert
                     else:
                         logger.warning(f"  No positions to insert for {fund_name} (all tickers failed price fetch)")
+                    
+                    # Keep the daily value rollup read by charts and NAV in step,
+                    # including when the delete went through but the upsert did not
+                    from data.repositories.fund_daily_values import refresh_fund_daily_values
+                    refresh_fund_daily_values(client.supabase, fund_name, target_date, target_date)
             
                 except Exception as e:
                     logger.error(f"  ❌ Error processing fund {fund_name}: {e}", exc_info=True)
@@ -920,8 +931,8 @@ def update_portfolio_prices_job(
         
             # Clear cache to ensure fresh data is used in charts
             try:
-                from cache_version import bump_cache_version
-                bump_cache_version()
+                from cache_version import bump_cache_version, POSITIONS
+                bump_cache_version(funds=funds_completed, kinds=[POSITIONS])
                 logger.info("🔄 Cache version bumped - charts will use fresh portfolio data")
             except Exception as cache_error:
                 logger.warning(f"⚠️  Failed to bump cache version: {cache_error}")
@@ -1022,15 +1033,15 @@ def backfill_portfolio_prices_range(start_date: date, end_date: date) -> None:
             # Import dependencies
             from market_data.data_fetcher import MarketDataFetcher
             from utils.market_holidays import MarketHolidays
-            from supabase_client import SupabaseClient
+            from supabase_client import get_shared_client
             from utils.job_tracking import mark_job_completed, add_to_retry_queue
-            from cache_version import bump_cache_version
+            from cache_version import bump_cache_version, POSITIONS
             import pytz
             
             # Initialize components
             market_fetcher = MarketDataFetcher()
             market_holidays = MarketHolidays()
-            client = SupabaseClient(use_service_role=True)
+            client = get_shared_client(use_service_role=True)
             
             # Get all production funds
             funds_result = client.supabase.table("funds")\
@@ -1046,12 +1057,7 @@ def backfill_portfolio_prices_range(start_date: date, end_date: date) -> None:
             logger.info(f"Processing {len(funds)} production funds")
             
             # Build list of trading days in the range
-            trading_days = []
-            current = start_date
-            while current <= end_date:
-                if market_holidays.is_trading_day(current, market="any"):
-                    trading_days.append(current)
-                current += timedelta(days=1)
+            trading_days = market_holidays.get_trading_days_in_range(start_date, end_date, market="any")
             
             if not trading_days:
                 logger.info(f"No trading days in range {start_date} to {end_date}")
@@ -1068,6 +1074,7 @@ def backfill_portfolio_prices_range(start_date: date, end_date: date) -> None:
             all_production_funds = set(f[0] for f in funds)  # All funds we're processing
         
             for fund_idx, (fund_name, base_currency) in enumerate(funds, 1):
+                range_deleted = False  # Set once positions in the range may have been deleted
                 try:
                     fund_start_time = time.time()  # Track timing per fund
                     print(f"[{fund_idx}/{len(funds)}] Processing fund: {fund_name} (base_currency: {base_currency})", flush=True)
@@ -1406,6 +1413,7 @@ def backfill_portfolio_prices_range(start_date: date, end_date: date) -> None:
                     
                     deleted_total = 0
                     delete_batch_num = 0
+                    range_deleted = True
                     max_delete_iterations = 100  # Safety limit to prevent infinite loops
                     delete_iteration = 0
                     
@@ -1745,8 +1753,15 @@ def backfill_portfolio_prices_range(start_date: date, end_date: date) -> None:
                     logger.info(f"    Days validated: {len(days_inserted_for_fund)}")
                     logger.info(f"    Failed chunks: {len(failed_chunks)}")
                     
+                    # Rebuild the daily value rollup for the whole range in one call,
+                    # even if inserts failed, so it never keeps deleted days
+                    from data.repositories.fund_daily_values import refresh_fund_daily_values
+                    refresh_fund_daily_values(client.supabase, fund_name, trading_days[0], trading_days[-1])
+                    range_deleted = False
+                    
                     if total_inserted > 0:
                         logger.info(f"  Inserted {total_inserted}/{len(all_positions)} positions for {fund_name}")
+                        
                         if fund_name not in successful_funds:
                             successful_funds.append(fund_name)
                         total_positions_created += total_inserted
@@ -1794,6 +1809,11 @@ def backfill_portfolio_prices_range(start_date: date, end_date: date) -> None:
                     logger.error(f"    Error message: {str(e)[:500]}")
                     logger.error(f"    Full traceback:", exc_info=True)
                     
+                    # Positions may have been deleted before the failure
+                    if range_deleted:
+                        from data.repositories.fund_daily_values import refresh_fund_daily_values
+                        refresh_fund_daily_values(client.supabase, fund_name, trading_days[0], trading_days[-1])
+                    
                     # Add all remaining days to retry queue
                     # Find which days haven't been processed yet
                     # BUGFIX: days_inserted_for_fund might not exist if error occurred before chunking
@@ -1940,7 +1960,7 @@ def backfill_portfolio_prices_range(start_date: date, end_date: date) -> None:
         
             # Bump cache version to force UI refresh
             try:
-                bump_cache_version()
+                bump_cache_version(funds=all_production_funds, kinds=[POSITIONS])
                 logger.info("Cache version bumped - Streamlit will show fresh data")
             except Exception as e:
                 logger.warning(f"Failed to bump cache version: {e}")
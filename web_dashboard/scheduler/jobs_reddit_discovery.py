@@ -46,7 +46,7 @@ def subreddit_scanner_job() -> None:
         
         # Initialize services
         social_service = SocialSentimentService() # Requires env vars setup (Ollama, etc)
-        research_repo = ResearchRepository()
+        research_repo = ResearchRepository(workload="scheduler")
         
         subreddits = [
             'pennystocks', 
@@ -6,9 +6,12 @@ Jobs for fetching and storing market research articles from various sources.
 """
 
 import logging
+import os
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from typing import Optional
 
 # Add parent directory to path if needed (standard boilerplate for these jobs)
 import sys
@@ -41,6 +44,16 @@ from scheduler.jobs_common import calculate_relevance_score
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# RSS ingest pipeline sizing. Feed fetches and content extraction are I/O bound
+# and run wide; the LLM stage is bounded by what Ollama can serve in parallel
+# (match OLLAMA_NUM_PARALLEL on the Ollama host).
+RSS_FEED_WORKERS = int(os.getenv("RSS_FEED_WORKERS", "8"))
+RSS_EXTRACT_WORKERS = int(os.getenv("RSS_EXTRACT_WORKERS", "6"))
+RSS_LLM_WORKERS = int(os.getenv("RSS_LLM_WORKERS", "2"))
+# Minimum seconds between requests to the same site (feeds and article pages)
+RSS_DOMAIN_INTERVAL = float(os.getenv("RSS_DOMAIN_INTERVAL", "1.0"))
+
+
 def market_research_job() -> None:
     """Fetch and store general market news articles.
     
@@ -96,7 +109,7 @@ def market_research_job() -> None:
             return
         
         # Initialize research repository
-        research_repo = ResearchRepository()
+        research_repo = ResearchRepository(workload="scheduler")
         
         # Load domain blacklist
         from settings import get_research_domain_blacklist
@@ -428,14 +441,189 @@ def market_research_job() -> None:
         logger.error(f"❌ Market research job failed: {e}", exc_info=True)
 
 
+def _fetch_rss_feed(rss_client, feed: dict, rate_limiter) -> Optional[dict]:
+    """Pipeline stage 1: fetch and parse one feed."""
+    logger.info(f"📡 Fetching feed: {feed['name']}")
+    rate_limiter.wait(feed['url'])
+    return rss_client.fetch_feed(feed['url'])
+
+
+def _extract_rss_item(item: dict, research_repo, rate_limiter) -> Optional[str]:
+    """Pipeline stage 2: fetch full article content for items whose RSS body is too short.
+    
+    Returns:
+        Article content, or None if the item should be skipped (paywalled or extraction failed)
+    """
+    from research_utils import extract_article_content
+    
+    url = item['url']
+    title = item['title']
+    logger.info(f"  Extracting full content: {title[:40]}...")
+    rate_limiter.wait(url)
+    extracted = extract_article_content(url)
+    
+    # Check for paid subscription articles
+    if extracted.get('error') == 'paid_subscription':
+        # Check if archive was submitted
+        if extracted.get('archive_submitted'):
+            logger.info(f"  Paywalled article submitted to archive, saving for retry: {title[:40]}...")
+            # Save article with minimal content so retry job can find it
+            article_id = research_repo.save_article(
+                tickers=None,
+                sector=None,
+                article_type="Market News",
+                title=title,
+                url=url,
+                summary="[Paywalled - Submitted to archive for processing]",
+                content="[Paywalled - Submitted to archive for processing]",
+                source=item.get('source'),
+                published_at=item.get('published_at'),
+                relevance_score=0.0,
+                embedding=None
+            )
+            if article_id:
+                # Mark as archive submitted
+                research_repo.mark_archive_submitted(article_id, url)
+                logger.info(f"  Saved paywalled article for archive retry: {article_id}")
+        else:
+            logger.info(f"  Skipping paid subscription article: {title[:40]}...")
+        return None
+    
+    content = extracted.get('content', '')
+    if not content:
+        logger.warning(f"Failed to extract content for {title[:40]}...")
+        return None
+    return content
+
+
+def _summarize_and_save_rss_item(item: dict, content: str, research_repo, ollama_client,
+                                 owned_tickers: set) -> bool:
+    """Pipeline stage 3: AI summary, embedding, relevance and save.
+    
+    Returns:
+        True if the article was saved
+    """
+    url = item['url']
+    title = item['title']
+    
+    # Generate AI summary and embedding
+    summary = None
+    summary_data = {}
+    extracted_tickers = list(item.get('tickers', []) or [])  # May be from RSS metadata
+    extracted_sector = None
+    embedding = None
+    
+    if ollama_client:
+        summary_data = ollama_client.generate_summary(content)
+        
+        if isinstance(summary_data, str):
+            summary = summary_data
+        elif isinstance(summary_data, dict) and summary_data:
+            summary = summary_data.get("summary", "")
+            
+            # Extract tickers from AI if not already from RSS
+            if not extracted_tickers:
+                ai_tickers = summary_data.get("tickers", [])
+                from research_utils import validate_ticker_format, normalize_ticker
+                for ticker in ai_tickers:
+                    # Only validate format, trust AI inference (AI marks uncertain tickers with '?')
+                    if validate_ticker_format(ticker):
+                        normalized = normalize_ticker(ticker)
+                        if normalized:
+                            extracted_tickers.append(normalized)
+            
+            # Extract sector
+            sectors = summary_data.get("sectors", [])
+            if sectors:
+                extracted_sector = sectors[0]
+        
+        # Generate embedding
+        embedding = ollama_client.generate_embedding(content[:6000])
+    
+    # Calculate relevance score
+    relevance_score = calculate_relevance_score(
+        extracted_tickers if extracted_tickers else [],
+        extracted_sector,
+        owned_tickers=list(owned_tickers) if owned_tickers else None
+    )
+    
+    # Extract logic_check for relationship confidence
+    logic_check = summary_data.get("logic_check") if isinstance(summary_data, dict) else None
+    
+    # Save article
+    article_id = research_repo.save_article(
+        tickers=extracted_tickers if extracted_tickers else None,
+        sector=extracted_sector,
+        article_type="Market News",  # RSS feeds are general news
+        title=title,
+        url=url,
+        summary=summary,
+        content=content,
+        source=item.get('source'),
+        published_at=item.get('published_at'),
+        relevance_score=relevance_score,
+        embedding=embedding,
+        claims=summary_data.get("claims") if isinstance(summary_data, dict) else None,
+        fact_check=summary_data.get("fact_check") if isinstance(summary_data, dict) else None,
+        conclusion=summary_data.get("conclusion") if isinstance(summary_data, dict) else None,
+        sentiment=summary_data.get("sentiment") if isinstance(summary_data, dict) else None,
+        sentiment_score=summary_data.get("sentiment_score") if isinstance(summary_data, dict) else None,
+        logic_check=logic_check
+    )
+    
+    if not article_id:
+        return False
+    
+    logger.info(f"  ✅ Saved: {title[:40]}...")
+    
+    # Extract and save relationships
+    if isinstance(summary_data, dict) and logic_check and logic_check != "HYPE_DETECTED":
+        relationships = summary_data.get("relationships", [])
+        if relationships and isinstance(relationships, list):
+            if logic_check == "DATA_BACKED":
+                initial_confidence = 0.8
+            else:
+                initial_confidence = 0.4
+            
+            from research_utils import normalize_relationship
+            relationships_saved = 0
+            for rel in relationships:
+                if isinstance(rel, dict):
+                    source = rel.get("source", "").strip()
+                    target = rel.get("target", "").strip()
+                    rel_type = rel.get("type", "").strip()
+                    
+                    if source and target and rel_type:
+                        norm_source, norm_target, norm_type = normalize_relationship(source, target, rel_type)
+                        rel_id = research_repo.save_relationship(
+                            source_ticker=norm_source,
+                            target_ticker=norm_target,
+                            relationship_type=norm_type,
+                            initial_confidence=initial_confidence,
+                            source_article_id=article_id
+                        )
+                        if rel_id:
+                            relationships_saved += 1
+            
+            if relationships_saved > 0:
+                logger.info(f"  ✅ Saved {relationships_saved} relationship(s)")
+    
+    return True
+
+
 def rss_feed_ingest_job() -> None:
     """Ingest articles from validated RSS feeds (Push strategy).
     
     This job:
     1. Fetches all enabled RSS feeds from database
-    2. Parses each feed for new articles
+    2. Parses each feed for new articles (feeds fetched concurrently)
     3. Applies junk filtering before AI processing
     4. Saves high-quality articles to research database
+    
+    Items flow through a staged pipeline: one existence check per feed, a
+    pool of content extractors, then a smaller pool for the Ollama stages
+    (see RSS_*_WORKERS). Requests to the same site are spaced out by
+    RSS_DOMAIN_INTERVAL instead of fixed sleeps.
     """
     job_id = 'rss_feed_ingest'
     start_time = time.time()
@@ -453,7 +641,7 @@ def rss_feed_ingest_job() -> None:
         # Import dependencies
         try:
             from rss_utils import get_rss_client
-            from research_utils import extract_article_content
+            from research_utils import DomainRateLimiter
             from ollama_client import get_ollama_client
             from research_repository import ResearchRepository
             from postgres_client import PostgresClient
@@ -467,8 +655,8 @@ def rss_feed_ingest_job() -> None:
         # Get clients
         rss_client = get_rss_client()
         ollama_client = get_ollama_client()
-        research_repo = ResearchRepository()
-        postgres_client = PostgresClient()
+        research_repo = ResearchRepository(workload="scheduler")
+        postgres_client = PostgresClient(workload="scheduler")
         
         # Fetch enabled RSS feeds from database
         try:
@@ -499,8 +687,8 @@ def rss_feed_ingest_job() -> None:
         feeds_failed = 0
         
         # Get owned tickers for relevance scoring
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         funds_result = client.supabase.table("funds").select("name").eq("is_production", True).execute()
         
         owned_tickers = set()
@@ -510,208 +698,108 @@ def rss_feed_ingest_job() -> None:
             if positions_result.data:
                 owned_tickers = set(pos['ticker'] for pos in positions_result.data)
         
-        # Process each feed
-        for feed in feeds_result:
-            feed_id = feed['id']
-            feed_name = feed['name']
-            feed_url = feed['url']
+        # Staged pipeline: feeds are fetched concurrently; each feed's new items go
+        # either straight to the LLM stage (RSS body is long enough) or through the
+        # extraction pool first. Total time is set by the LLM stage's throughput.
+        rate_limiter = DomainRateLimiter(RSS_DOMAIN_INTERVAL)
+        seen_urls = set()
+        llm_futures = []
+        
+        with ThreadPoolExecutor(max_workers=RSS_FEED_WORKERS, thread_name_prefix="rss-feed") as feed_pool, \
+             ThreadPoolExecutor(max_workers=RSS_EXTRACT_WORKERS, thread_name_prefix="rss-extract") as extract_pool, \
+             ThreadPoolExecutor(max_workers=RSS_LLM_WORKERS, thread_name_prefix="rss-llm") as llm_pool:
             
-            try:
-                logger.info(f"📡 Fetching feed: {feed_name}")
-                
-                # Fetch and parse RSS feed
-                feed_data = rss_client.fetch_feed(feed_url)
-                
-                if not feed_data or not feed_data.get('items'):
-                    logger.warning(f"No items found in feed: {feed_name}")
-                    feeds_failed += 1
-                    continue
-                
-                items = feed_data['items']
-                junk_filtered = feed_data.get('junk_filtered', 0)
-                total_junk_filtered += junk_filtered
-                
-                logger.info(f"  Found {len(items)} items (filtered {junk_filtered} junk articles)")
-                
-                # Process each item
-                for item in items:
+            def queue_for_llm(item, content):
+                llm_futures.append(llm_pool.submit(
+                    _summarize_and_save_rss_item, item, content, research_repo, ollama_client, owned_tickers
+                ))
+            
+            feed_futures = {
+                feed_pool.submit(_fetch_rss_feed, rss_client, feed, rate_limiter): feed
+                for feed in feeds_result
+            }
+            extract_futures = {}
+            pending = set(feed_futures)
+            
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in extract_futures:
+                        item = extract_futures.pop(future)
+                        try:
+                            content = future.result()
+                        except Exception as e:
+                            logger.error(f"Error extracting RSS item {item['url']}: {e}")
+                            continue
+                        if content:
+                            queue_for_llm(item, content)
+                        else:
+                            total_articles_skipped += 1
+                        continue
+                    
+                    feed = feed_futures[future]
+                    feed_name = feed['name']
                     try:
+                        feed_data = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing feed '{feed_name}': {e}")
+                        feeds_failed += 1
+                        continue
+                    
+                    if not feed_data or not feed_data.get('items'):
+                        logger.warning(f"No items found in feed: {feed_name}")
+                        feeds_failed += 1
+                        continue
+                    
+                    items = feed_data['items']
+                    junk_filtered = feed_data.get('junk_filtered', 0)
+                    total_junk_filtered += junk_filtered
+                    
+                    logger.info(f"  {feed_name}: found {len(items)} items (filtered {junk_filtered} junk articles)")
+                    
+                    # Drop incomplete items and URLs already queued from another feed
+                    new_items = []
+                    for item in items:
                         url = item.get('url')
-                        title = item.get('title')
-                        content = item.get('content', '')
-                        
-                        if not url or not title:
+                        if not url or not item.get('title') or url in seen_urls:
                             continue
-                        
-                        # Check if already exists
-                        if research_repo.article_exists(url):
-                            logger.debug(f"Article already exists: {title[:50]}...")
-                            total_articles_skipped += 1
+                        seen_urls.add(url)
+                        new_items.append(item)
+                    
+                    # One query per feed for all of its URLs
+                    existing_urls = research_repo.get_existing_urls([item['url'] for item in new_items])
+                    total_articles_skipped += len(existing_urls)
+                    
+                    for item in new_items:
+                        if item['url'] in existing_urls:
                             continue
-                        
                         # Use RSS content if available, otherwise fetch from URL
-                        if not content or len(content) < 200:
-                            logger.info(f"  Extracting full content: {title[:40]}...")
-                            extracted = extract_article_content(url)
-                            
-                            # Check for paid subscription articles
-                            if extracted.get('error') == 'paid_subscription':
-                                # Check if archive was submitted
-                                if extracted.get('archive_submitted'):
-                                    logger.info(f"  Paywalled article submitted to archive, saving for retry: {title[:40]}...")
-                                    # Save article with minimal content so retry job can find it
-                                    article_id = research_repo.save_article(
-                                        tickers=None,
-                                        sector=None,
-                                        article_type="Market News",
-                                        title=title,
-                                        url=url,
-                                        summary="[Paywalled - Submitted to archive for processing]",
-                                        content="[Paywalled - Submitted to archive for processing]",
-                                        source=item.get('source'),
-                                        published_at=item.get('published_at'),
-                                        relevance_score=0.0,
-                                        embedding=None
-                                    )
-                                    if article_id:
-                                        # Mark as archive submitted
-                                        research_repo.mark_archive_submitted(article_id, url)
-                                        total_articles_skipped += 1
-                                        logger.info(f"  Saved paywalled article for archive retry: {article_id}")
-                                else:
-                                    logger.info(f"  Skipping paid subscription article: {title[:40]}...")
-                                    total_articles_skipped += 1
-                                continue
-                            
-                            content = extracted.get('content', '')
-                            if not content:
-                                logger.warning(f"Failed to extract content for {title[:40]}...")
-                                continue
-                        
-                        # Generate AI summary and embedding
-                        summary = None
-                        summary_data = {}
-                        extracted_tickers = item.get('tickers', []) or []  # May be from RSS metadata
-                        extracted_sector = None
-                        embedding = None
-                        
-                        if ollama_client:
-                            summary_data = ollama_client.generate_summary(content)
-                            
-                            if isinstance(summary_data, str):
-                                summary = summary_data
-                            elif isinstance(summary_data, dict) and summary_data:
-                                summary = summary_data.get("summary", "")
-                                
-                                # Extract tickers from AI if not already from RSS
-                                if not extracted_tickers:
-                                    ai_tickers = summary_data.get("tickers", [])
-                                    from research_utils import validate_ticker_format, normalize_ticker
-                                    for ticker in ai_tickers:
-                                        # Only validate format, trust AI inference (AI marks uncertain tickers with '?')
-                                        if validate_ticker_format(ticker):
-                                            normalized = normalize_ticker(ticker)
-                                            if normalized:
-                                                extracted_tickers.append(normalized)
-                                
-                                # Extract sector
-                                sectors = summary_data.get("sectors", [])
-                                if sectors:
-                                    extracted_sector = sectors[0]
-                            
-                            # Generate embedding
-                            embedding = ollama_client.generate_embedding(content[:6000])
-                        
-                        # Calculate relevance score
-                        relevance_score = calculate_relevance_score(
-                            extracted_tickers if extracted_tickers else [],
-                            extracted_sector,
-                            owned_tickers=list(owned_tickers) if owned_tickers else None
-                        )
-                        
-                        # Extract logic_check for relationship confidence
-                        logic_check = summary_data.get("logic_check") if isinstance(summary_data, dict) else None
-                        
-                        # Save article
-                        article_id = research_repo.save_article(
-                            tickers=extracted_tickers if extracted_tickers else None,
-                            sector=extracted_sector,
-                            article_type="Market News",  # RSS feeds are general news
-                            title=title,
-                            url=url,
-                            summary=summary,
-                            content=content,
-                            source=item.get('source'),
-                            published_at=item.get('published_at'),
-                            relevance_score=relevance_score,
-                            embedding=embedding,
-                            claims=summary_data.get("claims") if isinstance(summary_data, dict) else None,
-                            fact_check=summary_data.get("fact_check") if isinstance(summary_data, dict) else None,
-                            conclusion=summary_data.get("conclusion") if isinstance(summary_data, dict) else None,
-                            sentiment=summary_data.get("sentiment") if isinstance(summary_data, dict) else None,
-                            sentiment_score=summary_data.get("sentiment_score") if isinstance(summary_data, dict) else None,
-                            logic_check=logic_check
+                        content = item.get('content', '')
+                        if content and len(content) >= 200:
+                            queue_for_llm(item, content)
+                        else:
+                            extract_future = extract_pool.submit(_extract_rss_item, item, research_repo, rate_limiter)
+                            extract_futures[extract_future] = item
+                            pending.add(extract_future)
+                    
+                    # Update feed's last_fetched_at timestamp
+                    try:
+                        postgres_client.execute_update(
+                            "UPDATE rss_feeds SET last_fetched_at = NOW() WHERE id = %s",
+                            (feed['id'],)
                         )
-                        
-                        if article_id:
-                            total_articles_saved += 1
-                            logger.info(f"  ✅ Saved: {title[:40]}...")
-                            
-                            # Extract and save relationships
-                            if isinstance(summary_data, dict) and logic_check and logic_check != "HYPE_DETECTED":
-                                relationships = summary_data.get("relationships", [])
-                                if relationships and isinstance(relationships, list):
-                                    if logic_check == "DATA_BACKED":
-                                        initial_confidence = 0.8
-                                    else:
-                                        initial_confidence = 0.4
-                                    
-                                    from research_utils import normalize_relationship
-                                    relationships_saved = 0
-                                    for rel in relationships:
-                                        if isinstance(rel, dict):
-                                            source = rel.get("source", "").strip()
-                                            target = rel.get("target", "").strip()
-                                            rel_type = rel.get("type", "").strip()
-                                            
-                                            if source and target and rel_type:
-                                                norm_source, norm_target, norm_type = normalize_relationship(source, target, rel_type)
-                                                rel_id = research_repo.save_relationship(
-                                                    source_ticker=norm_source,
-                                                    target_ticker=norm_target,
-                                                    relationship_type=norm_type,
-                                                    initial_confidence=initial_confidence,
-                                                    source_article_id=article_id
-                                                )
-                                                if rel_id:
-                                                    relationships_saved += 1
-                                    
-                                    if relationships_saved > 0:
-                                        logger.info(f"  ✅ Saved {relationships_saved} relationship(s)")
-                        
-                        total_articles_processed += 1
-                        time.sleep(0.5)  # Small delay between articles
-                        
                     except Exception as e:
-                        logger.error(f"Error processing RSS item: {e}")
-                        continue
-                
-                # Update feed's last_fetched_at timestamp
+                        logger.warning(f"Failed to update last_fetched_at for {feed_name}: {e}")
+                    
+                    feeds_processed += 1
+            
+            for future in as_completed(llm_futures):
                 try:
-                    postgres_client.execute_update(
-                        "UPDATE rss_feeds SET last_fetched_at = NOW() WHERE id = %s",
-                        (feed_id,)
-                    )
+                    if future.result():
+                        total_articles_saved += 1
+                    total_articles_processed += 1
                 except Exception as e:
-                    logger.warning(f"Failed to update last_fetched_at for {feed_name}: {e}")
-                
-                feeds_processed += 1
-                time.sleep(2)  # Delay between feeds
-                
-            except Exception as e:
-                logger.error(f"Error processing feed '{feed_name}': {e}")
-                feeds_failed += 1
-                continue
+                    logger.error(f"Error processing RSS item: {e}")
         
         duration_ms = int((time.time() - start_time) * 1000)
         message = f"Processed {feeds_processed} feeds: {total_articles_saved} saved, {total_articles_skipped} skipped, {total_junk_filtered} junk filtered"
@@ -758,7 +846,7 @@ def ticker_research_job() -> None:
             from research_utils import extract_article_content
             from ollama_client import get_ollama_client
             from research_repository import ResearchRepository
-            from supabase_client import SupabaseClient
+            from supabase_client import get_shared_client
         except ImportError as e:
             duration_ms = int((time.time() - start_time) * 1000)
             message = f"Missing dependency: {e}"
@@ -776,7 +864,7 @@ def ticker_research_job() -> None:
             
         searxng_client = get_searxng_client()
         ollama_client = get_ollama_client()
-        research_repo = ResearchRepository()
+        research_repo = ResearchRepository(workload="scheduler")
         
         if not searxng_client:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -790,7 +878,7 @@ def ticker_research_job() -> None:
         blacklist = get_research_domain_blacklist()
 
         # Connect to Supabase
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         
         # 1. Get production funds
         funds_result = client.supabase.table("funds")\
@@ -1276,12 +1364,12 @@ def archive_retry_job() -> None:
             return
         
         # Get clients
-        research_repo = ResearchRepository()
+        research_repo = ResearchRepository(workload="scheduler")
         ollama_client = get_ollama_client()
         
         # Get owned tickers for relevance scoring
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         funds_result = client.supabase.table("funds").select("name").eq("is_production", True).execute()
         
         owned_tickers = set()
@@ -1512,7 +1600,7 @@ def process_research_reports_job() -> None:
             return
         
         # Initialize clients
-        research_repo = ResearchRepository()
+        research_repo = ResearchRepository(workload="scheduler")
         ollama_client = get_ollama_client()
         
         if not ollama_client:
@@ -1584,6 +1672,9 @@ def process_research_reports_job() -> None:
                 except Exception as e:
                     logger.warning(f"  AI summary failed: {e}")
                 
+                # Cached by content hash, so re-processing an unchanged report skips the model
+                embedding = ollama_client.generate_embedding(text_content[:6000]) or None
+                
                 # Extract tickers from AI summary
                 extracted_tickers = []
                 from research_utils import validate_ticker_format, normalize_ticker
@@ -1633,7 +1724,7 @@ def process_research_reports_job() -> None:
                     source="Research Report",
                     published_at=published_at,
                     relevance_score=0.9,  # Research reports are highly relevant
-                    embedding=summary_result.get('embedding') if isinstance(summary_result, dict) else None,
+                    embedding=embedding,
                     fund=fund,
                     claims=summary_result.get("claims") if isinstance(summary_result, dict) else None,
                     fact_check=summary_result.get("fact_check") if isinstance(summary_result, dict) else None,
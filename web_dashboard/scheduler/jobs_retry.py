@@ -51,7 +51,7 @@ def process_retry_queue_job() -> None:
             mark_resolved, mark_abandoned
         )
         from scheduler.jobs_portfolio import backfill_portfolio_prices_range
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
         
         logger.info("🔄 Starting retry queue processor...")
         
@@ -64,7 +64,7 @@ def process_retry_queue_job() -> None:
         ]
         
         try:
-            client = SupabaseClient(use_service_role=True)
+            client = get_shared_client(use_service_role=True)
             running_jobs = client.supabase.table("job_executions")\
                 .select("job_name")\
                 .eq("status", "running")\
@@ -66,7 +66,7 @@ def fetch_social_sentiment_job() -> None:
         # Import dependencies (lazy imports)
         try:
             from social_service import SocialSentimentService
-            from supabase_client import SupabaseClient
+            from supabase_client import get_shared_client
         except ImportError as e:
             duration_ms = int((time.time() - start_time) * 1000)
             message = f"Missing dependency: {e}"
@@ -76,7 +76,7 @@ def fetch_social_sentiment_job() -> None:
         
         # Initialize service
         service = SocialSentimentService()
-        supabase_client = SupabaseClient(use_service_role=True)
+        supabase_client = get_shared_client(use_service_role=True)
         
         # Check FlareSolverr availability
         try:
@@ -342,7 +342,7 @@ def social_sentiment_ai_job() -> None:
 
         # Get sessions that need analysis (limit to avoid timeouts)
         from postgres_client import PostgresClient
-        pc = PostgresClient()
+        pc = PostgresClient(workload="scheduler")
         pending_sessions = pc.execute_query("""
             SELECT id, ticker, platform FROM sentiment_sessions
             WHERE needs_ai_analysis = TRUE
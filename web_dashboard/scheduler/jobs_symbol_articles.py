@@ -76,7 +76,7 @@ def seeking_alpha_symbol_job() -> None:
             from research_utils import extract_article_content, extract_source_from_url
             from ollama_client import get_ollama_client
             from research_repository import ResearchRepository
-            from supabase_client import SupabaseClient
+            from supabase_client import get_shared_client
         except ImportError as e:
             duration_ms = int((time.time() - start_time) * 1000)
             message = f"Missing dependency: {e}"
@@ -86,10 +86,10 @@ def seeking_alpha_symbol_job() -> None:
         
         # Initialize clients
         ollama_client = get_ollama_client()
-        research_repo = ResearchRepository()
+        research_repo = ResearchRepository(workload="scheduler")
         
         # Connect to Supabase to get portfolio tickers
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         
         # Get production funds
         funds_result = client.supabase.table("funds")\
@@ -166,8 +166,8 @@ def detect_stale_running_jobs() -> None:
     Mark as failed and add to retry queue if calculation job.
     """
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         # Find stale running jobs (older than 1 hour)
         from datetime import timezone
@@ -239,8 +239,8 @@ def detect_recent_failed_jobs() -> None:
     Add to retry queue if calculation job and not already queued.
     """
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         # Find failed jobs in last 24 hours
         from datetime import timezone
@@ -388,8 +388,8 @@ def process_retry_queue() -> None:
             else:
                 # Reset to pending for next retry
                 try:
-                    from supabase_client import SupabaseClient
-                    client = SupabaseClient(use_service_role=True)
+                    from supabase_client import get_shared_client
+                    client = get_shared_client(use_service_role=True)
                     effective_entity_id = entity_id if entity_id is not None else ''
                     client.supabase.table("job_retry_queue")\
                         .update({'status': 'pending'})\
@@ -410,8 +410,8 @@ def validate_critical_jobs() -> None:
     Catches cases where job was marked complete but data insert failed.
     """
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         market_holidays = MarketHolidays()
         
         # For update_portfolio_prices: check last 7 trading days
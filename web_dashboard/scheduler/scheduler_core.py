@@ -570,7 +570,7 @@ def cleanup_stale_running_jobs() -> int:
         Number of stale jobs cleaned up
     """
     try:
-        from supabase_client import SupabaseClient
+        from supabase_client import get_shared_client
         
         # Defensive import with retry logic
         try:
@@ -585,7 +585,7 @@ def cleanup_stale_running_jobs() -> int:
         
         from datetime import datetime
         
-        client = SupabaseClient(use_service_role=True)
+        client = get_shared_client(use_service_role=True)
         
         # Find all jobs still marked as running
         result = client.supabase.table("job_executions")\
@@ -1025,8 +1025,8 @@ def get_job_logs(job_id: str, limit: int = 10) -> List[Dict[str, Any]]:
     
     # First, try to read from database (persistent)
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         # Get recent successful/failed executions from database
         # Use completed_at for ordering (most recent first)
@@ -1158,8 +1158,8 @@ def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
     is_running = False
     running_since = None
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         # Query for running executions
         running_result = client.supabase.table("job_executions")\
@@ -1204,8 +1204,8 @@ def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
     # Get last error from failed executions
     last_error = None
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         # Query for most recent failed execution
         failed_result = client.supabase.table("job_executions")\
@@ -1494,8 +1494,8 @@ def get_all_jobs_status_batched() -> List[Dict[str, Any]]:
     # Batch query 1: Get all running jobs
     running_jobs = {}
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         # Get all running executions for our job names
         running_result = client.supabase.table("job_executions")\
@@ -1542,8 +1542,8 @@ def get_all_jobs_status_batched() -> List[Dict[str, Any]]:
     
     # Batch query 2: Get most recent execution status (to check for errors vs success)
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         # Get most recent execution (success or failed) for each job
         # We need to see if the *last* run was a failure
@@ -1580,8 +1580,8 @@ def get_all_jobs_status_batched() -> List[Dict[str, Any]]:
     # Batch query 3: Get recent logs for all jobs
     # We'll get recent executions and group by job_name in memory
     try:
-        from supabase_client import SupabaseClient
-        client = SupabaseClient(use_service_role=True)
+        from supabase_client import get_shared_client
+        client = get_shared_client(use_service_role=True)
         
         # Get recent successful/failed executions for all our jobs
         # Get more than we need, then group by job_name
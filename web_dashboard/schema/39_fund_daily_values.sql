@@ -0,0 +1,131 @@
+-- =====================================================
+-- FUND DAILY VALUES ROLLUP
+-- =====================================================
+-- Per-fund, per-day, per-currency totals of portfolio_positions.
+-- The performance chart and the NAV calculation used to pull every
+-- position row of a fund and group by day in pandas; they now read
+-- this table instead (a few hundred rows per fund).
+--
+-- Maintained incrementally by refresh_fund_daily_values(), which the
+-- portfolio price job, the price backfill and SupabaseRepository call
+-- for the days they rewrite, and the fund wipe/delete paths call for
+-- the days they delete.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS fund_daily_values (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    fund VARCHAR(50) NOT NULL,
+    date DATE NOT NULL,                      -- Same as portfolio_positions.date_only (UTC day)
+    currency VARCHAR(10) NOT NULL,           -- Position currency; native totals are in this currency
+    base_currency VARCHAR(10),
+    position_count INTEGER NOT NULL DEFAULT 0,
+    ticker_count INTEGER NOT NULL DEFAULT 0, -- Fewer tickers than positions means duplicate rows
+    total_value DECIMAL(20, 6) NOT NULL DEFAULT 0,
+    cost_basis DECIMAL(20, 6) NOT NULL DEFAULT 0,
+    pnl DECIMAL(20, 6) NOT NULL DEFAULT 0,
+    -- NULL unless every position of the group has a pre-converted value
+    total_value_base DECIMAL(20, 6),
+    cost_basis_base DECIMAL(20, 6),
+    pnl_base DECIMAL(20, 6),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE(fund, date, currency)
+);
+
+CREATE INDEX IF NOT EXISTS idx_fund_daily_values_fund_date ON fund_daily_values(fund, date);
+CREATE INDEX IF NOT EXISTS idx_fund_daily_values_date ON fund_daily_values(date);
+
+-- =====================================================
+-- REFRESH FUNCTION
+-- =====================================================
+-- Recomputes the rollup for one fund (or all funds when p_fund is NULL)
+-- over an inclusive date range (open-ended when a bound is NULL).
+-- Days that no longer have positions are removed.
+--
+-- Callers with a user JWT (the dashboard's admin wipe/delete paths) must
+-- name a fund they can access; only the service role and direct database
+-- sessions may refresh every fund at once.
+
+CREATE OR REPLACE FUNCTION refresh_fund_daily_values(
+    p_fund VARCHAR(50) DEFAULT NULL,
+    p_start_date DATE DEFAULT NULL,
+    p_end_date DATE DEFAULT NULL
+)
+RETURNS INTEGER AS $$
+DECLARE
+    rows_written INTEGER;
+BEGIN
+    IF auth.uid() IS NOT NULL THEN
+        IF p_fund IS NULL THEN
+            RAISE EXCEPTION 'refresh_fund_daily_values: p_fund is required';
+        END IF;
+        IF NOT (is_admin(auth.uid()) OR user_has_fund_access(auth.uid(), p_fund)) THEN
+            RAISE EXCEPTION 'refresh_fund_daily_values: access denied to fund %', p_fund;
+        END IF;
+    END IF;
+
+    DELETE FROM fund_daily_values
+    WHERE (p_fund IS NULL OR fund = p_fund)
+      AND (p_start_date IS NULL OR date >= p_start_date)
+      AND (p_end_date IS NULL OR date <= p_end_date);
+
+    INSERT INTO fund_daily_values (
+        fund, date, currency, base_currency, position_count, ticker_count,
+        total_value, cost_basis, pnl,
+        total_value_base, cost_basis_base, pnl_base, updated_at
+    )
+    SELECT
+        pp.fund,
+        pp.date_only,
+        UPPER(COALESCE(pp.currency, 'CAD')),
+        MAX(pp.base_currency),
+        COUNT(*),
+        COUNT(DISTINCT pp.ticker),
+        SUM(pp.shares * pp.price),
+        SUM(pp.cost_basis),
+        SUM(pp.pnl),
+        CASE WHEN COUNT(pp.total_value_base) = COUNT(*) THEN SUM(pp.total_value_base) END,
+        CASE WHEN COUNT(pp.cost_basis_base) = COUNT(*) THEN SUM(pp.cost_basis_base) END,
+        CASE WHEN COUNT(pp.pnl_base) = COUNT(*) THEN SUM(pp.pnl_base) END,
+        NOW()
+    FROM portfolio_positions pp
+    WHERE (p_fund IS NULL OR pp.fund = p_fund)
+      AND (p_start_date IS NULL OR pp.date_only >= p_start_date)
+      AND (p_end_date IS NULL OR pp.date_only <= p_end_date)
+    GROUP BY pp.fund, pp.date_only, UPPER(COALESCE(pp.currency, 'CAD'));
+
+    GET DIAGNOSTICS rows_written = ROW_COUNT;
+    RETURN rows_written;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- The rollup is derived data; the access check above limits user callers to their funds
+REVOKE ALL ON FUNCTION refresh_fund_daily_values(VARCHAR, DATE, DATE) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION refresh_fund_daily_values(VARCHAR, DATE, DATE) TO authenticated, service_role;
+
+-- =====================================================
+-- ROW LEVEL SECURITY
+-- =====================================================
+-- Same visibility as portfolio_positions
+
+ALTER TABLE fund_daily_values ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view daily values for their funds" ON fund_daily_values;
+CREATE POLICY "Users can view daily values for their funds"
+ON fund_daily_values FOR SELECT
+USING (
+    fund IN (SELECT fund_name FROM user_funds WHERE user_id = auth.uid())
+    OR
+    fund IN (
+        SELECT fund FROM fund_contributions
+        WHERE normalize_email(email) = normalize_email((SELECT email FROM user_profiles WHERE user_id = auth.uid()))
+    )
+);
+
+-- Initial population from existing positions
+SELECT refresh_fund_daily_values(NULL, NULL, NULL);
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '✅ fund_daily_values rollup created and populated!';
+END $$;
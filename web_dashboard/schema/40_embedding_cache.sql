@@ -0,0 +1,16 @@
+-- Embedding Cache Schema (research Postgres)
+-- Stores embeddings keyed by a hash of (model, normalized text) so that
+-- re-ingesting the same or whitespace-identical content does not call Ollama again.
+-- Used by ollama_client.OllamaClient.generate_embeddings via embedding_cache.py
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    content_hash CHAR(64) PRIMARY KEY,     -- sha256 hex of model + normalized text
+    model VARCHAR(100) NOT NULL,
+    embedding REAL[] NOT NULL,             -- Plain array: dimensions differ between models
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- For pruning entries of retired models
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_model ON embedding_cache(model);
+
+COMMENT ON TABLE embedding_cache IS 'Embedding vectors keyed by sha256(model, normalized text); safe to truncate';
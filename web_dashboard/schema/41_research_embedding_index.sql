@@ -0,0 +1,10 @@
+-- Approximate nearest-neighbour index for research_articles.embedding
+-- Lets search_similar_articles (ORDER BY embedding <=> query LIMIT n) walk an
+-- HNSW graph instead of scanning every article. Requires pgvector >= 0.5.0.
+--
+-- ResearchRepository.ensure_embedding_index() creates the same index
+-- (CONCURRENTLY, so ingestion keeps running) the first time a process runs a
+-- similarity search, so applying this file by hand is optional.
+
+CREATE INDEX IF NOT EXISTS idx_research_articles_embedding_hnsw
+ON research_articles USING hnsw (embedding vector_cosine_ops);
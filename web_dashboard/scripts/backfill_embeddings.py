@@ -75,43 +75,46 @@ def backfill_embeddings(batch_size: int = 10, delay_between_batches: float = 2.0
         successful = 0
         failed = 0
         
-        for i, article in enumerate(articles):
+        for start in range(0, total_articles, batch_size):
+            batch = [article for article in articles[start:start + batch_size] if article.get('content')]
+            skipped = min(batch_size, total_articles - start) - len(batch)
+            if skipped:
+                logger.warning(f"Skipping {skipped} article(s) with no content")
+                failed += skipped
+            
             try:
-                article_id = article['id']
-                title = article.get('title', 'Untitled')
-                content = article.get('content', '')
+                # One batched (and cached) embedding call per chunk
+                logger.info(f"[{start + 1}-{start + len(batch) + skipped}/{total_articles}] Embedding {len(batch)} articles...")
+                embeddings = ollama_client.generate_embeddings(
+                    [article['content'][:6000] for article in batch]  # Truncate to avoid token limits
+                )
                 
-                if not content:
-                    logger.warning(f"Skipping article {article_id}: no content")
-                    failed += 1
-                    continue
+                updates = []
+                for article, embedding in zip(batch, embeddings):
+                    if not embedding:
+                        logger.warning(f"Failed to generate embedding for {article['id']}")
+                        failed += 1
+                        continue
+                    embedding_str = "[" + ",".join(str(float(x)) for x in embedding) + "]"
+                    updates.append((embedding_str, article['id']))
                 
-                # Generate embedding
-                logger.info(f"[{i+1}/{total_articles}] Embedding: {title[:50]}...")
-                embedding = ollama_client.generate_embedding(content[:6000])  # Truncate to avoid token limits
+                # Save embeddings to database
+                if updates:
+                    update_query = "UPDATE research_articles SET embedding = %s::vector WHERE id = %s"
+                    repo.client.execute_many(update_query, updates)
                 
-                if not embedding:
-                    logger.warning(f"Failed to generate embedding for {article_id}")
-                    failed += 1
-                    continue
-                
-                # Save embedding to database
-                embedding_str = "[" + ",".join(str(float(x)) for x in embedding) + "]"
-                update_query = "UPDATE research_articles SET embedding = %s::vector WHERE id = %s"
-                repo.client.execute_update(update_query, (embedding_str, article_id))
-                
-                successful += 1
-                processed += 1
+                successful += len(updates)
+                processed += len(updates)
                 
                 # Pause between batches to avoid overloading Ollama
-                if processed % batch_size == 0:
-                    logger.info(f"Processed {processed}/{total_articles} ({successful} successful, {failed} failed)")
+                logger.info(f"Processed {processed}/{total_articles} ({successful} successful, {failed} failed)")
+                if start + batch_size < total_articles:
                     logger.info(f"Pausing for {delay_between_batches}s...")
                     time.sleep(delay_between_batches)
                 
             except Exception as e:
-                logger.error(f"Error processing article {article.get('id')}: {e}")
-                failed += 1
+                logger.error(f"Error processing batch starting at article {start + 1}: {e}")
+                failed += len(batch)
                 continue
         
         logger.info(f"✅ Backfill complete: {successful} successful, {failed} failed out of {total_articles} total")
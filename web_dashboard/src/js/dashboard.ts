@@ -572,6 +572,160 @@ function initGrid(): void {
     }
 }
 
+// --- Dashboard Bundle ---
+
+// One panel from /api/dashboard/bundle (data matches the panel's own endpoint)
+interface BundlePanel {
+    panel: string;
+    status: number;
+    data: unknown;
+    elapsed: number;
+}
+
+// Panel endpoints that /api/dashboard/bundle can answer
+const BUNDLE_PANEL_PATHS: Record<string, string> = {
+    '/api/dashboard/summary': 'summary',
+    '/api/dashboard/charts/performance': 'performance',
+    '/api/dashboard/charts/allocation': 'allocation',
+    '/api/dashboard/charts/pnl': 'pnl',
+    '/api/dashboard/charts/currency': 'currency',
+    '/api/dashboard/holdings': 'holdings',
+    '/api/dashboard/activity': 'activity',
+    '/api/dashboard/dividends': 'dividends',
+    '/api/dashboard/movers': 'movers'
+};
+
+// A bundle request: each panel's promise plus the query string its own endpoint would
+// need to produce the same data (e.g. fetchActivity's limit=100)
+interface DashboardBundle {
+    panels: Map<string, Promise<BundlePanel | null>>;
+    queries: Record<string, string>;
+}
+
+// Bundle request made by the current full refresh (null otherwise)
+let pendingBundle: DashboardBundle | null = null;
+
+// Order-independent form of a query string, for comparing panel requests with the bundle's
+function canonicalQuery(params: URLSearchParams | Record<string, string>): string {
+    const entries: [string, string][] = [];
+    if (params instanceof URLSearchParams) {
+        params.forEach((value, key) => entries.push([key, value]));
+    } else {
+        entries.push(...Object.entries(params));
+    }
+    return new URLSearchParams(entries.sort(([a], [b]) => a.localeCompare(b))).toString();
+}
+
+function detectChartTheme(): string {
+    const dataTheme = document.documentElement.getAttribute('data-theme') || 'system';
+    if (dataTheme === 'dark' || dataTheme === 'light' || dataTheme === 'midnight-tokyo' || dataTheme === 'abyss') {
+        return dataTheme;
+    }
+    if (dataTheme === 'system') {
+        const bodyBg = window.getComputedStyle(document.body).backgroundColor;
+        const isDark = bodyBg && (bodyBg.includes('rgb(31, 41, 55)') || bodyBg.includes('rgb(17, 24, 39)') || bodyBg.includes('rgb(55, 65, 81)'));
+        return isDark ? 'dark' : 'light';
+    }
+    return 'light';
+}
+
+/**
+ * Request every panel in one streamed call. Each panel's promise resolves as soon as its
+ * line arrives, or with null if the bundle fails (callers then use the panel endpoint).
+ */
+function startDashboardBundle(): DashboardBundle {
+    const resolvers = new Map<string, (panel: BundlePanel | null) => void>();
+    const panels = new Map<string, Promise<BundlePanel | null>>();
+    for (const name of Object.values(BUNDLE_PANEL_PATHS)) {
+        panels.set(name, new Promise<BundlePanel | null>(resolve => resolvers.set(name, resolve)));
+    }
+
+    const fund = state.currentFund;
+    const theme = detectChartTheme();
+    const range = state.timeRange;
+    const useSolid = String(state.useSolidLines);
+    const activityLimit = '100';
+    const moversLimit = '10';
+    const queries: Record<string, string> = {
+        summary: canonicalQuery({ fund }),
+        performance: canonicalQuery({ fund, range, use_solid: useSolid, theme }),
+        allocation: canonicalQuery({ fund, theme }),
+        pnl: canonicalQuery({ fund, theme }),
+        currency: canonicalQuery({ fund, theme }),
+        holdings: canonicalQuery({ fund }),
+        activity: canonicalQuery({ fund, limit: activityLimit }),
+        dividends: canonicalQuery({ fund }),
+        movers: canonicalQuery({ fund, limit: moversLimit })
+    };
+
+    const url = `/api/dashboard/bundle?fund=${encodeURIComponent(fund)}&range=${range}&use_solid=${useSolid}&theme=${encodeURIComponent(theme)}&activity_limit=${activityLimit}&movers_limit=${moversLimit}&stream=true`;
+    const startTime = performance.now();
+
+    (async () => {
+        try {
+            const response = await fetch(url, { credentials: 'include' });
+            if (!response.ok || !response.body) {
+                console.warn('[Dashboard] Bundle unavailable, using per-panel requests', { status: response.status });
+                return;
+            }
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                let newline = buffer.indexOf('\n');
+                while (newline >= 0) {
+                    const line = buffer.slice(0, newline).trim();
+                    buffer = buffer.slice(newline + 1);
+                    newline = buffer.indexOf('\n');
+                    if (!line) continue;
+                    const message = JSON.parse(line);
+                    if (message.panel) {
+                        resolvers.get(message.panel)?.(message as BundlePanel);
+                    } else if (message.done) {
+                        console.log('[Dashboard] Bundle complete', {
+                            duration: `${(performance.now() - startTime).toFixed(2)}ms`,
+                            load_times: message.load_times,
+                            processing_time: message.processing_time
+                        });
+                    }
+                }
+            }
+        } catch (error) {
+            console.warn('[Dashboard] Bundle request failed, using per-panel requests', error);
+        } finally {
+            // Panels not delivered fall back to their own endpoint (no-op for resolved ones)
+            resolvers.forEach(resolve => resolve(null));
+        }
+    })();
+
+    return { panels, queries };
+}
+
+/**
+ * fetch() for panel endpoints: answered from the pending bundle when it delivered the
+ * panel successfully for the same query parameters, otherwise a normal request.
+ */
+async function dashboardFetch(url: string, init?: RequestInit): Promise<Response> {
+    const parsed = new URL(url, window.location.origin);
+    const panelName = BUNDLE_PANEL_PATHS[parsed.pathname];
+    const pending = panelName && pendingBundle && pendingBundle.queries[panelName] === canonicalQuery(parsed.searchParams)
+        ? pendingBundle.panels.get(panelName)
+        : undefined;
+    if (pending) {
+        const panel = await pending;
+        if (panel && panel.status === 200) {
+            return new Response(JSON.stringify(panel.data), {
+                status: 200,
+                headers: { 'Content-Type': 'application/json' }
+            });
+        }
+    }
+    return fetch(url, init);
+}
+
 async function refreshDashboard(): Promise<void> {
     console.log('[Dashboard] Starting dashboard refresh...', {
         fund: state.currentFund,
@@ -587,6 +741,10 @@ async function refreshDashboard(): Promise<void> {
 
     const startTime = performance.now();
 
+    // One bundled request feeds every panel below; each falls back to its own endpoint
+    const bundle = startDashboardBundle();
+    pendingBundle = bundle;
+
     try {
         await Promise.all([
             fetchSummary(),
@@ -618,6 +776,10 @@ async function refreshDashboard(): Promise<void> {
             timestamp: new Date().toISOString()
         });
         showDashboardError(error);
+    } finally {
+        if (pendingBundle === bundle) {
+            pendingBundle = null;
+        }
     }
 }
 
@@ -674,7 +836,7 @@ async function fetchSummary(): Promise<void> {
     console.log('[Dashboard] Fetching summary...', { url, fund: state.currentFund });
 
     try {
-        const response = await fetch(url, { credentials: 'include' });
+        const response = await dashboardFetch(url, { credentials: 'include' });
         const duration = performance.now() - startTime;
 
         console.log('[Dashboard] Summary response received', {
@@ -808,24 +970,7 @@ async function fetchPerformanceChart(): Promise<void> {
     // Show spinner
     showSpinner('performance-chart-spinner');
 
-    // Detect actual theme from page (same as sector chart)
-    const htmlElement = document.documentElement;
-    const dataTheme = htmlElement.getAttribute('data-theme') || 'system';
-    let theme: string = 'light'; // default
-
-    if (dataTheme === 'dark' || dataTheme === 'light' || dataTheme === 'midnight-tokyo' || dataTheme === 'abyss') {
-        theme = dataTheme;
-    } else if (dataTheme === 'system') {
-        // For 'system', check if page is actually in dark mode via CSS
-        const bodyBg = window.getComputedStyle(document.body).backgroundColor;
-        // Check for dark mode background colors
-        const isDark = bodyBg && (
-            bodyBg.includes('rgb(31, 41, 55)') ||  // --bg-primary dark
-            bodyBg.includes('rgb(17, 24, 39)') ||  // --bg-secondary dark  
-            bodyBg.includes('rgb(55, 65, 81)')     // --bg-tertiary dark
-        );
-        theme = isDark ? 'dark' : 'light';
-    }
+    const theme = detectChartTheme();
 
     // Match Streamlit: use_solid_lines parameter from checkbox
     const url = `/api/dashboard/charts/performance?fund=${encodeURIComponent(state.currentFund)}&range=${state.timeRange}&use_solid=${state.useSolidLines}&theme=${encodeURIComponent(theme)}`;
@@ -834,7 +979,7 @@ async function fetchPerformanceChart(): Promise<void> {
     console.log('[Dashboard] Fetching performance chart...', { url, fund: state.currentFund, range: state.timeRange, use_solid: state.useSolidLines });
 
     try {
-        const response = await fetch(url, { credentials: 'include' });
+        const response = await dashboardFetch(url, { credentials: 'include' });
         const duration = performance.now() - startTime;
 
         console.log('[Dashboard] Performance chart response received', {
@@ -889,24 +1034,7 @@ async function fetchSectorChart(): Promise<void> {
     // Show spinner
     showSpinner('sector-chart-spinner');
 
-    // Detect actual theme from page (same as performance chart)
-    const htmlElement = document.documentElement;
-    const dataTheme = htmlElement.getAttribute('data-theme') || 'system';
-    let theme: string = 'light'; // default
-
-    if (dataTheme === 'dark' || dataTheme === 'light' || dataTheme === 'midnight-tokyo' || dataTheme === 'abyss') {
-        theme = dataTheme;
-    } else if (dataTheme === 'system') {
-        // For 'system', check if page is actually in dark mode via CSS
-        const bodyBg = window.getComputedStyle(document.body).backgroundColor;
-        // Check for dark mode background colors
-        const isDark = bodyBg && (
-            bodyBg.includes('rgb(31, 41, 55)') ||  // --bg-primary dark
-            bodyBg.includes('rgb(17, 24, 39)') ||  // --bg-secondary dark  
-            bodyBg.includes('rgb(55, 65, 81)')     // --bg-tertiary dark
-        );
-        theme = isDark ? 'dark' : 'light';
-    }
+    const theme = detectChartTheme();
 
     const url = `/api/dashboard/charts/allocation?fund=${encodeURIComponent(state.currentFund)}&theme=${encodeURIComponent(theme)}`;
     const startTime = performance.now();
@@ -914,7 +1042,7 @@ async function fetchSectorChart(): Promise<void> {
     console.log('[Dashboard] Fetching sector chart...', { url, fund: state.currentFund, theme });
 
     try {
-        const response = await fetch(url, { credentials: 'include' });
+        const response = await dashboardFetch(url, { credentials: 'include' });
         const duration = performance.now() - startTime;
 
         console.log('[Dashboard] Sector chart response received', {
@@ -967,7 +1095,7 @@ async function fetchHoldings(): Promise<void> {
     console.log('[Dashboard] Fetching holdings...', { url, fund: state.currentFund });
 
     try {
-        const response = await fetch(url, { credentials: 'include' });
+        const response = await dashboardFetch(url, { credentials: 'include' });
         const duration = performance.now() - startTime;
 
         console.log('[Dashboard] Holdings response received', {
@@ -1076,7 +1204,7 @@ async function fetchActivity(): Promise<void> {
     console.log('[Dashboard] Fetching activity...', { url, fund: state.currentFund });
 
     try {
-        const response = await fetch(url, { credentials: 'include' });
+        const response = await dashboardFetch(url, { credentials: 'include' });
         const duration = performance.now() - startTime;
 
         console.log('[Dashboard] Activity response received', {
@@ -1162,7 +1290,7 @@ async function fetchMovers(): Promise<void> {
     console.log('[Dashboard] Fetching movers...', { url, fund: state.currentFund });
 
     try {
-        const response = await fetch(url, { credentials: 'include' });
+        const response = await dashboardFetch(url, { credentials: 'include' });
         const duration = performance.now() - startTime;
 
         console.log('[Dashboard] Movers response received', {
@@ -1248,7 +1376,7 @@ async function fetchDividends(): Promise<void> {
     console.log('[Dashboard] Fetching dividends...', { url });
 
     try {
-        const response = await fetch(url, { credentials: 'include' });
+        const response = await dashboardFetch(url, { credentials: 'include' });
         if (!response.ok) throw new Error(`HTTP ${response.status}`);
         const data: DividendData = await response.json();
         
@@ -1313,23 +1441,13 @@ function updateMetricText(id: string, text: string): void {
 async function fetchCurrencyChart(): Promise<void> {
     showSpinner('currency-chart-spinner');
     
-    // Theme logic (same as other charts)
-    const htmlElement = document.documentElement;
-    const dataTheme = htmlElement.getAttribute('data-theme') || 'system';
-    let theme: string = 'light';
-    if (dataTheme === 'dark' || dataTheme === 'light' || dataTheme === 'midnight-tokyo' || dataTheme === 'abyss') {
-        theme = dataTheme;
-    } else if (dataTheme === 'system') {
-        const bodyBg = window.getComputedStyle(document.body).backgroundColor;
-        const isDark = bodyBg && (bodyBg.includes('rgb(31, 41, 55)') || bodyBg.includes('rgb(17, 24, 39)') || bodyBg.includes('rgb(55, 65, 81)'));
-        theme = isDark ? 'dark' : 'light';
-    }
+    const theme = detectChartTheme();
 
     const url = `/api/dashboard/charts/currency?fund=${encodeURIComponent(state.currentFund)}&theme=${encodeURIComponent(theme)}`;
     console.log('[Dashboard] Fetching currency chart...', { url });
 
     try {
-        const response = await fetch(url, { credentials: 'include' });
+        const response = await dashboardFetch(url, { credentials: 'include' });
         if (!response.ok) throw new Error(`HTTP ${response.status}`);
         
         const data: AllocationChartData = await response.json();
@@ -1663,24 +1781,7 @@ function renderPnlChart(data: PnlChartData): void {
 }
 
 async function loadPnlChart(fund: string): Promise<void> {
-    // Detect actual theme from page (same as other charts)
-    const htmlElement = document.documentElement;
-    const dataTheme = htmlElement.getAttribute('data-theme') || 'system';
-    let theme: string = 'light'; // default
-
-    if (dataTheme === 'dark' || dataTheme === 'light' || dataTheme === 'midnight-tokyo' || dataTheme === 'abyss') {
-        theme = dataTheme;
-    } else if (dataTheme === 'system') {
-        // For 'system', check if page is actually in dark mode via CSS
-        const bodyBg = window.getComputedStyle(document.body).backgroundColor;
-        // Check for dark mode background colors
-        const isDark = bodyBg && (
-            bodyBg.includes('rgb(31, 41, 55)') ||  // --bg-primary dark
-            bodyBg.includes('rgb(17, 24, 39)') ||  // --bg-secondary dark  
-            bodyBg.includes('rgb(55, 65, 81)')     // --bg-tertiary dark
-        );
-        theme = isDark ? 'dark' : 'light';
-    }
+    const theme = detectChartTheme();
 
     const startTime = performance.now();
     const url = `/api/dashboard/charts/pnl?fund=${encodeURIComponent(fund || '')}&theme=${encodeURIComponent(theme)}`;
@@ -1690,7 +1791,7 @@ async function loadPnlChart(fund: string): Promise<void> {
     try {
         showSpinner('pnl-chart-spinner');
         
-        const response = await fetch(url, {
+        const response = await dashboardFetch(url, {
             method: 'GET',
             credentials: 'include',
             headers: {
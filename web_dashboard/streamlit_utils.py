@@ -942,52 +942,39 @@ def calculate_portfolio_value_over_time(fund: str, days: Optional[int] = None, d
         if days is not None and days > 0:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
         
-        # Query portfolio_positions to get daily snapshots with actual market values
-        # Include currency for proper USD→CAD conversion
-        
-        # WE MUST PAGINATE - Supabase has a hard limit of 1000 rows per request
-        all_rows = []
-        batch_size = 1000
-        offset = 0
+        # Read daily totals from the fund_daily_values rollup (one row per day and
+        # currency). Its rows have the same columns as portfolio_positions, so the
+        # aggregation below works unchanged on either source.
+        from data.repositories.fund_daily_values import load_fund_daily_values
         query_start = time.time()
+        all_rows = load_fund_daily_values(
+            client.supabase, fund, cutoff_date.date() if cutoff_date else None
+        )
         
-        while True:
-            # Build query for this batch
-            # Include base currency columns for pre-converted values (performance optimization)
-            query = client.supabase.table("portfolio_positions").select(
-                "date, total_value, cost_basis, pnl, fund, currency, "
-                "total_value_base, cost_basis_base, pnl_base, base_currency"
-            )
+        if all_rows is None:
+            # Rollup not available - query portfolio_positions to get daily snapshots
+            # Include currency for proper USD→CAD conversion
             
-            if fund:
-                query = query.eq("fund", fund)
-            
-            # Apply date filter if specified (for performance with large datasets)
-            if cutoff_date:
-                query = query.gte("date", cutoff_date.strftime('%Y-%m-%dT%H:%M:%SZ'))
+            # WE MUST PAGINATE - Supabase has a hard limit of 1000 rows per request
+            # Keyset pages on (date, id), with date slices read in parallel
+            from data.repositories.supabase_pagination import SupabasePageReader
             
-            # Order by date AND id to ensure consistent pagination (stable sort)
-            # Use range() for pagination
-            # Note: range is 0-indexed and inclusive for start, inclusive for end in PostgREST logic usually,
-            # but supabase-py .range(start, end) handles it.
-            result = query.order("date").order("id").range(offset, offset + batch_size - 1).execute()
+            def apply_filters(query):
+                if fund:
+                    query = query.eq("fund", fund)
+                # Apply date filter if specified (for performance with large datasets)
+                if cutoff_date:
+                    query = query.gte("date", cutoff_date.strftime('%Y-%m-%dT%H:%M:%SZ'))
+                return query
             
-            rows = result.data
-            if not rows:
-                break
-                
-            all_rows.extend(rows)
-            
-            # If we got fewer rows than batch_size, we're done
-            if len(rows) < batch_size:
-                break
-                
-            offset += batch_size
-            
-            # Safety break to prevent infinite loops (e.g. max 50k rows = 50 batches)
-            if offset > 50000:
-                print("Warning: Reached 50,000 row safety limit in pagination")
-                break
+            # Include base currency columns for pre-converted values (performance optimization)
+            all_rows = SupabasePageReader(
+                client.supabase,
+                "portfolio_positions",
+                "date, total_value, cost_basis, pnl, fund, currency, "
+                "total_value_base, cost_basis_base, pnl_base, base_currency",
+                apply_filters
+            ).fetch_all()
         
         query_time = time.time() - query_start
         logger.info(f"⏱️ calculate_portfolio_value_over_time - DB queries: {query_time:.2f}s ({len(all_rows)} rows)")
@@ -1785,34 +1772,23 @@ def get_historical_fund_values(fund: str, dates: List[datetime], _cache_version:
         
         min_date = min(date_strs)
         
-        # Query portfolio_positions for this fund, from earliest contribution date onwards
-        # WE MUST PAGINATE - Supabase has a hard limit of 1000 rows per request
-        all_rows = []
-        batch_size = 1000
-        offset = 0
-        
-        while True:
-            query = client.supabase.table("portfolio_positions").select(
-                "id, date, ticker, shares, price, currency, cost_basis"
-            ).eq("fund", fund).gte("date", min_date).order("date").order("id")
-            
-            result = query.range(offset, offset + batch_size - 1).execute()
-            
-            if not result.data:
-                break
-            
-            all_rows.extend(result.data)
-            
-            # If we got fewer rows than batch_size, we're done
-            if len(result.data) < batch_size:
-                break
-            
-            offset += batch_size
-            
-            # Safety break to prevent infinite loops (e.g. max 50k rows = 50 batches)
-            if offset > 50000:
-                print("Warning: Reached 50,000 row safety limit in get_historical_fund_values pagination")
-                break
+        # Daily totals per currency from the fund_daily_values rollup
+        from data.repositories.fund_daily_values import load_fund_daily_values
+        all_rows = load_fund_daily_values(
+            client.supabase, fund, datetime.strptime(min_date, '%Y-%m-%d').date()
+        )
+        from_rollup = all_rows is not None
+        
+        if not from_rollup:
+            # Rollup not available - query portfolio_positions for this fund, from earliest contribution date onwards
+            # WE MUST PAGINATE - Supabase has a hard limit of 1000 rows per request
+            from data.repositories.supabase_pagination import SupabasePageReader
+            all_rows = SupabasePageReader(
+                client.supabase,
+                "portfolio_positions",
+                "id, date, ticker, shares, price, currency, cost_basis",
+                lambda query: query.eq("fund", fund).gte("date", min_date)
+            ).fetch_all()
         
         if not all_rows:
             return {}, {}
@@ -1827,8 +1803,16 @@ def get_historical_fund_values(fund: str, dates: List[datetime], _cache_version:
         df_check = pd.DataFrame(all_rows)
         df_check['date_key'] = df_check['date'].str[:10]  # Just YYYY-MM-DD
         
+        if from_rollup:
+            # The rollup counts positions and distinct tickers per day
+            duplicate_rows = df_check[df_check['position_count'] > df_check['ticker_count']]
+            if len(duplicate_rows) > 0:
+                logger.error(f"DUPLICATE DATA DETECTED in portfolio_positions for {fund}! {len(duplicate_rows)} day(s) have duplicate tickers. This will inflate NAV calculations!")
+                log_message(f"CRITICAL: duplicate portfolio positions found for {fund} on {len(duplicate_rows)} day(s). NAV calculations will be incorrect!", level='ERROR')
+                print(f"🚨 CRITICAL: duplicate portfolio positions detected for {fund}!")
+                print(f"   Run debug/clean_duplicate_positions_v2.py to fix.")
         # Check if we need ticker column (older data might not have it)
-        if 'ticker' in df_check.columns:
+        elif 'ticker' in df_check.columns:
             # Group by date and ticker to find duplicates
             duplicate_check = df_check.groupby(['date_key', 'ticker']).size().reset_index(name='count')
             duplicates = duplicate_check[duplicate_check['count'] > 1]
@@ -1901,13 +1885,15 @@ def get_historical_fund_values(fund: str, dates: List[datetime], _cache_version:
         cost_basis_by_date = {}  # Track cost basis for uninvested cash calculation
         for row in all_rows:
             date_str = row['date'][:10]  # Get just YYYY-MM-DD
-            shares = float(row.get('shares', 0))
-            price = float(row.get('price', 0))
             currency = row.get('currency', 'USD')
             cost_basis = float(row.get('cost_basis', 0))
+            if from_rollup:
+                # Already summed per day and currency
+                value = float(row.get('total_value', 0))
+            else:
+                value = float(row.get('shares', 0)) * float(row.get('price', 0))
             
             # Convert to CAD using date-specific exchange rate
-            value = shares * price
             if currency == 'USD':
                 usd_to_cad = exchange_rates_by_date.get(date_str, fallback_rate)
                 value *= usd_to_cad
@@ -6,6 +6,10 @@ Handles all database operations
 
 import os
 import json
+import base64
+import threading
+import time
+from collections import OrderedDict
 
 # Check critical dependencies first
 try:
@@ -18,7 +22,7 @@ except ImportError:
     raise ImportError("pandas not available. Activate virtual environment.")
 
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
 import logging
 from dotenv import load_dotenv
@@ -27,7 +31,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 try:
-    from supabase import create_client, Client
+    from supabase import create_client, Client, ClientOptions
 except ImportError:
     print("❌ ERROR: Supabase client not available")
     print("🔔 SOLUTION: Activate the virtual environment first!")
@@ -40,12 +44,18 @@ logger = logging.getLogger(__name__)
 class SupabaseClient:
     """Client for interacting with Supabase database"""
     
-    def __init__(self, user_token: Optional[str] = None, refresh_token: Optional[str] = None, use_service_role: bool = False):
+    def __init__(self, user_token: Optional[str] = None, refresh_token: Optional[str] = None, use_service_role: bool = False,
+                 http_client: Optional[Any] = None):
         """Initialize Supabase client
         
+        Prefer get_shared_client(), which reuses long-lived clients instead of
+        setting up a new HTTP connection pool on every call.
+        
         Args:
             user_token: Optional JWT token from authenticated user (respects RLS)
             use_service_role: If True, use service role key (bypasses RLS, admin only)
+            http_client: Optional httpx.Client shared with other clients (connection pooling).
+                Auth headers are then sent per request and never set on the shared session.
         """
         self.url = os.getenv("SUPABASE_URL")
         
@@ -65,7 +75,9 @@ class SupabaseClient:
             raise ValueError("SUPABASE_URL and appropriate key must be set")
         
         # Create client with publishable/service role key
-        self.supabase: Client = create_client(self.url, self.key)
+        self._shared_http = http_client is not None
+        options = ClientOptions(httpx_client=http_client) if self._shared_http else None
+        self.supabase: Client = create_client(self.url, self.key, options)
         
         # If user token provided, set it as the auth session
         if user_token and not use_service_role:
@@ -99,6 +111,13 @@ class SupabaseClient:
             except Exception as e:
                 logger.warning(f"[SUPABASE_CLIENT] ❌ auth.set_session() failed: {e}")
             
+            if self._shared_http:
+                # The session is shared with other clients - only set the header that
+                # postgrest sends with each request
+                self.supabase.postgrest.auth(user_token)
+                logger.debug("[SUPABASE_CLIENT] Completed user token initialization (shared connection pool)")
+                return
+            
             # Method 2: Set Authorization header directly on postgrest client
             # This ensures table queries work
             try:
@@ -207,6 +226,13 @@ class SupabaseClient:
         
         # Ensure Authorization header is set RIGHT before making the call
         # This is critical for auth.uid() to work in Postgres functions
+        if hasattr(self, '_user_token') and self._user_token and self._shared_http:
+            # Shared session: the per-request postgrest headers carry the token
+            postgrest.auth(self._user_token)
+            if params:
+                return postgrest.rpc(function_name, params).execute()
+            return postgrest.rpc(function_name).execute()
+        
         if hasattr(self, '_user_token') and self._user_token:
             # Set header directly on session - this is more reliable than postgrest.auth()
             if hasattr(postgrest, 'session'):
@@ -909,3 +935,103 @@ class SupabaseClient:
         except Exception as e:
             logger.error(f"❌ Error caching benchmark data: {e}")
             return False
+
+
+# =====================================================
+# SHARED CLIENT REGISTRY
+# =====================================================
+# Creating a SupabaseClient sets up a new HTTP client, TLS session and auth
+# state. Hot paths (job tracking, rate lookups, every scheduler job) get
+# long-lived clients from this registry instead. All registry clients share
+# one keep-alive connection pool; httpx clients are safe to use from the
+# scheduler's worker threads.
+
+_USER_CLIENT_TTL_SECONDS = 3600  # Used when a token's expiry cannot be read
+_MAX_USER_CLIENTS = 256
+
+_registry_lock = threading.Lock()
+_shared_http_client = None
+_role_clients: Dict[str, SupabaseClient] = {}
+_user_clients: "OrderedDict[Tuple[str, Optional[str]], Tuple[SupabaseClient, float]]" = OrderedDict()
+
+
+def _get_shared_http_client():
+    """Process-wide httpx.Client used by every registry client (call with the lock held)."""
+    global _shared_http_client
+    if _shared_http_client is None:
+        import httpx
+        _shared_http_client = httpx.Client(
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0),
+            follow_redirects=True,
+        )
+    return _shared_http_client
+
+
+def _token_expiry(token: str) -> float:
+    """Epoch seconds at which a JWT expires (its 'exp' claim), or a default TTL from now."""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except Exception:
+        return time.time() + _USER_CLIENT_TTL_SECONDS
+
+
+def get_shared_client(user_token: Optional[str] = None, refresh_token: Optional[str] = None,
+                      use_service_role: bool = False) -> SupabaseClient:
+    """Get a long-lived SupabaseClient for a role.
+    
+    Clients are keyed by role: service role, anon, or the user's access token.
+    User clients are dropped once their token expires (and the least recently
+    used ones beyond a fixed number), so a refreshed token gets a new client.
+    
+    Args:
+        user_token: Optional JWT token from authenticated user (respects RLS)
+        refresh_token: Optional refresh token for the user session
+        use_service_role: If True, use service role key (bypasses RLS, admin only)
+        
+    Returns:
+        Shared SupabaseClient
+        
+    Raises:
+        ValueError: If the required environment variables are missing
+    """
+    with _registry_lock:
+        if use_service_role or not user_token:
+            role = 'service' if use_service_role else 'anon'
+            client = _role_clients.get(role)
+            if client is None:
+                client = SupabaseClient(use_service_role=use_service_role, http_client=_get_shared_http_client())
+                client.supabase.postgrest  # Build the lazily created REST client before threads share it
+                _role_clients[role] = client
+            return client
+        
+        now = time.time()
+        for key in [k for k, (_, expires) in _user_clients.items() if expires <= now]:
+            del _user_clients[key]
+        
+        key = (user_token, refresh_token)
+        entry = _user_clients.get(key)
+        if entry is not None:
+            _user_clients.move_to_end(key)
+            return entry[0]
+        
+        client = SupabaseClient(user_token=user_token, refresh_token=refresh_token,
+                                http_client=_get_shared_http_client())
+        client.supabase.postgrest
+        _user_clients[key] = (client, _token_expiry(user_token))
+        while len(_user_clients) > _MAX_USER_CLIENTS:
+            _user_clients.popitem(last=False)
+        return client
+
+
+def clear_shared_clients() -> None:
+    """Drop all registry clients and close the shared connection pool."""
+    global _shared_http_client
+    with _registry_lock:
+        _role_clients.clear()
+        _user_clients.clear()
+        if _shared_http_client is not None:
+            _shared_http_client.close()
+            _shared_http_client = None
@@ -100,6 +100,10 @@ def rebuild_fund_from_date(fund_name: str, start_date: date, job_id: str = None)
             delete_count_pos = len(result.data) if result.data else 0
             logger.info(f"   Deleted {delete_count_pos} portfolio positions")
             
+            # Drop the deleted days from the daily value rollup too
+            from data.repositories.fund_daily_values import refresh_fund_daily_values
+            refresh_fund_daily_values(supabase, fund_name, start_date)
+            
             # Delete performance metrics
             result = supabase.table("performance_metrics").delete()\
                 .eq("fund", fund_name)\